@@ -32,7 +32,14 @@ from libs.helper import email as email_validate
 from libs.password import hash_password, password_pattern, valid_password
 from libs.rsa import generate_key_pair
 from models import Tenant
-from models.dataset import Dataset, DatasetCollectionBinding, DatasetMetadata, DatasetMetadataBinding, DocumentSegment
+from models.dataset import (
+    Dataset,
+    DatasetCollectionBinding,
+    DatasetMetadata,
+    DatasetMetadataBinding,
+    DocumentSegment,
+    Embedding,
+)
 from models.dataset import Document as DatasetDocument
 from models.model import Account, App, AppAnnotationSetting, AppMode, Conversation, MessageAnnotation, UploadFile
 from models.oauth import DatasourceOauthParamConfig, DatasourceProvider
@@ -1900,3 +1907,57 @@ def migrate_oss(
             except Exception as e:
                 db.session.rollback()
                 click.echo(click.style(f"Failed to update DB storage_type: {str(e)}", fg="red"))
+
+
+@click.command(
+    "convert-embedding-cache",
+    help="Convert cached embeddings stored as pickled lists into the compact binary format.",
+)
+@click.option("--batch-size", default=1000, show_default=True, help="Number of rows scanned per batch.")
+@click.option("--dry-run", is_flag=True, default=False, help="Count legacy rows without converting them.")
+def convert_embedding_cache(batch_size: int, dry_run: bool):
+    """
+    Convert rows of the `embeddings` table written as `pickle.dumps(list[float])`.
+
+    Legacy rows keep working, since decoding accepts both formats, so this can run at any time and be
+    interrupted and resumed. Rows are scanned in primary key order and committed per batch.
+    """
+    click.echo(click.style("Start converting embedding cache.", fg="green"))
+    last_id: str | None = None
+    scanned = 0
+    converted = 0
+    failed = 0
+    while True:
+        stmt = select(Embedding).order_by(Embedding.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Embedding.id > last_id)
+        embeddings = db.session.scalars(stmt).all()
+        if not embeddings:
+            break
+        last_id = embeddings[-1].id
+        scanned += len(embeddings)
+
+        for embedding in embeddings:
+            if not embedding.is_legacy_format:
+                continue
+            try:
+                if not dry_run:
+                    embedding.set_embedding(embedding.get_embedding_array())
+                converted += 1
+            except Exception:
+                failed += 1
+                logger.exception("Failed to convert embedding %s", embedding.id)
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        click.echo(f"Scanned {scanned} embeddings, {'found' if dry_run else 'converted'} {converted} legacy rows.")
+
+    click.echo(
+        click.style(
+            f"Embedding cache conversion finished. Scanned: {scanned}, "
+            f"{'legacy' if dry_run else 'converted'}: {converted}, failed: {failed}.",
+            fg="green" if not failed else "yellow",
+        )
+    )
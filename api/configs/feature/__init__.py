@@ -6,6 +6,7 @@ from pydantic import (
     Field,
     HttpUrl,
     NegativeInt,
+    NonNegativeFloat,
     NonNegativeInt,
     PositiveFloat,
     PositiveInt,
@@ -128,6 +129,28 @@ class CodeExecutionSandboxConfig(BaseSettings):
         default=5.0,
     )
 
+    CODE_EXECUTION_JINJA2_MODE: Literal["sandbox", "in_process"] = Field(
+        description="Where Jinja2 templates are rendered: 'sandbox' sends them to the code execution service,"
+        " 'in_process' renders them in a sandboxed Jinja2 environment in the API process",
+        default="sandbox",
+    )
+
+    CODE_EXECUTION_JINJA2_TEMPLATE_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum number of compiled Jinja2 templates cached per process for in-process rendering."
+        " Set to 0 to disable the cache.",
+        default=256,
+    )
+
+    CODE_EXECUTION_JINJA2_RENDER_TIMEOUT: PositiveFloat = Field(
+        description="Maximum time in seconds an in-process Jinja2 render may take",
+        default=5.0,
+    )
+
+    CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH: PositiveInt = Field(
+        description="Maximum number of characters an in-process Jinja2 render may produce",
+        default=1_000_000,
+    )
+
     CODE_MAX_NUMBER: PositiveInt = Field(
         description="Maximum allowed numeric value in code execution",
         default=9223372036854775807,
@@ -221,6 +244,26 @@ class PluginConfig(BaseSettings):
         default=600.0,
     )
 
+    PLUGIN_DAEMON_POOL_MAX_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of concurrent connections for the plugin daemon HTTP client",
+        default=100,
+    )
+
+    PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of persistent keep-alive connections for the plugin daemon HTTP client",
+        default=20,
+    )
+
+    PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY: PositiveFloat | None = Field(
+        description="Keep-alive expiry in seconds for idle plugin daemon connections (set to None to disable)",
+        default=5.0,
+    )
+
+    PLUGIN_DAEMON_HTTP2_ENABLED: bool = Field(
+        description="Negotiate HTTP/2 with the plugin daemon, requires an https PLUGIN_DAEMON_URL and the 'h2' package",
+        default=False,
+    )
+
     INNER_API_KEY_FOR_PLUGIN: str = Field(description="Inner api key for plugin", default="inner-api-key")
 
     PLUGIN_REMOTE_INSTALL_HOST: str = Field(
@@ -243,6 +286,18 @@ class PluginConfig(BaseSettings):
         default=15728640 * 12,
     )
 
+    PLUGIN_TOOL_PROVIDER_CACHE_TTL: NonNegativeInt = Field(
+        description="Seconds a plugin tool provider declaration is cached per process, which bounds how long it stays"
+        " stale after plugin changes whose completion is not observed, such as remote debugging plugins or installs"
+        " nobody polls. Set to 0 to disable the cache.",
+        default=300,
+    )
+
+    PLUGIN_TOOL_PROVIDER_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of plugin tool provider declarations cached per process",
+        default=1024,
+    )
+
 
 class MarketplaceConfig(BaseSettings):
     """
@@ -705,6 +760,11 @@ class WorkflowConfig(BaseSettings):
         default=400_000,
     )
 
+    WORKFLOW_GRAPH_CACHE_MAX_SIZE: NonNegativeInt = Field(
+        description="Maximum number of compiled workflow graphs cached per process. Set to 0 to disable the cache.",
+        default=128,
+    )
+
     # GraphEngine Worker Pool Configuration
     GRAPH_ENGINE_MIN_WORKERS: PositiveInt = Field(
         description="Minimum number of workers per GraphEngine instance",
@@ -727,6 +787,29 @@ class WorkflowConfig(BaseSettings):
         ge=0.1,
     )
 
+    GRAPH_ENGINE_COALESCE_STREAM_CHUNKS: bool = Field(
+        description="Merge adjacent stream chunks of the same node output that have not been streamed yet,"
+        " so slow consumers receive fewer, larger chunks",
+        default=False,
+    )
+
+    GRAPH_ENGINE_SHARED_POOL_ENABLED: bool = Field(
+        description="Execute the nodes of all GraphEngine instances on one worker pool shared by the process,"
+        " instead of dedicated workers per instance",
+        default=False,
+    )
+
+    GRAPH_ENGINE_SHARED_POOL_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of workers of the shared worker pool,"
+        " workers blocked on nested iteration or loop runs are not counted",
+        default=64,
+    )
+
+    GRAPH_ENGINE_SHARED_POOL_MAX_WORKERS_PER_TENANT: NonNegativeInt = Field(
+        description="Maximum number of nodes of one tenant executing at once on the shared worker pool, 0 for no limit",
+        default=0,
+    )
+
 
 class WorkflowNodeExecutionConfig(BaseSettings):
     """
@@ -842,6 +925,33 @@ class AuthConfig(BaseSettings):
         default=86400,
     )
 
+    API_TOKEN_AUTH_CACHE_ENABLED: bool = Field(
+        description="Cache the API tokens the service API authenticates with,"
+        " and update the last use time of API tokens in batches",
+        default=False,
+    )
+
+    API_TOKEN_AUTH_CACHE_TTL: PositiveInt = Field(
+        description="Seconds a service API authentication context is kept in Redis",
+        default=300,
+    )
+
+    API_TOKEN_AUTH_CACHE_LOCAL_TTL: NonNegativeInt = Field(
+        description="Seconds a service API authentication context is kept in process memory,"
+        " which bounds how long other processes accept a deleted API token. Set to 0 to only cache in Redis.",
+        default=10,
+    )
+
+    API_TOKEN_AUTH_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of service API authentication contexts kept in process memory",
+        default=10000,
+    )
+
+    API_TOKEN_LAST_USED_UPDATE_INTERVAL: PositiveInt = Field(
+        description="Seconds between two updates of the last use time of an API token",
+        default=60,
+    )
+
 
 class ModerationConfig(BaseSettings):
     """
@@ -853,6 +963,17 @@ class ModerationConfig(BaseSettings):
         default=300,
     )
 
+    MODERATION_BUFFER_OVERLAP: NonNegativeInt = Field(
+        description="Characters of already moderated output prepended to the next streamed window,"
+        " so that text spanning two windows is still moderated",
+        default=100,
+    )
+
+    MODERATION_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of threads moderating streamed outputs, shared by all requests of a process",
+        default=16,
+    )
+
 
 class ToolConfig(BaseSettings):
     """
@@ -864,6 +985,37 @@ class ToolConfig(BaseSettings):
         default=3600,
     )
 
+    MCP_CLIENT_POOL_MAX_IDLE_PER_PROVIDER: NonNegativeInt = Field(
+        description="Maximum number of idle MCP client sessions kept per provider and credentials."
+        " Set to 0 to open a new session for every call.",
+        default=4,
+    )
+
+    MCP_CLIENT_POOL_IDLE_TIMEOUT: PositiveFloat = Field(
+        description="Seconds an idle MCP client session is kept before it is closed",
+        default=300.0,
+    )
+
+    MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL: NonNegativeFloat = Field(
+        description="Idle seconds after which a pooled MCP client session is pinged before it is reused",
+        default=30.0,
+    )
+
+    AGENT_PARALLEL_TOOL_CALLS_ENABLED: bool = Field(
+        description="Run the tool calls emitted by a function calling agent in one turn concurrently",
+        default=False,
+    )
+
+    AGENT_PARALLEL_TOOL_CALLS_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of tool calls of one agent turn running at the same time",
+        default=4,
+    )
+
+    AGENT_PARALLEL_TOOL_CALL_TIMEOUT: PositiveFloat = Field(
+        description="Seconds a concurrently run tool call may take before the agent reports it as timed out",
+        default=300.0,
+    )
+
 
 class TemplateMode(StrEnum):
     # unsafe mode allows flexible operations in templates, but may cause security vulnerabilities
@@ -982,6 +1134,40 @@ class RagEtlConfig(BaseSettings):
         default="",
     )
 
+    DOCUMENT_EXTRACTOR_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of files a document extractor node extracts text from in parallel",
+        default=4,
+    )
+
+    DOCUMENT_EXTRACTOR_PARSER_PROCESSES: NonNegativeInt = Field(
+        description="Number of processes per API or worker process that parse PDF, DOCX and spreadsheet files for"
+        " document extractor nodes, so they are parsed in parallel. The processes are spawned on first use."
+        " Set to 0 to parse them in the calling thread, PDF files are then parsed one at a time.",
+        default=0,
+    )
+
+    EXTRACTED_TEXT_CACHE_ENABLED: bool = Field(
+        description="Store the text extracted from files in storage, keyed by the hash of the file content,"
+        " so the same file is not parsed again by knowledge indexing or document extractor nodes",
+        default=False,
+    )
+
+    EXTRACTED_TEXT_CACHE_MAX_ENTRY_SIZE: PositiveInt = Field(
+        description="Maximum size in bytes of an extracted text to cache, larger texts are not cached",
+        default=10 * 1024 * 1024,
+    )
+
+    EXTRACTED_TEXT_CACHE_MAX_TOTAL_SIZE: PositiveInt = Field(
+        description="Maximum total size in bytes of the extracted text cache,"
+        " the least recently used texts are deleted above it by the clean extracted text cache task",
+        default=5 * 1024 * 1024 * 1024,
+    )
+
+    EXTRACTED_TEXT_CACHE_RETENTION_DAYS: PositiveInt = Field(
+        description="Days an extracted text is kept in the cache after its last use",
+        default=30,
+    )
+
     SCARF_NO_ANALYTICS: str | None = Field(
         description="This is about whether to disable Scarf analytics in Unstructured library.",
         default="false",
@@ -1060,6 +1246,23 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    EMBEDDING_CACHE_BATCH_SIZE: PositiveInt = Field(
+        description="Maximum number of hashes looked up or inserted per query against the embedding cache table",
+        default=500,
+    )
+
+    EMBEDDING_CACHE_LRU_SIZE: NonNegativeInt = Field(
+        description="Maximum number of document embeddings kept in the in-process cache in front of the"
+        " embedding cache table (0 to disable)",
+        default=1000,
+    )
+
+    EMBEDDING_CACHE_STORAGE_DTYPE: Literal["float32", "float16"] = Field(
+        description="Precision used to store cached embeddings in the database and Redis,"
+        " float16 halves the size at the cost of precision",
+        default="float32",
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -1080,6 +1283,10 @@ class CeleryScheduleTasksConfig(BaseSettings):
         description="Enable clean embedding cache task",
         default=False,
     )
+    ENABLE_CLEAN_EXTRACTED_TEXT_CACHE_TASK: bool = Field(
+        description="Enable clean extracted text cache task",
+        default=False,
+    )
     ENABLE_CLEAN_UNUSED_DATASETS_TASK: bool = Field(
         description="Enable clean unused datasets task",
         default=False,
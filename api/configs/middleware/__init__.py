@@ -96,14 +96,37 @@ class VectorStoreConfig(BaseSettings):
         default="Vector_index",
     )
 
+    VECTOR_STORE_CLIENT_REGISTRY_MAX_SIZE: NonNegativeInt = Field(
+        description="Maximum number of vector store clients and connection pools shared per process, one per"
+        " connection config. Set to 0 to create them for every Vector instance.",
+        default=32,
+    )
+
+    VECTOR_STORE_CLIENT_IDLE_TIMEOUT: PositiveFloat = Field(
+        description="Seconds a shared vector store client or connection pool is kept without being used",
+        default=600.0,
+    )
+
+    VECTOR_STORE_POOL_WAIT_TIMEOUT: PositiveFloat = Field(
+        description="Seconds to wait for a free connection of a shared vector store connection pool",
+        default=30.0,
+    )
+
 
 class KeywordStoreConfig(BaseSettings):
     KEYWORD_STORE: str = Field(
         description="Method for keyword extraction and storage."
-        " Default is 'jieba', a Chinese text segmentation library.",
+        " Default is 'jieba', a Chinese text segmentation library."
+        " 'jieba_incremental' stores one row per keyword and segment, so updates only touch the affected keywords.",
         default="jieba",
     )
 
+    KEYWORD_TABLE_CACHE_MAX_POSTINGS: NonNegativeInt = Field(
+        description="Maximum number of keyword postings kept in the per-process cache of 'jieba' keyword tables"
+        " used by keyword search. Set to 0 to disable the cache.",
+        default=2_000_000,
+    )
+
 
 class DatabaseConfig(BaseSettings):
     # Database type selector
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import Forbidden
 
+from core.helper.api_token_auth_cache import api_token_auth_cache
 from extensions.ext_database import db
 from libs.helper import TimestampField
 from libs.login import current_account_with_tenant, login_required
@@ -130,9 +131,12 @@ class BaseApiKeyResource(Resource):
 
         if key is None:
             flask_restx.abort(HTTPStatus.NOT_FOUND, message="API key not found")
+        assert key is not None
 
+        token, token_type = key.token, key.type
         db.session.query(ApiToken).where(ApiToken.id == api_key_id).delete()
         db.session.commit()
+        api_token_auth_cache.invalidate_token(token, token_type)
 
         return {"result": "success"}, 204
 
@@ -14,6 +14,7 @@ from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import Forbidden, NotFound, Unauthorized
 
+from core.helper.api_token_auth_cache import ApiTokenAuthContext, api_token_auth_cache, api_token_last_used_recorder
 from enums.cloud_plan import CloudPlan
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
@@ -53,9 +54,12 @@ def validate_app_token(view: Callable[P, R] | None = None, *, fetch_user_arg: Fe
         def decorated_view(*args: P.args, **kwargs: P.kwargs):
             api_token = validate_and_get_api_token("app")
 
-            app_model = db.session.query(App).where(App.id == api_token.app_id).first()
-            if not app_model:
+            app_and_tenant = db.session.execute(
+                select(App, Tenant).outerjoin(Tenant, Tenant.id == App.tenant_id).where(App.id == api_token.app_id)
+            ).one_or_none()
+            if not app_and_tenant:
                 raise Forbidden("The app no longer exists.")
+            app_model, tenant = app_and_tenant
 
             if app_model.status != "normal":
                 raise Forbidden("The app's status is abnormal.")
@@ -63,7 +67,6 @@ def validate_app_token(view: Callable[P, R] | None = None, *, fetch_user_arg: Fe
             if not app_model.enable_api:
                 raise Forbidden("The app's API service has been disabled.")
 
-            tenant = db.session.query(Tenant).where(Tenant.id == app_model.tenant_id).first()
             if tenant is None:
                 raise ValueError("Tenant does not exist.")
             if tenant.status == TenantStatus.ARCHIVE:
@@ -294,9 +297,12 @@ def validate_dataset_token(view: Callable[Concatenate[T, P], R] | None = None):
     return decorator
 
 
-def validate_and_get_api_token(scope: str | None = None):
+def validate_and_get_api_token(scope: str | None = None) -> ApiToken:
     """
     Validate and get API token.
+
+    With API_TOKEN_AUTH_CACHE_ENABLED, the token is looked up in the auth cache and the returned ApiToken is not
+    attached to a session. Its last use time is recorded and written to the database in batches.
     """
     auth_header = request.headers.get("Authorization")
     if auth_header is None or " " not in auth_header:
@@ -308,6 +314,18 @@ def validate_and_get_api_token(scope: str | None = None):
     if auth_scheme != "bearer":
         raise Unauthorized("Authorization scheme must be 'Bearer'")
 
+    if api_token_auth_cache.enabled:
+        auth_context = api_token_auth_cache.get_token(auth_token, scope)
+        if auth_context is None:
+            with Session(db.engine, expire_on_commit=False) as session:
+                api_token = session.scalar(select(ApiToken).where(ApiToken.token == auth_token, ApiToken.type == scope))
+            if not api_token:
+                raise Unauthorized("Access token is invalid")
+            auth_context = ApiTokenAuthContext.from_api_token(api_token)
+            api_token_auth_cache.set_token(auth_token, auth_context)
+        api_token_last_used_recorder.record(auth_context.id)
+        return auth_context.to_api_token()
+
     current_time = naive_utc_now()
     cutoff_time = current_time - timedelta(minutes=1)
     with Session(db.engine, expire_on_commit=False) as session:
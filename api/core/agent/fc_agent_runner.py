@@ -1,9 +1,17 @@
+import contextvars
 import json
 import logging
+import math
+import threading
+import time
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from typing import Any, Union
 
+from flask import Flask, current_app
+
+from configs import dify_config
 from core.agent.base_agent_runner import BaseAgentRunner
 from core.app.apps.base_app_queue_manager import PublishFrom
 from core.app.entities.queue_entities import QueueAgentThoughtEvent, QueueMessageEndEvent, QueueMessageFileEvent
@@ -22,14 +30,31 @@ from core.model_runtime.entities import (
     UserPromptMessage,
 )
 from core.model_runtime.entities.message_entities import ImagePromptMessageContent, PromptMessageContentUnionTypes
+from core.ops.ops_trace_manager import TraceQueueManager
 from core.prompt.agent_history_prompt_transform import AgentHistoryPromptTransform
+from core.tools.__base.tool import Tool
 from core.tools.entities.tool_entities import ToolInvokeMeta
 from core.tools.tool_engine import ToolEngine
+from libs.flask_utils import preserve_flask_contexts
 from models.model import Message
 
 logger = logging.getLogger(__name__)
 
 
+class _ToolCallStart:
+    """
+    Records when a parallel tool call starts running on a worker thread.
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.started_at = 0.0
+
+    def set(self):
+        self.started_at = time.monotonic()
+        self.started.set()
+
+
 class FunctionCallAgentRunner(BaseAgentRunner):
     def run(self, message: Message, query: str, **kwargs: Any) -> Generator[LLMResultChunk, None, None]:
         """
@@ -224,53 +249,23 @@ class FunctionCallAgentRunner(BaseAgentRunner):
 
             # call tools
             tool_responses = []
-            for tool_call_id, tool_call_name, tool_call_args in tool_calls:
-                tool_instance = tool_instances.get(tool_call_name)
-                if not tool_instance:
-                    tool_response = {
-                        "tool_call_id": tool_call_id,
-                        "tool_call_name": tool_call_name,
-                        "tool_response": f"there is not a tool named {tool_call_name}",
-                        "meta": ToolInvokeMeta.error_instance(f"there is not a tool named {tool_call_name}").to_dict(),
-                    }
-                else:
-                    # invoke tool
-                    tool_invoke_response, message_files, tool_invoke_meta = ToolEngine.agent_invoke(
-                        tool=tool_instance,
-                        tool_parameters=tool_call_args,
-                        user_id=self.user_id,
-                        tenant_id=self.tenant_id,
-                        message=self.message,
-                        invoke_from=self.application_generate_entity.invoke_from,
-                        agent_tool_callback=self.agent_callback,
-                        trace_manager=trace_manager,
-                        app_id=self.application_generate_entity.app_config.app_id,
-                        message_id=self.message.id,
-                        conversation_id=self.conversation.id,
+            for tool_response, message_files in self._invoke_tool_calls(tool_calls, tool_instances, trace_manager):
+                # publish files
+                for message_file_id in message_files:
+                    # publish message file
+                    self.queue_manager.publish(
+                        QueueMessageFileEvent(message_file_id=message_file_id), PublishFrom.APPLICATION_MANAGER
                     )
-                    # publish files
-                    for message_file_id in message_files:
-                        # publish message file
-                        self.queue_manager.publish(
-                            QueueMessageFileEvent(message_file_id=message_file_id), PublishFrom.APPLICATION_MANAGER
-                        )
-                        # add message file ids
-                        message_file_ids.append(message_file_id)
-
-                    tool_response = {
-                        "tool_call_id": tool_call_id,
-                        "tool_call_name": tool_call_name,
-                        "tool_response": tool_invoke_response,
-                        "meta": tool_invoke_meta.to_dict(),
-                    }
+                    # add message file ids
+                    message_file_ids.append(message_file_id)
 
                 tool_responses.append(tool_response)
                 if tool_response["tool_response"] is not None:
                     self._current_thoughts.append(
                         ToolPromptMessage(
                             content=str(tool_response["tool_response"]),
-                            tool_call_id=tool_call_id,
-                            name=tool_call_name,
+                            tool_call_id=tool_response["tool_call_id"],
+                            name=tool_response["tool_call_name"],
                         )
                     )
 
@@ -315,6 +310,125 @@ class FunctionCallAgentRunner(BaseAgentRunner):
             PublishFrom.APPLICATION_MANAGER,
         )
 
+    def _invoke_tool_calls(
+        self,
+        tool_calls: list[tuple[str, str, dict[str, Any]]],
+        tool_instances: dict[str, Tool],
+        trace_manager: TraceQueueManager | None,
+    ) -> Generator[tuple[dict[str, Any], list[str]], None, None]:
+        """
+        Invoke the tool calls of one turn, yield the tool responses and message file ids in the order of the calls.
+
+        With AGENT_PARALLEL_TOOL_CALLS_ENABLED, the calls of a turn are dispatched to a bounded thread pool, so
+        the turn takes as long as its slowest tool instead of the sum of all tools. The timeout of a call starts
+        when it starts running, time spent waiting for a free worker does not count.
+        """
+        if not dify_config.AGENT_PARALLEL_TOOL_CALLS_ENABLED or len(tool_calls) <= 1:
+            for tool_call_id, tool_call_name, tool_call_args in tool_calls:
+                yield self._invoke_tool_call(
+                    tool_instances, tool_call_id, tool_call_name, tool_call_args, trace_manager
+                )
+            return
+
+        flask_app = current_app._get_current_object()  # type: ignore
+        timeout = dify_config.AGENT_PARALLEL_TOOL_CALL_TIMEOUT
+        max_workers = min(len(tool_calls), dify_config.AGENT_PARALLEL_TOOL_CALLS_MAX_WORKERS)
+        # A queued call starts within this time unless earlier calls overrun their timeout and keep their worker
+        start_deadline = time.monotonic() + timeout * math.ceil(len(tool_calls) / max_workers)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent_tool_call")
+        try:
+            futures = []
+            for tool_call_id, tool_call_name, tool_call_args in tool_calls:
+                tool_call_start = _ToolCallStart()
+                future = executor.submit(
+                    self._invoke_tool_call_in_thread,
+                    flask_app,
+                    contextvars.copy_context(),
+                    tool_call_start,
+                    tool_instances,
+                    tool_call_id,
+                    tool_call_name,
+                    tool_call_args,
+                    trace_manager,
+                )
+                futures.append((tool_call_start, future))
+
+            for (tool_call_id, tool_call_name, _), (tool_call_start, future) in zip(tool_calls, futures):
+                try:
+                    if not tool_call_start.started.wait(timeout=max(start_deadline - time.monotonic(), 0)):
+                        raise TimeoutError
+                    yield future.result(timeout=max(tool_call_start.started_at + timeout - time.monotonic(), 0))
+                except TimeoutError:
+                    future.cancel()
+                    logger.warning("Tool %s did not finish within %s seconds", tool_call_name, timeout)
+                    error = f"tool invoke timeout: {tool_call_name} did not finish within {timeout} seconds"
+                    yield self._tool_error_response(tool_call_id, tool_call_name, error), []
+        finally:
+            # tools that timed out keep running in the background, their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke_tool_call_in_thread(
+        self,
+        flask_app: Flask,
+        context_vars: contextvars.Context,
+        tool_call_start: _ToolCallStart,
+        tool_instances: dict[str, Tool],
+        tool_call_id: str,
+        tool_call_name: str,
+        tool_call_args: dict[str, Any],
+        trace_manager: TraceQueueManager | None,
+    ) -> tuple[dict[str, Any], list[str]]:
+        tool_call_start.set()
+        with preserve_flask_contexts(flask_app, context_vars=context_vars):
+            return self._invoke_tool_call(tool_instances, tool_call_id, tool_call_name, tool_call_args, trace_manager)
+
+    def _invoke_tool_call(
+        self,
+        tool_instances: dict[str, Tool],
+        tool_call_id: str,
+        tool_call_name: str,
+        tool_call_args: dict[str, Any],
+        trace_manager: TraceQueueManager | None,
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Invoke one tool call, return the tool response and the ids of the message files it created.
+        """
+        tool_instance = tool_instances.get(tool_call_name)
+        if not tool_instance:
+            error = f"there is not a tool named {tool_call_name}"
+            return self._tool_error_response(tool_call_id, tool_call_name, error), []
+
+        # invoke tool
+        tool_invoke_response, message_files, tool_invoke_meta = ToolEngine.agent_invoke(
+            tool=tool_instance,
+            tool_parameters=tool_call_args,
+            user_id=self.user_id,
+            tenant_id=self.tenant_id,
+            message=self.message,
+            invoke_from=self.application_generate_entity.invoke_from,
+            agent_tool_callback=self.agent_callback,
+            trace_manager=trace_manager,
+            app_id=self.application_generate_entity.app_config.app_id,
+            message_id=self.message.id,
+            conversation_id=self.conversation.id,
+        )
+        tool_response = {
+            "tool_call_id": tool_call_id,
+            "tool_call_name": tool_call_name,
+            "tool_response": tool_invoke_response,
+            "meta": tool_invoke_meta.to_dict(),
+        }
+        return tool_response, message_files
+
+    @staticmethod
+    def _tool_error_response(tool_call_id: str, tool_call_name: str, error: str) -> dict[str, Any]:
+        return {
+            "tool_call_id": tool_call_id,
+            "tool_call_name": tool_call_name,
+            "tool_response": error,
+            "meta": ToolInvokeMeta.error_instance(error).to_dict(),
+        }
+
     def check_tool_calls(self, llm_result_chunk: LLMResultChunk) -> bool:
         """
         Check if there is any tool call in llm result chunk
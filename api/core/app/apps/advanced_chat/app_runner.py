@@ -110,6 +110,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
                 single_iteration_run=self.application_generate_entity.single_iteration_run,
                 single_loop_run=self.application_generate_entity.single_loop_run,
             )
+            graph_config: Mapping[str, Any] = self._workflow.graph_dict
         else:
             inputs = self.application_generate_entity.inputs
             query = self.application_generate_entity.query
@@ -149,12 +150,15 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
 
             # init graph
             graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.time())
+            compiled_graph = self._compile_workflow_graph(self._workflow)
+            graph_config = compiled_graph.graph_config
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=graph_config,
                 graph_runtime_state=graph_runtime_state,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
+                compiled_graph=compiled_graph,
             )
 
         db.session.close()
@@ -170,7 +174,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
             app_id=self._workflow.app_id,
             workflow_id=self._workflow.id,
             graph=graph,
-            graph_config=self._workflow.graph_dict,
+            graph_config=graph_config,
             user_id=self.application_generate_entity.user_id,
             user_from=(
                 UserFrom.ACCOUNT
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import threading
+
+from cachetools import LRUCache
+from opentelemetry.metrics import get_meter
+
+from configs import dify_config
+from core.workflow.graph import CompiledGraph, Graph
+
+_meter = get_meter("workflow_graph", version=dify_config.project.version)
+graph_init_duration = _meter.create_histogram(
+    "workflow.graph.init.duration",
+    description="Time spent preparing the graph of a workflow run, by phase (parse, build) and graph cache hit",
+    unit="ms",
+)
+
+
+class WorkflowGraphCache:
+    """
+    Process-local cache of compiled workflow graphs.
+
+    Entries are keyed on the workflow id and a hash of the serialized graph, so editing a draft workflow or
+    publishing a new version never serves a stale graph. Only the run-independent topology is cached, node
+    instances are still created for every run by `Graph.from_compiled`.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: LRUCache[tuple[str, str, str | None], CompiledGraph] = LRUCache(maxsize=max(maxsize, 1))
+        self._lock = threading.Lock()
+
+    def get(self, workflow_id: str, graph: str, root_node_id: str | None = None) -> tuple[CompiledGraph, bool]:
+        """
+        Return the compiled graph of a workflow version, compiling it on a miss.
+
+        :param workflow_id: workflow id
+        :param graph: serialized graph of the workflow, `Workflow.graph`
+        :param root_node_id: root node id, if the run does not start at the default root node
+        :return: compiled graph and whether it was served from the cache
+        """
+        if self._maxsize <= 0:
+            return self._compile(graph, root_node_id), False
+
+        key = (workflow_id, hashlib.sha256(graph.encode()).hexdigest(), root_node_id)
+        with self._lock:
+            compiled_graph = self._entries.get(key)
+        if compiled_graph is not None:
+            return compiled_graph, True
+
+        compiled_graph = self._compile(graph, root_node_id)
+        with self._lock:
+            self._entries[key] = compiled_graph
+        return compiled_graph, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _compile(graph: str, root_node_id: str | None) -> CompiledGraph:
+        graph_config = json.loads(graph) if graph else {}
+        if "nodes" not in graph_config or "edges" not in graph_config:
+            raise ValueError("nodes or edges not found in workflow graph")
+
+        if not isinstance(graph_config.get("nodes"), list):
+            raise ValueError("nodes in workflow graph must be a list")
+
+        if not isinstance(graph_config.get("edges"), list):
+            raise ValueError("edges in workflow graph must be a list")
+
+        return Graph.compile(graph_config=graph_config, root_node_id=root_node_id)
+
+
+workflow_graph_cache = WorkflowGraphCache(maxsize=dify_config.WORKFLOW_GRAPH_CACHE_MAX_SIZE)
@@ -1,7 +1,7 @@
 import logging
 import time
-from collections.abc import Sequence
-from typing import cast
+from collections.abc import Mapping, Sequence
+from typing import Any, cast
 
 from core.app.apps.base_app_queue_manager import AppQueueManager
 from core.app.apps.workflow.app_config_manager import WorkflowAppConfig
@@ -81,6 +81,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
                 single_iteration_run=self.application_generate_entity.single_iteration_run,
                 single_loop_run=self.application_generate_entity.single_loop_run,
             )
+            graph_config: Mapping[str, Any] = self._workflow.graph_dict
         else:
             inputs = self.application_generate_entity.inputs
 
@@ -96,13 +97,16 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
 
             # init graph
+            compiled_graph = self._compile_workflow_graph(self._workflow, root_node_id=self._root_node_id)
+            graph_config = compiled_graph.graph_config
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=graph_config,
                 graph_runtime_state=graph_runtime_state,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
                 root_node_id=self._root_node_id,
+                compiled_graph=compiled_graph,
             )
 
         # RUN WORKFLOW
@@ -118,7 +122,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             app_id=self._workflow.app_id,
             workflow_id=self._workflow.id,
             graph=graph,
-            graph_config=self._workflow.graph_dict,
+            graph_config=graph_config,
             user_id=self.application_generate_entity.user_id,
             user_from=(
                 UserFrom.ACCOUNT
@@ -125,7 +125,7 @@ class BasedGenerateTaskPipeline:
         """
         # response moderation
         if self.output_moderation_handler:
-            self.output_moderation_handler.stop_thread()
+            self.output_moderation_handler.stop()
 
             completion, flagged = self.output_moderation_handler.moderation_completion(
                 completion=completion, public_event=False
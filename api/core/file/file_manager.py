@@ -1,5 +1,5 @@
 import base64
-from collections.abc import Mapping
+from collections.abc import Generator, Mapping
 
 from configs import dify_config
 from core.helper import ssrf_proxy
@@ -110,6 +110,22 @@ def download(f: File, /):
     raise ValueError(f"unsupported transfer method: {f.transfer_method}")
 
 
+def download_stream(f: File, /) -> Generator[bytes, None, None]:
+    """Yield the content of a file in chunks, without loading it into memory at once."""
+    if f.transfer_method in (
+        FileTransferMethod.TOOL_FILE,
+        FileTransferMethod.LOCAL_FILE,
+        FileTransferMethod.DATASOURCE_FILE,
+    ):
+        yield from storage.load(f.storage_key, stream=True)
+    elif f.transfer_method == FileTransferMethod.REMOTE_URL:
+        with ssrf_proxy.get(f.remote_url, follow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes()
+    else:
+        raise ValueError(f"unsupported transfer method: {f.transfer_method}")
+
+
 def _download_file_content(path: str, /):
     """
     Download and return the contents of a file as bytes.
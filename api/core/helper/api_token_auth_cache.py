@@ -0,0 +1,219 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import cast
+
+from cachetools import TTLCache
+from opentelemetry.metrics import get_meter
+from sqlalchemy import Table, bindparam, or_, update
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.model import ApiToken
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter("api_token_auth_cache", version=dify_config.project.version)
+cache_lookups = _meter.create_counter(
+    "api_token.auth_cache.lookups",
+    description="Lookups of service API authentication contexts in the cache, by cache hit and entry kind",
+)
+
+
+@dataclass(frozen=True)
+class ApiTokenAuthContext:
+    """The columns of an API token the service API authenticates with."""
+
+    id: str
+    type: str
+    tenant_id: str | None
+    app_id: str | None
+
+    @classmethod
+    def from_api_token(cls, api_token: ApiToken) -> "ApiTokenAuthContext":
+        return cls(id=api_token.id, type=api_token.type, tenant_id=api_token.tenant_id, app_id=api_token.app_id)
+
+    def to_api_token(self) -> ApiToken:
+        """Return a transient ApiToken, it is not attached to any session."""
+        return ApiToken(id=self.id, type=self.type, tenant_id=self.tenant_id, app_id=self.app_id)
+
+
+class ApiTokenAuthCache:
+    """
+    Authentication contexts of the service API, cached in a process-local LRU in front of Redis.
+
+    API tokens are cached, keyed on their scope and the sha256 of the token. App, tenant and account rows are still
+    loaded and checked on every request, only the token lookup is skipped.
+
+    Deleting an API token removes it from Redis and from the cache of the current process. Other processes may
+    still accept the token for up to `local_ttl` seconds. Redis entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, enabled: bool, ttl: int, local_ttl: int, maxsize: int):
+        self.enabled = enabled
+        self._ttl = ttl
+        self._local: TTLCache[str, str] | None = (
+            TTLCache(maxsize=maxsize, ttl=local_ttl) if enabled and local_ttl > 0 else None
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _token_key(token: str, scope: str | None) -> str:
+        return f"api_token_auth:token:{scope}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    def get_token(self, token: str, scope: str | None) -> ApiTokenAuthContext | None:
+        value = self._get(self._token_key(token, scope), kind="token")
+        return ApiTokenAuthContext(**json.loads(value)) if value else None
+
+    def set_token(self, token: str, context: ApiTokenAuthContext):
+        self._set(self._token_key(token, context.type), json.dumps(asdict(context)))
+
+    def invalidate_token(self, token: str, scope: str | None):
+        self._delete(self._token_key(token, scope))
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._local) if self._local is not None else 0,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            if self._local is not None:
+                self._local.clear()
+
+    def _get(self, key: str, kind: str) -> str | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._local.get(key) if self._local is not None else None
+        if value is None:
+            try:
+                raw_value = redis_client.get(key)
+            except Exception:
+                logger.warning("Failed to read service API auth context %s", kind, exc_info=True)
+                raw_value = None
+            if raw_value is not None:
+                value = raw_value.decode() if isinstance(raw_value, bytes) else raw_value
+                with self._lock:
+                    if self._local is not None:
+                        self._local[key] = value
+
+        hit = value is not None
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        cache_lookups.add(1, {"hit": hit, "kind": kind})
+        return value
+
+    def _set(self, key: str, value: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._local is not None:
+                self._local[key] = value
+        try:
+            redis_client.setex(key, self._ttl, value)
+        except Exception:
+            logger.warning("Failed to cache service API auth context", exc_info=True)
+
+    def _delete(self, key: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._local is not None:
+                self._local.pop(key, None)
+        try:
+            redis_client.delete(key)
+        except Exception:
+            logger.exception("Failed to invalidate service API auth context")
+
+
+class ApiTokenLastUsedRecorder:
+    """
+    Coalesces the `last_used_at` updates of API tokens.
+
+    A process records a token in a Redis hash at most once per `interval` seconds, `flush` writes the recorded
+    times to the database in batches. It runs from the `flush_api_token_last_used_task` schedule task.
+    """
+
+    _LAST_USED_KEY = "api_token_last_used_at"
+    _FLUSHING_KEY = "api_token_last_used_at:flushing"
+
+    def __init__(self, interval: int, maxsize: int):
+        self._recorded: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=interval)
+        self._lock = threading.Lock()
+
+    def record(self, token_id: str):
+        with self._lock:
+            if token_id in self._recorded:
+                return
+            self._recorded[token_id] = True
+        try:
+            redis_client.hset(self._LAST_USED_KEY, token_id, int(time.time()))
+        except Exception:
+            logger.warning("Failed to record last use of API token %s", token_id, exc_info=True)
+
+    def flush(self, batch_size: int = 500) -> int:
+        """Write the recorded last use times to the database, return the number of tokens updated."""
+        updated = 0
+        # A hash left behind by a failed flush is written first, renaming onto it would drop its times
+        if redis_client.exists(self._FLUSHING_KEY):
+            updated += self._flush_hash(batch_size)
+        # Tokens recorded while flushing go to a new hash. RENAMENX does nothing while another flush still owns
+        # the flushing hash, the times are then written by the next flush.
+        if redis_client.exists(self._LAST_USED_KEY) and redis_client.renamenx(self._LAST_USED_KEY, self._FLUSHING_KEY):
+            updated += self._flush_hash(batch_size)
+        return updated
+
+    def _flush_hash(self, batch_size: int) -> int:
+        last_used_times = redis_client.hgetall(self._FLUSHING_KEY)
+        rows = [
+            {
+                "token_id": token_id.decode() if isinstance(token_id, bytes) else token_id,
+                "used_at": datetime.fromtimestamp(int(timestamp), UTC).replace(tzinfo=None),
+            }
+            for token_id, timestamp in last_used_times.items()
+        ]
+        table = cast(Table, ApiToken.__table__)
+        # Only moves `last_used_at` forward, so writing older or duplicate times is harmless
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == bindparam("token_id"),
+                or_(table.c.last_used_at.is_(None), table.c.last_used_at < bindparam("used_at")),
+            )
+            .values(last_used_at=bindparam("used_at"))
+        )
+        with Session(db.engine) as session:
+            for start in range(0, len(rows), batch_size):
+                session.execute(stmt, rows[start : start + batch_size])
+            session.commit()
+
+        redis_client.delete(self._FLUSHING_KEY)
+        return len(rows)
+
+
+api_token_auth_cache = ApiTokenAuthCache(
+    enabled=dify_config.API_TOKEN_AUTH_CACHE_ENABLED,
+    ttl=dify_config.API_TOKEN_AUTH_CACHE_TTL,
+    local_ttl=dify_config.API_TOKEN_AUTH_CACHE_LOCAL_TTL,
+    maxsize=dify_config.API_TOKEN_AUTH_CACHE_MAX_SIZE,
+)
+
+api_token_last_used_recorder = ApiTokenLastUsedRecorder(
+    interval=dify_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL,
+    maxsize=dify_config.API_TOKEN_AUTH_CACHE_MAX_SIZE,
+)
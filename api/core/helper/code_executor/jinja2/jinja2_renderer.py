@@ -0,0 +1,354 @@
+import functools
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import types
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sized
+from typing import Any, TypeVar
+
+from cachetools import LRUCache
+from jinja2 import Template, TemplateError, nodes, pass_environment, pass_eval_context
+from jinja2.compiler import CodeGenerator, Frame
+from jinja2.filters import do_center, do_format, do_indent, do_replace, sync_do_join
+from jinja2.nodes import EvalContext
+from jinja2.runtime import Context
+from jinja2.sandbox import ImmutableSandboxedEnvironment, SandboxedEscapeFormatter, SandboxedFormatter
+from markupsafe import Markup
+
+from configs import dify_config
+from core.variables.utils import dumps_with_segments
+
+_T = TypeVar("_T")
+
+# Width and precision of a `str.format` spec, and of the conversions of a printf-style format string
+_FORMAT_SPEC_SIZES = re.compile(r"(\d*)[,_]?(?:\.(\d*))?[a-zA-Z%]?$")
+_PRINTF_SPEC_SIZES = re.compile(r"%(?:\([^)]*\))?[#0 +-]*(\*|\d*)(?:\.(\*|\d*))?")
+
+
+class Jinja2RenderError(Exception):
+    pass
+
+
+class _RenderDeadline(threading.local):
+    deadline: float = math.inf
+
+
+_render_deadline = _RenderDeadline()
+
+
+def _check_deadline() -> None:
+    if time.monotonic() > _render_deadline.deadline:
+        raise Jinja2RenderError("Template rendering timed out")
+
+
+def _iter_with_deadline(iterable: Iterable[Any]) -> Iterator[Any]:
+    for item in iterable:
+        _check_deadline()
+        yield item
+
+
+def _format_spec_size(format_spec: str) -> int:
+    match = _FORMAT_SPEC_SIZES.search(format_spec)
+    return sum(int(size) for size in match.groups() if size) if match else 0
+
+
+def _printf_size(template: str, values: Any) -> int:
+    star_values = [abs(value) for value in (values if isinstance(values, tuple) else (values,)) if type(value) is int]
+    size = len(template)
+    for match in _PRINTF_SPEC_SIZES.finditer(template):
+        for group in match.groups():
+            if group == "*":
+                size += max(star_values, default=0)
+            elif group:
+                size += int(group)
+    return size
+
+
+def _joined_size(separator: str, items: Any) -> int:
+    # Iterators can not be measured without consuming them
+    if not isinstance(items, Collection):
+        return 0
+    return len(separator) * len(items) + sum(len(item) for item in items if isinstance(item, Sized))
+
+
+def _replaced_size(value: str, old: str, new: str, count: Any = None) -> int:
+    occurrences = value.count(old) if old else len(value) + 1
+    if type(count) is int and count >= 0:
+        occurrences = min(occurrences, count)
+    return len(value) + occurrences * len(new)
+
+
+def _str_method_size(method: Any, args: tuple[Any, ...]) -> int:
+    """Upper bound on the length of the result of a padding, join or replace method of a string, 0 otherwise."""
+    value = getattr(method, "__self__", None)
+    if not isinstance(method, types.BuiltinMethodType) or not isinstance(value, str) or not args:
+        return 0
+    name = method.__name__
+    if name in {"center", "ljust", "rjust", "zfill"} and type(args[0]) is int:
+        return args[0]
+    if name == "expandtabs" and type(args[0]) is int:
+        return len(value) + value.count("\t") * args[0]
+    if name == "join":
+        return _joined_size(value, args[0])
+    if name == "replace" and len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        return _replaced_size(value, args[0], args[1], *args[2:3])
+    return 0
+
+
+@pass_environment
+def _do_center(environment: "_LimitedSandboxedEnvironment", value: str, width: int = 80) -> str:
+    environment.check_size(width)
+    return do_center(value, width)
+
+
+@pass_environment
+def _do_indent(
+    environment: "_LimitedSandboxedEnvironment", s: str, width: int | str = 4, first: bool = False, blank: bool = False
+) -> str:
+    text = str(s)
+    environment.check_size(len(text) + (text.count("\n") + 1) * (width if isinstance(width, int) else len(width)))
+    return do_indent(s, width, first, blank)
+
+
+@pass_environment
+def _do_format(environment: "_LimitedSandboxedEnvironment", value: str, *args: Any, **kwargs: Any) -> str:
+    environment.check_size(_printf_size(str(value), kwargs or args))
+    return do_format(value, *args, **kwargs)
+
+
+@pass_eval_context
+def _do_join(eval_ctx: EvalContext, value: Iterable[Any], d: str = "", attribute: str | int | None = None) -> str:
+    if attribute is None:
+        _limited_environment(eval_ctx).check_size(_joined_size(d, value))
+    return sync_do_join(eval_ctx, value, d, attribute)
+
+
+@pass_eval_context
+def _do_replace(eval_ctx: EvalContext, s: str, old: str, new: str, count: int | None = None) -> str:
+    _limited_environment(eval_ctx).check_size(_replaced_size(str(s), str(old), str(new), count))
+    return do_replace(eval_ctx, s, old, new, count)
+
+
+def _limited_environment(eval_ctx: EvalContext) -> "_LimitedSandboxedEnvironment":
+    environment = eval_ctx.environment
+    assert isinstance(environment, _LimitedSandboxedEnvironment)
+    return environment
+
+
+class _LimitedSandboxedFormatter(SandboxedFormatter):
+    """
+    `str.format` formatter that rejects field widths and precisions adding up beyond the output length limit.
+
+    Widths are counted over the lifetime of the formatter, so one is created per formatted string.
+    """
+
+    _size = 0
+
+    def format_field(self, value: Any, format_spec: str) -> Any:
+        self._size += _format_spec_size(format_spec)
+        environment = self._env
+        assert isinstance(environment, _LimitedSandboxedEnvironment)
+        environment.check_size(self._size)
+        return super().format_field(value, format_spec)
+
+
+class _LimitedSandboxedEscapeFormatter(_LimitedSandboxedFormatter, SandboxedEscapeFormatter):
+    pass
+
+
+class _DeadlineCodeGenerator(CodeGenerator):
+    """
+    Code generator that routes the iterable of every `{% for %}` loop through the render deadline check,
+    and the result of every `~` concatenation through the output length check.
+    """
+
+    def visit_For(self, node: nodes.For, frame: Frame) -> None:  # noqa: N802
+        deadline_iter = nodes.Call(
+            nodes.EnvironmentAttribute("iter_with_deadline"), [node.iter], [], None, None, lineno=node.lineno
+        )
+        node = nodes.For(
+            node.target, deadline_iter, node.body, node.else_, node.test, node.recursive, lineno=node.lineno
+        )
+        super().visit_For(node, frame)
+
+    def visit_Concat(self, node: nodes.Concat, frame: Frame) -> None:  # noqa: N802
+        self.write("environment.check_output_length(")
+        super().visit_Concat(node, frame)
+        self.write(")")
+
+
+class _LimitedSandboxedEnvironment(ImmutableSandboxedEnvironment):
+    """
+    Sandboxed environment that enforces the render deadline and bounds the length of intermediate strings.
+
+    The deadline is checked on every loop iteration and on every call, attribute and item access
+    of a template, so loops that produce no output are interrupted as well.
+
+    Strings longer than the output length limit are rejected wherever a template can build them: repetition,
+    `+`, `~`, printf-style and `str.format` formatting, padding, joining and replacing, and the results of
+    every call and filter. Operations whose result size is known upfront are rejected before the string is
+    allocated, so doubling a string in a loop or formatting it with a huge width can not exhaust memory.
+    """
+
+    code_generator_class = _DeadlineCodeGenerator
+    intercepted_binops = frozenset({"*", "+", "%"})
+
+    def __init__(self, max_output_length: int) -> None:
+        super().__init__()
+        self._max_output_length = max_output_length
+        self.filters.update(center=_do_center, indent=_do_indent, format=_do_format, join=_do_join, replace=_do_replace)
+        self.filters = {name: self._check_filter_output(filter_func) for name, filter_func in self.filters.items()}
+
+    def check_size(self, size: int) -> None:
+        if size > self._max_output_length:
+            raise Jinja2RenderError(f"Output length exceeds {self._max_output_length} characters")
+
+    def check_output_length(self, value: _T) -> _T:
+        if isinstance(value, str):
+            self.check_size(len(value))
+        return value
+
+    def _check_filter_output(self, filter_func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(filter_func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.check_output_length(filter_func(*args, **kwargs))
+
+        return wrapper
+
+    def iter_with_deadline(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        return _iter_with_deadline(iterable)
+
+    def wrap_str_format(self, value: Any) -> Callable[..., str] | None:
+        # Same as the base implementation, with formatters that bound field widths and precisions
+        if not isinstance(value, (types.MethodType, types.BuiltinMethodType)) or value.__name__ not in (
+            "format",
+            "format_map",
+        ):
+            return None
+        f_self: Any = value.__self__
+        if not isinstance(f_self, str):
+            return None
+
+        str_type: type[str] = type(f_self)
+        is_format_map = value.__name__ == "format_map"
+
+        def wrapper(*args: Any, **kwargs: Any) -> str:
+            if is_format_map:
+                if kwargs:
+                    raise TypeError("format_map() takes no keyword arguments")
+                if len(args) != 1:
+                    raise TypeError(f"format_map() takes exactly one argument ({len(args)} given)")
+                kwargs = args[0]
+                args = ()
+            formatter: _LimitedSandboxedFormatter
+            if isinstance(f_self, Markup):
+                formatter = _LimitedSandboxedEscapeFormatter(self, escape=f_self.escape)
+            else:
+                formatter = _LimitedSandboxedFormatter(self)
+            return str_type(formatter.vformat(f_self, args, kwargs))
+
+        return functools.update_wrapper(wrapper, value)
+
+    def call(self, context: Context, obj: Any, /, *args: Any, **kwargs: Any) -> Any:
+        _check_deadline()
+        self.check_size(_str_method_size(obj, args))
+        return self.check_output_length(super().call(context, obj, *args, **kwargs))
+
+    def getattr(self, obj: Any, attribute: str) -> Any:
+        _check_deadline()
+        return super().getattr(obj, attribute)
+
+    def getitem(self, obj: Any, argument: Any) -> Any:
+        _check_deadline()
+        return super().getitem(obj, argument)
+
+    def call_binop(self, context: Context, operator: str, left: Any, right: Any) -> Any:
+        # Reject `'a' * 10 ** 9`, `s + s` and `'%999999999s' % s` before the result is allocated
+        if operator == "*":
+            for sequence, count in ((left, right), (right, left)):
+                if isinstance(sequence, Sized) and isinstance(count, int):
+                    self.check_size(len(sequence) * count)
+        elif operator == "+" and isinstance(left, Sized) and isinstance(right, Sized):
+            self.check_size(len(left) + len(right))
+        elif operator == "%" and isinstance(left, str):
+            self.check_size(_printf_size(left, right))
+        return self.check_output_length(super().call_binop(context, operator, left, right))
+
+
+class Jinja2Renderer:
+    """
+    Renders Jinja2 templates in the current process, as an alternative to the code execution service.
+
+    Templates run in an immutable sandboxed environment with a render deadline and an output length limit.
+    Compiled templates are kept in an LRU keyed on a hash of the template source. Inputs are passed through
+    the same JSON serialization as for the code execution service, so templates see the same values.
+    """
+
+    def __init__(self, cache_size: int, render_timeout: float, max_output_length: int):
+        self._cache_size = cache_size
+        self._render_timeout = render_timeout
+        self._max_output_length = max_output_length
+        self._environment = _LimitedSandboxedEnvironment(max_output_length=max_output_length)
+        self._templates: LRUCache[str, Template] = LRUCache(maxsize=max(cache_size, 1))
+        self._lock = threading.Lock()
+
+    def render(self, template: str, inputs: Mapping[str, Any]) -> str:
+        """
+        Render a template
+        :param template: template source
+        :param inputs: template variables
+        :return: rendered text
+        """
+        try:
+            compiled_template = self._get_template(template)
+            variables = json.loads(dumps_with_segments(inputs, ensure_ascii=False))
+        except TemplateError as e:
+            raise Jinja2RenderError(f"{type(e).__name__}: {e}") from e
+
+        previous_deadline = _render_deadline.deadline
+        _render_deadline.deadline = min(previous_deadline, time.monotonic() + self._render_timeout)
+        chunks: list[str] = []
+        output_length = 0
+        try:
+            for chunk in compiled_template.generate(**variables):
+                output_length += len(chunk)
+                if output_length > self._max_output_length:
+                    raise Jinja2RenderError(f"Output length exceeds {self._max_output_length} characters")
+                _check_deadline()
+                chunks.append(chunk)
+        except Jinja2RenderError:
+            raise
+        except Exception as e:
+            raise Jinja2RenderError(f"{type(e).__name__}: {e}") from e
+        finally:
+            _render_deadline.deadline = previous_deadline
+        return "".join(chunks)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def _get_template(self, template: str) -> Template:
+        if self._cache_size <= 0:
+            return self._environment.from_string(template)
+
+        key = hashlib.sha256(template.encode()).hexdigest()
+        with self._lock:
+            compiled_template = self._templates.get(key)
+        if compiled_template is not None:
+            return compiled_template
+
+        compiled_template = self._environment.from_string(template)
+        with self._lock:
+            self._templates[key] = compiled_template
+        return compiled_template
+
+
+jinja2_renderer = Jinja2Renderer(
+    cache_size=dify_config.CODE_EXECUTION_JINJA2_TEMPLATE_CACHE_SIZE,
+    render_timeout=dify_config.CODE_EXECUTION_JINJA2_RENDER_TIMEOUT,
+    max_output_length=dify_config.CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH,
+)
@@ -4,12 +4,24 @@ from __future__ import annotations
 
 import atexit
 import threading
+import time
 from collections.abc import Callable
+from typing import Any
 
 import httpx
+from opentelemetry.metrics import get_meter
+
+from configs import dify_config
 
 ClientBuilder = Callable[[], httpx.Client]
 
+_meter = get_meter("http_client_pool", version=dify_config.project.version)
+_pool_wait_time = _meter.create_histogram(
+    "http.client.pool.wait_time",
+    description="Time a request waited for a connection of a pooled HTTP client",
+    unit="ms",
+)
+
 
 class HttpClientPoolFactory:
     """Thread-safe factory that maintains reusable HTTP client instances."""
@@ -31,6 +43,11 @@ class HttpClientPoolFactory:
                 self._clients[key] = client
         return client
 
+    def snapshot(self) -> dict[str, httpx.Client]:
+        """Return the pooled clients by key."""
+        with self._lock:
+            return dict(self._clients)
+
     def close_all(self) -> None:
         """Close all pooled clients and clear the pool."""
         with self._lock:
@@ -47,6 +64,43 @@ def get_pooled_http_client(key: str, builder: ClientBuilder) -> httpx.Client:
     return _factory.get_or_create(key, builder)
 
 
+def get_pooled_http_clients() -> dict[str, httpx.Client]:
+    """Return every client created through the pooling factory, by key."""
+    return _factory.snapshot()
+
+
+def get_connection_counts(client: httpx.Client) -> tuple[int, int]:
+    """Return the number of active and idle connections held by the default transport of ``client``."""
+    # httpx does not expose the connection pool of its transport publicly.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None) or []
+    active = idle = 0
+    for connection in connections:
+        if connection.is_idle():
+            idle += 1
+        elif not connection.is_closed():
+            active += 1
+    return active, idle
+
+
+def pool_wait_trace(key: str) -> Callable[[str, dict[str, Any]], None]:
+    """
+    Return an httpcore ``trace`` extension recording how long a request on the ``key`` client waited for a
+    connection. Create it right before sending the request: the first trace event is emitted once the request
+    holds a pooled connection, either connecting a new one or sending the request headers on a reused one.
+    """
+    started_at = time.perf_counter()
+    recorded = False
+
+    def trace(event_name: str, info: dict[str, Any]) -> None:
+        nonlocal recorded
+        if not recorded:
+            recorded = True
+            _pool_wait_time.record((time.perf_counter() - started_at) * 1000, {"pool": key})
+
+    return trace
+
+
 def close_all_pooled_clients() -> None:
     """Close every client created through the pooling factory."""
     _factory.close_all()
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+from opentelemetry.metrics import get_meter
+
+from configs import dify_config
+from core.plugin.entities.plugin_daemon import PluginToolProviderEntity
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter("plugin_tool_provider_cache", version=dify_config.project.version)
+cache_lookups = _meter.create_counter(
+    "plugin.tool_provider.cache.lookups",
+    description="Lookups of plugin tool provider declarations in the per-process cache, by cache hit",
+)
+
+
+@dataclass(frozen=True)
+class CachedPluginToolProvider:
+    """Plugin tool provider declaration, stamped with the tenant plugin generation it was fetched at."""
+
+    generation: int
+    provider: PluginToolProviderEntity
+
+
+class PluginToolProviderCache:
+    """
+    Process-local cache of plugin tool provider declarations, keyed on tenant and provider.
+
+    Installing, upgrading or uninstalling a plugin bumps a per-tenant generation counter in Redis, so all API
+    processes notice the change on their next lookup. Entries also expire after `PLUGIN_TOOL_PROVIDER_CACHE_TTL`,
+    which bounds staleness for changes made without going through `PluginInstaller`, like remote debugging plugins.
+
+    Callers get a deep copy of the declaration, tool entities are modified per request, for example by agent nodes.
+    """
+
+    def __init__(self, ttl: int, maxsize: int):
+        self._ttl = ttl
+        self._entries: TTLCache[tuple[str, str], CachedPluginToolProvider] = TTLCache(maxsize=maxsize, ttl=max(ttl, 1))
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _generation_key(tenant_id: str) -> str:
+        return f"plugin_tool_provider_generation:{tenant_id}"
+
+    def get_generation(self, tenant_id: str) -> int | None:
+        """Return the plugin generation of the tenant, None if it can not be read."""
+        try:
+            generation = redis_client.get(self._generation_key(tenant_id))
+        except Exception:
+            logger.exception("Failed to read plugin generation for tenant %s", tenant_id)
+            return None
+        return int(generation) if generation else 0
+
+    def get(
+        self, tenant_id: str, provider: str, loader: Callable[[], PluginToolProviderEntity]
+    ) -> PluginToolProviderEntity:
+        """Return the declaration of a plugin tool provider, loading it with `loader` if it is missing or stale."""
+        if self._ttl <= 0:
+            return loader()
+
+        key = (tenant_id, provider)
+        generation = self.get_generation(tenant_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and generation is not None and entry.generation == generation
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        cache_lookups.add(1, {"hit": hit})
+        if entry is not None and hit:
+            return entry.provider.model_copy(deep=True)
+
+        provider_entity = loader()
+        if generation is not None:
+            entry = CachedPluginToolProvider(generation=generation, provider=provider_entity.model_copy(deep=True))
+            with self._lock:
+                self._entries[key] = entry
+        return provider_entity
+
+    def invalidate(self, tenant_id: str):
+        """Mark the plugin tool providers of the tenant as changed in every process."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == tenant_id]:
+                self._entries.pop(key, None)
+        try:
+            redis_client.incr(self._generation_key(tenant_id))
+        except Exception:
+            logger.exception("Failed to bump plugin generation for tenant %s", tenant_id)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+plugin_tool_provider_cache = PluginToolProviderCache(
+    ttl=dify_config.PLUGIN_TOOL_PROVIDER_CACHE_TTL,
+    maxsize=dify_config.PLUGIN_TOOL_PROVIDER_CACHE_MAX_SIZE,
+)
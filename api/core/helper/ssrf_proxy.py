@@ -89,6 +89,12 @@ def _get_user_provided_host_header(headers: dict | None) -> str | None:
 
 
 def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
+    """
+    Send a request through the SSRF proxy, retrying on connection errors and retryable status codes.
+
+    With `stream=True` the body is not read, iterate it with `response.iter_bytes()` and close the response.
+    """
+    stream = kwargs.pop("stream", False)
     if "allow_redirects" in kwargs:
         allow_redirects = kwargs.pop("allow_redirects")
         if "follow_redirects" not in kwargs:
@@ -122,7 +128,13 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
             if user_provided_host is not None:
                 headers["host"] = user_provided_host
             kwargs["headers"] = headers
-            response = client.request(method=method, url=url, **kwargs)
+            if stream:
+                send_kwargs = {key: kwargs[key] for key in ("follow_redirects", "auth") if key in kwargs}
+                request_kwargs = {key: value for key, value in kwargs.items() if key not in send_kwargs}
+                request = client.build_request(method=method, url=url, **request_kwargs)
+                response = client.send(request, stream=True, **send_kwargs)
+            else:
+                response = client.request(method=method, url=url, **kwargs)
 
             # Check for SSRF protection by Squid proxy
             if response.status_code in (401, 403):
@@ -132,6 +144,7 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
 
                 # Squid typically identifies itself in Server or Via headers
                 if "squid" in server_header or "squid" in via_header:
+                    response.close()
                     raise ToolSSRFError(
                         f"Access to '{url}' was blocked by SSRF protection. "
                         f"The URL may point to a private or local network address. "
@@ -140,6 +153,7 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
             if response.status_code not in STATUS_FORCELIST:
                 return response
             else:
+                response.close()
                 logger.warning(
                     "Received status code %s for URL %s which is in the force list",
                     response.status_code,
@@ -0,0 +1,211 @@
+"""
+Process-wide pool of initialized MCP client sessions.
+
+Opening an MCP client connects to the server, performs the `initialize`
+handshake and starts the receiver threads of the session. The pool keeps
+clients open after use, so consecutive tool calls and tool listings of the
+same provider reuse the session instead.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from configs import dify_config
+from core.entities.mcp_provider import MCPProviderEntity
+from core.mcp.auth_client import MCPClientWithAuthRetry
+
+logger = logging.getLogger(__name__)
+
+_PoolKey = tuple[str, str, str, str, float | None, float | None]
+
+
+class _PooledClient:
+    def __init__(self, key: _PoolKey, client: MCPClientWithAuthRetry):
+        self.key = key
+        self.client = client
+        self.last_used_at = time.monotonic()
+
+
+class MCPClientPool:
+    """
+    Pool of MCP clients keyed on the provider and the credentials used to connect.
+
+    A client is used by one caller at a time. Idle clients are kept per key up to
+    `max_idle_per_key` and closed once they have been idle for `idle_timeout`.
+    Before reuse, a client whose receiver has stopped is discarded, and a client
+    idle for longer than `health_check_interval` is pinged first.
+
+    Clients reconnect with refreshed tokens on authentication errors, see
+    `MCPClientWithAuthRetry`. A client that raised any error is closed instead of
+    being returned to the pool.
+    """
+
+    def __init__(self, max_idle_per_key: int, idle_timeout: float, health_check_interval: float):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_key: Maximum number of idle clients kept per key (0 to disable pooling)
+            idle_timeout: Seconds an idle client is kept before it is closed
+            health_check_interval: Idle seconds after which a client is pinged before reuse
+        """
+        self._max_idle_per_key = max_idle_per_key
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._idle: dict[_PoolKey, list[_PooledClient]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def client(
+        self,
+        *,
+        provider_entity: MCPProviderEntity,
+        server_url: str,
+        headers: dict[str, str],
+        timeout: float | None = None,
+        sse_read_timeout: float | None = None,
+    ) -> Generator[MCPClientWithAuthRetry, None, None]:
+        """
+        Borrow an initialized client, connecting a new one if no healthy idle client is pooled.
+
+        Args:
+            provider_entity: Provider entity, used for authentication retry
+            server_url: The decrypted MCP server URL
+            headers: The decrypted headers, including the Authorization header if any
+            timeout: Request timeout
+            sse_read_timeout: SSE read timeout
+        """
+        key = self._key(provider_entity, server_url, headers, timeout, sse_read_timeout)
+        pooled = self._acquire(key)
+        if pooled is None:
+            client = MCPClientWithAuthRetry(
+                server_url=server_url,
+                headers=dict(headers),
+                timeout=timeout,
+                sse_read_timeout=sse_read_timeout,
+                provider_entity=provider_entity,
+            ).__enter__()
+            pooled = _PooledClient(key, client)
+
+        try:
+            yield pooled.client
+        except BaseException:
+            self._close(pooled)
+            raise
+        self._release(pooled)
+
+    def clear(self):
+        """Close all idle clients."""
+        with self._lock:
+            idle = [pooled for clients in self._idle.values() for pooled in clients]
+            self._idle.clear()
+        for pooled in idle:
+            self._close(pooled)
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get pool status information.
+
+        Returns:
+            Dictionary with status information
+        """
+        with self._lock:
+            return {
+                "keys": len(self._idle),
+                "idle_clients": sum(len(clients) for clients in self._idle.values()),
+            }
+
+    @staticmethod
+    def _key(
+        provider_entity: MCPProviderEntity,
+        server_url: str,
+        headers: dict[str, str],
+        timeout: float | None,
+        sse_read_timeout: float | None,
+    ) -> _PoolKey:
+        # Hash the credentials, so rotated tokens or headers never reuse a session opened with the old ones
+        credentials = json.dumps([server_url, headers], sort_keys=True)
+        return (
+            provider_entity.tenant_id,
+            provider_entity.id,
+            server_url,
+            hashlib.sha256(credentials.encode()).hexdigest(),
+            timeout,
+            sse_read_timeout,
+        )
+
+    def _acquire(self, key: _PoolKey) -> _PooledClient | None:
+        """Take the most recently used healthy idle client of a key, None if there is none."""
+        while True:
+            with self._lock:
+                expired = self._take_expired()
+                clients = self._idle.get(key)
+                pooled = clients.pop() if clients else None
+                if clients is not None and not clients:
+                    del self._idle[key]
+            for expired_client in expired:
+                self._close(expired_client)
+
+            if pooled is None:
+                return None
+            if self._is_healthy(pooled):
+                return pooled
+            self._close(pooled)
+
+    def _release(self, pooled: _PooledClient) -> None:
+        pooled.last_used_at = time.monotonic()
+        with self._lock:
+            expired = self._take_expired()
+            clients = self._idle.setdefault(pooled.key, [])
+            if len(clients) < self._max_idle_per_key:
+                clients.append(pooled)
+            else:
+                expired.append(pooled)
+                if not clients:
+                    del self._idle[pooled.key]
+        for expired_client in expired:
+            self._close(expired_client)
+
+    def _take_expired(self) -> list[_PooledClient]:
+        """Remove the clients idle for longer than the idle timeout. Requires the lock."""
+        deadline = time.monotonic() - self._idle_timeout
+        expired: list[_PooledClient] = []
+        for key in list(self._idle):
+            clients = self._idle[key]
+            # Clients are appended on release, so the least recently used come first
+            while clients and clients[0].last_used_at < deadline:
+                expired.append(clients.pop(0))
+            if not clients:
+                del self._idle[key]
+        return expired
+
+    def _is_healthy(self, pooled: _PooledClient) -> bool:
+        if not pooled.client.is_connected():
+            return False
+        if time.monotonic() - pooled.last_used_at < self._health_check_interval:
+            return True
+        try:
+            pooled.client.ping()
+        except Exception:
+            logger.debug("Pooled MCP client failed the health check, reconnecting", exc_info=True)
+            return False
+        return True
+
+    @staticmethod
+    def _close(pooled: _PooledClient) -> None:
+        try:
+            pooled.client.__exit__(None, None, None)
+        except Exception:
+            logger.warning("Failed to close pooled MCP client", exc_info=True)
+
+
+mcp_client_pool = MCPClientPool(
+    max_idle_per_key=dify_config.MCP_CLIENT_POOL_MAX_IDLE_PER_PROVIDER,
+    idle_timeout=dify_config.MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    health_check_interval=dify_config.MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL,
+)
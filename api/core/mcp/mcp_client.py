@@ -102,6 +102,16 @@ class MCPClient:
             raise ValueError("Session not initialized.")
         return self._session.call_tool(tool_name, tool_args)
 
+    def is_connected(self) -> bool:
+        """Check whether the session is initialized and still receiving messages"""
+        return self._session is not None and self._session.is_receiving()
+
+    def ping(self):
+        """Ping the MCP server"""
+        if not self._session:
+            raise ValueError("Session not initialized.")
+        self._session.send_ping()
+
     def cleanup(self):
         """Clean up resources"""
         try:
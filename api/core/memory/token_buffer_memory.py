@@ -1,3 +1,5 @@
+import logging
+from collections import defaultdict
 from collections.abc import Sequence
 
 from sqlalchemy import select
@@ -17,12 +19,18 @@ from core.model_runtime.entities import (
 from core.model_runtime.entities.message_entities import PromptMessageContentUnionTypes
 from core.prompt.utils.extract_thread_messages import extract_thread_messages
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client
 from factories import file_factory
 from models.model import AppMode, Conversation, Message, MessageFile
 from models.workflow import Workflow
 from repositories.api_workflow_run_repository import APIWorkflowRunRepository
 from repositories.factory import DifyAPIRepositoryFactory
 
+logger = logging.getLogger(__name__)
+
+# Prompt message token counts never change for a given message and model, the TTL only bounds the cache size
+_PROMPT_MESSAGE_TOKENS_CACHE_TTL = 86400
+
 
 class TokenBufferMemory:
     def __init__(
@@ -148,17 +156,14 @@ class TokenBufferMemory:
 
         messages = list(reversed(thread_messages))
 
-        curr_message_tokens = 0
+        message_files = self._get_message_files([message.id for message in messages])
+
         prompt_messages: list[PromptMessage] = []
+        prompt_message_keys: list[str] = []
         for message in messages:
-            # Process user message with files
-            user_files = db.session.scalars(
-                select(MessageFile).where(
-                    MessageFile.message_id == message.id,
-                    (MessageFile.belongs_to == "user") | (MessageFile.belongs_to.is_(None)),
-                )
-            ).all()
+            user_files, assistant_files = message_files.get(message.id, ([], []))
 
+            # Process user message with files
             if user_files:
                 user_prompt_message = self._build_prompt_message_with_files(
                     message_files=user_files,
@@ -170,12 +175,9 @@ class TokenBufferMemory:
                 prompt_messages.append(user_prompt_message)
             else:
                 prompt_messages.append(UserPromptMessage(content=message.query))
+            prompt_message_keys.append(f"{message.id}:user")
 
             # Process assistant message with files
-            assistant_files = db.session.scalars(
-                select(MessageFile).where(MessageFile.message_id == message.id, MessageFile.belongs_to == "assistant")
-            ).all()
-
             if assistant_files:
                 assistant_prompt_message = self._build_prompt_message_with_files(
                     message_files=assistant_files,
@@ -187,17 +189,106 @@ class TokenBufferMemory:
                 prompt_messages.append(assistant_prompt_message)
             else:
                 prompt_messages.append(AssistantPromptMessage(content=message.answer))
+            prompt_message_keys.append(f"{message.id}:assistant")
 
         if not prompt_messages:
             return []
 
         # prune the chat message if it exceeds the max token limit
-        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+        return self._prune_prompt_messages(prompt_messages, prompt_message_keys, max_token_limit)
 
-        if curr_message_tokens > max_token_limit:
-            while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
-                prompt_messages.pop(0)
-                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+    @staticmethod
+    def _get_message_files(message_ids: Sequence[str]) -> dict[str, tuple[list[MessageFile], list[MessageFile]]]:
+        """
+        Get the files of messages in one query.
+        :param message_ids: message ids
+        :return: mapping of message id to its user files and assistant files
+        """
+        message_files: dict[str, tuple[list[MessageFile], list[MessageFile]]] = defaultdict(lambda: ([], []))
+        if not message_ids:
+            return message_files
+
+        for message_file in db.session.scalars(select(MessageFile).where(MessageFile.message_id.in_(message_ids))):
+            user_files, assistant_files = message_files[message_file.message_id]
+            if message_file.belongs_to == "assistant":
+                assistant_files.append(message_file)
+            elif message_file.belongs_to in {"user", None}:
+                user_files.append(message_file)
+        return message_files
+
+    def _prune_prompt_messages(
+        self, prompt_messages: list[PromptMessage], prompt_message_keys: Sequence[str], max_token_limit: int
+    ) -> list[PromptMessage]:
+        """
+        Drop the oldest prompt messages until the rest fits in the max token limit.
+
+        The whole history is counted once. If it does not fit, per-message token counts are summed from the
+        newest message backwards to find where the history starts, and only that window is counted again.
+        Per-message counts are cached in Redis, so each message is counted on its own once per model.
+        :param prompt_messages: prompt messages, oldest first
+        :param prompt_message_keys: cache key of each prompt message, unique per message and role
+        :param max_token_limit: max token limit
+        :return: pruned prompt messages
+        """
+        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+        if curr_message_tokens <= max_token_limit or len(prompt_messages) <= 1:
+            return prompt_messages
+
+        cache_keys = [
+            f"prompt_message_tokens:{self.model_instance.provider}:{self.model_instance.model}:{key}"
+            for key in prompt_message_keys
+        ]
+        try:
+            cached_tokens = redis_client.mget(cache_keys)
+        except Exception:
+            logger.exception("Failed to get cached prompt message tokens")
+            cached_tokens = [None] * len(cache_keys)
+
+        message_tokens: dict[int, int] = {}
+
+        def get_message_tokens(index: int) -> int:
+            if index not in message_tokens:
+                cached = cached_tokens[index]
+                if cached is not None:
+                    message_tokens[index] = int(cached)
+                else:
+                    message_tokens[index] = self.model_instance.get_llm_num_tokens([prompt_messages[index]])
+                    try:
+                        redis_client.setex(cache_keys[index], _PROMPT_MESSAGE_TOKENS_CACHE_TTL, message_tokens[index])
+                    except Exception:
+                        logger.exception("Failed to cache prompt message tokens")
+            return message_tokens[index]
+
+        # Every message counted on its own includes the per-request overhead of the model,
+        # so the sum of the counts never underestimates a window.
+        start = len(prompt_messages)
+        window_tokens = 0
+        while start > 1 and window_tokens + get_message_tokens(start - 1) <= max_token_limit:
+            start -= 1
+            window_tokens += get_message_tokens(start)
+        start = min(start, len(prompt_messages) - 1)
+        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages[start:])
+
+        # Estimate the overhead from the window to add back the older messages that still fit
+        window_size = len(prompt_messages) - start
+        if window_size > 1 and curr_message_tokens <= max_token_limit:
+            overhead = max(window_tokens - curr_message_tokens, 0) / (window_size - 1)
+            estimated_tokens = float(curr_message_tokens)
+            extended_start = start
+            while (
+                extended_start > 1
+                and estimated_tokens + get_message_tokens(extended_start - 1) - overhead <= max_token_limit
+            ):
+                extended_start -= 1
+                estimated_tokens += get_message_tokens(extended_start) - overhead
+            if extended_start < start:
+                start = extended_start
+                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages[start:])
+
+        prompt_messages = prompt_messages[start:]
+        while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
+            prompt_messages.pop(0)
+            curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
 
         return prompt_messages
 
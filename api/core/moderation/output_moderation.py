@@ -1,10 +1,10 @@
 import logging
 import threading
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from flask import Flask, current_app
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from configs import dify_config
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
@@ -14,6 +14,11 @@ from core.moderation.factory import ModerationFactory
 
 logger = logging.getLogger(__name__)
 
+# shared by the output moderation of all streamed answers in the process
+_moderation_executor = ThreadPoolExecutor(
+    max_workers=dify_config.MODERATION_MAX_WORKERS, thread_name_prefix="output_moderation"
+)
+
 
 class ModerationRule(BaseModel):
     type: str
@@ -21,19 +26,34 @@ class ModerationRule(BaseModel):
 
 
 class OutputModeration(BaseModel):
+    """
+    Moderates a streamed answer while it is generated.
+
+    Tokens are kept as a list of chunks. Every MODERATION_BUFFER_SIZE new characters, a check of the new text,
+    prefixed with the last MODERATION_BUFFER_OVERLAP characters already checked, is scheduled on a shared executor.
+    At most one check per answer is in flight. When an overridden window is flagged, the whole text streamed so far
+    is moderated once more, so that the replacement covers the full answer. The complete answer is always
+    moderated again by `moderation_completion` when the task finishes.
+    """
+
     tenant_id: str
     app_id: str
 
     rule: ModerationRule
     queue_manager: AppQueueManager
 
-    thread: threading.Thread | None = None
-    thread_running: bool = True
-    buffer: str = ""
-    is_final_chunk: bool = False
     final_output: str | None = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    _chunks: list[str] = PrivateAttr(default_factory=list)
+    _checked_chunks: int = PrivateAttr(default=0)
+    _pending_length: int = PrivateAttr(default=0)
+    _overlap: str = PrivateAttr(default="")
+    _check: Future | None = PrivateAttr(default=None)
+    _flask_app: Flask | None = PrivateAttr(default=None)
+    _running: bool = PrivateAttr(default=True)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
     def should_direct_output(self) -> bool:
         return self.final_output is not None
 
@@ -41,14 +61,15 @@ class OutputModeration(BaseModel):
         return self.final_output or ""
 
     def append_new_token(self, token: str):
-        self.buffer += token
-
-        if not self.thread:
-            self.thread = self.start_thread()
+        with self._lock:
+            self._chunks.append(token)
+            self._pending_length += len(token)
+            if self._flask_app is None:
+                self._flask_app = current_app._get_current_object()  # type: ignore
+            self._schedule_check()
 
     def moderation_completion(self, completion: str, public_event: bool = False) -> tuple[str, bool]:
-        self.buffer = completion
-        self.is_final_chunk = True
+        self.stop()
 
         result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=completion)
 
@@ -70,62 +91,59 @@ class OutputModeration(BaseModel):
 
         return final_output, True
 
-    def start_thread(self) -> threading.Thread:
-        buffer_size = dify_config.MODERATION_BUFFER_SIZE
-        thread = threading.Thread(
-            target=self.worker,
-            kwargs={
-                "flask_app": current_app._get_current_object(),  # type: ignore
-                "buffer_size": buffer_size if buffer_size > 0 else dify_config.MODERATION_BUFFER_SIZE,
-            },
-        )
-
-        thread.start()
-
-        return thread
-
-    def stop_thread(self):
-        if self.thread and self.thread.is_alive():
-            self.thread_running = False
-
-    def worker(self, flask_app: Flask, buffer_size: int):
-        with flask_app.app_context():
-            current_length = 0
-            while self.thread_running:
-                moderation_buffer = self.buffer
-                buffer_length = len(moderation_buffer)
-                if not self.is_final_chunk:
-                    chunk_length = buffer_length - current_length
-                    if 0 <= chunk_length < buffer_size:
-                        time.sleep(1)
-                        continue
-
-                current_length = buffer_length
-
-                result = self.moderation(
-                    tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=moderation_buffer
-                )
-
-                if not result or not result.flagged:
-                    continue
-
-                if result.action == ModerationAction.DIRECT_OUTPUT:
-                    final_output = result.preset_response
-                    self.final_output = final_output
-                else:
-                    final_output = result.text + self.buffer[len(moderation_buffer) :]
-
-                # trigger replace event
-                if self.thread_running:
-                    self.queue_manager.publish(
-                        QueueMessageReplaceEvent(
-                            text=final_output, reason=QueueMessageReplaceEvent.MessageReplaceReason.OUTPUT_MODERATION
-                        ),
-                        PublishFrom.TASK_PIPELINE,
-                    )
-
-                if result.action == ModerationAction.DIRECT_OUTPUT:
-                    break
+    def stop(self):
+        """Stop scheduling checks, a check in flight no longer publishes its result."""
+        with self._lock:
+            self._running = False
+
+    def _schedule_check(self):
+        """Submit a check of the text appended since the last one, must be called with the lock held."""
+        if not self._running or self.final_output is not None or self._check is not None:
+            return
+        if self._pending_length < dify_config.MODERATION_BUFFER_SIZE or self._flask_app is None:
+            return
+
+        end = len(self._chunks)
+        window = self._overlap + "".join(self._chunks[self._checked_chunks : end])
+        overlap_size = dify_config.MODERATION_BUFFER_OVERLAP
+        self._overlap = window[-overlap_size:] if overlap_size else ""
+        self._checked_chunks = end
+        self._pending_length = 0
+        self._check = _moderation_executor.submit(self._check_window, self._flask_app, window, end)
+
+    def _check_window(self, flask_app: Flask, window: str, end: int):
+        try:
+            with flask_app.app_context():
+                result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=window)
+                if result and result.flagged and result.action == ModerationAction.OVERRIDDEN:
+                    # the overridden text of a window can not be spliced into the answer, override the whole text
+                    with self._lock:
+                        text = "".join(self._chunks[:end])
+                    result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=text)
+
+                if result and result.flagged:
+                    self._publish_flagged(result, end)
+        finally:
+            with self._lock:
+                self._check = None
+                self._schedule_check()
+
+    def _publish_flagged(self, result: ModerationOutputsResult, end: int):
+        if result.action == ModerationAction.DIRECT_OUTPUT:
+            final_output = result.preset_response
+            self.final_output = final_output
+        else:
+            with self._lock:
+                final_output = result.text + "".join(self._chunks[end:])
+
+        # trigger replace event
+        if self._running:
+            self.queue_manager.publish(
+                QueueMessageReplaceEvent(
+                    text=final_output, reason=QueueMessageReplaceEvent.MessageReplaceReason.OUTPUT_MODERATION
+                ),
+                PublishFrom.TASK_PIPELINE,
+            )
 
     def moderation(self, tenant_id: str, app_id: str, moderation_buffer: str) -> ModerationOutputsResult | None:
         try:
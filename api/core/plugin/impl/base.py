@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from yarl import URL
 
 from configs import dify_config
+from core.helper.http_client_pooling import get_pooled_http_client, pool_wait_trace
 from core.model_runtime.errors.invoke import (
     InvokeAuthorizationError,
     InvokeBadRequestError,
@@ -49,11 +50,31 @@ elif isinstance(_plugin_daemon_timeout_config, httpx.Timeout):
 else:
     plugin_daemon_request_timeout = httpx.Timeout(_plugin_daemon_timeout_config)
 
+_PLUGIN_DAEMON_CLIENT_KEY = "plugin_daemon:http_client"
+_PLUGIN_DAEMON_CLIENT_LIMITS = httpx.Limits(
+    max_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=dify_config.PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY,
+)
+
 T = TypeVar("T", bound=(BaseModel | dict[str, Any] | list[Any] | bool | str))
 
 logger = logging.getLogger(__name__)
 
 
+def _build_plugin_daemon_client() -> httpx.Client:
+    if dify_config.PLUGIN_DAEMON_HTTP2_ENABLED:
+        try:
+            return httpx.Client(limits=_PLUGIN_DAEMON_CLIENT_LIMITS, http2=True)
+        except ImportError:
+            logger.warning("HTTP/2 for the plugin daemon requires the 'h2' package, falling back to HTTP/1.1")
+    return httpx.Client(limits=_PLUGIN_DAEMON_CLIENT_LIMITS)
+
+
+def _get_plugin_daemon_client() -> httpx.Client:
+    return get_pooled_http_client(_PLUGIN_DAEMON_CLIENT_KEY, _build_plugin_daemon_client)
+
+
 class BasePluginClient:
     def _request(
         self,
@@ -83,7 +104,9 @@ class BasePluginClient:
             request_kwargs["content"] = prepared_data
 
         try:
-            response = httpx.request(**request_kwargs)
+            response = _get_plugin_daemon_client().request(
+                **request_kwargs, extensions={"trace": pool_wait_trace(_PLUGIN_DAEMON_CLIENT_KEY)}
+            )
         except httpx.RequestError:
             logger.exception("Request to Plugin Daemon Service failed")
             raise PluginDaemonInnerError(code=-500, message="Request to Plugin Daemon Service failed")
@@ -142,7 +165,9 @@ class BasePluginClient:
             stream_kwargs["content"] = prepared_data
 
         try:
-            with httpx.stream(**stream_kwargs) as response:
+            with _get_plugin_daemon_client().stream(
+                **stream_kwargs, extensions={"trace": pool_wait_trace(_PLUGIN_DAEMON_CLIENT_KEY)}
+            ) as response:
                 for raw_line in response.iter_lines():
                     if not raw_line:
                         continue
@@ -2,6 +2,7 @@ from collections.abc import Sequence
 
 from requests import HTTPError
 
+from core.helper.plugin_tool_provider_cache import plugin_tool_provider_cache
 from core.plugin.entities.bundle import PluginBundleDependency
 from core.plugin.entities.plugin import (
     MissingPluginDependency,
@@ -14,6 +15,7 @@ from core.plugin.entities.plugin_daemon import (
     PluginDecodeResponse,
     PluginInstallTask,
     PluginInstallTaskStartResponse,
+    PluginInstallTaskStatus,
     PluginListResponse,
     PluginReadmeResponse,
 )
@@ -126,7 +128,7 @@ class PluginInstaller(BasePluginClient):
         Install a plugin from an identifier.
         """
         # exception will be raised if the request failed
-        return self._request_with_plugin_daemon_response(
+        response = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/install/identifiers",
             PluginInstallTaskStartResponse,
@@ -137,6 +139,8 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        return response
 
     def fetch_plugin_installation_tasks(self, tenant_id: str, page: int, page_size: int) -> Sequence[PluginInstallTask]:
         """
@@ -153,11 +157,16 @@ class PluginInstaller(BasePluginClient):
         """
         Fetch a plugin installation task.
         """
-        return self._request_with_plugin_daemon_response(
+        task = self._request_with_plugin_daemon_response(
             "GET",
             f"plugin/{tenant_id}/management/install/tasks/{task_id}",
             PluginInstallTask,
         )
+        # Installs and upgrades finish in the background, providers may have been fetched in the meantime.
+        # A failed task may still have installed some of its plugins.
+        if task.status in {PluginInstallTaskStatus.Success, PluginInstallTaskStatus.Failed}:
+            plugin_tool_provider_cache.invalidate(tenant_id)
+        return task
 
     def delete_plugin_installation_task(self, tenant_id: str, task_id: str) -> bool:
         """
@@ -245,7 +254,7 @@ class PluginInstaller(BasePluginClient):
         """
         Uninstall a plugin.
         """
-        return self._request_with_plugin_daemon_response(
+        result = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/uninstall",
             bool,
@@ -254,6 +263,8 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        return result
 
     def upgrade_plugin(
         self,
@@ -266,7 +277,7 @@ class PluginInstaller(BasePluginClient):
         """
         Upgrade a plugin.
         """
-        return self._request_with_plugin_daemon_response(
+        response = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/install/upgrade",
             PluginInstallTaskStartResponse,
@@ -278,6 +289,8 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        return response
 
     def check_tools_existence(self, tenant_id: str, provider_ids: Sequence[GenericProviderID]) -> Sequence[bool]:
         """
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Mapping, Set
 from typing import Any
 
 import orjson
@@ -7,6 +8,7 @@ from sqlalchemy import select
 
 from configs import dify_config
 from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.datasource.keyword.jieba.keyword_table_cache import keyword_table_cache
 from core.rag.datasource.keyword.keyword_base import BaseKeyword
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -68,10 +70,10 @@ class Jieba(BaseKeyword):
             self._save_dataset_keyword_table(keyword_table)
 
     def text_exists(self, id: str) -> bool:
-        keyword_table = self._get_dataset_keyword_table()
-        if keyword_table is None:
+        cached_keyword_table = keyword_table_cache.get(self.dataset.id, self._get_dataset_keyword_table)
+        if cached_keyword_table is None:
             return False
-        return id in set.union(*keyword_table.values())
+        return id in cached_keyword_table.node_ids
 
     def delete_by_ids(self, ids: list[str]):
         lock_name = f"keyword_indexing_lock_{self.dataset.id}"
@@ -83,12 +85,18 @@ class Jieba(BaseKeyword):
             self._save_dataset_keyword_table(keyword_table)
 
     def search(self, query: str, **kwargs: Any) -> list[Document]:
-        keyword_table = self._get_dataset_keyword_table()
+        cached_keyword_table = keyword_table_cache.get(self.dataset.id, self._get_dataset_keyword_table)
+        keyword_table = cached_keyword_table.table if cached_keyword_table else {}
 
         k = kwargs.get("top_k", 4)
         document_ids_filter = kwargs.get("document_ids_filter")
-        sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table or {}, query, k)
+        sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table, query, k)
+
+        return self._get_documents_by_index_node_ids(sorted_chunk_indices, document_ids_filter)
 
+    def _get_documents_by_index_node_ids(
+        self, sorted_chunk_indices: list[str], document_ids_filter: list[str] | None = None
+    ) -> list[Document]:
         documents = []
 
         segment_query_stmt = db.session.query(DocumentSegment).where(
@@ -127,6 +135,7 @@ class Jieba(BaseKeyword):
                 if dataset_keyword_table.data_source_type != "database":
                     file_key = "keyword_files/" + self.dataset.tenant_id + "/" + self.dataset.id + ".txt"
                     storage.delete(file_key)
+                keyword_table_cache.invalidate(self.dataset.id)
 
     def _save_dataset_keyword_table(self, keyword_table):
         keyword_table_dict = {
@@ -143,6 +152,7 @@ class Jieba(BaseKeyword):
             if storage.exists(file_key):
                 storage.delete(file_key)
             storage.save(file_key, dumps_with_sets(keyword_table_dict).encode("utf-8"))
+        keyword_table_cache.invalidate(self.dataset.id)
 
     def _get_dataset_keyword_table(self) -> dict | None:
         dataset_keyword_table = self.dataset.dataset_keyword_table
@@ -193,13 +203,13 @@ class Jieba(BaseKeyword):
 
         return keyword_table
 
-    def _retrieve_ids_by_query(self, keyword_table: dict, query: str, k: int = 4):
+    def _retrieve_ids_by_query(self, keyword_table: Mapping[str, Set[str]], query: str, k: int = 4):
         keyword_table_handler = JiebaKeywordTableHandler()
         keywords = keyword_table_handler.extract_keywords(query)
 
         # go through text chunks in order of most matching keywords
         chunk_indices_count: dict[str, int] = defaultdict(int)
-        keywords_list = [keyword for keyword in keywords if keyword in set(keyword_table.keys())]
+        keywords_list = [keyword for keyword in keywords if keyword in keyword_table]
         for keyword in keywords_list:
             for node_id in keyword_table[keyword]:
                 chunk_indices_count[node_id] += 1
@@ -0,0 +1,196 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from configs import dify_config
+from core.rag.datasource.keyword.jieba.jieba import Jieba
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.datasource.keyword.keyword_base import BaseKeyword
+from core.rag.models.document import Document
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from extensions.ext_storage import storage
+from models.dataset import DatasetKeywordPosting
+
+# Must match the length of `DatasetKeywordPosting.keyword`.
+MAX_KEYWORD_LENGTH = 255
+_INSERT_BATCH_SIZE = 1000
+
+
+class JiebaIncremental(Jieba):
+    """
+    Jieba keyword store that keeps one row per (keyword, index node) pair.
+
+    Unlike `Jieba`, which rewrites the whole keyword table blob on every change, inserts and deletes only touch the
+    rows of the affected nodes, and searches only load the postings of the query keywords. Datasets indexed with
+    the `jieba` store are imported on first use.
+    """
+
+    def create(self, texts: list[Document], **kwargs) -> BaseKeyword:
+        self.add_texts(texts, **kwargs)
+        return self
+
+    def add_texts(self, texts: list[Document], **kwargs):
+        self._migrate_legacy_keyword_table()
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keywords_list = kwargs.get("keywords_list")
+        keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
+
+        postings: dict[str, list[str]] = {}
+        for i, text in enumerate(texts):
+            keywords = keywords_list[i] if keywords_list else None
+            if not keywords:
+                keywords = keyword_table_handler.extract_keywords(text.page_content, keyword_number)
+            if text.metadata is not None:
+                self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
+                postings[text.metadata["doc_id"]] = list(keywords)
+
+        self._save_postings(postings)
+
+    def text_exists(self, id: str) -> bool:
+        self._migrate_legacy_keyword_table()
+        stmt = (
+            select(DatasetKeywordPosting.id)
+            .where(DatasetKeywordPosting.dataset_id == self.dataset.id, DatasetKeywordPosting.index_node_id == id)
+            .limit(1)
+        )
+        return db.session.scalar(stmt) is not None
+
+    def delete_by_ids(self, ids: list[str]):
+        self._migrate_legacy_keyword_table()
+        if not ids:
+            return
+        db.session.execute(
+            delete(DatasetKeywordPosting).where(
+                DatasetKeywordPosting.dataset_id == self.dataset.id,
+                DatasetKeywordPosting.index_node_id.in_(ids),
+            )
+        )
+        db.session.commit()
+
+    def search(self, query: str, **kwargs: Any) -> list[Document]:
+        self._migrate_legacy_keyword_table()
+        k = kwargs.get("top_k", 4)
+        document_ids_filter = kwargs.get("document_ids_filter")
+
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keywords = [keyword for keyword in keyword_table_handler.extract_keywords(query) if keyword]
+        if not keywords:
+            return []
+
+        stmt = select(DatasetKeywordPosting.keyword, DatasetKeywordPosting.index_node_id).where(
+            DatasetKeywordPosting.dataset_id == self.dataset.id,
+            DatasetKeywordPosting.keyword.in_(keywords),
+        )
+        keyword_table: dict[str, set[str]] = defaultdict(set)
+        for keyword, index_node_id in db.session.execute(stmt):
+            keyword_table[keyword].add(index_node_id)
+
+        sorted_chunk_indices = self._rank_index_node_ids(keywords, keyword_table, k)
+        return self._get_documents_by_index_node_ids(sorted_chunk_indices, document_ids_filter)
+
+    def delete(self):
+        db.session.execute(delete(DatasetKeywordPosting).where(DatasetKeywordPosting.dataset_id == self.dataset.id))
+        db.session.commit()
+        # Remove any keyword table left by the `jieba` store as well.
+        super().delete()
+
+    def create_segment_keywords(self, node_id: str, keywords: list[str]):
+        self._migrate_legacy_keyword_table()
+        self._update_segment_keywords(self.dataset.id, node_id, keywords)
+        self._save_postings({node_id: keywords})
+
+    def multi_create_segment_keywords(self, pre_segment_data_list: list):
+        self._migrate_legacy_keyword_table()
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
+        postings: dict[str, list[str]] = {}
+        for pre_segment_data in pre_segment_data_list:
+            segment = pre_segment_data["segment"]
+            keywords = pre_segment_data["keywords"] or list(
+                keyword_table_handler.extract_keywords(segment.content, keyword_number)
+            )
+            segment.keywords = keywords
+            postings[segment.index_node_id] = keywords
+        self._save_postings(postings)
+
+    def update_segment_keywords_index(self, node_id: str, keywords: list[str]):
+        self._migrate_legacy_keyword_table()
+        self._save_postings({node_id: keywords})
+
+    @staticmethod
+    def _rank_index_node_ids(keywords: Iterable[str], keyword_table: dict[str, set[str]], k: int) -> list[str]:
+        # go through text chunks in order of most matching keywords, same as `Jieba._retrieve_ids_by_query`
+        chunk_indices_count: dict[str, int] = defaultdict(int)
+        for keyword in keywords:
+            for node_id in keyword_table.get(keyword, ()):
+                chunk_indices_count[node_id] += 1
+
+        sorted_chunk_indices = sorted(
+            chunk_indices_count.keys(),
+            key=lambda x: chunk_indices_count[x],
+            reverse=True,
+        )
+        return sorted_chunk_indices[:k]
+
+    def _save_postings(self, postings: dict[str, list[str]]):
+        rows = [
+            {"dataset_id": self.dataset.id, "keyword": keyword, "index_node_id": node_id}
+            for node_id, keywords in postings.items()
+            for keyword in dict.fromkeys(keywords)
+            if keyword and len(keyword) <= MAX_KEYWORD_LENGTH
+        ]
+        self._insert_postings(rows)
+
+    def _insert_postings(self, rows: list[dict[str, str]]):
+        if not rows:
+            return
+        for i in range(0, len(rows), _INSERT_BATCH_SIZE):
+            batch = [DatasetKeywordPosting(**row) for row in rows[i : i + _INSERT_BATCH_SIZE]]
+            values = [
+                {
+                    "id": posting.id,
+                    "dataset_id": posting.dataset_id,
+                    "keyword": posting.keyword,
+                    "index_node_id": posting.index_node_id,
+                }
+                for posting in batch
+            ]
+            if dify_config.SQLALCHEMY_DATABASE_URI_SCHEME == "postgresql":
+                stmt = pg_insert(DatasetKeywordPosting).values(values)
+                stmt = stmt.on_conflict_do_nothing(index_elements=["dataset_id", "keyword", "index_node_id"])
+            else:
+                stmt = mysql_insert(DatasetKeywordPosting).values(values).prefix_with("IGNORE")  # type: ignore[assignment]
+            db.session.execute(stmt)
+        db.session.commit()
+
+    def _migrate_legacy_keyword_table(self):
+        """Import the keyword table blob written by the `jieba` store into postings, then drop the blob."""
+        if self.dataset.dataset_keyword_table is None:
+            return
+
+        lock_name = f"keyword_indexing_lock_{self.dataset.id}"
+        with redis_client.lock(lock_name, timeout=600):
+            dataset_keyword_table = self.dataset.dataset_keyword_table
+            if dataset_keyword_table is None:
+                return
+            keyword_table_dict = dataset_keyword_table.keyword_table_dict
+            keyword_table = dict(keyword_table_dict["__data__"]["table"]) if keyword_table_dict else {}
+            self._insert_postings(
+                [
+                    {"dataset_id": self.dataset.id, "keyword": keyword, "index_node_id": node_id}
+                    for keyword, node_ids in keyword_table.items()
+                    if keyword and len(keyword) <= MAX_KEYWORD_LENGTH
+                    for node_id in node_ids
+                ]
+            )
+
+            db.session.delete(dataset_keyword_table)
+            db.session.commit()
+            if dataset_keyword_table.data_source_type != "database":
+                file_key = "keyword_files/" + self.dataset.tenant_id + "/" + self.dataset.id + ".txt"
+                storage.delete(file_key)
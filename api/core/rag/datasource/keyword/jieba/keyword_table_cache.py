@@ -0,0 +1,92 @@
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from cachetools import LRUCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedKeywordTable:
+    """Read-only snapshot of a dataset keyword table, stamped with the version it was loaded at."""
+
+    version: int
+    table: Mapping[str, frozenset[str]]
+    node_ids: frozenset[str]
+    postings: int
+
+
+class KeywordTableCache:
+    """
+    Process-local cache of dataset keyword tables for the read paths of the `jieba` keyword store.
+
+    Every write to a keyword table bumps a per-dataset version counter in Redis, so all API processes notice the
+    change on their next read. Entries are evicted least recently used once the total number of postings exceeds
+    `KEYWORD_TABLE_CACHE_MAX_POSTINGS`.
+    """
+
+    def __init__(self, max_postings: int):
+        self._max_postings = max_postings
+        self._entries: LRUCache[str, CachedKeywordTable] = LRUCache(
+            maxsize=max(max_postings, 1), getsizeof=lambda entry: max(entry.postings, 1)
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version_key(dataset_id: str) -> str:
+        return f"keyword_table_version:{dataset_id}"
+
+    def get_version(self, dataset_id: str) -> int:
+        version = redis_client.get(self._version_key(dataset_id))
+        return int(version) if version else 0
+
+    def get(self, dataset_id: str, loader: Callable[[], Mapping[str, set[str]] | None]) -> CachedKeywordTable | None:
+        """Return the cached keyword table of the dataset, loading it with `loader` if it is missing or stale."""
+        if self._max_postings <= 0:
+            keyword_table = loader()
+            return self._build_entry(0, keyword_table) if keyword_table is not None else None
+
+        version = self.get_version(dataset_id)
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+        if entry is not None and entry.version == version:
+            return entry
+
+        keyword_table = loader()
+        if keyword_table is None:
+            return None
+        entry = self._build_entry(version, keyword_table)
+        with self._lock:
+            try:
+                self._entries[dataset_id] = entry
+            except ValueError:
+                # The table alone is larger than the whole cache, serve it without caching.
+                self._entries.pop(dataset_id, None)
+        return entry
+
+    def invalidate(self, dataset_id: str):
+        """Mark the dataset keyword table as changed in every process."""
+        with self._lock:
+            self._entries.pop(dataset_id, None)
+        try:
+            redis_client.incr(self._version_key(dataset_id))
+        except Exception:
+            logger.exception("Failed to bump keyword table version for dataset %s", dataset_id)
+
+    @staticmethod
+    def _build_entry(version: int, keyword_table: Mapping[str, set[str]]) -> CachedKeywordTable:
+        table = {keyword: frozenset(node_ids) for keyword, node_ids in keyword_table.items()}
+        node_ids: set[str] = set()
+        postings = 0
+        for ids in table.values():
+            node_ids.update(ids)
+            postings += len(ids)
+        return CachedKeywordTable(version=version, table=table, node_ids=frozenset(node_ids), postings=postings)
+
+
+keyword_table_cache = KeywordTableCache(max_postings=dify_config.KEYWORD_TABLE_CACHE_MAX_POSTINGS)
@@ -21,6 +21,7 @@ from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
 from core.rag.rerank.rerank_type import RerankMode
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
+from core.rag.retrieval.retrieval_plan import RetrievalPlan
 from core.tools.signature import sign_upload_file
 from extensions.ext_database import db
 from models.dataset import ChildChunk, Dataset, DocumentSegment, SegmentAttachmentBinding
@@ -52,10 +53,12 @@ class RetrievalService:
         weights: dict | None = None,
         document_ids_filter: list[str] | None = None,
         attachment_ids: list | None = None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
         if not query and not attachment_ids:
             return []
-        dataset = cls._get_dataset(dataset_id)
+        retrieval_plan = retrieval_plan or RetrievalPlan()
+        dataset = cls._get_dataset(dataset_id, retrieval_plan)
         if not dataset:
             return []
 
@@ -83,6 +86,7 @@ class RetrievalService:
                         attachment_id=None,
                         all_documents=all_documents,
                         exceptions=exceptions,
+                        retrieval_plan=retrieval_plan,
                     )
                 )
             if attachment_ids:
@@ -103,6 +107,7 @@ class RetrievalService:
                             attachment_id=attachment_id,
                             all_documents=all_documents,
                             exceptions=exceptions,
+                            retrieval_plan=retrieval_plan,
                         )
                     )
 
@@ -182,7 +187,9 @@ class RetrievalService:
         return [chosen[k] for k in order]
 
     @classmethod
-    def _get_dataset(cls, dataset_id: str) -> Dataset | None:
+    def _get_dataset(cls, dataset_id: str, retrieval_plan: RetrievalPlan | None = None) -> Dataset | None:
+        if retrieval_plan:
+            return retrieval_plan.get_dataset(dataset_id)
         with Session(db.engine) as session:
             return session.query(Dataset).where(Dataset.id == dataset_id).first()
 
@@ -196,18 +203,21 @@ class RetrievalService:
         all_documents: list,
         exceptions: list,
         document_ids_filter: list[str] | None = None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
+        retrieval_plan = retrieval_plan or RetrievalPlan()
         with flask_app.app_context():
             try:
-                dataset = cls._get_dataset(dataset_id)
+                dataset = cls._get_dataset(dataset_id, retrieval_plan)
                 if not dataset:
                     raise ValueError("dataset not found")
 
                 keyword = Keyword(dataset=dataset)
 
-                documents = keyword.search(
-                    cls.escape_query_for_search(query), top_k=top_k, document_ids_filter=document_ids_filter
-                )
+                with retrieval_plan.stage("keyword_search"):
+                    documents = keyword.search(
+                        cls.escape_query_for_search(query), top_k=top_k, document_ids_filter=document_ids_filter
+                    )
                 all_documents.extend(documents)
             except Exception as e:
                 exceptions.append(str(e))
@@ -226,38 +236,45 @@ class RetrievalService:
         exceptions: list,
         document_ids_filter: list[str] | None = None,
         query_type: QueryType = QueryType.TEXT_QUERY,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
+        retrieval_plan = retrieval_plan or RetrievalPlan()
         with flask_app.app_context():
             try:
-                dataset = cls._get_dataset(dataset_id)
+                dataset = cls._get_dataset(dataset_id, retrieval_plan)
                 if not dataset:
                     raise ValueError("dataset not found")
 
                 vector = Vector(dataset=dataset)
                 documents = []
                 if query_type == QueryType.TEXT_QUERY:
-                    documents.extend(
-                        vector.search_by_vector(
-                            query,
-                            search_type="similarity_score_threshold",
-                            top_k=top_k,
-                            score_threshold=score_threshold,
-                            filter={"group_id": [dataset.id]},
-                            document_ids_filter=document_ids_filter,
+                    # Datasets sharing an embedding model share the query embedding of the request
+                    query_vector = retrieval_plan.embed_query(dataset, query, lambda: vector.embed_query(query))
+                    with retrieval_plan.stage("vector_search"):
+                        documents.extend(
+                            vector.search_by_vector(
+                                query,
+                                query_vector=query_vector,
+                                search_type="similarity_score_threshold",
+                                top_k=top_k,
+                                score_threshold=score_threshold,
+                                filter={"group_id": [dataset.id]},
+                                document_ids_filter=document_ids_filter,
+                            )
                         )
-                    )
                 if query_type == QueryType.IMAGE_QUERY:
                     if not dataset.is_multimodal:
                         return
-                    documents.extend(
-                        vector.search_by_file(
-                            file_id=query,
-                            top_k=top_k,
-                            score_threshold=score_threshold,
-                            filter={"group_id": [dataset.id]},
-                            document_ids_filter=document_ids_filter,
+                    with retrieval_plan.stage("vector_search"):
+                        documents.extend(
+                            vector.search_by_file(
+                                file_id=query,
+                                top_k=top_k,
+                                score_threshold=score_threshold,
+                                filter={"group_id": [dataset.id]},
+                                document_ids_filter=document_ids_filter,
+                            )
                         )
-                    )
 
                 if documents:
                     if (
@@ -318,18 +335,21 @@ class RetrievalService:
         retrieval_method: str,
         exceptions: list,
         document_ids_filter: list[str] | None = None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
+        retrieval_plan = retrieval_plan or RetrievalPlan()
         with flask_app.app_context():
             try:
-                dataset = cls._get_dataset(dataset_id)
+                dataset = cls._get_dataset(dataset_id, retrieval_plan)
                 if not dataset:
                     raise ValueError("dataset not found")
 
                 vector_processor = Vector(dataset=dataset)
 
-                documents = vector_processor.search_by_full_text(
-                    cls.escape_query_for_search(query), top_k=top_k, document_ids_filter=document_ids_filter
-                )
+                with retrieval_plan.stage("full_text_search"):
+                    documents = vector_processor.search_by_full_text(
+                        cls.escape_query_for_search(query), top_k=top_k, document_ids_filter=document_ids_filter
+                    )
                 if documents:
                     if (
                         reranking_model
@@ -590,9 +610,11 @@ class RetrievalService:
         weights: dict | None = None,
         document_ids_filter: list[str] | None = None,
         attachment_id: str | None = None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
         if not query and not attachment_id:
             return
+        retrieval_plan = retrieval_plan or RetrievalPlan()
         with flask_app.app_context():
             all_documents_item: list[Document] = []
             # Optimize multithreading with thread pools
@@ -609,6 +631,7 @@ class RetrievalService:
                             all_documents=all_documents_item,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
+                            retrieval_plan=retrieval_plan,
                         )
                     )
                 if RetrievalMethod.is_support_semantic_search(retrieval_method):
@@ -627,6 +650,7 @@ class RetrievalService:
                                 exceptions=exceptions,
                                 document_ids_filter=document_ids_filter,
                                 query_type=QueryType.TEXT_QUERY,
+                                retrieval_plan=retrieval_plan,
                             )
                         )
                     if attachment_id:
@@ -644,6 +668,7 @@ class RetrievalService:
                                 exceptions=exceptions,
                                 document_ids_filter=document_ids_filter,
                                 query_type=QueryType.IMAGE_QUERY,
+                                retrieval_plan=retrieval_plan,
                             )
                         )
                 if RetrievalMethod.is_support_fulltext_search(retrieval_method) and query:
@@ -660,6 +685,7 @@ class RetrievalService:
                             retrieval_method=retrieval_method,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
+                            retrieval_plan=retrieval_plan,
                         )
                     )
                 concurrent.futures.wait(futures, timeout=300, return_when=concurrent.futures.ALL_COMPLETED)
@@ -679,13 +705,14 @@ class RetrievalService:
                 query = query or attachment_id
                 if not query:
                     return
-                all_documents_item = data_post_processor.invoke(
-                    query=query,
-                    documents=all_documents_item,
-                    score_threshold=score_threshold,
-                    top_n=top_k,
-                    query_type=QueryType.TEXT_QUERY if query else QueryType.IMAGE_QUERY,
-                )
+                with retrieval_plan.stage("rerank"):
+                    all_documents_item = data_post_processor.invoke(
+                        query=query,
+                        documents=all_documents_item,
+                        score_threshold=score_threshold,
+                        top_n=top_k,
+                        query_type=QueryType.TEXT_QUERY if query else QueryType.IMAGE_QUERY,
+                    )
 
             all_documents.extend(all_documents_item)
 
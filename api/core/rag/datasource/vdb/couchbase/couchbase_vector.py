@@ -17,7 +17,7 @@ from flask import current_app
 from pydantic import BaseModel, model_validator
 
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -55,18 +55,24 @@ class CouchbaseVector(BaseVector):
         super().__init__(collection_name)
         self._client_config = config
 
+        self._cluster, self._bucket = vector_client_registry.get(
+            VectorType.COUCHBASE, config, lambda: self._connect(config)
+        )
+        self._scope = self._bucket.scope(config.scope_name)
+        self._bucket_name = config.bucket_name
+        self._scope_name = config.scope_name
+
+    def _connect(self, config: CouchbaseConfig) -> tuple[Cluster, Any]:
         """Connect to couchbase"""
 
         auth = PasswordAuthenticator(config.user, config.password)
         options = ClusterOptions(auth)
-        self._cluster = Cluster(config.connection_string, options)
-        self._bucket = self._cluster.bucket(config.bucket_name)
-        self._scope = self._bucket.scope(config.scope_name)
-        self._bucket_name = config.bucket_name
-        self._scope_name = config.scope_name
+        cluster = Cluster(config.connection_string, options)
+        bucket = cluster.bucket(config.bucket_name)
 
         # Wait until the cluster is ready for use.
-        self._cluster.wait_until_ready(timedelta(seconds=5))
+        cluster.wait_until_ready(timedelta(seconds=5))
+        return cluster, bucket
 
     def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
         index_id = str(uuid.uuid4()).replace("-", "")
@@ -12,7 +12,7 @@ from pydantic import BaseModel, model_validator
 
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -73,11 +73,19 @@ class ElasticSearchConfig(BaseModel):
 class ElasticSearchVector(BaseVector):
     def __init__(self, index_name: str, config: ElasticSearchConfig, attributes: list):
         super().__init__(index_name.lower())
-        self._client = self._init_client(config)
-        self._version = self._get_version()
+        self._client, self._version = vector_client_registry.get(
+            VectorType.ELASTICSEARCH, config, lambda: self._connect(config)
+        )
         self._check_version()
         self._attributes = attributes
 
+    def _connect(self, config: ElasticSearchConfig) -> tuple[Elasticsearch, str]:
+        """
+        Create the client and read the server version, they are shared through `vector_client_registry`.
+        """
+        self._client = self._init_client(config)
+        return self._client, self._get_version()
+
     def _init_client(self, config: ElasticSearchConfig) -> Elasticsearch:
         """
         Initialize Elasticsearch client for both regular Elasticsearch and Elastic Cloud.
@@ -9,7 +9,7 @@ from pydantic import BaseModel, model_validator
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -55,7 +55,9 @@ class HuaweiCloudVectorConfig(BaseModel):
 class HuaweiCloudVector(BaseVector):
     def __init__(self, index_name: str, config: HuaweiCloudVectorConfig):
         super().__init__(index_name.lower())
-        self._client = Elasticsearch(**config.to_elasticsearch_params())
+        self._client = vector_client_registry.get(
+            VectorType.HUAWEI_CLOUD, config, lambda: Elasticsearch(**config.to_elasticsearch_params())
+        )
 
     def get_type(self) -> str:
         return VectorType.HUAWEI_CLOUD
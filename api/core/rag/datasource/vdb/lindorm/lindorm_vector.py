@@ -11,7 +11,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -66,7 +66,9 @@ class LindormVectorStore(BaseVector):
             self._routing = routing_value.lower()
         super().__init__(collection_name.lower())
         self._client_config = config
-        self._client = OpenSearch(**config.to_opensearch_params())
+        self._client = vector_client_registry.get(
+            VectorType.LINDORM, config, lambda: OpenSearch(**config.to_opensearch_params())
+        )
         self._using_ugc = using_ugc
         self.kwargs = kwargs
 
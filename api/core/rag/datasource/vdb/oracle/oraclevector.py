@@ -13,7 +13,7 @@ from pydantic import BaseModel, model_validator
 
 from configs import dify_config
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -71,7 +71,7 @@ INDEXTYPE IS CTXSYS.CONTEXT PARAMETERS
 class OracleVector(BaseVector):
     def __init__(self, collection_name: str, config: OracleVectorConfig):
         super().__init__(collection_name)
-        self.pool = self._create_connection_pool(config)
+        self.pool = vector_client_registry.get(VectorType.ORACLE, config, lambda: self._create_connection_pool(config))
         self.table_name = f"embedding_{collection_name}"
         self.config = config
 
@@ -112,19 +112,8 @@ class OracleVector(BaseVector):
             )
 
     def _get_connection(self) -> Connection:
-        if self.config.is_autonomous:
-            connection = oracledb.connect(
-                user=self.config.user,
-                password=self.config.password,
-                dsn=self.config.dsn,
-                config_dir=self.config.config_dir,
-                wallet_location=self.config.wallet_location,
-                wallet_password=self.config.wallet_password,
-            )
-            return connection
-        else:
-            connection = oracledb.connect(user=self.config.user, password=self.config.password, dsn=self.config.dsn)
-            return connection
+        # Closing a pooled connection returns it to the pool
+        return self.pool.acquire()
 
     def _create_connection_pool(self, config: OracleVectorConfig):
         pool_params = {
@@ -134,6 +123,9 @@ class OracleVector(BaseVector):
             "min": 1,
             "max": 5,
             "increment": 1,
+            # The pool is shared, wait for a free connection instead of opening one per caller
+            "getmode": oracledb.POOL_GETMODE_TIMEDWAIT,
+            "wait_timeout": int(dify_config.VECTOR_STORE_POOL_WAIT_TIMEOUT * 1000),
         }
         if config.is_autonomous:
             pool_params.update(
@@ -205,7 +197,6 @@ class OracleVector(BaseVector):
                 docs = []
                 for record in cur:
                     docs.append(Document(page_content=record[1], metadata=record[0]))
-            self.pool.release(connection=conn)
             conn.close()
         return docs
 
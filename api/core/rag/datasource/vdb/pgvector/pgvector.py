@@ -1,6 +1,8 @@
 import hashlib
 import json
 import logging
+import threading
+import time
 import uuid
 from contextlib import contextmanager
 from typing import Any
@@ -12,7 +14,7 @@ from pydantic import BaseModel, model_validator
 
 from configs import dify_config
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -74,10 +76,72 @@ USING gin (text gin_bigm_ops);
 """
 
 
+class BlockingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    Thread-safe connection pool that waits for a free connection instead of failing when all are in use.
+
+    Pools are shared by all `Vector` instances of a connection config, see `vector_client_registry`, so concurrent
+    retrievals may briefly need more connections than `maxconn`. `getconn` raises `PoolError` only after waiting
+    for `VECTOR_STORE_POOL_WAIT_TIMEOUT` seconds.
+
+    Connections are validated when handed out, since a long-lived pool outlives server restarts and idle timeouts.
+    Closed connections are replaced, and connections idle for more than `_ping_after_idle` seconds are replaced
+    if a `SELECT 1` fails on them.
+    """
+
+    _ping_after_idle = 30.0
+
+    def __init__(self, minconn: int, maxconn: int, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._available = threading.BoundedSemaphore(maxconn)
+        self._wait_timeout = dify_config.VECTOR_STORE_POOL_WAIT_TIMEOUT
+        self._idle_since: dict[int, float] = {}
+
+    def getconn(self, key=None):
+        if not self._available.acquire(timeout=self._wait_timeout):
+            raise psycopg2.pool.PoolError(f"no connection available within {self._wait_timeout} seconds")
+        try:
+            while True:
+                conn = super().getconn(key)
+                if self._is_usable(conn):
+                    return conn
+                # Discard the stale connection, the next one is another idle connection or a new one
+                super().putconn(conn, key, close=True)
+        except Exception:
+            self._available.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+            # Connections beyond `minconn` are closed by the pool instead of kept
+            if conn is not None and not conn.closed:
+                self._idle_since[id(conn)] = time.monotonic()
+        finally:
+            self._available.release()
+
+    def _is_usable(self, conn) -> bool:
+        idle_since = self._idle_since.pop(id(conn), None)
+        if conn.closed:
+            return False
+        if idle_since is None or time.monotonic() - idle_since < self._ping_after_idle:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            logger.info("Discarding a stale vector store connection", exc_info=True)
+            return False
+
+
 class PGVector(BaseVector):
     def __init__(self, collection_name: str, config: PGVectorConfig):
         super().__init__(collection_name)
-        self.pool = self._create_connection_pool(config)
+        self.pool = vector_client_registry.get(
+            VectorType.PGVECTOR, config, lambda: self._create_connection_pool(config)
+        )
         self.table_name = f"embedding_{collection_name}"
         self.index_hash = hashlib.md5(self.table_name.encode()).hexdigest()[:8]
         self.pg_bigm = config.pg_bigm
@@ -86,7 +150,7 @@ class PGVector(BaseVector):
         return VectorType.PGVECTOR
 
     def _create_connection_pool(self, config: PGVectorConfig):
-        return psycopg2.pool.SimpleConnectionPool(
+        return BlockingConnectionPool(
             config.min_connection,
             config.max_connection,
             host=config.host,
@@ -104,8 +168,12 @@ class PGVector(BaseVector):
             yield cur
         finally:
             cur.close()
-            conn.commit()
-            self.pool.putconn(conn)
+            try:
+                if not conn.closed:
+                    conn.commit()
+            finally:
+                # Always return the connection, the pool is shared, and discard it if it broke
+                self.pool.putconn(conn, close=bool(conn.closed))
 
     def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
         dimension = len(embeddings[0])
@@ -4,12 +4,12 @@ from contextlib import contextmanager
 from typing import Any
 
 import psycopg2.extras
-import psycopg2.pool
 from pydantic import BaseModel, model_validator
 
 from configs import dify_config
+from core.rag.datasource.vdb.pgvector.pgvector import BlockingConnectionPool
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -66,14 +66,16 @@ USING hnsw (embedding floatvector_cosine_ops) WITH (m = 16, ef_construction = 64
 class VastbaseVector(BaseVector):
     def __init__(self, collection_name: str, config: VastbaseVectorConfig):
         super().__init__(collection_name)
-        self.pool = self._create_connection_pool(config)
+        self.pool = vector_client_registry.get(
+            VectorType.VASTBASE, config, lambda: self._create_connection_pool(config)
+        )
         self.table_name = f"embedding_{collection_name}"
 
     def get_type(self) -> str:
         return VectorType.VASTBASE
 
     def _create_connection_pool(self, config: VastbaseVectorConfig):
-        return psycopg2.pool.SimpleConnectionPool(
+        return BlockingConnectionPool(
             config.min_connection,
             config.max_connection,
             host=config.host,
@@ -91,8 +93,12 @@ class VastbaseVector(BaseVector):
             yield cur
         finally:
             cur.close()
-            conn.commit()
-            self.pool.putconn(conn)
+            try:
+                if not conn.closed:
+                    conn.commit()
+            finally:
+                # Always return the connection, the pool is shared, and discard it if it broke
+                self.pool.putconn(conn, close=bool(conn.closed))
 
     def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
         dimension = len(embeddings[0])
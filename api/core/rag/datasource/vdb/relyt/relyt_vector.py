@@ -9,7 +9,7 @@ from sqlalchemy import text as sql_text
 from sqlalchemy.dialects.postgresql import JSON, TEXT
 from sqlalchemy.orm import Session
 
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from models.dataset import Dataset
@@ -60,7 +60,10 @@ class RelytVector(BaseVector):
         self._url = (
             f"postgresql+psycopg2://{config.user}:{config.password}@{config.host}:{config.port}/{config.database}"
         )
-        self.client = create_engine(self._url)
+        # Engines are shared, ping pooled connections since they outlive server restarts
+        self.client = vector_client_registry.get(
+            VectorType.RELYT, config, lambda: create_engine(self._url, pool_pre_ping=True)
+        )
         self._fields: list[str] = []
         self._group_id = group_id
 
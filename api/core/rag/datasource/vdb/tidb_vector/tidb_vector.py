@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session, declarative_base
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
-from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory, vector_client_registry
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
 from core.rag.models.document import Document
@@ -78,7 +78,10 @@ class TiDBVector(BaseVector):
             f"ssl_verify_cert=true&ssl_verify_identity=true&program_name={config.program_name}"
         )
         self._distance_func = distance_func.lower()
-        self._engine = create_engine(self._url)
+        # Engines are shared, ping pooled connections since they outlive server restarts
+        self._engine = vector_client_registry.get(
+            VectorType.TIDB_VECTOR, config, lambda: create_engine(self._url, pool_pre_ping=True)
+        )
         self._orm_base = declarative_base()
         self._dimension = 1536
 
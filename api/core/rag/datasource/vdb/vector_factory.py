@@ -1,9 +1,14 @@
 import base64
+import hashlib
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
 
+from pydantic import BaseModel
 from sqlalchemy import select
 
 from configs import dify_config
@@ -35,6 +40,94 @@ class AbstractVectorFactory(ABC):
         return index_struct_dict
 
 
+_T = TypeVar("_T")
+
+
+class _RegistryEntry:
+    def __init__(self, client: Any):
+        self.client = client
+        self.last_used_at = time.monotonic()
+
+
+class VectorClientRegistry:
+    """
+    Process-wide registry of vector store clients and connection pools, keyed by backend and connection config.
+
+    Backends look up their client here instead of creating one for every `Vector` instance, so retrievals reuse
+    open connections across requests and threads. Registered clients must be safe to share between threads.
+
+    At most `max_size` clients are kept, the least recently used one is dropped first, and clients not looked up
+    for `idle_timeout` seconds are dropped. Dropped clients are not closed, since `Vector` instances created
+    earlier may still use them, their connections are closed once the last of them is garbage collected.
+    """
+
+    def __init__(self, max_size: int, idle_timeout: float):
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._entries: OrderedDict[tuple[str, str], _RegistryEntry] = OrderedDict()
+        self._creation_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, vector_type: str, config: BaseModel, factory: Callable[[], _T]) -> _T:
+        """
+        Return the shared client of a connection config, creating it with `factory` on first use.
+
+        :param vector_type: vector store type
+        :param config: connection config of the client, hashed to key the registry
+        :param factory: creates the client
+        """
+        if self._max_size <= 0:
+            return factory()
+
+        key = (vector_type, hashlib.sha256(config.model_dump_json().encode()).hexdigest())
+        with self._lock:
+            client = self._lookup(key)
+            if client is not None:
+                return client
+            creation_lock = self._creation_locks.setdefault(key, threading.Lock())
+
+        # Create clients outside the registry lock, connecting may take a while
+        with creation_lock:
+            with self._lock:
+                client = self._lookup(key)
+            if client is not None:
+                return client
+
+            client = factory()
+            with self._lock:
+                self._entries[key] = _RegistryEntry(client)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                self._creation_locks.pop(key, None)
+            return client
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: tuple[str, str]) -> Any:
+        """Return the client of a key and mark it used, after dropping idle clients. Requires the lock."""
+        now = time.monotonic()
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if now - oldest.last_used_at <= self._idle_timeout:
+                break
+            del self._entries[oldest_key]
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.last_used_at = now
+        self._entries.move_to_end(key)
+        return entry.client
+
+
+vector_client_registry = VectorClientRegistry(
+    max_size=dify_config.VECTOR_STORE_CLIENT_REGISTRY_MAX_SIZE,
+    idle_timeout=dify_config.VECTOR_STORE_CLIENT_IDLE_TIMEOUT,
+)
+
+
 class Vector:
     def __init__(self, dataset: Dataset, attributes: list | None = None):
         if attributes is None:
@@ -268,8 +361,12 @@ class Vector:
     def delete_by_metadata_field(self, key: str, value: str):
         self._vector_processor.delete_by_metadata_field(key, value)
 
-    def search_by_vector(self, query: str, **kwargs: Any) -> list[Document]:
-        query_vector = self._embeddings.embed_query(query)
+    def embed_query(self, query: str) -> list[float]:
+        return self._embeddings.embed_query(query)
+
+    def search_by_vector(self, query: str, query_vector: list[float] | None = None, **kwargs: Any) -> list[Document]:
+        if query_vector is None:
+            query_vector = self.embed_query(query)
         return self._vector_processor.search_by_vector(query_vector, **kwargs)
 
     def search_by_file(self, file_id: str, **kwargs: Any) -> list[Document]:
@@ -1,9 +1,15 @@
 import base64
 import logging
-import pickle
+import threading
+from collections.abc import Iterable, Mapping
 from typing import Any, cast
 
 import numpy as np
+import numpy.typing as npt
+from cachetools import LRUCache
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from configs import dify_config
@@ -12,6 +18,7 @@ from core.model_manager import ModelInstance
 from core.model_runtime.entities.model_entities import ModelPropertyKey
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.rag.embedding.embedding_base import Embeddings
+from core.rag.embedding.embedding_codec import EmbeddingDType, decode_embedding, encode_embedding, is_compact_embedding
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
 from libs import helper
@@ -19,28 +26,129 @@ from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
+# In-process tier in front of the `embeddings` table, keyed by (provider, model, hash).
+# Vectors are kept as float32 arrays, which are several times smaller than lists of Python floats.
+_document_embedding_cache: LRUCache[tuple[str, str, str], npt.NDArray[np.float32]] | None = (
+    LRUCache(maxsize=dify_config.EMBEDDING_CACHE_LRU_SIZE) if dify_config.EMBEDDING_CACHE_LRU_SIZE > 0 else None
+)
+_document_embedding_cache_lock = threading.Lock()
+
+
+def clear_document_embedding_cache():
+    """Drop every entry of the in-process document embedding cache."""
+    if _document_embedding_cache is None:
+        return
+    with _document_embedding_cache_lock:
+        _document_embedding_cache.clear()
+
+
+def _decode_query_embedding(data: bytes | str) -> npt.NDArray[np.float32] | npt.NDArray[np.float64]:
+    if isinstance(data, bytes) and is_compact_embedding(data):
+        return decode_embedding(data)
+    # Entries written before the compact format are base64 encoded float64 bytes.
+    return np.frombuffer(base64.b64decode(data), dtype=np.float64)
+
 
 class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: str | None = None):
         self._model_instance = model_instance
         self._user = user
 
+    def _get_cached_embeddings(self, hashes: Iterable[str]) -> dict[str, list[float]]:
+        """
+        Resolve cached document embeddings for the given hashes.
+
+        Hashes are looked up in the in-process LRU first, the remaining ones are fetched from the `embeddings`
+        table with one `IN` query per batch of `EMBEDDING_CACHE_BATCH_SIZE` hashes.
+        """
+        provider = self._model_instance.provider
+        model = self._model_instance.model
+        cached_embeddings: dict[str, list[float]] = {}
+        missing_hashes: list[str] = []
+        with _document_embedding_cache_lock:
+            for hash in dict.fromkeys(hashes):
+                vector = (
+                    _document_embedding_cache.get((provider, model, hash))
+                    if _document_embedding_cache is not None
+                    else None
+                )
+                if vector is not None:
+                    cached_embeddings[hash] = vector.tolist()
+                else:
+                    missing_hashes.append(hash)
+
+        batch_size = dify_config.EMBEDDING_CACHE_BATCH_SIZE
+        for i in range(0, len(missing_hashes), batch_size):
+            stmt = select(Embedding).where(
+                Embedding.model_name == model,
+                Embedding.provider_name == provider,
+                Embedding.hash.in_(missing_hashes[i : i + batch_size]),
+            )
+            for embedding in db.session.scalars(stmt):
+                vector = embedding.get_embedding_array()
+                cached_embeddings[embedding.hash] = vector.tolist()
+                self._remember_embedding(embedding.hash, vector)
+
+        return cached_embeddings
+
+    def _store_embeddings(self, embeddings: Mapping[str, list[float]]):
+        """
+        Persist newly computed document embeddings with batched `INSERT ... ON CONFLICT DO NOTHING` statements.
+
+        Rows already inserted by a concurrent indexing task are skipped by the database instead of failing the
+        whole batch.
+        """
+        if not embeddings:
+            return
+        rows = []
+        for hash, vector in embeddings.items():
+            embedding_cache = Embedding(
+                model_name=self._model_instance.model,
+                hash=hash,
+                provider_name=self._model_instance.provider,
+                embedding=b"",
+            )
+            embedding_cache.set_embedding(vector)
+            rows.append(
+                {
+                    "id": embedding_cache.id,
+                    "model_name": embedding_cache.model_name,
+                    "hash": embedding_cache.hash,
+                    "provider_name": embedding_cache.provider_name,
+                    "embedding": embedding_cache.embedding,
+                }
+            )
+            self._remember_embedding(hash, vector)
+
+        batch_size = dify_config.EMBEDDING_CACHE_BATCH_SIZE
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i : i + batch_size]
+            if dify_config.SQLALCHEMY_DATABASE_URI_SCHEME == "postgresql":
+                stmt = pg_insert(Embedding).values(batch)
+                stmt = stmt.on_conflict_do_nothing(index_elements=["model_name", "hash", "provider_name"])
+            else:
+                stmt = mysql_insert(Embedding).values(batch).prefix_with("IGNORE")  # type: ignore[assignment]
+            db.session.execute(stmt)
+        db.session.commit()
+
+    def _remember_embedding(self, hash: str, vector: list[float] | npt.NDArray[np.float32]):
+        if _document_embedding_cache is None:
+            return
+        with _document_embedding_cache_lock:
+            _document_embedding_cache[(self._model_instance.provider, self._model_instance.model, hash)] = np.asarray(
+                vector, dtype=np.float32
+            )
+
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed search docs in batches of 10."""
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
         embedding_queue_indices = []
-        for i, text in enumerate(texts):
-            hash = helper.generate_text_hash(text)
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=hash, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                text_embeddings[i] = embedding.get_embedding()
+        text_hashes = [helper.generate_text_hash(text) for text in texts]
+        cached_embeddings = self._get_cached_embeddings(text_hashes)
+        for i, hash in enumerate(text_hashes):
+            if hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[hash]
             else:
                 embedding_queue_indices.append(i)
 
@@ -80,21 +188,12 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
+                new_embeddings: dict[str, list[float]] = {}
+                for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                    text_embeddings[i] = n_embedding
+                    new_embeddings.setdefault(text_hashes[i], n_embedding)
                 try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
-                        text_embeddings[i] = n_embedding
-                        hash = helper.generate_text_hash(texts[i])
-                        if hash not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=hash,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(hash)
-                    db.session.commit()
+                    self._store_embeddings(new_embeddings)
                 except IntegrityError:
                     db.session.rollback()
             except Exception as ex:
@@ -109,17 +208,11 @@ class CacheEmbedding(Embeddings):
         # use doc embedding cache or store if not exists
         multimodel_embeddings: list[Any] = [None for _ in range(len(multimodel_documents))]
         embedding_queue_indices = []
-        for i, multimodel_document in enumerate(multimodel_documents):
-            file_id = multimodel_document["file_id"]
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=file_id, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                multimodel_embeddings[i] = embedding.get_embedding()
+        file_ids = [multimodel_document["file_id"] for multimodel_document in multimodel_documents]
+        cached_embeddings = self._get_cached_embeddings(file_ids)
+        for i, file_id in enumerate(file_ids):
+            if file_id in cached_embeddings:
+                multimodel_embeddings[i] = cached_embeddings[file_id]
             else:
                 embedding_queue_indices.append(i)
 
@@ -161,22 +254,12 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
+                new_embeddings: dict[str, list[float]] = {}
+                for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                    multimodel_embeddings[i] = n_embedding
+                    new_embeddings.setdefault(file_ids[i], n_embedding)
                 try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
-                        multimodel_embeddings[i] = n_embedding
-                        file_id = multimodel_documents[i]["file_id"]
-                        if file_id not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=file_id,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            embedding_cache.set_embedding(n_embedding)
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(file_id)
-                    db.session.commit()
+                    self._store_embeddings(new_embeddings)
                 except IntegrityError:
                     db.session.rollback()
             except Exception as ex:
@@ -194,8 +277,7 @@ class CacheEmbedding(Embeddings):
         embedding = redis_client.get(embedding_cache_key)
         if embedding:
             redis_client.expire(embedding_cache_key, 600)
-            decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
-            return [float(x) for x in decoded_embedding]
+            return _decode_query_embedding(embedding).tolist()
         try:
             embedding_result = self._model_instance.invoke_text_embedding(
                 texts=[text], user=self._user, input_type=EmbeddingInputType.QUERY
@@ -212,14 +294,11 @@ class CacheEmbedding(Embeddings):
             raise ex
 
         try:
-            # encode embedding to base64
-            embedding_vector = np.array(embedding_results)
-            vector_bytes = embedding_vector.tobytes()
-            # Transform to Base64
-            encoded_vector = base64.b64encode(vector_bytes)
-            # Transform to string
-            encoded_str = encoded_vector.decode("utf-8")
-            redis_client.setex(embedding_cache_key, 600, encoded_str)
+            redis_client.setex(
+                embedding_cache_key,
+                600,
+                encode_embedding(embedding_results, EmbeddingDType(dify_config.EMBEDDING_CACHE_STORAGE_DTYPE)),
+            )
         except Exception as ex:
             if dify_config.DEBUG:
                 logger.exception(
@@ -237,8 +316,7 @@ class CacheEmbedding(Embeddings):
         embedding = redis_client.get(embedding_cache_key)
         if embedding:
             redis_client.expire(embedding_cache_key, 600)
-            decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
-            return [float(x) for x in decoded_embedding]
+            return _decode_query_embedding(embedding).tolist()
         try:
             embedding_result = self._model_instance.invoke_multimodal_embedding(
                 multimodel_documents=[multimodel_document], user=self._user, input_type=EmbeddingInputType.QUERY
@@ -255,14 +333,11 @@ class CacheEmbedding(Embeddings):
             raise ex
 
         try:
-            # encode embedding to base64
-            embedding_vector = np.array(embedding_results)
-            vector_bytes = embedding_vector.tobytes()
-            # Transform to Base64
-            encoded_vector = base64.b64encode(vector_bytes)
-            # Transform to string
-            encoded_str = encoded_vector.decode("utf-8")
-            redis_client.setex(embedding_cache_key, 600, encoded_str)
+            redis_client.setex(
+                embedding_cache_key,
+                600,
+                encode_embedding(embedding_results, EmbeddingDType(dify_config.EMBEDDING_CACHE_STORAGE_DTYPE)),
+            )
         except Exception as ex:
             if dify_config.DEBUG:
                 logger.exception(
@@ -0,0 +1,83 @@
+"""
+Compact binary encoding for cached embedding vectors.
+
+Layout (little endian)::
+
+    magic (4 bytes) | version (1 byte) | dtype (1 byte) | reserved (2 bytes) | dimension (uint32) | raw values
+
+Rows written before this format existed hold `pickle.dumps(list[float])`. They are still decoded transparently,
+so existing rows can be converted lazily with the `convert-embedding-cache` command.
+"""
+
+import pickle
+import struct
+from collections.abc import Sequence
+from enum import StrEnum
+
+import numpy as np
+import numpy.typing as npt
+
+EMBEDDING_MAGIC = b"DEMB"
+EMBEDDING_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBxxI")
+
+
+class EmbeddingDType(StrEnum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+
+
+_DTYPE_CODES: dict[EmbeddingDType, int] = {
+    EmbeddingDType.FLOAT32: 1,
+    EmbeddingDType.FLOAT16: 2,
+}
+_NUMPY_DTYPES: dict[int, np.dtype] = {
+    1: np.dtype("<f4"),
+    2: np.dtype("<f2"),
+}
+
+
+class EmbeddingDecodeError(ValueError):
+    pass
+
+
+def encode_embedding(
+    vector: Sequence[float] | npt.NDArray[np.floating], dtype: EmbeddingDType = EmbeddingDType.FLOAT32
+) -> bytes:
+    """Encode a vector into the compact binary format."""
+    dtype_code = _DTYPE_CODES[dtype]
+    array = np.asarray(vector, dtype=_NUMPY_DTYPES[dtype_code])
+    if array.ndim != 1:
+        raise ValueError(f"Embedding must be one-dimensional, got shape {array.shape}")
+    return _HEADER.pack(EMBEDDING_MAGIC, EMBEDDING_FORMAT_VERSION, dtype_code, array.shape[0]) + array.tobytes()
+
+
+def is_compact_embedding(data: bytes) -> bool:
+    """Return whether `data` was produced by `encode_embedding`."""
+    return len(data) >= _HEADER.size and data[: len(EMBEDDING_MAGIC)] == EMBEDDING_MAGIC
+
+
+def decode_embedding(data: bytes) -> npt.NDArray[np.float32]:
+    """
+    Decode an embedding into a float32 array.
+
+    Both the compact format and legacy pickled lists are accepted. The returned array is read-only when it is a
+    view over `data`; copy it before mutating.
+    """
+    if not is_compact_embedding(data):
+        return np.asarray(pickle.loads(data), dtype=np.float32)  # noqa: S301
+
+    _, version, dtype_code, dimension = _HEADER.unpack_from(data)
+    if version != EMBEDDING_FORMAT_VERSION:
+        raise EmbeddingDecodeError(f"Unsupported embedding format version: {version}")
+    numpy_dtype = _NUMPY_DTYPES.get(dtype_code)
+    if numpy_dtype is None:
+        raise EmbeddingDecodeError(f"Unsupported embedding dtype code: {dtype_code}")
+    if len(data) != _HEADER.size + dimension * numpy_dtype.itemsize:
+        raise EmbeddingDecodeError("Embedding payload size does not match its header")
+
+    array = np.frombuffer(data, dtype=numpy_dtype, count=dimension, offset=_HEADER.size)
+    if numpy_dtype != np.float32:
+        array = array.astype(np.float32)
+    return array
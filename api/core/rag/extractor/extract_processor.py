@@ -1,3 +1,5 @@
+import hashlib
+import json
 import re
 import tempfile
 from pathlib import Path
@@ -10,6 +12,7 @@ from core.rag.extractor.csv_extractor import CSVExtractor
 from core.rag.extractor.entity.datasource_type import DatasourceType
 from core.rag.extractor.entity.extract_setting import ExtractSetting
 from core.rag.extractor.excel_extractor import ExcelExtractor
+from core.rag.extractor.extracted_text_cache import extracted_text_cache
 from core.rag.extractor.extractor_base import BaseExtractor
 from core.rag.extractor.firecrawl.firecrawl_web_extractor import FirecrawlWebExtractor
 from core.rag.extractor.html_extractor import HtmlExtractor
@@ -33,6 +36,9 @@ from extensions.ext_storage import storage
 from models.model import UploadFile
 
 SUPPORT_URL_CONTENT_TYPES = ["application/pdf", "text/plain", "application/json"]
+# Placeholder for the path of the extracted file in cached document metadata
+_EXTRACTED_FILE_PATH = "{extracted_file_path}"
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124"
     " Safari/537.36"
@@ -162,7 +168,13 @@ class ExtractProcessor:
                     else:
                         # txt
                         extractor = TextExtractor(file_path, autodetect_encoding=True)
-                return extractor.extract()
+                cache_options = {
+                    "etl_type": etl_type,
+                    "file_extension": file_extension,
+                    "is_automatic": is_automatic,
+                    "tenant_id": extract_setting.upload_file.tenant_id if extract_setting.upload_file else None,
+                }
+                return cls._extract_file(extractor, file_path, cache_options)
         elif extract_setting.datasource_type == DatasourceType.NOTION:
             assert extract_setting.notion_info is not None, "notion_info is required"
             extractor = NotionExtractor(
@@ -207,3 +219,42 @@ class ExtractProcessor:
                 raise ValueError(f"Unsupported website provider: {extract_setting.website_info.provider}")
         else:
             raise ValueError(f"Unsupported datasource type: {extract_setting.datasource_type}")
+
+    @classmethod
+    def _extract_file(cls, extractor: BaseExtractor, file_path: str, cache_options: dict) -> list[Document]:
+        """
+        Extract a file, reusing the documents extracted from a file with the same content before.
+
+        Entries are scoped to the tenant, documents may link to files of the tenant, like the images saved by
+        `WordExtractor`. Documents linking to such images are not cached, they are deleted with the dataset
+        document the file was extracted for.
+        """
+        if not extracted_text_cache.enabled:
+            return extractor.extract()
+
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            while chunk := file.read(1024 * 1024):
+                content_hash.update(chunk)
+        cache_key = json.dumps({"extractor": type(extractor).__name__, **cache_options}, sort_keys=True)
+
+        cached = extracted_text_cache.get(content_hash.hexdigest(), cache_key, source="extract_processor")
+        if cached is not None:
+            documents = [Document.model_validate(document) for document in json.loads(cached)]
+            # Metadata refers to the temporary file the documents were extracted from
+            for document in documents:
+                if document.metadata.get("source") == _EXTRACTED_FILE_PATH:
+                    document.metadata["source"] = file_path
+            return documents
+
+        documents = extractor.extract()
+        if isinstance(extractor, WordExtractor) and any("![image](" in doc.page_content for doc in documents):
+            return documents
+        serialized_documents = []
+        for document in documents:
+            metadata = dict(document.metadata)
+            if metadata.get("source") == file_path:
+                metadata["source"] = _EXTRACTED_FILE_PATH
+            serialized_documents.append({"page_content": document.page_content, "metadata": metadata})
+        extracted_text_cache.set(content_hash.hexdigest(), cache_key, json.dumps(serialized_documents))
+        return documents
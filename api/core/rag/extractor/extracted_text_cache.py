@@ -0,0 +1,175 @@
+import hashlib
+import logging
+import threading
+import time
+
+from opentelemetry.metrics import get_meter
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from extensions.ext_storage import storage
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter("extracted_text_cache", version=dify_config.project.version)
+cache_lookups = _meter.create_counter(
+    "extracted_text.cache.lookups",
+    description="Lookups of extracted text in the content-addressed cache, by cache hit and caller",
+)
+
+
+class ExtractedTextCache:
+    """
+    Text extracted from files, stored through `ext_storage` under the sha256 of the file content.
+
+    Entries are also keyed on the extractor, a file parsed by different extractors or with different options
+    is cached once per extractor. Storage errors are logged and treated as cache misses.
+
+    Texts larger than `max_entry_size` bytes are not cached. Redis keeps the size and the last access time of
+    every entry, `cleanup` deletes the entries not accessed within `retention_days`, then the least recently
+    accessed ones until the cache fits in `max_total_size` bytes.
+    """
+
+    _ACCESS_TIMES_KEY = "extracted_text_cache:access_times"
+    _SIZES_KEY = "extracted_text_cache:sizes"
+    _CLEANUP_BATCH_SIZE = 100
+
+    def __init__(self, enabled: bool, max_entry_size: int, max_total_size: int, retention_days: int):
+        self.enabled = enabled
+        self._max_entry_size = max_entry_size
+        self._max_total_size = max_total_size
+        self._retention_days = retention_days
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _storage_key(content_hash: str, extractor: str) -> str:
+        extractor_hash = hashlib.sha256(extractor.encode()).hexdigest()[:16]
+        return f"extracted_text/{content_hash}/{extractor_hash}.txt"
+
+    def get(self, content_hash: str, extractor: str, source: str) -> str | None:
+        """
+        Return the cached text of a file, None on a miss.
+
+        :param content_hash: sha256 of the file content
+        :param extractor: extractor and options the text was extracted with
+        :param source: caller, reported in the lookup metrics
+        """
+        if not self.enabled:
+            return None
+        key = self._storage_key(content_hash, extractor)
+        text = self._load(key)
+        hit = text is not None
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        cache_lookups.add(1, {"hit": hit, "source": source})
+        if hit:
+            try:
+                redis_client.zadd(self._ACCESS_TIMES_KEY, {key: time.time()})
+            except Exception:
+                logger.warning("Failed to record access of extracted text %s", key, exc_info=True)
+        return text
+
+    def set(self, content_hash: str, extractor: str, text: str):
+        if not self.enabled:
+            return
+        data = text.encode("utf-8")
+        if len(data) > self._max_entry_size:
+            return
+        key = self._storage_key(content_hash, extractor)
+        try:
+            storage.save(key, data)
+            pipeline = redis_client.pipeline()
+            pipeline.zadd(self._ACCESS_TIMES_KEY, {key: time.time()})
+            pipeline.hset(self._SIZES_KEY, key, len(data))
+            pipeline.execute()
+        except Exception:
+            logger.warning("Failed to save extracted text %s", key, exc_info=True)
+
+    def cleanup(self) -> tuple[int, int]:
+        """Delete expired entries, then the least recently accessed ones over the size limit. Returns count, bytes."""
+        deleted_count = 0
+        deleted_size = 0
+
+        # Entries that failed to delete stay in the index, skip them and retry them on the next cleanup
+        failed_count = 0
+        expired_before = time.time() - self._retention_days * 24 * 60 * 60
+        while keys := self._decode(
+            redis_client.zrangebyscore(
+                self._ACCESS_TIMES_KEY, 0, expired_before, failed_count, self._CLEANUP_BATCH_SIZE
+            )
+        ):
+            count, size = self._delete(keys)
+            deleted_count += count
+            deleted_size += size
+            failed_count += len(keys) - count
+
+        failed_count = 0
+        total_size = sum(int(size) for size in redis_client.hvals(self._SIZES_KEY))
+        while total_size > self._max_total_size:
+            keys = self._decode(
+                redis_client.zrange(self._ACCESS_TIMES_KEY, failed_count, failed_count + self._CLEANUP_BATCH_SIZE - 1)
+            )
+            if not keys:
+                break
+            count, size = self._delete(keys)
+            deleted_count += count
+            deleted_size += size
+            total_size -= size
+            failed_count += len(keys) - count
+
+        return deleted_count, deleted_size
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    @staticmethod
+    def _load(key: str) -> str | None:
+        try:
+            if not storage.exists(key):
+                return None
+            return storage.load_once(key).decode("utf-8")
+        except Exception:
+            logger.warning("Failed to load extracted text %s", key, exc_info=True)
+            return None
+
+    def _delete(self, keys: list[str]) -> tuple[int, int]:
+        """
+        Delete entries from storage, and from the index the ones deleted from storage.
+
+        Returns the number and total size of the deleted entries.
+        """
+        sizes = redis_client.hmget(self._SIZES_KEY, keys)
+        deleted_keys = []
+        deleted_size = 0
+        for key, size in zip(keys, sizes):
+            try:
+                storage.delete(key)
+            except Exception:
+                logger.warning("Failed to delete extracted text %s", key, exc_info=True)
+                continue
+            deleted_keys.append(key)
+            deleted_size += int(size) if size is not None else 0
+        if deleted_keys:
+            pipeline = redis_client.pipeline()
+            pipeline.zrem(self._ACCESS_TIMES_KEY, *deleted_keys)
+            pipeline.hdel(self._SIZES_KEY, *deleted_keys)
+            pipeline.execute()
+        return len(deleted_keys), deleted_size
+
+    @staticmethod
+    def _decode(keys: list) -> list[str]:
+        return [key.decode() if isinstance(key, bytes) else key for key in keys]
+
+
+extracted_text_cache = ExtractedTextCache(
+    enabled=dify_config.EXTRACTED_TEXT_CACHE_ENABLED,
+    max_entry_size=dify_config.EXTRACTED_TEXT_CACHE_MAX_ENTRY_SIZE,
+    max_total_size=dify_config.EXTRACTED_TEXT_CACHE_MAX_TOTAL_SIZE,
+    retention_days=dify_config.EXTRACTED_TEXT_CACHE_RETENTION_DAYS,
+)
@@ -0,0 +1,100 @@
+from collections import Counter
+from collections.abc import Collection, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from core.db.session_factory import session_factory
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.models.document import Document
+from models.dataset import DocumentSegment
+
+
+def get_documents_keywords(
+    documents: Sequence[Document], keyword_table_handler: JiebaKeywordTableHandler
+) -> list[set[str]]:
+    """
+    Get the keywords of each document and store them in `document.metadata["keywords"]`.
+
+    Keywords already persisted on the document segment are reused, other documents are tokenized with Jieba.
+    """
+    segment_keywords = _get_segment_keywords(documents)
+    documents_keywords = []
+    for document in documents:
+        if document.metadata is None:
+            documents_keywords.append(set())
+            continue
+        document_keywords = segment_keywords.get((document.metadata.get("doc_id"), document.metadata.get("dataset_id")))
+        if document_keywords is None:
+            document_keywords = keyword_table_handler.extract_keywords(document.page_content, None)
+        document.metadata["keywords"] = document_keywords
+        documents_keywords.append(document_keywords)
+    return documents_keywords
+
+
+def calculate_tfidf_similarities(
+    query_keywords: Collection[str], documents_keywords: Sequence[Collection[str]]
+) -> list[float]:
+    """
+    Calculate the TF-IDF cosine similarity between the query and each document.
+
+    IDF is computed over the given documents only. Query keywords that appear in none of them are ignored.
+    """
+    total_documents = len(documents_keywords)
+    vocabulary: dict[str, int] = {}
+    document_indices: list[int] = []
+    keyword_indices: list[int] = []
+    for document_index, document_keywords in enumerate(documents_keywords):
+        for keyword in document_keywords:
+            document_indices.append(document_index)
+            keyword_indices.append(vocabulary.setdefault(keyword, len(vocabulary)))
+    if not vocabulary:
+        return [0.0] * total_documents
+
+    # sparse document-keyword matrix in coordinate form, one entry per distinct (document, keyword) pair
+    vocabulary_size = len(vocabulary)
+    pairs, tf = np.unique(
+        np.asarray(document_indices, dtype=np.int64) * vocabulary_size + np.asarray(keyword_indices, dtype=np.int64),
+        return_counts=True,
+    )
+    rows, columns = np.divmod(pairs, vocabulary_size)
+
+    document_frequency = np.bincount(columns, minlength=vocabulary_size)
+    idf = np.log((1 + total_documents) / (1 + document_frequency)) + 1
+    values = tf * idf[columns]
+
+    query_tfidf = np.zeros(vocabulary_size)
+    for keyword, count in Counter(query_keywords).items():
+        keyword_index = vocabulary.get(keyword)
+        if keyword_index is not None:
+            query_tfidf[keyword_index] = count * idf[keyword_index]
+
+    numerators = np.bincount(rows, weights=values * query_tfidf[columns], minlength=total_documents)
+    document_norms = np.sqrt(np.bincount(rows, weights=values**2, minlength=total_documents))
+    denominators = document_norms * np.linalg.norm(query_tfidf)
+    similarities = np.divide(numerators, denominators, out=np.zeros(total_documents), where=denominators > 0)
+    return similarities.tolist()
+
+
+def _get_segment_keywords(documents: Sequence[Document]) -> dict[tuple[str, str], set[str]]:
+    node_ids = set()
+    dataset_ids = set()
+    for document in documents:
+        if document.provider != "dify" or not document.metadata:
+            continue
+        if document.metadata.get("doc_id") and document.metadata.get("dataset_id"):
+            node_ids.add(document.metadata["doc_id"])
+            dataset_ids.add(document.metadata["dataset_id"])
+    if not node_ids:
+        return {}
+
+    stmt = select(DocumentSegment.index_node_id, DocumentSegment.dataset_id, DocumentSegment.keywords).where(
+        DocumentSegment.index_node_id.in_(node_ids),
+        DocumentSegment.dataset_id.in_(dataset_ids),
+    )
+    with session_factory.create_session() as session:
+        return {
+            (index_node_id, dataset_id): set(keywords)
+            for index_node_id, dataset_id, keywords in session.execute(stmt)
+            if keywords
+        }
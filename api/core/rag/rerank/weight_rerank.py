@@ -1,6 +1,3 @@
-import math
-from collections import Counter
-
 import numpy as np
 
 from core.model_manager import ModelManager
@@ -11,6 +8,7 @@ from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
 from core.rag.rerank.entity.weight import VectorSetting, Weights
+from core.rag.rerank.keyword_score import calculate_tfidf_similarities, get_documents_keywords
 from core.rag.rerank.rerank_base import BaseRerankRunner
 
 
@@ -84,72 +82,8 @@ class WeightRerankRunner(BaseRerankRunner):
         """
         keyword_table_handler = JiebaKeywordTableHandler()
         query_keywords = keyword_table_handler.extract_keywords(query, None)
-        documents_keywords = []
-        for document in documents:
-            # get the document keywords
-            document_keywords = keyword_table_handler.extract_keywords(document.page_content, None)
-            if document.metadata is not None:
-                document.metadata["keywords"] = document_keywords
-                documents_keywords.append(document_keywords)
-
-        # Counter query keywords(TF)
-        query_keyword_counts = Counter(query_keywords)
-
-        # total documents
-        total_documents = len(documents)
-
-        # calculate all documents' keywords IDF
-        all_keywords = set()
-        for document_keywords in documents_keywords:
-            all_keywords.update(document_keywords)
-
-        keyword_idf = {}
-        for keyword in all_keywords:
-            # calculate include query keywords' documents
-            doc_count_containing_keyword = sum(1 for doc_keywords in documents_keywords if keyword in doc_keywords)
-            # IDF
-            keyword_idf[keyword] = math.log((1 + total_documents) / (1 + doc_count_containing_keyword)) + 1
-
-        query_tfidf = {}
-
-        for keyword, count in query_keyword_counts.items():
-            tf = count
-            idf = keyword_idf.get(keyword, 0)
-            query_tfidf[keyword] = tf * idf
-
-        # calculate all documents' TF-IDF
-        documents_tfidf = []
-        for document_keywords in documents_keywords:
-            document_keyword_counts = Counter(document_keywords)
-            document_tfidf = {}
-            for keyword, count in document_keyword_counts.items():
-                tf = count
-                idf = keyword_idf.get(keyword, 0)
-                document_tfidf[keyword] = tf * idf
-            documents_tfidf.append(document_tfidf)
-
-        def cosine_similarity(vec1, vec2):
-            intersection = set(vec1.keys()) & set(vec2.keys())
-            numerator = sum(vec1[x] * vec2[x] for x in intersection)
-
-            sum1 = sum(vec1[x] ** 2 for x in vec1)
-            sum2 = sum(vec2[x] ** 2 for x in vec2)
-            denominator = math.sqrt(sum1) * math.sqrt(sum2)
-
-            if not denominator:
-                return 0.0
-            else:
-                return float(numerator) / denominator
-
-        similarities = []
-        for document_tfidf in documents_tfidf:
-            similarity = cosine_similarity(query_tfidf, document_tfidf)
-            similarities.append(similarity)
-
-        # for idx, similarity in enumerate(similarities):
-        #     print(f"Document {idx + 1} similarity: {similarity}")
-
-        return similarities
+        documents_keywords = get_documents_keywords(documents, keyword_table_handler)
+        return calculate_tfidf_similarities(query_keywords, documents_keywords)
 
     def _calculate_cosine(
         self, tenant_id: str, query: str, documents: list[Document], vector_setting: VectorSetting
@@ -161,8 +95,6 @@ class WeightRerankRunner(BaseRerankRunner):
 
         :return:
         """
-        query_vector_scores = []
-
         model_manager = ModelManager()
 
         embedding_model = model_manager.get_model_instance(
@@ -173,24 +105,33 @@ class WeightRerankRunner(BaseRerankRunner):
         )
         cache_embedding = CacheEmbedding(embedding_model)
         query_vector = cache_embedding.embed_query(query)
-        for document in documents:
-            # calculate cosine similarity
+
+        query_vector_scores = [0.0] * len(documents)
+        scored_indices = []
+        for i, document in enumerate(documents):
             if document.metadata and "score" in document.metadata:
-                query_vector_scores.append(document.metadata["score"])
+                query_vector_scores[i] = document.metadata["score"]
             else:
-                # transform to NumPy
-                vec1 = np.array(query_vector)
-                vec2 = np.array(document.vector)
-
-                # calculate dot product
-                dot_product = np.dot(vec1, vec2)
-
-                # calculate norm
-                norm_vec1 = np.linalg.norm(vec1)
-                norm_vec2 = np.linalg.norm(vec2)
-
-                # calculate cosine similarity
-                cosine_sim = dot_product / (norm_vec1 * norm_vec2)
-                query_vector_scores.append(cosine_sim)
+                scored_indices.append(i)
+
+        # embed documents that came without a vector in one batch, through the embedding cache
+        missing_vector_indices = [i for i in scored_indices if not documents[i].vector]
+        if missing_vector_indices:
+            vectors = cache_embedding.embed_documents([documents[i].page_content for i in missing_vector_indices])
+            for i, vector in zip(missing_vector_indices, vectors):
+                documents[i].vector = vector
+        scored_indices = [i for i in scored_indices if documents[i].vector]
+        if not scored_indices:
+            return query_vector_scores
+
+        # calculate cosine similarity of all documents at once
+        query_array = np.asarray(query_vector, dtype=np.float64)
+        document_matrix = np.asarray([documents[i].vector for i in scored_indices], dtype=np.float64)
+        norms = np.linalg.norm(document_matrix, axis=1) * np.linalg.norm(query_array)
+        similarities = np.divide(
+            document_matrix @ query_array, norms, out=np.zeros(len(scored_indices)), where=norms > 0
+        )
+        for i, similarity in zip(scored_indices, similarities.tolist()):
+            query_vector_scores[i] = similarity
 
         return query_vector_scores
@@ -1,8 +1,8 @@
 import json
-import math
+import logging
 import re
 import threading
-from collections import Counter, defaultdict
+from collections import defaultdict
 from collections.abc import Generator, Mapping
 from typing import Any, Union, cast
 
@@ -43,8 +43,10 @@ from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.index_type import IndexStructureType, IndexTechniqueType
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
+from core.rag.rerank.keyword_score import calculate_tfidf_similarities, get_documents_keywords
 from core.rag.rerank.rerank_type import RerankMode
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
+from core.rag.retrieval.retrieval_plan import RetrievalPlan
 from core.rag.retrieval.router.multi_dataset_function_call_router import FunctionCallMultiDatasetRouter
 from core.rag.retrieval.router.multi_dataset_react_route import ReactMultiDatasetRouter
 from core.rag.retrieval.template_prompts import (
@@ -65,6 +67,8 @@ from models.dataset import ChildChunk, Dataset, DatasetMetadata, DatasetQuery, D
 from models.dataset import Document as DatasetDocument
 from services.external_knowledge_service import ExternalDatasetService
 
+logger = logging.getLogger(__name__)
+
 default_retrieval_model: dict[str, Any] = {
     "search_method": RetrievalMethod.SEMANTIC_SEARCH,
     "reranking_enable": False,
@@ -515,7 +519,10 @@ class DatasetRetrieval:
                         0
                     ].embedding_model_provider
                     weights["vector_setting"]["embedding_model_name"] = available_datasets[0].embedding_model
+        # Shared by the threads of all datasets, so dataset rows are loaded and the query is embedded only once
+        retrieval_plan = RetrievalPlan()
         with measure_time() as timer:
+            retrieval_plan.load_datasets(dataset_ids)
             if query:
                 query_thread = threading.Thread(
                     target=self._multiple_retrieve_thread,
@@ -534,6 +541,7 @@ class DatasetRetrieval:
                         "score_threshold": score_threshold,
                         "query": query,
                         "attachment_id": None,
+                        "retrieval_plan": retrieval_plan,
                     },
                 )
                 all_threads.append(query_thread)
@@ -557,12 +565,15 @@ class DatasetRetrieval:
                             "score_threshold": score_threshold,
                             "query": None,
                             "attachment_id": attachment_id,
+                            "retrieval_plan": retrieval_plan,
                         },
                     )
                     all_threads.append(attachment_thread)
                     attachment_thread.start()
             for thread in all_threads:
                 thread.join()
+        timer["stages"] = retrieval_plan.get_timings()
+        logger.debug("Retrieval stage timings (ms): %s, %s", timer["stages"], retrieval_plan.get_stats())
         self._on_query(query, attachment_ids, dataset_ids, app_id, user_from, user_id)
 
         if all_documents:
@@ -752,10 +763,14 @@ class DatasetRetrieval:
         document_ids_filter: list[str] | None = None,
         metadata_condition: MetadataCondition | None = None,
         attachment_ids: list[str] | None = None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
         with flask_app.app_context():
-            dataset_stmt = select(Dataset).where(Dataset.id == dataset_id)
-            dataset = db.session.scalar(dataset_stmt)
+            if retrieval_plan:
+                dataset = retrieval_plan.get_dataset(dataset_id)
+            else:
+                dataset_stmt = select(Dataset).where(Dataset.id == dataset_id)
+                dataset = db.session.scalar(dataset_stmt)
 
             if not dataset:
                 return []
@@ -792,6 +807,7 @@ class DatasetRetrieval:
                         query=query,
                         top_k=top_k,
                         document_ids_filter=document_ids_filter,
+                        retrieval_plan=retrieval_plan,
                     )
                     if documents:
                         all_documents.extend(documents)
@@ -813,6 +829,7 @@ class DatasetRetrieval:
                             weights=retrieval_model.get("weights", None),
                             document_ids_filter=document_ids_filter,
                             attachment_ids=attachment_ids,
+                            retrieval_plan=retrieval_plan,
                         )
 
                         all_documents.extend(documents)
@@ -924,67 +941,8 @@ class DatasetRetrieval:
         """
         keyword_table_handler = JiebaKeywordTableHandler()
         query_keywords = keyword_table_handler.extract_keywords(query, None)
-        documents_keywords = []
-        for document in documents:
-            if document.metadata is not None:
-                # get the document keywords
-                document_keywords = keyword_table_handler.extract_keywords(document.page_content, None)
-                document.metadata["keywords"] = document_keywords
-                documents_keywords.append(document_keywords)
-
-        # Counter query keywords(TF)
-        query_keyword_counts = Counter(query_keywords)
-
-        # total documents
-        total_documents = len(documents)
-
-        # calculate all documents' keywords IDF
-        all_keywords = set()
-        for document_keywords in documents_keywords:
-            all_keywords.update(document_keywords)
-
-        keyword_idf = {}
-        for keyword in all_keywords:
-            # calculate include query keywords' documents
-            doc_count_containing_keyword = sum(1 for doc_keywords in documents_keywords if keyword in doc_keywords)
-            # IDF
-            keyword_idf[keyword] = math.log((1 + total_documents) / (1 + doc_count_containing_keyword)) + 1
-
-        query_tfidf = {}
-
-        for keyword, count in query_keyword_counts.items():
-            tf = count
-            idf = keyword_idf.get(keyword, 0)
-            query_tfidf[keyword] = tf * idf
-
-        # calculate all documents' TF-IDF
-        documents_tfidf = []
-        for document_keywords in documents_keywords:
-            document_keyword_counts = Counter(document_keywords)
-            document_tfidf = {}
-            for keyword, count in document_keyword_counts.items():
-                tf = count
-                idf = keyword_idf.get(keyword, 0)
-                document_tfidf[keyword] = tf * idf
-            documents_tfidf.append(document_tfidf)
-
-        def cosine_similarity(vec1, vec2):
-            intersection = set(vec1.keys()) & set(vec2.keys())
-            numerator = sum(vec1[x] * vec2[x] for x in intersection)
-
-            sum1 = sum(vec1[x] ** 2 for x in vec1)
-            sum2 = sum(vec2[x] ** 2 for x in vec2)
-            denominator = math.sqrt(sum1) * math.sqrt(sum2)
-
-            if not denominator:
-                return 0.0
-            else:
-                return float(numerator) / denominator
-
-        similarities = []
-        for document_tfidf in documents_tfidf:
-            similarity = cosine_similarity(query_tfidf, document_tfidf)
-            similarities.append(similarity)
+        documents_keywords = get_documents_keywords(documents, keyword_table_handler)
+        similarities = calculate_tfidf_similarities(query_keywords, documents_keywords)
 
         for document, score in zip(documents, similarities):
             # format document
@@ -1389,7 +1347,9 @@ class DatasetRetrieval:
         score_threshold: float,
         query: str | None,
         attachment_id: str | None,
+        retrieval_plan: RetrievalPlan | None = None,
     ):
+        retrieval_plan = retrieval_plan or RetrievalPlan()
         with flask_app.app_context():
             threads = []
             all_documents_item: list[Document] = []
@@ -1417,6 +1377,7 @@ class DatasetRetrieval:
                         "document_ids_filter": document_ids_filter,
                         "metadata_condition": metadata_condition,
                         "attachment_ids": [attachment_id] if attachment_id else None,
+                        "retrieval_plan": retrieval_plan,
                     },
                 )
                 threads.append(retrieval_thread)
@@ -1427,22 +1388,23 @@ class DatasetRetrieval:
             if reranking_enable:
                 # do rerank for searched documents
                 data_post_processor = DataPostProcessor(tenant_id, reranking_mode, reranking_model, weights, False)
-                if query:
-                    all_documents_item = data_post_processor.invoke(
-                        query=query,
-                        documents=all_documents_item,
-                        score_threshold=score_threshold,
-                        top_n=top_k,
-                        query_type=QueryType.TEXT_QUERY,
-                    )
-                if attachment_id:
-                    all_documents_item = data_post_processor.invoke(
-                        documents=all_documents_item,
-                        score_threshold=score_threshold,
-                        top_n=top_k,
-                        query_type=QueryType.IMAGE_QUERY,
-                        query=attachment_id,
-                    )
+                with retrieval_plan.stage("rerank"):
+                    if query:
+                        all_documents_item = data_post_processor.invoke(
+                            query=query,
+                            documents=all_documents_item,
+                            score_threshold=score_threshold,
+                            top_n=top_k,
+                            query_type=QueryType.TEXT_QUERY,
+                        )
+                    if attachment_id:
+                        all_documents_item = data_post_processor.invoke(
+                            documents=all_documents_item,
+                            score_threshold=score_threshold,
+                            top_n=top_k,
+                            query_type=QueryType.IMAGE_QUERY,
+                            query=attachment_id,
+                        )
             else:
                 if index_type == IndexTechniqueType.ECONOMY:
                     if not query:
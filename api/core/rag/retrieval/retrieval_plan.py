@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Generator, Sequence
+from contextlib import contextmanager
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from extensions.ext_database import db
+from models.dataset import Dataset
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalPlan:
+    """
+    State shared by the retrieval threads of one request over one or more datasets.
+
+    Dataset rows are loaded once, in a single query when the dataset ids are known upfront, and the query is
+    embedded once per embedding model instead of once per dataset and retrieval method. Every stage records its
+    duration, the totals are summed over threads, so they show where the time went rather than the wall clock.
+    """
+
+    def __init__(self):
+        self._datasets: dict[str, Dataset | None] = {}
+        self._query_vectors: dict[tuple[str, str, str, str], list[float]] = {}
+        self._embedding_locks: dict[tuple[str, str, str, str], threading.Lock] = {}
+        self._timings: dict[str, float] = defaultdict(float)
+        self._counters: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def load_datasets(self, dataset_ids: Sequence[str]):
+        """Load the dataset rows not loaded yet, in one query."""
+        with self._lock:
+            missing_ids = [dataset_id for dataset_id in dataset_ids if dataset_id not in self._datasets]
+        if not missing_ids:
+            return
+
+        with self.stage("load_datasets"), Session(db.engine) as session:
+            datasets = {
+                dataset.id: dataset for dataset in session.scalars(select(Dataset).where(Dataset.id.in_(missing_ids)))
+            }
+        with self._lock:
+            for dataset_id in missing_ids:
+                self._datasets.setdefault(dataset_id, datasets.get(dataset_id))
+
+    def get_dataset(self, dataset_id: str) -> Dataset | None:
+        self.load_datasets([dataset_id])
+        with self._lock:
+            return self._datasets[dataset_id]
+
+    def embed_query(self, dataset: Dataset, query: str, embed: Callable[[], list[float]]) -> list[float]:
+        """
+        Return the embedding of the query with the embedding model of the dataset, computing it with `embed` once.
+
+        Concurrent callers for the same model wait for the first one instead of embedding the query again.
+        """
+        key = (dataset.tenant_id, dataset.embedding_model_provider or "", dataset.embedding_model or "", query)
+        with self._lock:
+            query_vector = self._query_vectors.get(key)
+            if query_vector is None:
+                embedding_lock = self._embedding_locks.setdefault(key, threading.Lock())
+
+        if query_vector is None:
+            with embedding_lock:
+                with self._lock:
+                    query_vector = self._query_vectors.get(key)
+                if query_vector is None:
+                    with self.stage("embedding"):
+                        query_vector = embed()
+                    with self._lock:
+                        self._query_vectors[key] = query_vector
+                        self._counters["embeddings"] += 1
+                    return query_vector
+
+        with self._lock:
+            self._counters["reused_embeddings"] += 1
+        return query_vector
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """Add the duration of the block to the total of a stage."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._timings[name] += elapsed
+
+    def get_timings(self) -> dict[str, float]:
+        """Return the total milliseconds spent per stage."""
+        with self._lock:
+            return {name: round(seconds * 1000, 3) for name, seconds in self._timings.items()}
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"datasets": len(self._datasets), **self._counters}
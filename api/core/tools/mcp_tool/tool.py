@@ -4,7 +4,7 @@ import logging
 from collections.abc import Generator
 from typing import Any
 
-from core.mcp.auth_client import MCPClientWithAuthRetry
+from core.mcp.client_pool import mcp_client_pool
 from core.mcp.error import MCPConnectionError
 from core.mcp.types import AudioContent, CallToolResult, ImageContent, TextContent
 from core.tools.__base.tool import Tool
@@ -158,9 +158,9 @@ class MCPTool(Tool):
                     headers["Authorization"] = f"{tokens.token_type.capitalize()} {tokens.access_token}"
 
         # Step 2: Session is now closed, perform network operations without holding database connection
-        # MCPClientWithAuthRetry will create a new session lazily only if auth retry is needed
+        # Pooled clients are MCPClientWithAuthRetry, which create a new session lazily only if auth retry is needed
         try:
-            with MCPClientWithAuthRetry(
+            with mcp_client_pool.client(
                 server_url=server_url,
                 headers=headers,
                 timeout=self.timeout,
@@ -14,6 +14,7 @@ from yarl import URL
 
 import contexts
 from configs import dify_config
+from core.helper.plugin_tool_provider_cache import plugin_tool_provider_cache
 from core.helper.provider_cache import ToolProviderCredentialsCache
 from core.plugin.impl.tool import PluginToolManager
 from core.tools.__base.tool_provider import ToolProviderController
@@ -141,7 +142,9 @@ class ToolManager:
                 return plugin_tool_providers[provider]
 
             manager = PluginToolManager()
-            provider_entity = manager.fetch_tool_provider(tenant_id, provider)
+            provider_entity = plugin_tool_provider_cache.get(
+                tenant_id, provider, lambda: manager.fetch_tool_provider(tenant_id, provider)
+            )
             if not provider_entity:
                 raise ToolProviderNotFoundError(f"plugin provider {provider} not found")
 
@@ -1,8 +1,9 @@
 from .edge import Edge
-from .graph import Graph, GraphBuilder, NodeFactory
+from .graph import CompiledGraph, Graph, GraphBuilder, NodeFactory
 from .graph_template import GraphTemplate
 
 __all__ = [
+    "CompiledGraph",
     "Edge",
     "Graph",
     "GraphBuilder",
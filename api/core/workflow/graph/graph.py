@@ -1,7 +1,8 @@
 import logging
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
-from typing import Protocol, cast, final
+from dataclasses import dataclass, replace
+from typing import Any, Protocol, cast, final
 
 from core.workflow.enums import ErrorStrategy, NodeExecutionType, NodeState, NodeType
 from core.workflow.nodes.base.node import Node
@@ -32,6 +33,23 @@ class NodeFactory(Protocol):
         ...
 
 
+@dataclass(frozen=True)
+class CompiledGraph:
+    """
+    Run-independent part of a graph: parsed node configs, root node and edge topology.
+
+    Edges are templates in their initial state, `Graph.from_compiled` copies them for each run.
+    The node configs are shared between runs and must not be mutated.
+    """
+
+    graph_config: Mapping[str, Any]
+    node_configs_map: Mapping[str, dict[str, object]]
+    root_node_id: str
+    edges: tuple[Edge, ...]
+    in_edges: Mapping[str, tuple[str, ...]]
+    out_edges: Mapping[str, tuple[str, ...]]
+
+
 @final
 class Graph:
     """Graph representation with nodes and edges for workflow execution."""
@@ -174,7 +192,7 @@ class Graph:
     @classmethod
     def _create_node_instances(
         cls,
-        node_configs_map: dict[str, dict[str, object]],
+        node_configs_map: Mapping[str, dict[str, object]],
         node_factory: "NodeFactory",
     ) -> dict[str, Node]:
         """
@@ -280,20 +298,21 @@ class Graph:
             mark_downstream(root_id)
 
     @classmethod
-    def init(
+    def compile(
         cls,
         *,
         graph_config: Mapping[str, object],
-        node_factory: "NodeFactory",
         root_node_id: str | None = None,
-    ) -> "Graph":
+    ) -> "CompiledGraph":
         """
-        Initialize graph
+        Compile the run-independent part of a graph config.
+
+        The result holds no node instances or edge states, so it can be cached and
+        shared by every run of the same graph config.
 
         :param graph_config: graph config containing nodes and edges
-        :param node_factory: factory for creating node instances from config data
         :param root_node_id: root node id
-        :return: graph instance
+        :return: compiled graph
         """
         # Parse configs
         edge_configs = graph_config.get("edges", [])
@@ -316,13 +335,38 @@ class Graph:
         # Build edges
         edges, in_edges, out_edges = cls._build_edges(edge_configs)
 
+        return CompiledGraph(
+            graph_config=graph_config,
+            node_configs_map=node_configs_map,
+            root_node_id=root_node_id,
+            edges=tuple(edges.values()),
+            in_edges={node_id: tuple(edge_ids) for node_id, edge_ids in in_edges.items()},
+            out_edges={node_id: tuple(edge_ids) for node_id, edge_ids in out_edges.items()},
+        )
+
+    @classmethod
+    def from_compiled(cls, compiled_graph: "CompiledGraph", node_factory: "NodeFactory") -> "Graph":
+        """
+        Create a graph for a single run from a compiled graph.
+
+        Node instances and edges are created fresh, since both carry per-run state.
+
+        :param compiled_graph: compiled graph
+        :param node_factory: factory for creating node instances from config data
+        :return: graph instance
+        """
+        edges = {edge.id: replace(edge) for edge in compiled_graph.edges}
+        in_edges = {node_id: list(edge_ids) for node_id, edge_ids in compiled_graph.in_edges.items()}
+        out_edges = {node_id: list(edge_ids) for node_id, edge_ids in compiled_graph.out_edges.items()}
+
         # Create node instances
-        nodes = cls._create_node_instances(node_configs_map, node_factory)
+        nodes = cls._create_node_instances(compiled_graph.node_configs_map, node_factory)
 
         # Promote fail-branch nodes to branch execution type at graph level
         cls._promote_fail_branch_nodes(nodes)
 
         # Get root node instance
+        root_node_id = compiled_graph.root_node_id
         root_node = nodes[root_node_id]
 
         # Mark inactive root branches as skipped
@@ -342,6 +386,25 @@ class Graph:
 
         return graph
 
+    @classmethod
+    def init(
+        cls,
+        *,
+        graph_config: Mapping[str, object],
+        node_factory: "NodeFactory",
+        root_node_id: str | None = None,
+    ) -> "Graph":
+        """
+        Initialize graph
+
+        :param graph_config: graph config containing nodes and edges
+        :param node_factory: factory for creating node instances from config data
+        :param root_node_id: root node id
+        :return: graph instance
+        """
+        compiled_graph = cls.compile(graph_config=graph_config, root_node_id=root_node_id)
+        return cls.from_compiled(compiled_graph, node_factory)
+
     @property
     def node_ids(self) -> list[str]:
         """
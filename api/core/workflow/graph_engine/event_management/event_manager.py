@@ -4,76 +4,18 @@ Unified event manager for collecting and emitting events.
 
 import logging
 import threading
-import time
+from collections import deque
 from collections.abc import Generator
-from contextlib import contextmanager
+from itertools import islice
 from typing import final
 
-from core.workflow.graph_events import GraphEngineEvent
+from core.workflow.graph_events import GraphEngineEvent, NodeRunStreamChunkEvent
 
 from ..layers.base import GraphEngineLayer
 
 _logger = logging.getLogger(__name__)
 
 
-@final
-class ReadWriteLock:
-    """
-    A read-write lock implementation that allows multiple concurrent readers
-    but only one writer at a time.
-    """
-
-    def __init__(self) -> None:
-        self._read_ready = threading.Condition(threading.RLock())
-        self._readers = 0
-
-    def acquire_read(self) -> None:
-        """Acquire a read lock."""
-        _ = self._read_ready.acquire()
-        try:
-            self._readers += 1
-        finally:
-            self._read_ready.release()
-
-    def release_read(self) -> None:
-        """Release a read lock."""
-        _ = self._read_ready.acquire()
-        try:
-            self._readers -= 1
-            if self._readers == 0:
-                self._read_ready.notify_all()
-        finally:
-            self._read_ready.release()
-
-    def acquire_write(self) -> None:
-        """Acquire a write lock."""
-        _ = self._read_ready.acquire()
-        while self._readers > 0:
-            _ = self._read_ready.wait()
-
-    def release_write(self) -> None:
-        """Release a write lock."""
-        self._read_ready.release()
-
-    @contextmanager
-    def read_lock(self):
-        """Return a context manager for read locking."""
-        self.acquire_read()
-        try:
-            yield
-        finally:
-            self.release_read()
-
-    @contextmanager
-    def write_lock(self):
-        """Return a context manager for write locking."""
-        self.acquire_write()
-        try:
-            yield
-        finally:
-            self.release_write()
-
-
 @final
 class EventManager:
     """
@@ -82,14 +24,31 @@ class EventManager:
     This class combines event collection with event emission, providing
     thread-safe event management with support for notifying layers and
     streaming events to external consumers.
+
+    Collected events are buffered only until every active consumer of
+    emit_events has read them, each consumer keeps a cursor into the buffer.
+    Optionally, adjacent stream chunks for the same selector are merged
+    while no consumer has read them yet.
     """
 
-    def __init__(self) -> None:
-        """Initialize the event manager."""
-        self._events: list[GraphEngineEvent] = []
-        self._lock = ReadWriteLock()
+    def __init__(self, coalesce_stream_chunks: bool = False) -> None:
+        """
+        Initialize the event manager.
+
+        Args:
+            coalesce_stream_chunks: Merge adjacent unread stream chunks of the same node execution and selector
+        """
+        self._events: deque[GraphEngineEvent] = deque()
+        # Absolute index of the first buffered event, earlier events have been read by every consumer
+        self._first_index = 0
+        # Absolute index of the next event to read, per active consumer
+        self._cursors: dict[int, int] = {}
+        self._consumer_counter = 0
+        self._coalesce_stream_chunks = coalesce_stream_chunks
+        # Guards the buffer, notified when an event is collected or execution completes
+        self._condition = threading.Condition()
         self._layers: list[GraphEngineLayer] = []
-        self._execution_complete = threading.Event()
+        self._execution_complete = False
 
     def set_layers(self, layers: list[GraphEngineLayer]) -> None:
         """
@@ -111,64 +70,107 @@ class EventManager:
         Args:
             event: The event to collect
         """
-        with self._lock.write_lock():
-            self._events.append(event)
+        with self._condition:
+            if not (self._coalesce_stream_chunks and self._coalesce(event)):
+                self._events.append(event)
+            self._condition.notify_all()
 
         # NOTE: `_notify_layers` is intentionally called outside the critical section
-        # to minimize lock contention and avoid blocking other readers or writers.
+        # to minimize lock contention and avoid blocking consumers.
         #
-        # The public `notify_layers` method also does not use a write lock,
-        # so protecting `_notify_layers` with a lock here is unnecessary.
+        # Layers always receive every collected event, chunk coalescing only
+        # applies to the events yielded by `emit_events`.
         self._notify_layers(event)
 
-    def _get_new_events(self, start_index: int) -> list[GraphEngineEvent]:
+    def _coalesce(self, event: GraphEngineEvent) -> bool:
         """
-        Get new events starting from a specific index.
+        Merge a stream chunk into the last buffered event, if that is an unread chunk it continues.
+
+        Must be called with the condition held.
 
         Args:
-            start_index: The index to start from
+            event: The collected event
 
         Returns:
-            List of new events
+            True if the event was merged and must not be buffered on its own
         """
-        with self._lock.read_lock():
-            return list(self._events[start_index:])
-
-    def _event_count(self) -> int:
+        if not isinstance(event, NodeRunStreamChunkEvent) or not self._events:
+            return False
+
+        last_event = self._events[-1]
+        last_index = self._first_index + len(self._events) - 1
+        if (
+            not isinstance(last_event, NodeRunStreamChunkEvent)
+            or last_event.is_final
+            or any(cursor > last_index for cursor in self._cursors.values())
+            or last_event.id != event.id
+            or last_event.node_id != event.node_id
+            or list(last_event.selector) != list(event.selector)
+            or last_event.in_iteration_id != event.in_iteration_id
+            or last_event.in_loop_id != event.in_loop_id
+        ):
+            return False
+
+        self._events[-1] = last_event.model_copy(
+            update={"chunk": last_event.chunk + event.chunk, "is_final": event.is_final}
+        )
+        return True
+
+    def _release_read_events(self) -> None:
         """
-        Get the current count of collected events.
+        Drop the buffered events every active consumer has read.
 
-        Returns:
-            Number of collected events
+        Must be called with the condition held. Without active consumers,
+        events are kept for the next consumer.
         """
-        with self._lock.read_lock():
-            return len(self._events)
+        if not self._cursors:
+            return
+        read_index = min(self._cursors.values())
+        while self._first_index < read_index:
+            _ = self._events.popleft()
+            self._first_index += 1
 
     def mark_complete(self) -> None:
         """Mark execution as complete to stop the event emission generator."""
-        self._execution_complete.set()
+        with self._condition:
+            self._execution_complete = True
+            self._condition.notify_all()
 
     def emit_events(self) -> Generator[GraphEngineEvent, None, None]:
         """
         Generator that yields events as they're collected.
 
+        A consumer starts at the oldest buffered event, events are released
+        from the buffer once every active consumer has read them.
+
         Yields:
             GraphEngineEvent instances as they're processed
         """
-        yielded_count = 0
-
-        while not self._execution_complete.is_set() or yielded_count < self._event_count():
-            # Get new events since last yield
-            new_events = self._get_new_events(yielded_count)
+        with self._condition:
+            consumer_id = self._consumer_counter
+            self._consumer_counter += 1
+            self._cursors[consumer_id] = self._first_index
 
-            # Yield any new events
-            for event in new_events:
-                yield event
-                yielded_count += 1
-
-            # Small sleep to avoid busy waiting
-            if not self._execution_complete.is_set() and not new_events:
-                time.sleep(0.001)
+        try:
+            while True:
+                with self._condition:
+                    cursor = self._cursors[consumer_id]
+                    # Wait for the next collected event instead of busy waiting
+                    while not self._execution_complete and cursor >= self._first_index + len(self._events):
+                        _ = self._condition.wait()
+
+                    end_index = self._first_index + len(self._events)
+                    if cursor >= end_index:
+                        return
+                    new_events = list(islice(self._events, cursor - self._first_index, None))
+                    self._cursors[consumer_id] = end_index
+                    self._release_read_events()
+
+                yield from new_events
+        finally:
+            with self._condition:
+                del self._cursors[consumer_id]
+                self._release_read_events()
 
     def _notify_layers(self, event: GraphEngineEvent) -> None:
         """
@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING, cast, final
 
 from flask import Flask, current_app
 
+from configs import dify_config
 from core.workflow.enums import NodeExecutionType
 from core.workflow.graph import Graph
 from core.workflow.graph_events import (
@@ -40,7 +41,7 @@ from .layers.base import GraphEngineLayer
 from .orchestration import Dispatcher, ExecutionCoordinator
 from .protocols.command_channel import CommandChannel
 from .ready_queue import ReadyQueue
-from .worker_management import WorkerPool
+from .worker_management import SharedWorkerPoolClient, WorkerPool
 
 if TYPE_CHECKING:
     from core.workflow.graph_engine.domain.graph_execution import GraphExecution
@@ -68,6 +69,7 @@ class GraphEngine:
         max_workers: int | None = None,
         scale_up_threshold: int | None = None,
         scale_down_idle_time: float | None = None,
+        use_shared_worker_pool: bool | None = None,
     ) -> None:
         """Initialize the graph engine with all subsystems and dependencies."""
 
@@ -87,6 +89,9 @@ class GraphEngine:
         self._max_workers = max_workers
         self._scale_up_threshold = scale_up_threshold
         self._scale_down_idle_time = scale_down_idle_time
+        self._use_shared_worker_pool = (
+            dify_config.GRAPH_ENGINE_SHARED_POOL_ENABLED if use_shared_worker_pool is None else use_shared_worker_pool
+        )
 
         # === Execution Queues ===
         self._ready_queue = cast(ReadyQueue, self._graph_runtime_state.ready_queue)
@@ -104,7 +109,9 @@ class GraphEngine:
 
         # === Event Management ===
         # Event manager handles both collection and emission of events
-        self._event_manager = EventManager()
+        self._event_manager = EventManager(
+            coalesce_stream_chunks=dify_config.GRAPH_ENGINE_COALESCE_STREAM_CHUNKS,
+        )
 
         # === Error Handling ===
         # Centralized error handler for graph execution errors
@@ -157,19 +164,31 @@ class GraphEngine:
         # Capture context variables for worker threads
         context_vars = contextvars.copy_context()
 
-        # Create worker pool for parallel node execution
-        self._worker_pool = WorkerPool(
-            ready_queue=self._ready_queue,
-            event_queue=self._event_queue,
-            graph=self._graph,
-            layers=self._layers,
-            flask_app=flask_app,
-            context_vars=context_vars,
-            min_workers=self._min_workers,
-            max_workers=self._max_workers,
-            scale_up_threshold=self._scale_up_threshold,
-            scale_down_idle_time=self._scale_down_idle_time,
-        )
+        # Create worker pool for parallel node execution, or a handle on the process-wide shared pool
+        self._worker_pool: WorkerPool | SharedWorkerPoolClient
+        if self._use_shared_worker_pool:
+            self._worker_pool = SharedWorkerPoolClient(
+                ready_queue=self._ready_queue,
+                event_queue=self._event_queue,
+                graph=self._graph,
+                layers=self._layers,
+                flask_app=flask_app,
+                context_vars=context_vars,
+                max_workers=self._max_workers,
+            )
+        else:
+            self._worker_pool = WorkerPool(
+                ready_queue=self._ready_queue,
+                event_queue=self._event_queue,
+                graph=self._graph,
+                layers=self._layers,
+                flask_app=flask_app,
+                context_vars=context_vars,
+                min_workers=self._min_workers,
+                max_workers=self._max_workers,
+                scale_up_threshold=self._scale_up_threshold,
+                scale_down_idle_time=self._scale_down_idle_time,
+            )
 
         # === Orchestration ===
         # Coordinates the overall execution lifecycle
@@ -33,6 +33,10 @@ class Dispatcher:
     with timeout and completion detection.
     """
 
+    # Events wake the dispatcher as soon as they are queued, the timeout only paces
+    # worker scale-down checks and the stop check while no node reports progress.
+    _IDLE_CHECK_INTERVAL = 0.5
+
     _COMMAND_TRIGGER_EVENTS = (
         NodeRunSucceededEvent,
         NodeRunFailedEvent,
@@ -94,12 +98,12 @@ class Dispatcher:
 
                 self._execution_coordinator.check_scaling()
                 try:
-                    event = self._event_queue.get(timeout=0.1)
-                    self._event_handler.dispatch(event)
-                    self._event_queue.task_done()
-                    self._process_commands(event)
+                    event = self._event_queue.get(timeout=self._IDLE_CHECK_INTERVAL)
                 except queue.Empty:
-                    time.sleep(0.1)
+                    continue
+                self._event_handler.dispatch(event)
+                self._event_queue.task_done()
+                self._process_commands(event)
 
             self._process_commands()
             while True:
@@ -7,7 +7,7 @@ from typing import final
 from ..command_processing import CommandProcessor
 from ..domain import GraphExecution
 from ..graph_state_manager import GraphStateManager
-from ..worker_management import WorkerPool
+from ..worker_management import SharedWorkerPoolClient, WorkerPool
 
 
 @final
@@ -24,7 +24,7 @@ class ExecutionCoordinator:
         graph_execution: GraphExecution,
         state_manager: GraphStateManager,
         command_processor: CommandProcessor,
-        worker_pool: WorkerPool,
+        worker_pool: WorkerPool | SharedWorkerPoolClient,
     ) -> None:
         """
         Initialize the execution coordinator.
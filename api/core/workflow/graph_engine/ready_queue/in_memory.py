@@ -1,11 +1,15 @@
 """
 In-memory implementation of the ReadyQueue protocol.
 
-This implementation wraps Python's standard queue.Queue and adds
+This implementation keeps node IDs in a deque guarded by a condition
+variable, so that waiting workers can be woken on stop, and adds
 serialization capabilities for state storage.
 """
 
 import queue
+import threading
+import time
+from collections import deque
 from typing import final
 
 from .protocol import ReadyQueue, ReadyQueueState
@@ -16,8 +20,9 @@ class InMemoryReadyQueue(ReadyQueue):
     """
     In-memory ready queue implementation with serialization support.
 
-    This implementation uses Python's queue.Queue internally and provides
-    methods to serialize and restore the queue state.
+    This implementation follows the semantics of Python's queue.Queue and
+    provides methods to serialize and restore the queue state, and to wake
+    threads blocked in get().
     """
 
     def __init__(self, maxsize: int = 0) -> None:
@@ -27,7 +32,13 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             maxsize: Maximum size of the queue (0 for unlimited)
         """
-        self._queue: queue.Queue[str] = queue.Queue(maxsize=maxsize)
+        self._maxsize = maxsize
+        self._items: deque[str] = deque()
+        self._unfinished_tasks = 0
+        self._wakeups = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
 
     def put(self, item: str) -> None:
         """
@@ -36,7 +47,12 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             item: The node ID to add to the queue
         """
-        self._queue.put(item)
+        with self._not_full:
+            while 0 < self._maxsize <= len(self._items):
+                self._not_full.wait()
+            self._items.append(item)
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
 
     def get(self, timeout: float | None = None) -> str:
         """
@@ -49,11 +65,35 @@ class InMemoryReadyQueue(ReadyQueue):
             The node ID retrieved from the queue
 
         Raises:
-            queue.Empty: If timeout expires and no item is available
-        """
-        if timeout is None:
-            return self._queue.get(block=True)
-        return self._queue.get(timeout=timeout)
+            queue.Empty: If timeout expires or wake_waiters() is called before an item is available
+        """
+        with self._not_empty:
+            wakeups = self._wakeups
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                if self._wakeups != wakeups:
+                    raise queue.Empty
+                if deadline is None:
+                    self._not_empty.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def wake_waiters(self) -> None:
+        """
+        Wake every thread blocked in get().
+
+        The woken get() calls raise queue.Empty, so that workers blocking
+        without a timeout can re-check whether they have been stopped.
+        """
+        with self._not_empty:
+            self._wakeups += 1
+            self._not_empty.notify_all()
 
     def task_done(self) -> None:
         """
@@ -62,7 +102,10 @@ class InMemoryReadyQueue(ReadyQueue):
         Used by worker threads to signal task completion for
         join() synchronization.
         """
-        self._queue.task_done()
+        with self._mutex:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished_tasks -= 1
 
     def empty(self) -> bool:
         """
@@ -71,7 +114,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             True if the queue has no items, False otherwise
         """
-        return self._queue.empty()
+        with self._mutex:
+            return not self._items
 
     def qsize(self) -> int:
         """
@@ -80,7 +124,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             The approximate number of items in the queue
         """
-        return self._queue.qsize()
+        with self._mutex:
+            return len(self._items)
 
     def dumps(self) -> str:
         """
@@ -89,22 +134,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             A JSON string containing the serialized queue state
         """
-        # Extract all items from the queue without removing them
-        items: list[str] = []
-        temp_items: list[str] = []
-
-        # Drain the queue temporarily to get all items
-        while not self._queue.empty():
-            try:
-                item = self._queue.get_nowait()
-                temp_items.append(item)
-                items.append(item)
-            except queue.Empty:
-                break
-
-        # Put items back in the same order
-        for item in temp_items:
-            self._queue.put(item)
+        with self._mutex:
+            items = list(self._items)
 
         state = ReadyQueueState(
             type="InMemoryReadyQueue",
@@ -128,13 +159,10 @@ class InMemoryReadyQueue(ReadyQueue):
         if state.version != "1.0":
             raise ValueError(f"Unsupported version: {state.version}")
 
-        # Clear the current queue
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
-
-        # Restore items
-        for item in state.items:
-            self._queue.put(item)
+        # Replace the current items with the restored ones
+        with self._mutex:
+            self._unfinished_tasks -= len(self._items)
+            self._items.clear()
+            self._items.extend(state.items)
+            self._unfinished_tasks += len(state.items)
+            self._not_empty.notify(len(state.items))
@@ -57,6 +57,15 @@ class ReadyQueue(Protocol):
         """
         ...
 
+    def wake_waiters(self) -> None:
+        """
+        Wake every thread blocked in get().
+
+        The woken get() calls raise queue.Empty, so that workers blocking
+        without a timeout can re-check whether they have been stopped.
+        """
+        ...
+
     def task_done(self) -> None:
         """
         Indicate that a previously retrieved task is complete.
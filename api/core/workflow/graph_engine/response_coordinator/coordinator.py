@@ -14,13 +14,13 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
-from core.workflow.enums import NodeExecutionType, NodeState
+from core.workflow.enums import NodeState
 from core.workflow.graph import Graph
 from core.workflow.graph_events import NodeRunStreamChunkEvent, NodeRunSucceededEvent
 from core.workflow.nodes.base.template import TextSegment, VariableSegment
 from core.workflow.runtime import VariablePool
 
-from .path import Path
+from .path import Path, get_blocking_edge_graph
 from .session import ResponseSession
 
 logger = logging.getLogger(__name__)
@@ -61,6 +61,8 @@ class ResponseStreamCoordinatorState(BaseModel):
     waiting_sessions: Sequence[ResponseSessionState] = Field(default_factory=list)
     pending_sessions: Sequence[ResponseSessionState] = Field(default_factory=list)
     node_execution_ids: dict[str, str] = Field(default_factory=dict)
+    taken_edges: dict[str, list[str]] | None = None
+    # Enumerated blocking edges per path, only present in snapshots taken before `taken_edges`
     paths_map: dict[str, list[list[str]]] = Field(default_factory=dict)
     stream_buffers: Sequence[StreamBufferState] = Field(default_factory=list)
     stream_positions: Sequence[StreamPositionState] = Field(default_factory=list)
@@ -97,8 +99,8 @@ class ResponseStreamCoordinator:
         # Track response nodes
         self._response_nodes: set[NodeID] = set()
 
-        # Store paths for each response node
-        self._paths_maps: dict[NodeID, list[Path]] = {}
+        # Track paths to each response node
+        self._paths: dict[NodeID, Path] = {}
 
         # Track node execution IDs and types for proper event forwarding
         self._node_execution_ids: dict[NodeID, str] = {}  # node_id -> execution_id
@@ -112,9 +114,8 @@ class ResponseStreamCoordinator:
                 return
             self._response_nodes.add(response_node_id)
 
-            # Build and save paths map for this response node
-            paths_map = self._build_paths_map(response_node_id)
-            self._paths_maps[response_node_id] = paths_map
+            # Track the blocking edges that must be taken to reach this response node
+            self._paths[response_node_id] = Path(get_blocking_edge_graph(self._graph, response_node_id))
 
             # Create and store response session for this node
             response_node = self._graph.nodes[response_node_id]
@@ -145,93 +146,13 @@ class ResponseStreamCoordinator:
                 self._node_execution_ids[node_id] = str(uuid4())
             return self._node_execution_ids[node_id]
 
-    def _build_paths_map(self, response_node_id: NodeID) -> list[Path]:
-        """
-        Build a paths map for a response node by finding all paths from root node
-        to the response node, recording branch edges along each path.
-
-        Args:
-            response_node_id: ID of the response node to analyze
-
-        Returns:
-            List of Path objects, where each path contains branch edge IDs
-        """
-        # Get root node ID
-        root_node_id = self._graph.root_node.id
-
-        # If root is the response node, return empty path
-        if root_node_id == response_node_id:
-            return [Path()]
-
-        # Extract variable selectors from the response node's template
-        response_node = self._graph.nodes[response_node_id]
-        response_session = ResponseSession.from_node(response_node)
-        template = response_session.template
-
-        # Collect all variable selectors from the template
-        variable_selectors: set[tuple[str, ...]] = set()
-        for segment in template.segments:
-            if isinstance(segment, VariableSegment):
-                variable_selectors.add(tuple(segment.selector[:2]))
-
-        # Step 1: Find all complete paths from root to response node
-        all_complete_paths: list[list[EdgeID]] = []
-
-        def find_paths(
-            current_node_id: NodeID, target_node_id: NodeID, current_path: list[EdgeID], visited: set[NodeID]
-        ) -> None:
-            """Recursively find all paths from current node to target node."""
-            if current_node_id == target_node_id:
-                # Found a complete path, store it
-                all_complete_paths.append(current_path.copy())
-                return
-
-            # Mark as visited to avoid cycles
-            visited.add(current_node_id)
-
-            # Explore outgoing edges
-            outgoing_edges = self._graph.get_outgoing_edges(current_node_id)
-            for edge in outgoing_edges:
-                edge_id = edge.id
-                next_node_id = edge.head
-
-                # Skip if already visited in this path
-                if next_node_id not in visited:
-                    # Add edge to path and recurse
-                    new_path = current_path + [edge_id]
-                    find_paths(next_node_id, target_node_id, new_path, visited.copy())
-
-        # Start searching from root node
-        find_paths(root_node_id, response_node_id, [], set())
-
-        # Step 2: For each complete path, filter edges based on node blocking behavior
-        filtered_paths: list[Path] = []
-        for path in all_complete_paths:
-            blocking_edges: list[str] = []
-            for edge_id in path:
-                edge = self._graph.edges[edge_id]
-                source_node = self._graph.nodes[edge.tail]
-
-                # Check if node is a branch, container, or response node
-                if source_node.execution_type in {
-                    NodeExecutionType.BRANCH,
-                    NodeExecutionType.CONTAINER,
-                    NodeExecutionType.RESPONSE,
-                } or source_node.blocks_variable_output(variable_selectors):
-                    blocking_edges.append(edge_id)
-
-            # Keep the path even if it's empty
-            filtered_paths.append(Path(edges=blocking_edges))
-
-        return filtered_paths
-
     def on_edge_taken(self, edge_id: str) -> Sequence[NodeRunStreamChunkEvent]:
         """
         Handle when an edge is taken (selected by a branch node).
 
-        This method updates the paths for all response nodes by removing
-        the taken edge. If any response node has an empty path after removal,
-        it means the node is now deterministically reachable and should start.
+        This method records the taken edge on the paths of all response nodes.
+        If a response node can now be reached through taken blocking edges only,
+        it is deterministically reachable and should start.
 
         Args:
             edge_id: The ID of the edge that was taken
@@ -244,23 +165,14 @@ class ResponseStreamCoordinator:
         with self._lock:
             # Check each response node in order
             for response_node_id in self._response_nodes:
-                if response_node_id not in self._paths_maps:
+                path = self._paths.get(response_node_id)
+                if path is None:
                     continue
 
-                paths = self._paths_maps[response_node_id]
-                has_reachable_path = False
-
-                # Update each path by removing the taken edge
-                for path in paths:
-                    # Remove the taken edge from this path
-                    path.remove_edge(edge_id)
+                path.take_edge(edge_id)
 
-                    # Check if this path is now empty (node is reachable)
-                    if path.is_empty():
-                        has_reachable_path = True
-
-                # If node is now reachable (has empty path), start/queue session
-                if has_reachable_path:
+                # If node is now reachable, start/queue session
+                if path.is_reachable():
                     # Pass the node_id to the activation method
                     # The method will handle checking and removing from map
                     events.extend(self._active_or_queue_session(response_node_id))
@@ -619,6 +531,23 @@ class ResponseStreamCoordinator:
         session.index = session_state.index
         return session
 
+    def _restore_paths(self, state: ResponseStreamCoordinatorState) -> dict[NodeID, Path]:
+        """Rebuild response node paths from serialized taken edges or a legacy paths map."""
+
+        paths: dict[NodeID, Path] = {}
+        if state.taken_edges is not None:
+            for node_id, taken_edges in state.taken_edges.items():
+                paths[node_id] = Path(get_blocking_edge_graph(self._graph, node_id), taken_edges)
+            return paths
+
+        for node_id, legacy_paths in state.paths_map.items():
+            edge_graph = get_blocking_edge_graph(self._graph, node_id)
+            # Legacy paths only ever shrank by removing taken edges
+            remaining_edges = {edge_id for path_edges in legacy_paths for edge_id in path_edges}
+            taken_edges = [edge_id for edge_id in edge_graph.blocking_edges if edge_id not in remaining_edges]
+            paths[node_id] = Path(edge_graph, taken_edges if legacy_paths else ())
+        return paths
+
     def dumps(self) -> str:
         """Serialize coordinator state to JSON."""
 
@@ -637,10 +566,7 @@ class ResponseStreamCoordinator:
                     if (session_state := self._serialize_session(session)) is not None
                 ],
                 node_execution_ids=dict(sorted(self._node_execution_ids.items())),
-                paths_map={
-                    node_id: [path.edges.copy() for path in paths]
-                    for node_id, paths in sorted(self._paths_maps.items())
-                },
+                taken_edges={node_id: path.taken_edges for node_id, path in sorted(self._paths.items())},
                 stream_buffers=[
                     StreamBufferState(
                         selector=selector,
@@ -669,10 +595,7 @@ class ResponseStreamCoordinator:
 
         with self._lock:
             self._response_nodes = set(state.response_nodes)
-            self._paths_maps = {
-                node_id: [Path(edges=list(path_edges)) for path_edges in paths]
-                for node_id, paths in state.paths_map.items()
-            }
+            self._paths = self._restore_paths(state)
             self._node_execution_ids = dict(state.node_execution_ids)
 
             self._stream_buffers = {
@@ -1,35 +1,178 @@
 """
-Internal path representation for response coordinator.
+Internal path analysis for response coordinator.
 
-This module contains the private Path class used internally by ResponseStreamCoordinator
-to track execution paths to response nodes.
+This module contains the private classes used internally by ResponseStreamCoordinator
+to decide when a response node is deterministically reachable.
+
+A response node becomes reachable once some path from the root node reaches it using
+only non-blocking edges and blocking edges that have already been taken. Instead of
+enumerating every path, which is exponential in the number of branch/merge diamonds,
+the static part of the analysis keeps only the edges that lie on some root-to-response
+path, and the runtime part grows the set of nodes reachable through usable edges as
+blocking edges are taken. Each node is visited at most once per run.
 """
 
-from dataclasses import dataclass, field
-from typing import TypeAlias
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias
+from weakref import WeakKeyDictionary
+
+from core.workflow.enums import NodeExecutionType
+from core.workflow.nodes.base.template import VariableSegment
+
+from .session import ResponseSession
+
+if TYPE_CHECKING:
+    from core.workflow.graph import Graph
 
+NodeID: TypeAlias = str
 EdgeID: TypeAlias = str
 
+_BLOCKING_EXECUTION_TYPES = frozenset(
+    {NodeExecutionType.BRANCH, NodeExecutionType.CONTAINER, NodeExecutionType.RESPONSE}
+)
+
+
+@dataclass(frozen=True)
+class OutgoingEdge:
+    edge_id: EdgeID
+    head: NodeID
+    blocking: bool
+
+
+@dataclass(frozen=True)
+class BlockingEdgeGraph:
+    """
+    Edges lying on some path from the root node to a response node.
+
+    An edge is blocking when its source node is a branch, container or response node,
+    or blocks the output of a variable the response node streams.
+
+    Note: This is an internal class not exposed in the public API.
+    """
+
+    root_node_id: NodeID
+    response_node_id: NodeID
+    outgoing_edges: Mapping[NodeID, Sequence[OutgoingEdge]]
+    # blocking edge id -> (tail, head)
+    blocking_edges: Mapping[EdgeID, tuple[NodeID, NodeID]]
+
+
+_blocking_edge_graphs: "WeakKeyDictionary[Graph, dict[NodeID, BlockingEdgeGraph]]" = WeakKeyDictionary()
+_blocking_edge_graphs_lock = threading.Lock()
+
+
+def get_blocking_edge_graph(graph: "Graph", response_node_id: NodeID) -> BlockingEdgeGraph:
+    """Return the blocking edge graph of a response node, computed once per graph."""
+    with _blocking_edge_graphs_lock:
+        cached = _blocking_edge_graphs.get(graph, {}).get(response_node_id)
+    if cached is not None:
+        return cached
+
+    blocking_edge_graph = build_blocking_edge_graph(graph, response_node_id)
+    with _blocking_edge_graphs_lock:
+        _blocking_edge_graphs.setdefault(graph, {})[response_node_id] = blocking_edge_graph
+    return blocking_edge_graph
+
+
+def build_blocking_edge_graph(graph: "Graph", response_node_id: NodeID) -> BlockingEdgeGraph:
+    """Compute the blocking edge graph of a response node in O(nodes + edges)."""
+    root_node_id = graph.root_node.id
+    if root_node_id == response_node_id:
+        return BlockingEdgeGraph(root_node_id, response_node_id, outgoing_edges={}, blocking_edges={})
+
+    # Collect all variable selectors from the response node's template
+    response_session = ResponseSession.from_node(graph.nodes[response_node_id])
+    variable_selectors: set[tuple[str, ...]] = {
+        tuple(segment.selector[:2])
+        for segment in response_session.template.segments
+        if isinstance(segment, VariableSegment)
+    }
+
+    # Nodes reachable from the root, without walking past the response node
+    reachable_from_root = _collect_nodes(
+        root_node_id,
+        lambda node_id: [] if node_id == response_node_id else [e.head for e in graph.get_outgoing_edges(node_id)],
+    )
+    # Nodes the response node is reachable from
+    reaching_response = _collect_nodes(
+        response_node_id, lambda node_id: [e.tail for e in graph.get_incoming_edges(node_id)]
+    )
+
+    outgoing_edges: dict[NodeID, list[OutgoingEdge]] = {}
+    blocking_edges: dict[EdgeID, tuple[NodeID, NodeID]] = {}
+    blocking_by_node: dict[NodeID, bool] = {}
+    for node_id in reachable_from_root:
+        if node_id == response_node_id:
+            continue
+        for edge in graph.get_outgoing_edges(node_id):
+            if edge.head not in reaching_response:
+                continue
+            if node_id not in blocking_by_node:
+                source_node = graph.nodes[node_id]
+                blocking_by_node[node_id] = source_node.execution_type in _BLOCKING_EXECUTION_TYPES or (
+                    source_node.blocks_variable_output(variable_selectors)
+                )
+            blocking = blocking_by_node[node_id]
+            outgoing_edges.setdefault(node_id, []).append(OutgoingEdge(edge.id, edge.head, blocking))
+            if blocking:
+                blocking_edges[edge.id] = (node_id, edge.head)
+
+    return BlockingEdgeGraph(root_node_id, response_node_id, outgoing_edges, blocking_edges)
+
+
+def _collect_nodes(start_node_id: NodeID, neighbors) -> set[NodeID]:
+    visited = {start_node_id}
+    stack = [start_node_id]
+    while stack:
+        for next_node_id in neighbors(stack.pop()):
+            if next_node_id not in visited:
+                visited.add(next_node_id)
+                stack.append(next_node_id)
+    return visited
+
 
-@dataclass
 class Path:
     """
-    Represents a path of branch edges that must be taken to reach a response node.
+    Tracks which blocking edges have been taken on the way to a response node.
 
     Note: This is an internal class not exposed in the public API.
     """
 
-    edges: list[EdgeID] = field(default_factory=list[EdgeID])
+    def __init__(self, edge_graph: BlockingEdgeGraph, taken_edges: Iterable[EdgeID] = ()) -> None:
+        self._edge_graph = edge_graph
+        self._taken_edges: set[EdgeID] = set()
+        self._reached: set[NodeID] = set()
+        self._reach(edge_graph.root_node_id)
+        for edge_id in taken_edges:
+            self.take_edge(edge_id)
+
+    @property
+    def taken_edges(self) -> list[EdgeID]:
+        """Blocking edges taken so far, in a stable order."""
+        return sorted(self._taken_edges)
 
-    def contains_edge(self, edge_id: EdgeID) -> bool:
-        """Check if this path contains the given edge."""
-        return edge_id in self.edges
+    def take_edge(self, edge_id: EdgeID) -> None:
+        """Record that the given edge was taken."""
+        edge = self._edge_graph.blocking_edges.get(edge_id)
+        if edge is None or edge_id in self._taken_edges:
+            return
+        self._taken_edges.add(edge_id)
+        tail, head = edge
+        if tail in self._reached and head not in self._reached:
+            self._reach(head)
 
-    def remove_edge(self, edge_id: EdgeID) -> None:
-        """Remove the given edge from this path in place."""
-        if self.contains_edge(edge_id):
-            self.edges.remove(edge_id)
+    def is_reachable(self) -> bool:
+        """Check if every blocking edge on some path to the response node has been taken."""
+        return self._edge_graph.response_node_id in self._reached
 
-    def is_empty(self) -> bool:
-        """Check if the path has no edges (node is reachable)."""
-        return len(self.edges) == 0
+    def _reach(self, start_node_id: NodeID) -> None:
+        self._reached.add(start_node_id)
+        stack = [start_node_id]
+        while stack:
+            for edge in self._edge_graph.outgoing_edges.get(stack.pop(), ()):
+                if edge.head in self._reached or (edge.blocking and edge.edge_id not in self._taken_edges):
+                    continue
+                self._reached.add(edge.head)
+                stack.append(edge.head)
@@ -1,8 +1,8 @@
 """
 Worker - Thread implementation for queue-based node execution
 
-Workers pull node IDs from the ready_queue, execute nodes, and push events
-to the event_queue for the dispatcher to process.
+Workers pull node IDs from the ready_queue, execute nodes with a
+NodeExecutor, and push events to the event_queue for the dispatcher to process.
 """
 
 import contextvars
@@ -25,15 +25,18 @@ from libs.flask_utils import preserve_flask_contexts
 
 from .ready_queue import ReadyQueue
 
+_STOP_CHECK_INTERVAL = 1.0
+
 
 @final
-class Worker(threading.Thread):
+class NodeExecutor:
     """
-    Worker thread that executes nodes from the ready queue.
+    Executes nodes of one graph on the calling thread.
 
-    Workers continuously pull node IDs from the ready_queue, execute the
-    corresponding nodes, and push the resulting events to the event_queue
-    for the dispatcher to process.
+    Runs the node with the Flask context of the engine and the node run hooks
+    of its layers, pushes the resulting events to the event_queue and reports
+    failures as NodeRunFailedEvent. Used by the dedicated Worker threads of an
+    engine and by the shared worker pool.
     """
 
     def __init__(
@@ -42,83 +45,48 @@ class Worker(threading.Thread):
         event_queue: queue.Queue[GraphNodeEventBase],
         graph: Graph,
         layers: Sequence[GraphEngineLayer],
-        worker_id: int = 0,
         flask_app: Flask | None = None,
         context_vars: contextvars.Context | None = None,
     ) -> None:
         """
-        Initialize worker thread.
+        Initialize the node executor.
 
         Args:
-            ready_queue: Ready queue containing node IDs ready for execution
+            ready_queue: Ready queue the executed node IDs were taken from
             event_queue: Queue for pushing execution events
             graph: Graph containing nodes to execute
             layers: Graph engine layers for node execution hooks
-            worker_id: Unique identifier for this worker
             flask_app: Optional Flask application for context preservation
-            context_vars: Optional context variables to preserve in worker thread
+            context_vars: Optional context variables to preserve in the executing thread
         """
-        super().__init__(name=f"GraphWorker-{worker_id}", daemon=True)
         self._ready_queue = ready_queue
         self._event_queue = event_queue
         self._graph = graph
-        self._worker_id = worker_id
         self._flask_app = flask_app
         self._context_vars = context_vars
-        self._stop_event = threading.Event()
-        self._last_task_time = time.time()
         self._layers = layers if layers is not None else []
 
-    def stop(self) -> None:
-        """Signal the worker to stop processing."""
-        self._stop_event.set()
-
-    @property
-    def is_idle(self) -> bool:
-        """Check if the worker is currently idle."""
-        # Worker is idle if it hasn't processed a task recently (within 0.2 seconds)
-        return (time.time() - self._last_task_time) > 0.2
-
-    @property
-    def idle_duration(self) -> float:
-        """Get the duration in seconds since the worker last processed a task."""
-        return time.time() - self._last_task_time
-
-    @property
-    def worker_id(self) -> int:
-        """Get the worker's ID."""
-        return self._worker_id
-
-    @override
-    def run(self) -> None:
+    def execute(self, node_id: str) -> None:
         """
-        Main worker loop.
+        Execute a node taken from the ready queue and mark it done.
 
-        Continuously pulls node IDs from ready_queue, executes them,
-        and pushes events to event_queue until stopped.
+        Args:
+            node_id: ID of the node to execute
         """
-        while not self._stop_event.is_set():
-            # Try to get a node ID from the ready queue (with timeout)
-            try:
-                node_id = self._ready_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-
-            self._last_task_time = time.time()
-            node = self._graph.nodes[node_id]
-            try:
-                self._execute_node(node)
-                self._ready_queue.task_done()
-            except Exception as e:
-                error_event = NodeRunFailedEvent(
-                    id=str(uuid4()),
-                    node_id=node.id,
-                    node_type=node.node_type,
-                    in_iteration_id=None,
-                    error=str(e),
-                    start_at=datetime.now(),
-                )
-                self._event_queue.put(error_event)
+        node = self._graph.nodes[node_id]
+        try:
+            self._execute_node(node)
+            self._ready_queue.task_done()
+        except Exception as e:
+            error_event = NodeRunFailedEvent(
+                id=str(uuid4()),
+                node_id=node.id,
+                node_type=node.node_type,
+                in_iteration_id=None,
+                error=str(e),
+                start_at=datetime.now(),
+            )
+            self._event_queue.put(error_event)
 
     def _execute_node(self, node: Node) -> None:
         """
@@ -175,3 +143,90 @@ class Worker(threading.Thread):
             except Exception:
                 # Silently ignore layer errors to prevent disrupting node execution
                 continue
+
+
+@final
+class Worker(threading.Thread):
+    """
+    Worker thread that executes nodes from the ready queue.
+
+    Workers continuously pull node IDs from the ready_queue, execute the
+    corresponding nodes, and push the resulting events to the event_queue
+    for the dispatcher to process.
+    """
+
+    def __init__(
+        self,
+        ready_queue: ReadyQueue,
+        event_queue: queue.Queue[GraphNodeEventBase],
+        graph: Graph,
+        layers: Sequence[GraphEngineLayer],
+        worker_id: int = 0,
+        flask_app: Flask | None = None,
+        context_vars: contextvars.Context | None = None,
+    ) -> None:
+        """
+        Initialize worker thread.
+
+        Args:
+            ready_queue: Ready queue containing node IDs ready for execution
+            event_queue: Queue for pushing execution events
+            graph: Graph containing nodes to execute
+            layers: Graph engine layers for node execution hooks
+            worker_id: Unique identifier for this worker
+            flask_app: Optional Flask application for context preservation
+            context_vars: Optional context variables to preserve in worker thread
+        """
+        super().__init__(name=f"GraphWorker-{worker_id}", daemon=True)
+        self._ready_queue = ready_queue
+        self._worker_id = worker_id
+        self._stop_event = threading.Event()
+        self._last_task_time = time.time()
+        self._node_executor = NodeExecutor(
+            ready_queue=ready_queue,
+            event_queue=event_queue,
+            graph=graph,
+            layers=layers,
+            flask_app=flask_app,
+            context_vars=context_vars,
+        )
+
+    def stop(self) -> None:
+        """Signal the worker to stop processing and wake it if it is waiting for a node."""
+        self._stop_event.set()
+        self._ready_queue.wake_waiters()
+
+    @property
+    def is_idle(self) -> bool:
+        """Check if the worker is currently idle."""
+        # Worker is idle if it hasn't processed a task recently (within 0.2 seconds)
+        return (time.time() - self._last_task_time) > 0.2
+
+    @property
+    def idle_duration(self) -> float:
+        """Get the duration in seconds since the worker last processed a task."""
+        return time.time() - self._last_task_time
+
+    @property
+    def worker_id(self) -> int:
+        """Get the worker's ID."""
+        return self._worker_id
+
+    @override
+    def run(self) -> None:
+        """
+        Main worker loop.
+
+        Continuously pulls node IDs from ready_queue, executes them,
+        and pushes events to event_queue until stopped.
+        """
+        while not self._stop_event.is_set():
+            # Block until a node is ready, stop() wakes the worker through the ready queue.
+            # The timeout only bounds the wait if stop() lands between the check above and get().
+            try:
+                node_id = self._ready_queue.get(timeout=_STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+
+            self._last_task_time = time.time()
+            self._node_executor.execute(node_id)
@@ -2,11 +2,16 @@
 Worker management subsystem for graph engine.
 
 This package manages the worker pool, including creation,
-scaling, and activity tracking.
+scaling, and activity tracking, and the worker pool shared by
+all engines of the process.
 """
 
+from .shared_worker_pool import SharedWorkerPool, SharedWorkerPoolClient, get_shared_worker_pool
 from .worker_pool import WorkerPool
 
 __all__ = [
+    "SharedWorkerPool",
+    "SharedWorkerPoolClient",
     "WorkerPool",
+    "get_shared_worker_pool",
 ]
@@ -0,0 +1,389 @@
+"""
+Process-wide worker pool shared by all GraphEngine instances.
+
+Instead of starting dedicated worker threads per engine, engines register
+their run with the shared pool, which executes ready nodes of all runs on
+one bounded set of threads. Runs are served round-robin, one node at a
+time, and the number of nodes executing at once is capped per run and
+per tenant.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, final
+
+from configs import dify_config
+from core.workflow.enums import NodeExecutionType
+from core.workflow.graph import Graph
+from core.workflow.graph_events import GraphNodeEventBase
+
+from ..layers.base import GraphEngineLayer
+from ..ready_queue import ReadyQueue
+from ..worker import NodeExecutor
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from contextvars import Context
+
+    from flask import Flask
+
+
+@final
+class _SharedWorker(threading.Thread):
+    """Thread of the shared worker pool, tracks whether it is blocked on nested runs."""
+
+    def __init__(self, pool: "SharedWorkerPool", worker_id: int) -> None:
+        super().__init__(name=f"SharedGraphWorker-{worker_id}", daemon=True)
+        self.pool = pool
+        self.blocked = False
+        self.tenant_id: str | None = None
+
+    def run(self) -> None:
+        self.pool.worker_loop(self)
+
+
+@final
+class _Run:
+    """Scheduling state of one engine run registered with the shared pool."""
+
+    def __init__(self, client: "SharedWorkerPoolClient", tenant_id: str, max_running: int) -> None:
+        self.client = client
+        self.tenant_id = tenant_id
+        self.max_running = max_running
+        self.running = 0
+        self.queued = False
+        self.stopped = False
+
+
+@final
+class SharedWorkerPool:
+    """
+    Bounded pool of threads executing the nodes of all registered runs.
+
+    Runs with ready nodes wait in a round-robin queue, a worker takes one node
+    of the first run that is below its own cap and its tenant's cap, then puts
+    the run back at the end of the queue.
+
+    A worker that runs a container node (iteration, loop) or starts a nested
+    engine blocks until the nested run finishes, which needs other workers.
+    Such workers are marked blocked and count neither against max_workers nor
+    against the tenant cap, so nested runs can never starve the pool.
+    """
+
+    def __init__(self, max_workers: int, max_workers_per_tenant: int, idle_time: float) -> None:
+        """
+        Initialize the shared worker pool, threads are started on demand.
+
+        Args:
+            max_workers: Maximum number of unblocked worker threads
+            max_workers_per_tenant: Maximum number of nodes executing at once per tenant (0 for no limit)
+            idle_time: Seconds of idle time before a worker thread exits
+        """
+        self._max_workers = max_workers
+        self._max_workers_per_tenant = max_workers_per_tenant
+        self._idle_time = idle_time
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._run_finished = threading.Condition(self._lock)
+        self._ready_runs: deque[_Run] = deque()
+        self._tenant_running: Counter[str] = Counter()
+        self._workers: set[_SharedWorker] = set()
+        self._worker_counter = 0
+        self._idle_workers = 0
+        self._blocked_workers = 0
+
+    def register(self, client: "SharedWorkerPoolClient", tenant_id: str, max_running: int) -> _Run:
+        """Register a run whose ready nodes should be executed by the pool."""
+        return _Run(client=client, tenant_id=tenant_id, max_running=max_running)
+
+    def notify_ready(self, run: _Run) -> None:
+        """Signal that the ready queue of a run has nodes to execute."""
+        with self._lock:
+            if run.stopped or run.queued:
+                return
+            run.queued = True
+            self._ready_runs.append(run)
+            self._wake_worker()
+
+    def unregister(self, run: _Run, timeout: float) -> None:
+        """
+        Stop scheduling nodes of a run and wait for its executing nodes to finish.
+
+        Nodes still in the ready queue of the run are left there.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            run.stopped = True
+            while run.running > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Timed out waiting for %d running nodes of a stopped run", run.running)
+                    return
+                _ = self._run_finished.wait(remaining)
+
+    def begin_blocking(self) -> _SharedWorker | None:
+        """
+        Mark the current thread as blocked if it is an unblocked worker of this pool.
+
+        Returns:
+            The worker to pass to end_blocking(), or None if nothing was marked
+        """
+        worker = threading.current_thread()
+        if not isinstance(worker, _SharedWorker) or worker.pool is not self or worker.blocked:
+            return None
+        with self._lock:
+            worker.blocked = True
+            self._blocked_workers += 1
+            if worker.tenant_id is not None:
+                self._release_tenant(worker.tenant_id)
+            if self._ready_runs:
+                self._wake_worker()
+        return worker
+
+    def end_blocking(self, worker: _SharedWorker | None) -> None:
+        """Unmark a worker marked by begin_blocking()."""
+        if worker is None:
+            return
+        with self._lock:
+            worker.blocked = False
+            self._blocked_workers -= 1
+            if worker.tenant_id is not None:
+                self._tenant_running[worker.tenant_id] += 1
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get pool status information.
+
+        Returns:
+            Dictionary with status information
+        """
+        with self._lock:
+            return {
+                "total_workers": len(self._workers),
+                "idle_workers": self._idle_workers,
+                "blocked_workers": self._blocked_workers,
+                "ready_runs": len(self._ready_runs),
+                "max_workers": self._max_workers,
+            }
+
+    def _release_tenant(self, tenant_id: str) -> None:
+        """Count one node of a tenant less as executing. Requires the lock."""
+        self._tenant_running[tenant_id] -= 1
+        if not self._tenant_running[tenant_id]:
+            del self._tenant_running[tenant_id]
+
+    def _wake_worker(self) -> None:
+        """Wake an idle worker, or start one if none is idle and the pool has room. Requires the lock."""
+        if self._idle_workers > 0:
+            self._work_available.notify()
+        elif len(self._workers) - self._blocked_workers < self._max_workers:
+            worker = _SharedWorker(self, self._worker_counter)
+            self._worker_counter += 1
+            self._workers.add(worker)
+            worker.start()
+
+    def _take_node(self) -> tuple[_Run, str] | None:
+        """Take the next node to execute, round-robin over the ready runs. Requires the lock."""
+        for _ in range(len(self._ready_runs)):
+            run = self._ready_runs.popleft()
+            if run.stopped:
+                run.queued = False
+                continue
+            if run.running >= run.max_running or (
+                self._max_workers_per_tenant and self._tenant_running[run.tenant_id] >= self._max_workers_per_tenant
+            ):
+                self._ready_runs.append(run)
+                continue
+            node_id = run.client.take_ready_node()
+            if node_id is None:
+                run.queued = False
+                continue
+            self._ready_runs.append(run)
+            run.running += 1
+            self._tenant_running[run.tenant_id] += 1
+            return run, node_id
+        return None
+
+    def worker_loop(self, worker: _SharedWorker) -> None:
+        """Execute ready nodes on a worker thread until it is idle for too long or the pool has too many workers."""
+        while True:
+            with self._lock:
+                while True:
+                    if len(self._workers) - self._blocked_workers > self._max_workers:
+                        # Surplus worker started while other workers were blocked, pass on a pending wakeup
+                        self._workers.discard(worker)
+                        if self._ready_runs:
+                            self._wake_worker()
+                        return
+                    task = self._take_node()
+                    if task is not None:
+                        break
+                    self._idle_workers += 1
+                    notified = self._work_available.wait(self._idle_time)
+                    self._idle_workers -= 1
+                    if not notified and not self._ready_runs:
+                        self._workers.discard(worker)
+                        return
+                # Let another worker pick up the remaining ready nodes
+                if self._ready_runs:
+                    self._wake_worker()
+
+            run, node_id = task
+            worker.tenant_id = run.tenant_id
+            try:
+                run.client.execute(node_id)
+            finally:
+                with self._lock:
+                    worker.tenant_id = None
+                    run.running -= 1
+                    self._release_tenant(run.tenant_id)
+                    self._run_finished.notify_all()
+
+
+@final
+class SharedWorkerPoolClient:
+    """
+    Per-engine handle on the shared worker pool.
+
+    Provides the same interface as WorkerPool, so the engine can use either.
+    The dispatcher calls check_and_scale() after handling each event, which
+    is when new nodes may have been put in the ready queue, and the client
+    then offers its run to the shared pool.
+    """
+
+    def __init__(
+        self,
+        ready_queue: ReadyQueue,
+        event_queue: queue.Queue[GraphNodeEventBase],
+        graph: Graph,
+        layers: list[GraphEngineLayer],
+        flask_app: "Flask | None" = None,
+        context_vars: "Context | None" = None,
+        max_workers: int | None = None,
+        shared_pool: SharedWorkerPool | None = None,
+    ) -> None:
+        """
+        Initialize the shared worker pool client.
+
+        Args:
+            ready_queue: Ready queue for nodes ready for execution
+            event_queue: Queue for worker events
+            graph: The workflow graph
+            layers: Graph engine layers for node execution hooks
+            flask_app: Optional Flask app for context preservation
+            context_vars: Optional context variables
+            max_workers: Maximum number of nodes of this run executing at once
+            shared_pool: Shared pool to execute nodes on, the process-wide pool by default
+        """
+        self._ready_queue = ready_queue
+        self._graph = graph
+        self._max_workers = max_workers or dify_config.GRAPH_ENGINE_MAX_WORKERS
+        self._shared_pool = shared_pool or get_shared_worker_pool()
+        self._node_executor = NodeExecutor(
+            ready_queue=ready_queue,
+            event_queue=event_queue,
+            graph=graph,
+            layers=layers,
+            flask_app=flask_app,
+            context_vars=context_vars,
+        )
+
+        self._lock = threading.Lock()
+        self._run: _Run | None = None
+        self._blocked_worker: _SharedWorker | None = None
+
+    def start(self, initial_count: int | None = None) -> None:
+        """
+        Register the run with the shared pool.
+
+        Args:
+            initial_count: Unused, workers are shared
+        """
+        with self._lock:
+            if self._run is not None:
+                return
+
+            # A nested engine started on a shared worker keeps that worker busy until it finishes
+            self._blocked_worker = self._shared_pool.begin_blocking()
+            self._run = self._shared_pool.register(
+                client=self,
+                tenant_id=self._graph.root_node.tenant_id,
+                max_running=self._max_workers,
+            )
+
+        self.check_and_scale()
+
+    def stop(self) -> None:
+        """Unregister the run and wait for its executing nodes to finish."""
+        with self._lock:
+            run, self._run = self._run, None
+            blocked_worker, self._blocked_worker = self._blocked_worker, None
+
+        if run is not None:
+            self._shared_pool.unregister(run, timeout=10.0)
+        self._shared_pool.end_blocking(blocked_worker)
+
+    def check_and_scale(self) -> None:
+        """Offer the run to the shared pool if its ready queue has nodes."""
+        run = self._run
+        if run is not None and not self._ready_queue.empty():
+            self._shared_pool.notify_ready(run)
+
+    def take_ready_node(self) -> str | None:
+        """Take the next ready node without blocking, None if the ready queue is empty."""
+        try:
+            return self._ready_queue.get(timeout=0)
+        except queue.Empty:
+            return None
+
+    def execute(self, node_id: str) -> None:
+        """Execute a node on the current shared worker thread."""
+        if self._graph.nodes[node_id].execution_type != NodeExecutionType.CONTAINER:
+            self._node_executor.execute(node_id)
+            return
+
+        blocked_worker = self._shared_pool.begin_blocking()
+        try:
+            self._node_executor.execute(node_id)
+        finally:
+            self._shared_pool.end_blocking(blocked_worker)
+
+    def get_worker_count(self) -> int:
+        """Get current number of nodes of this run executing on the shared pool."""
+        run = self._run
+        return run.running if run is not None else 0
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get client status information.
+
+        Returns:
+            Dictionary with status information
+        """
+        return {
+            "total_workers": self.get_worker_count(),
+            "queue_depth": self._ready_queue.qsize(),
+            "max_workers": self._max_workers,
+        }
+
+
+_shared_worker_pool: SharedWorkerPool | None = None
+_shared_worker_pool_lock = threading.Lock()
+
+
+def get_shared_worker_pool() -> SharedWorkerPool:
+    """Get the process-wide shared worker pool."""
+    global _shared_worker_pool
+    with _shared_worker_pool_lock:
+        if _shared_worker_pool is None:
+            _shared_worker_pool = SharedWorkerPool(
+                max_workers=dify_config.GRAPH_ENGINE_SHARED_POOL_MAX_WORKERS,
+                max_workers_per_tenant=dify_config.GRAPH_ENGINE_SHARED_POOL_MAX_WORKERS_PER_TENANT,
+                idle_time=dify_config.GRAPH_ENGINE_SCALE_DOWN_IDLE_TIME,
+            )
+        return _shared_worker_pool
@@ -1,11 +1,17 @@
+import contextvars
 import csv
+import hashlib
 import io
 import json
 import logging
+import multiprocessing
 import os
 import tempfile
-from collections.abc import Mapping, Sequence
-from typing import Any
+import threading
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Any
 
 import charset_normalizer
 import docx
@@ -23,6 +29,7 @@ from docx.text.paragraph import Paragraph
 from configs import dify_config
 from core.file import File, FileTransferMethod, file_manager
 from core.helper import ssrf_proxy
+from core.rag.extractor.extracted_text_cache import extracted_text_cache
 from core.variables import ArrayFileSegment
 from core.variables.segments import ArrayStringSegment, FileSegment
 from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
@@ -34,6 +41,24 @@ from .exc import DocumentExtractorError, FileDownloadError, TextExtractionError,
 
 logger = logging.getLogger(__name__)
 
+# PDFium is not thread-safe, PDFs parsed in the calling threads are parsed one at a time
+_pdfium_lock = threading.Lock()
+
+# File types parsed from the downloaded file by `_parse_file`, in the parser processes when they are enabled
+_PARSED_FILE_FORMATS = {
+    ".pdf": "pdf",
+    "application/pdf": "pdf",
+    ".docx": "docx",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    ".xls": "excel",
+    ".xlsx": "excel",
+    "application/vnd.ms-excel": "excel",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "excel",
+}
+
+_parser_pool: ProcessPoolExecutor | None = None
+_parser_pool_lock = threading.Lock()
+
 
 class DocumentExtractorNode(Node[DocumentExtractorNodeData]):
     """
@@ -64,7 +89,7 @@ class DocumentExtractorNode(Node[DocumentExtractorNodeData]):
 
         try:
             if isinstance(value, list):
-                extracted_text_list = list(map(_extract_text_from_file, value))
+                extracted_text_list = _extract_text_from_files(value)
                 return NodeRunResult(
                     status=WorkflowNodeExecutionStatus.SUCCEEDED,
                     inputs=inputs,
@@ -297,16 +322,20 @@ def _extract_text_from_yaml(file_content: bytes) -> str:
             raise TextExtractionError(f"Failed to decode or parse YAML file: {e}") from e
 
 
-def _extract_text_from_pdf(file_content: bytes) -> str:
+def _extract_text_from_pdf(file_content: bytes | IO[bytes]) -> str:
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
-        text = ""
-        for page in pdf_document:
-            text_page = page.get_textpage()
-            text += text_page.get_text_range()
-            text_page.close()
-            page.close()
+        pdf_file = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+        with _pdfium_lock:
+            pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
+            try:
+                text = ""
+                for page in pdf_document:
+                    text_page = page.get_textpage()
+                    text += text_page.get_text_range()
+                    text_page.close()
+                    page.close()
+            finally:
+                pdf_document.close()
         return text
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from PDF: {str(e)}") from e
@@ -345,13 +374,13 @@ def parser_docx_part(block, doc: Document, content_items, i):
         content_items.append((i, "table", Table(block, doc)))
 
 
-def _extract_text_from_docx(file_content: bytes) -> str:
+def _extract_text_from_docx(file_content: bytes | IO[bytes]) -> str:
     """
     Extract text from a DOCX file.
     For now support only paragraph and table add more if needed
     """
     try:
-        doc_file = io.BytesIO(file_content)
+        doc_file = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
         doc = docx.Document(doc_file)
         text = []
 
@@ -405,32 +434,138 @@ def _extract_text_from_docx(file_content: bytes) -> str:
         raise TextExtractionError(f"Failed to extract text from DOCX: {str(e)}") from e
 
 
-def _download_file_content(file: File) -> bytes:
-    """Download the content of a file based on its transfer method."""
-    try:
-        if file.transfer_method == FileTransferMethod.REMOTE_URL:
-            if file.remote_url is None:
-                raise FileDownloadError("Missing URL for remote file")
-            response = ssrf_proxy.get(file.remote_url)
+def _iter_file_content(file: File) -> Iterator[bytes]:
+    """Yield the content of a file in chunks, based on its transfer method."""
+    if file.transfer_method == FileTransferMethod.REMOTE_URL:
+        if file.remote_url is None:
+            raise FileDownloadError("Missing URL for remote file")
+        with ssrf_proxy.get(file.remote_url, stream=True) as response:
             response.raise_for_status()
-            return response.content
-        else:
-            return file_manager.download(file)
+            yield from response.iter_bytes()
+    else:
+        yield from file_manager.download_stream(file)
+
+
+def _download_file_to(file: File, target: IO[bytes]) -> str:
+    """Stream the content of a file into `target` and return its sha256."""
+    content_hash = hashlib.sha256()
+    try:
+        for chunk in _iter_file_content(file):
+            content_hash.update(chunk)
+            target.write(chunk)
+    except FileDownloadError:
+        raise
     except Exception as e:
         raise FileDownloadError(f"Error downloading file: {str(e)}") from e
+    return content_hash.hexdigest()
+
+
+def _parse_file(path: str, file_type: str) -> str:
+    """Parse a downloaded PDF, DOCX or spreadsheet file."""
+    with open(path, "rb") as file:
+        match _PARSED_FILE_FORMATS[file_type]:
+            case "pdf":
+                return _extract_text_from_pdf(file)
+            case "docx":
+                return _extract_text_from_docx(file)
+            case _:
+                return _extract_text_from_excel(file.read())
+
+
+def _get_parser_pool() -> ProcessPoolExecutor | None:
+    global _parser_pool
+    if dify_config.DOCUMENT_EXTRACTOR_PARSER_PROCESSES <= 0:
+        return None
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            # Spawn instead of forking the threads of the API process
+            _parser_pool = ProcessPoolExecutor(
+                max_workers=dify_config.DOCUMENT_EXTRACTOR_PARSER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parser_pool
+
+
+def _discard_parser_pool(parser_pool: ProcessPoolExecutor):
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is parser_pool:
+            _parser_pool = None
+    parser_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_downloaded_file(path: str, file_type: str) -> str:
+    """
+    Parse a downloaded PDF, DOCX or spreadsheet file in a parser process, or in the calling thread if they are
+    disabled.
+
+    Parsing these formats is CPU-bound and mostly runs in Python or holds the PDFium lock, so threads can not
+    parse files in parallel.
+    """
+    parser_pool = _get_parser_pool()
+    if parser_pool is None:
+        return _parse_file(path, file_type)
+
+    try:
+        return parser_pool.submit(_parse_file, path, file_type).result()
+    except BrokenProcessPool as e:
+        # A parser process crashed, for example on a malformed PDF, start new ones for the next files
+        _discard_parser_pool(parser_pool)
+        raise TextExtractionError(f"Parser process terminated while extracting text: {str(e)}") from e
 
 
-def _extract_text_from_file(file: File):
-    file_content = _download_file_content(file)
+def _extract_text_from_file(file: File) -> str:
     if file.extension:
-        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
+        file_type = file.extension
     elif file.mime_type:
-        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
+        file_type = file.mime_type
     else:
         raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
+
+    # Download to a temporary file instead of memory, PDF, DOCX and spreadsheet files are parsed from it directly
+    with tempfile.NamedTemporaryFile() as temp_file:
+        content_hash = _download_file_to(file, temp_file)
+        # Scoped to the tenant like the entries of ExtractProcessor
+        extractor = f"document_extractor:{file.tenant_id}:{file_type}"
+        cached_text = extracted_text_cache.get(content_hash, extractor, source="document_extractor")
+        if cached_text is not None:
+            return cached_text
+
+        temp_file.flush()
+        temp_file.seek(0)
+        if file_type in _PARSED_FILE_FORMATS:
+            extracted_text = _parse_downloaded_file(temp_file.name, file_type)
+        elif file.extension:
+            extracted_text = _extract_text_by_file_extension(file_content=temp_file.read(), file_extension=file_type)
+        else:
+            extracted_text = _extract_text_by_mime_type(file_content=temp_file.read(), mime_type=file_type)
+
+    extracted_text_cache.set(content_hash, extractor, extracted_text)
     return extracted_text
 
 
+def _extract_text_from_files(files: Sequence[File]) -> list[str]:
+    """
+    Extract text from files in parallel, keeping their order.
+
+    Threads overlap the downloads. PDF, DOCX and spreadsheet files are parsed in parallel only with
+    `DOCUMENT_EXTRACTOR_PARSER_PROCESSES`, otherwise their parsing is serialized by the GIL or the PDFium lock.
+    """
+    max_workers = min(dify_config.DOCUMENT_EXTRACTOR_MAX_WORKERS, len(files))
+    if max_workers <= 1:
+        return [_extract_text_from_file(file) for file in files]
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="document_extractor") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _extract_text_from_file, file) for file in files]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            # Do not start extracting the remaining files, the node fails anyway
+            for future in futures:
+                future.cancel()
+            raise
+
+
 def _extract_text_from_csv(file_content: bytes) -> str:
     try:
         # Detect encoding using charset_normalizer
@@ -516,12 +516,12 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         return variable_mapping
 
     def _extract_conversation_variable_snapshot(self, *, variable_pool: VariablePool) -> dict[str, VariableUnion]:
-        conversation_variables = variable_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
-        return {name: variable.model_copy(deep=True) for name, variable in conversation_variables.items()}
+        # Variables are replaced rather than mutated in place, so sharing them with the iteration's pool is safe.
+        return variable_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)
 
     def _sync_conversation_variables_from_snapshot(self, snapshot: dict[str, VariableUnion]) -> None:
         parent_pool = self.graph_runtime_state.variable_pool
-        parent_conversations = parent_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
+        parent_conversations = parent_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)
 
         current_keys = set(parent_conversations.keys())
         snapshot_keys = set(snapshot.keys())
@@ -530,6 +530,8 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
             parent_pool.remove((CONVERSATION_VARIABLE_NODE_ID, removed_key))
 
         for name, variable in snapshot.items():
+            if parent_conversations.get(name) is variable:
+                continue
             parent_pool.add((CONVERSATION_VARIABLE_NODE_ID, name), variable)
 
     def _append_iteration_info_to_event(
@@ -604,8 +606,8 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
             invoke_from=self.invoke_from.value,
             call_depth=self.workflow_call_depth,
         )
-        # Create a deep copy of the variable pool for each iteration
-        variable_pool_copy = self.graph_runtime_state.variable_pool.model_copy(deep=True)
+        # Layer a copy-on-write pool over the parent pool for each iteration
+        variable_pool_copy = self.graph_runtime_state.variable_pool.create_child()
 
         # append iteration variable (item, index) to variable pool
         variable_pool_copy.add([self._node_id, "index"], index)
@@ -25,6 +25,10 @@ class ReadyQueueProtocol(Protocol):
         """Return the next node identifier, blocking until available or timeout expires."""
         ...
 
+    def wake_waiters(self) -> None:
+        """Wake every thread blocked in get(), the woken calls raise queue.Empty."""
+        ...
+
     def task_done(self) -> None:
         """Signal that the most recently dequeued node has completed processing."""
         ...
@@ -26,9 +26,8 @@ class ReadOnlyVariablePoolWrapper:
     def get_all_by_node(self, node_id: str) -> Mapping[str, object]:
         """Return a copy of all variables for the specified node."""
         variables: dict[str, object] = {}
-        if node_id in self._variable_pool.variable_dictionary:
-            for key, variable in self._variable_pool.variable_dictionary[node_id].items():
-                variables[key] = deepcopy(variable.value)
+        for key, variable in self._variable_pool.get_node_variables(node_id).items():
+            variables[key] = deepcopy(variable.value)
         return variables
 
     def get_by_prefix(self, prefix: str) -> Mapping[str, object]:
@@ -4,7 +4,7 @@ from collections.abc import Mapping, Sequence
 from copy import deepcopy
 from typing import Annotated, Any, Union, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, SerializerFunctionWrapHandler, field_serializer
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, Variable
@@ -57,6 +57,13 @@ class VariablePool(BaseModel):
         default_factory=list,
     )
 
+    # A child pool created by `create_child` reads through to `_parent_variables`, a snapshot of the parent's
+    # variables taken when the child was created, and only stores its own writes in `variable_dictionary`. Removals
+    # are recorded as masks so they hide the snapshot's entries without touching them.
+    _parent_variables: dict[str, dict[str, VariableUnion]] | None = PrivateAttr(default=None)
+    _removed_node_ids: set[str] = PrivateAttr(default_factory=set)
+    _removed_selectors: set[tuple[str, str]] = PrivateAttr(default_factory=set)
+
     def model_post_init(self, context: Any, /):
         # Create a mapping from field names to SystemVariableKey enum values
         self._add_system_variables(self.system_variables)
@@ -115,6 +122,7 @@ class VariablePool(BaseModel):
         # Based on the definition of `VariableUnion`,
         # `list[Variable]` can be safely used as `list[VariableUnion]` since they are compatible.
         self.variable_dictionary[node_id][name] = cast(VariableUnion, variable)
+        self._removed_selectors.discard((node_id, name))
 
     @classmethod
     def _selector_to_keys(cls, selector: Sequence[str]) -> tuple[str, str]:
@@ -122,11 +130,19 @@ class VariablePool(BaseModel):
 
     def _has(self, selector: Sequence[str]) -> bool:
         node_id, name = self._selector_to_keys(selector)
-        if node_id not in self.variable_dictionary:
-            return False
-        if name not in self.variable_dictionary[node_id]:
-            return False
-        return True
+        return self._lookup(node_id, name) is not None
+
+    def _lookup(self, node_id: str, name: str) -> VariableUnion | None:
+        node_map = self.variable_dictionary.get(node_id)
+        if node_map is not None and name in node_map:
+            return node_map[name]
+        if (
+            self._parent_variables is None
+            or node_id in self._removed_node_ids
+            or (node_id, name) in self._removed_selectors
+        ):
+            return None
+        return self._parent_variables.get(node_id, {}).get(name)
 
     def get(self, selector: Sequence[str], /) -> Segment | None:
         """
@@ -153,11 +169,7 @@ class VariablePool(BaseModel):
             return None
 
         node_id, name = self._selector_to_keys(selector)
-        node_map = self.variable_dictionary.get(node_id)
-        if node_map is None:
-            return None
-
-        segment: Segment | None = node_map.get(name)
+        segment: Segment | None = self._lookup(node_id, name)
 
         if segment is None:
             return None
@@ -220,9 +232,13 @@ class VariablePool(BaseModel):
             return
         if len(selector) == 1:
             self.variable_dictionary[selector[0]] = {}
+            if self._parent_variables is not None:
+                self._removed_node_ids.add(selector[0])
             return
         key, hash_key = self._selector_to_keys(selector)
         self.variable_dictionary[key].pop(hash_key, None)
+        if self._parent_variables is not None:
+            self._removed_selectors.add((key, hash_key))
 
     def convert_template(self, template: str, /):
         parts = VARIABLE_PATTERN.split(template)
@@ -243,7 +259,7 @@ class VariablePool(BaseModel):
     def get_by_prefix(self, prefix: str, /) -> Mapping[str, object]:
         """Return a copy of all variables stored under the given node prefix."""
 
-        nodes = self.variable_dictionary.get(prefix)
+        nodes = self.get_node_variables(prefix)
         if not nodes:
             return {}
 
@@ -254,6 +270,56 @@ class VariablePool(BaseModel):
 
         return result
 
+    def get_node_variables(self, node_id: str, /) -> dict[str, VariableUnion]:
+        """
+        Return the variables stored under the given node id, including those visible through the parent pool.
+
+        The returned mapping is a new dict, but the variables themselves are shared with the pool and must be
+        treated as immutable. Use `add` to replace a variable instead of mutating it in place.
+        """
+        variables: dict[str, VariableUnion] = {}
+        if self._parent_variables is not None and node_id not in self._removed_node_ids:
+            for name, variable in self._parent_variables.get(node_id, {}).items():
+                if (node_id, name) not in self._removed_selectors:
+                    variables[name] = variable
+        variables.update(self.variable_dictionary.get(node_id, {}))
+        return variables
+
+    def create_child(self) -> "VariablePool":
+        """
+        Create a copy-on-write child pool layered on top of a snapshot of this pool.
+
+        The child sees the variables of this pool as they were when it was created, like a deep copy would, while
+        `add` and `remove` on the child only affect the child. Later writes to this pool, such as outputs of
+        parallel branches or synced conversation variables, are not visible to the child. This replaces
+        `model_copy(deep=True)` for sub-graphs such as iterations, where copying large upstream outputs for every
+        item dominates CPU and memory: only the per-node mappings are copied, the variables are shared and must not
+        be mutated in place.
+        """
+        child = self.model_copy(update={"variable_dictionary": defaultdict(dict)})
+        child._parent_variables = {node_id: self.get_node_variables(node_id) for node_id in self._get_node_ids()}
+        child._removed_node_ids = set()
+        child._removed_selectors = set()
+        return child
+
+    def _get_node_ids(self) -> set[str]:
+        node_ids = set(self.variable_dictionary.keys())
+        if self._parent_variables is not None:
+            node_ids.update(node_id for node_id in self._parent_variables if node_id not in self._removed_node_ids)
+        return node_ids
+
+    @field_serializer("variable_dictionary", mode="wrap")
+    def _serialize_variable_dictionary(
+        self, variable_dictionary: defaultdict[str, dict[str, VariableUnion]], handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        # Child pools are flattened so that a dumped pool can be restored without its parent.
+        if self._parent_variables is None:
+            return handler(variable_dictionary)
+        flattened: defaultdict[str, dict[str, VariableUnion]] = defaultdict(dict)
+        for node_id in self._get_node_ids():
+            flattened[node_id] = self.get_node_variables(node_id)
+        return handler(flattened)
+
     def _add_system_variables(self, system_variable: SystemVariable):
         sys_var_mapping = system_variable.to_dict()
         for key, value in sys_var_mapping.items():
@@ -110,6 +110,12 @@ def init_app(app: DifyApp) -> Celery:
             "task": "schedule.clean_embedding_cache_task.clean_embedding_cache_task",
             "schedule": crontab(minute="0", hour="2", day_of_month=f"*/{day}"),
         }
+    if dify_config.ENABLE_CLEAN_EXTRACTED_TEXT_CACHE_TASK:
+        imports.append("schedule.clean_extracted_text_cache_task")
+        beat_schedule["clean_extracted_text_cache_task"] = {
+            "task": "schedule.clean_extracted_text_cache_task.clean_extracted_text_cache_task",
+            "schedule": crontab(minute="30", hour="2", day_of_month=f"*/{day}"),
+        }
     if dify_config.ENABLE_CLEAN_UNUSED_DATASETS_TASK:
         imports.append("schedule.clean_unused_datasets_task")
         beat_schedule["clean_unused_datasets_task"] = {
@@ -172,6 +178,12 @@ def init_app(app: DifyApp) -> Celery:
             "task": "schedule.trigger_provider_refresh_task.trigger_provider_refresh",
             "schedule": timedelta(minutes=dify_config.TRIGGER_PROVIDER_REFRESH_INTERVAL),
         }
+    if dify_config.API_TOKEN_AUTH_CACHE_ENABLED:
+        imports.append("schedule.flush_api_token_last_used_task")
+        beat_schedule["flush_api_token_last_used_task"] = {
+            "task": "schedule.flush_api_token_last_used_task.flush_api_token_last_used_task",
+            "schedule": timedelta(seconds=dify_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL),
+        }
     celery_app.conf.update(beat_schedule=beat_schedule, imports=imports)
 
     return celery_app
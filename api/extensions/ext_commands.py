@@ -7,6 +7,7 @@ def init_app(app: DifyApp):
         cleanup_orphaned_draft_variables,
         clear_free_plan_tenant_expired_logs,
         clear_orphaned_file_records,
+        convert_embedding_cache,
         convert_to_agent_apps,
         create_tenant,
         extract_plugins,
@@ -54,6 +55,7 @@ def init_app(app: DifyApp):
         setup_datasource_oauth_client,
         transform_datasource_credentials,
         install_rag_pipeline_plugins,
+        convert_embedding_cache,
     ]
     for cmd in cmds_to_register:
         app.cli.add_command(cmd)
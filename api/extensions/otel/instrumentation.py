@@ -1,17 +1,19 @@
 import contextlib
 import logging
+from collections.abc import Iterable
 
 import flask
 from opentelemetry.instrumentation.celery import CeleryInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.instrumentation.redis import RedisInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-from opentelemetry.metrics import get_meter, get_meter_provider
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter, get_meter_provider
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace import Span, get_tracer_provider
 from opentelemetry.trace.status import StatusCode
 
 from configs import dify_config
+from core.helper.http_client_pooling import get_connection_counts, get_pooled_http_clients
 from dify_app import DifyApp
 from extensions.otel.runtime import is_celery_worker
 
@@ -97,6 +99,23 @@ def init_httpx_instrumentor() -> None:
     HTTPXClientInstrumentor().instrument()
 
 
+def init_http_client_pool_instrumentor() -> None:
+    meter = get_meter("http_client_pool", version=dify_config.project.version)
+
+    def observe_connections(options: CallbackOptions) -> Iterable[Observation]:
+        for key, client in get_pooled_http_clients().items():
+            active, idle = get_connection_counts(client)
+            yield Observation(active, {"pool": key, "state": "active"})
+            yield Observation(idle, {"pool": key, "state": "idle"})
+
+    meter.create_observable_gauge(
+        "http.client.pool.connections",
+        callbacks=[observe_connections],
+        description="Connections held by pooled HTTP clients, by pool and state (active, idle)",
+        unit="{connection}",
+    )
+
+
 def init_instruments(app: DifyApp) -> None:
     if not is_celery_worker():
         init_flask_instrumentor(app)
@@ -106,3 +125,4 @@ def init_instruments(app: DifyApp) -> None:
     init_sqlalchemy_instrumentor(app)
     init_redis_instrumentor()
     init_httpx_instrumentor()
+    init_http_client_pool_instrumentor()
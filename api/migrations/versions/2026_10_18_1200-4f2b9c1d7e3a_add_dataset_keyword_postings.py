@@ -0,0 +1,41 @@
+"""add dataset_keyword_postings table
+
+Revision ID: 4f2b9c1d7e3a
+Revises: 03ea244985ce
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4f2b9c1d7e3a"
+down_revision = "03ea244985ce"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "dataset_keyword_postings",
+        sa.Column("id", models.types.StringUUID(), nullable=False),
+        sa.Column("dataset_id", models.types.StringUUID(), nullable=False),
+        sa.Column("keyword", sa.String(length=255), nullable=False),
+        sa.Column("index_node_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("dataset_keyword_posting_pkey")),
+        sa.UniqueConstraint(
+            "dataset_id", "keyword", "index_node_id", name=op.f("dataset_keyword_posting_keyword_idx")
+        ),
+    )
+    with op.batch_alter_table("dataset_keyword_postings", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("dataset_keyword_posting_node_idx"), ["dataset_id", "index_node_id"], unique=False
+        )
+
+
+def downgrade():
+    op.drop_table("dataset_keyword_postings")
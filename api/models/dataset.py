@@ -5,19 +5,22 @@ import hmac
 import json
 import logging
 import os
-import pickle
 import re
 import time
+from collections.abc import Sequence
 from datetime import datetime
 from json import JSONDecodeError
 from typing import Any, cast
 from uuid import uuid4
 
+import numpy as np
+import numpy.typing as npt
 import sqlalchemy as sa
 from sqlalchemy import DateTime, String, func, select
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
 from configs import dify_config
+from core.rag.embedding.embedding_codec import EmbeddingDType, decode_embedding, encode_embedding, is_compact_embedding
 from core.rag.index_processor.constant.built_in_field import BuiltInField, MetadataDataSource
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
@@ -1097,6 +1100,31 @@ class DatasetKeywordTable(TypeBase):
                 return None
 
 
+class DatasetKeywordPosting(TypeBase):
+    """One (keyword, index node) pair of a dataset's keyword index, used by the `jieba_incremental` keyword store."""
+
+    __tablename__ = "dataset_keyword_postings"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("id", name="dataset_keyword_posting_pkey"),
+        sa.UniqueConstraint("dataset_id", "keyword", "index_node_id", name="dataset_keyword_posting_keyword_idx"),
+        sa.Index("dataset_keyword_posting_node_idx", "dataset_id", "index_node_id"),
+    )
+
+    id: Mapped[str] = mapped_column(
+        StringUUID,
+        primary_key=True,
+        insert_default=lambda: str(uuid4()),
+        default_factory=lambda: str(uuid4()),
+        init=False,
+    )
+    dataset_id: Mapped[str] = mapped_column(StringUUID, nullable=False)
+    keyword: Mapped[str] = mapped_column(String(255), nullable=False)
+    index_node_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp(), init=False
+    )
+
+
 class Embedding(TypeBase):
     __tablename__ = "embeddings"
     __table_args__ = (
@@ -1122,11 +1150,18 @@ class Embedding(TypeBase):
     )
     provider_name: Mapped[str] = mapped_column(String(255), nullable=False, server_default=sa.text("''"))
 
-    def set_embedding(self, embedding_data: list[float]):
-        self.embedding = pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+    def set_embedding(self, embedding_data: Sequence[float] | npt.NDArray[np.floating]):
+        self.embedding = encode_embedding(embedding_data, EmbeddingDType(dify_config.EMBEDDING_CACHE_STORAGE_DTYPE))
 
     def get_embedding(self) -> list[float]:
-        return cast(list[float], pickle.loads(self.embedding))  # noqa: S301
+        return cast(list[float], self.get_embedding_array().tolist())
+
+    def get_embedding_array(self) -> npt.NDArray[np.float32]:
+        return decode_embedding(self.embedding)
+
+    @property
+    def is_legacy_format(self) -> bool:
+        return not is_compact_embedding(self.embedding)
 
 
 class DatasetCollectionBinding(TypeBase):
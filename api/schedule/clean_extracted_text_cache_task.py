@@ -0,0 +1,20 @@
+import time
+
+import click
+
+import app
+from core.rag.extractor.extracted_text_cache import extracted_text_cache
+
+
+@app.celery.task(queue="dataset")
+def clean_extracted_text_cache_task():
+    click.echo(click.style("Start clean extracted text cache.", fg="green"))
+    start_at = time.perf_counter()
+    deleted_count, deleted_size = extracted_text_cache.cleanup()
+    end_at = time.perf_counter()
+    click.echo(
+        click.style(
+            f"Cleaned {deleted_count} extracted texts ({deleted_size} bytes) latency: {end_at - start_at}",
+            fg="green",
+        )
+    )
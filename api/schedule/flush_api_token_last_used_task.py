@@ -0,0 +1,17 @@
+import time
+
+import click
+
+import app
+from core.helper.api_token_auth_cache import api_token_last_used_recorder
+
+
+@app.celery.task(queue="dataset")
+def flush_api_token_last_used_task():
+    start_at = time.perf_counter()
+    updated_count = api_token_last_used_recorder.flush()
+    end_at = time.perf_counter()
+    if updated_count:
+        click.echo(
+            click.style(f"Flushed last use time of {updated_count} API tokens latency: {end_at - start_at}", fg="green")
+        )
@@ -1355,6 +1355,28 @@ class DocumentService:
 
         return documents
 
+    @staticmethod
+    def get_segment_counts(document_ids: Sequence[str]) -> dict[str, tuple[int, int]]:
+        """
+        Get the completed and total segment counts of documents in one grouped query.
+
+        Segments being re-segmented are not counted, documents without segments are not in the result.
+
+        :return: document id to (completed segments, total segments)
+        """
+        if not document_ids:
+            return {}
+        rows = db.session.execute(
+            select(
+                DocumentSegment.document_id,
+                func.count(DocumentSegment.completed_at),
+                func.count(),
+            )
+            .where(DocumentSegment.document_id.in_(document_ids), DocumentSegment.status != "re_segment")
+            .group_by(DocumentSegment.document_id)
+        ).all()
+        return {str(document_id): (completed, total) for document_id, completed, total in rows}
+
     @staticmethod
     def get_document_file_detail(file_id: str):
         file_detail = db.session.query(UploadFile).where(UploadFile.id == file_id).one_or_none()
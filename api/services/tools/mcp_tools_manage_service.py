@@ -16,7 +16,7 @@ from core.entities.mcp_provider import MCPAuthentication, MCPConfiguration, MCPP
 from core.helper import encrypter
 from core.helper.provider_cache import NoOpProviderCredentialCache
 from core.mcp.auth.auth_flow import auth
-from core.mcp.auth_client import MCPClientWithAuthRetry
+from core.mcp.client_pool import mcp_client_pool
 from core.mcp.error import MCPAuthError, MCPError
 from core.tools.entities.api_entities import ToolProviderApiEntity
 from core.tools.utils.encryption import ProviderConfigEncrypter
@@ -480,7 +480,7 @@ class MCPToolManageService:
         provider_entity: MCPProviderEntity,
     ):
         """Retrieve tools from remote MCP server."""
-        with MCPClientWithAuthRetry(
+        with mcp_client_pool.client(
             server_url=server_url,
             headers=headers,
             timeout=provider_entity.timeout,
@@ -9,6 +9,7 @@ from celery import shared_task
 from core.helper import marketplace
 from core.helper.marketplace import MarketplacePluginDeclaration
 from core.plugin.entities.plugin import PluginInstallationSource
+from core.plugin.entities.plugin_daemon import PluginInstallTaskStatus
 from core.plugin.impl.plugin import PluginInstaller
 from extensions.ext_redis import redis_client
 from models.account import TenantPluginAutoUpgradeStrategy
@@ -18,6 +19,8 @@ logger = logging.getLogger(__name__)
 RETRY_TIMES_OF_ONE_PLUGIN_IN_ONE_TENANT = 3
 CACHE_REDIS_KEY_PREFIX = "plugin_autoupgrade_check_task:cached_plugin_manifests:"
 CACHE_REDIS_TTL = 60 * 15  # 15 minutes
+UPGRADE_TASK_CHECK_INTERVAL = 10  # seconds
+UPGRADE_TASK_CHECK_MAX_ATTEMPTS = 30  # 5 minutes
 
 
 def _get_redis_cache_key(plugin_id: str) -> str:
@@ -117,6 +120,37 @@ def marketplace_batch_fetch_plugin_manifests(
     return result
 
 
+@shared_task(queue="plugin")
+def check_plugin_upgrade_tasks_task(tenant_id: str, task_ids: list[str], attempt: int = 0):
+    """
+    Check whether upgrade tasks have finished, re-enqueuing itself while any of them is still running.
+
+    Fetching a finished task invalidates the cached plugin tool providers of the tenant, which may have been
+    fetched while the upgrade was still running.
+    """
+    manager = PluginInstaller()
+    running_task_ids: list[str] = []
+    for task_id in task_ids:
+        try:
+            task = manager.fetch_plugin_installation_task(tenant_id, task_id)
+        except Exception:
+            logger.exception("Failed to fetch plugin upgrade task %s of tenant %s", task_id, tenant_id)
+            continue
+        if task.status not in {PluginInstallTaskStatus.Success, PluginInstallTaskStatus.Failed}:
+            running_task_ids.append(task_id)
+
+    if not running_task_ids:
+        return
+
+    if attempt + 1 >= UPGRADE_TASK_CHECK_MAX_ATTEMPTS:
+        logger.warning("Plugin upgrade tasks %s of tenant %s did not finish in time", running_task_ids, tenant_id)
+        return
+
+    check_plugin_upgrade_tasks_task.apply_async(  # type: ignore
+        args=(tenant_id, running_task_ids, attempt + 1), countdown=UPGRADE_TASK_CHECK_INTERVAL
+    )
+
+
 @shared_task(queue="plugin")
 def process_tenant_plugin_autoupgrade_check_task(
     tenant_id: str,
@@ -182,6 +216,8 @@ def process_tenant_plugin_autoupgrade_check_task(
         if not manifests:
             return
 
+        upgrade_task_ids: list[str] = []
+
         for manifest in manifests:
             for plugin_id, version, original_unique_identifier in plugin_ids:
                 if manifest.plugin_id != plugin_id:
@@ -218,7 +254,7 @@ def process_tenant_plugin_autoupgrade_check_task(
                                 fg="green",
                             )
                         )
-                        _ = manager.upgrade_plugin(
+                        response = manager.upgrade_plugin(
                             tenant_id,
                             original_unique_identifier,
                             new_unique_identifier,
@@ -227,11 +263,18 @@ def process_tenant_plugin_autoupgrade_check_task(
                                 "plugin_unique_identifier": new_unique_identifier,
                             },
                         )
+                        if not response.all_installed:
+                            upgrade_task_ids.append(response.task_id)
                 except Exception as e:
                     click.echo(click.style(f"Error when upgrading plugin: {e}", fg="red"))
                     # traceback.print_exc()
                 break
 
+        if upgrade_task_ids:
+            check_plugin_upgrade_tasks_task.apply_async(
+                args=(tenant_id, upgrade_task_ids), countdown=UPGRADE_TASK_CHECK_INTERVAL
+            )
+
     except Exception as e:
         click.echo(click.style(f"Error when checking upgradable plugin: {e}", fg="red"))
         # traceback.print_exc()
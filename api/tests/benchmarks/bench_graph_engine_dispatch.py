@@ -0,0 +1,195 @@
+"""
+Measure per-hop dispatch latency and idle CPU of the graph engine on a 20-node linear workflow.
+
+The engine threads used to poll: `EventManager.emit_events` slept 1 ms between empty checks, the dispatcher polled
+the event queue with a 0.1 s timeout followed by another 0.1 s sleep, and every worker polled the ready queue with a
+0.1 s timeout. They now block on condition variables and are woken when an event is collected, an event is queued,
+a node becomes ready or the engine stops. Every node sleeps for `--node-ms` to stand in for real work, a hop is the
+time from the end of a node's `_run` to the start of the next node's `_run`. Idle CPU is sampled while concurrent
+runs are all parked on a node that blocks.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Any
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import Graph
+from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.graph_events import NodeRunStartedEvent
+from core.workflow.nodes.base.node import Node
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+from models.enums import UserFrom
+
+
+def build_graph_config(nodes: int) -> dict[str, Any]:
+    """A start node, a chain of variable aggregators and an end node."""
+    node_configs: list[dict[str, Any]] = [{"id": "start", "data": {"type": "start", "title": "start", "variables": []}}]
+    for i in range(nodes - 2):
+        node_configs.append(
+            {
+                "id": f"aggregator_{i}",
+                "data": {
+                    "type": "variable-aggregator",
+                    "title": f"aggregator_{i}",
+                    "output_type": "string",
+                    "variables": [["sys", "user_id"]],
+                },
+            }
+        )
+    node_configs.append({"id": "end", "data": {"type": "end", "title": "end", "outputs": []}})
+    edges = [
+        {"id": f"{tail['id']}-{head['id']}", "source": tail["id"], "target": head["id"]}
+        for tail, head in zip(node_configs, node_configs[1:])
+    ]
+    return {"nodes": node_configs, "edges": edges}
+
+
+class TimedNodeFactory(DifyNodeFactory):
+    """Creates nodes that record when they run, and optionally a node that waits for `release` before it runs."""
+
+    def __init__(
+        self, *args: Any, node_seconds: float, blocking_node_id: str | None, release: threading.Event, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.timings: dict[str, tuple[float, float]] = {}
+        self._node_seconds = node_seconds
+        self._blocking_node_id = blocking_node_id
+        self._release = release
+
+    def create_node(self, node_config: dict[str, object]) -> Node:
+        node = super().create_node(node_config)
+        run = node._run
+
+        def timed_run():
+            if node.id == self._blocking_node_id:
+                self._release.wait()
+            started_at = time.perf_counter()
+            time.sleep(self._node_seconds)
+            result = run()
+            self.timings[node.id] = (started_at, time.perf_counter())
+            return result
+
+        node._run = timed_run  # type: ignore[method-assign]
+        return node
+
+
+def build_engine(
+    graph_config: dict[str, Any],
+    node_seconds: float = 0.0,
+    blocking_node_id: str | None = None,
+    release: threading.Event | None = None,
+) -> tuple[GraphEngine, TimedNodeFactory]:
+    graph_init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from=UserFrom.ACCOUNT,
+        invoke_from=InvokeFrom.SERVICE_API,
+        call_depth=0,
+    )
+    variable_pool = VariablePool(system_variables=SystemVariable(user_id="user", files=[]), user_inputs={})
+    graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
+    node_factory = TimedNodeFactory(
+        graph_init_params=graph_init_params,
+        graph_runtime_state=graph_runtime_state,
+        node_seconds=node_seconds,
+        blocking_node_id=blocking_node_id,
+        release=release or threading.Event(),
+    )
+    engine = GraphEngine(
+        workflow_id="workflow",
+        graph=Graph.init(graph_config=graph_config, node_factory=node_factory),
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+    return engine, node_factory
+
+
+def measure_hops(graph_config: dict[str, Any], node_seconds: float) -> tuple[list[float], float]:
+    """Run the workflow once and return the hop latencies and the run duration in milliseconds."""
+    engine, node_factory = build_engine(graph_config, node_seconds)
+    started_at = time.perf_counter()
+    for _ in engine.run():
+        pass
+    duration = (time.perf_counter() - started_at) * 1000
+
+    node_ids = [node_config["id"] for node_config in graph_config["nodes"]]
+    hops = [
+        (node_factory.timings[head][0] - node_factory.timings[tail][1]) * 1000
+        for tail, head in zip(node_ids, node_ids[1:])
+    ]
+    return hops, duration
+
+
+def measure_idle_cpu(graph_config: dict[str, Any], runs: int, seconds: float) -> float:
+    """Park concurrent runs on a blocking node and return the CPU used per wall second, in percent."""
+    release = threading.Event()
+    parked = threading.Semaphore(0)
+
+    def consume(engine: GraphEngine) -> None:
+        for event in engine.run():
+            if isinstance(event, NodeRunStartedEvent) and event.node_id == "aggregator_0":
+                parked.release()
+
+    threads = [
+        threading.Thread(target=consume, args=(build_engine(graph_config, 0.0, "aggregator_0", release)[0],))
+        for _ in range(runs)
+    ]
+    for thread in threads:
+        thread.start()
+    for _ in range(runs):
+        parked.acquire()
+    time.sleep(0.5)
+
+    cpu_started_at, wall_started_at = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_started_at
+    wall = time.perf_counter() - wall_started_at
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    return cpu / wall * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=20)
+    parser.add_argument("--node-ms", type=float, default=120.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--idle-runs", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    graph_config = build_graph_config(args.nodes)
+    measure_hops(graph_config, 0.0)
+
+    hops: list[float] = []
+    durations: list[float] = []
+    for _ in range(args.runs):
+        run_hops, duration = measure_hops(graph_config, args.node_ms / 1000)
+        hops.extend(run_hops)
+        durations.append(duration)
+    hops.sort()
+    print(f"{'nodes':>6} {'node (ms)':>10} {'hop p50 (ms)':>13} {'hop p99 (ms)':>13} {'run p50 (ms)':>13}")
+    print(
+        f"{args.nodes:>6} {args.node_ms:>10.0f} {statistics.median(hops):>13.2f} {hops[int(len(hops) * 0.99)]:>13.2f} "
+        f"{statistics.median(durations):>13.1f}"
+    )
+    print()
+    print(f"{'parked runs':>11} {'idle CPU (%)':>13}")
+    for runs in args.idle_runs:
+        print(f"{runs:>11} {measure_idle_cpu(graph_config, runs, args.idle_seconds):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Compare dedicated worker threads per GraphEngine with the process-wide shared worker pool under concurrent runs.
+
+Every `GraphEngine` used to start its own `WorkerPool` threads, so the thread count of a process grew with the number
+of concurrent runs. With `GRAPH_ENGINE_SHARED_POOL_ENABLED`, node executions of all engines are scheduled onto one
+bounded pool, round-robin per run. The benchmark starts all runs at once, each on its own consumer thread like an API
+request, on a workflow of parallel branches of nodes sleeping `--node-ms` to stand in for I/O. Each mode runs in a
+fresh process, so peak RSS is comparable. Dispatcher and consumer threads exist per run in both modes.
+"""
+
+import argparse
+import multiprocessing
+import resource
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import Graph
+from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.graph_events import GraphRunSucceededEvent
+from core.workflow.nodes.base.node import Node
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+from models.enums import UserFrom
+
+
+def build_graph_config(branches: int, depth: int) -> dict[str, Any]:
+    """A start node fanning out to parallel chains of variable aggregators, joined by an end node."""
+    node_configs: list[dict[str, Any]] = [{"id": "start", "data": {"type": "start", "title": "start", "variables": []}}]
+    edges: list[dict[str, Any]] = []
+    for branch in range(branches):
+        previous = "start"
+        for i in range(depth):
+            node_id = f"aggregator_{branch}_{i}"
+            node_configs.append(
+                {
+                    "id": node_id,
+                    "data": {
+                        "type": "variable-aggregator",
+                        "title": node_id,
+                        "output_type": "string",
+                        "variables": [["sys", "user_id"]],
+                    },
+                }
+            )
+            edges.append({"id": f"{previous}-{node_id}", "source": previous, "target": node_id})
+            previous = node_id
+        edges.append({"id": f"{previous}-end", "source": previous, "target": "end"})
+    node_configs.append({"id": "end", "data": {"type": "end", "title": "end", "outputs": []}})
+    return {"nodes": node_configs, "edges": edges}
+
+
+class SleepingNodeFactory(DifyNodeFactory):
+    """Creates nodes that sleep before they run."""
+
+    def __init__(self, *args: Any, node_seconds: float, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._node_seconds = node_seconds
+
+    def create_node(self, node_config: dict[str, object]) -> Node:
+        node = super().create_node(node_config)
+        run = node._run
+
+        def sleeping_run():
+            time.sleep(self._node_seconds)
+            return run()
+
+        node._run = sleeping_run  # type: ignore[method-assign]
+        return node
+
+
+def build_engine(graph_config: dict[str, Any], node_seconds: float, shared: bool, tenant_id: str) -> GraphEngine:
+    graph_init_params = GraphInitParams(
+        tenant_id=tenant_id,
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from=UserFrom.ACCOUNT,
+        invoke_from=InvokeFrom.SERVICE_API,
+        call_depth=0,
+    )
+    variable_pool = VariablePool(system_variables=SystemVariable(user_id="user", files=[]), user_inputs={})
+    graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
+    node_factory = SleepingNodeFactory(
+        graph_init_params=graph_init_params,
+        graph_runtime_state=graph_runtime_state,
+        node_seconds=node_seconds,
+    )
+    return GraphEngine(
+        workflow_id="workflow",
+        graph=Graph.init(graph_config=graph_config, node_factory=node_factory),
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+        use_shared_worker_pool=shared,
+    )
+
+
+def run_load(shared: bool, runs: int, tenants: int, branches: int, depth: int, node_ms: float) -> dict[str, float]:
+    """Start all runs at once and report peak threads, peak RSS and run latencies. Runs in a fresh process."""
+    graph_config = build_graph_config(branches, depth)
+    latencies: list[float] = []
+    failures = 0
+    lock = threading.Lock()
+    ready = threading.Barrier(runs + 1)
+
+    def consume(engine: GraphEngine) -> None:
+        nonlocal failures
+        ready.wait()
+        started_at = time.perf_counter()
+        events = list(engine.run())
+        with lock:
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            if not isinstance(events[-1], GraphRunSucceededEvent):
+                failures += 1
+
+    engines = [build_engine(graph_config, node_ms / 1000, shared, f"tenant_{i % tenants}") for i in range(runs)]
+    threads = [threading.Thread(target=consume, args=(engine,)) for engine in engines]
+    for thread in threads:
+        thread.start()
+
+    baseline_threads = threading.active_count()
+    peak_threads = baseline_threads
+    started_at = time.perf_counter()
+    ready.wait()
+    while any(thread.is_alive() for thread in threads):
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "peak_threads": peak_threads - baseline_threads,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99)],
+        "runs_per_s": runs / elapsed,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--branches", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--node-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'runs':>5} {'mode':>10} {'extra threads':>14} {'peak RSS (MB)':>14} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+        f"{'runs/s':>7} {'failed':>7}"
+    )
+    for runs in args.runs:
+        for mode in ("dedicated", "shared"):
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                result = executor.submit(
+                    run_load, mode == "shared", runs, args.tenants, args.branches, args.depth, args.node_ms
+                ).result()
+            print(
+                f"{runs:>5} {mode:>10} {result['peak_threads']:>14.0f} {result['peak_rss_mb']:>14.0f} "
+                f"{result['p50_ms']:>9.0f} {result['p99_ms']:>9.0f} {result['runs_per_s']:>7.0f} "
+                f"{result['failures']:>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compare per-run graph preparation of large workflows with and without the compiled graph cache.
+
+Workflow runs used to decode `Workflow.graph` with `graph_dict` twice (for `Graph.init` and for `WorkflowEntry`) and
+rebuild the graph topology from the decoded config. Runs now look up the compiled topology in `workflow_graph_cache`
+by workflow id and graph hash, and only create the per-run node instances. The benchmark reports the parse and build
+phases separately, the same phases recorded by the `workflow.graph.init.duration` histogram.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from core.app.apps.common.workflow_graph_cache import WorkflowGraphCache
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import CompiledGraph, Graph
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+from models.enums import UserFrom
+
+
+def build_graph(branches: int) -> str:
+    """A chain of if-else nodes, each guarding a template transform node, as the editor serializes it."""
+
+    def node(node_id: str, index: int, data: dict) -> dict:
+        return {
+            "id": node_id,
+            "type": "custom",
+            "data": {"title": node_id, "desc": "", "selected": False, **data},
+            "position": {"x": index * 300, "y": 200},
+            "positionAbsolute": {"x": index * 300, "y": 200},
+            "width": 244,
+            "height": 90,
+            "sourcePosition": "right",
+            "targetPosition": "left",
+        }
+
+    def edge(source: str, target: str, source_handle: str = "source") -> dict:
+        return {
+            "id": f"{source}-{source_handle}-{target}-target",
+            "type": "custom",
+            "source": source,
+            "sourceHandle": source_handle,
+            "target": target,
+            "targetHandle": "target",
+            "data": {"sourceType": "", "targetType": "", "isInIteration": False},
+            "zIndex": 0,
+        }
+
+    nodes = [node("start", 0, {"type": "start", "variables": []})]
+    edges = []
+    previous = "start"
+    for i in range(branches):
+        condition = {"variable_selector": ["start", "x"], "comparison_operator": "contains", "value": "a"}
+        nodes.append(
+            node(
+                f"if_{i}",
+                2 * i + 1,
+                {
+                    "type": "if-else",
+                    "cases": [{"case_id": "true", "logical_operator": "and", "conditions": [condition]}],
+                },
+            )
+        )
+        nodes.append(
+            node(
+                f"template_{i}",
+                2 * i + 2,
+                {
+                    "type": "template-transform",
+                    "variables": [{"variable": "x", "value_selector": ["start", "x"]}],
+                    "template": "{{ x }}",
+                },
+            )
+        )
+        edges.append(edge(previous, f"if_{i}"))
+        edges.append(edge(f"if_{i}", f"template_{i}", "true"))
+        previous = f"template_{i}"
+    nodes.append(node("end", 2 * branches + 1, {"type": "end", "outputs": []}))
+    edges.append(edge(previous, "end"))
+    return json.dumps({"nodes": nodes, "edges": edges})
+
+
+def build(graph_config, compiled_graph: CompiledGraph) -> Graph:
+    graph_init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from=UserFrom.ACCOUNT,
+        invoke_from=InvokeFrom.SERVICE_API,
+        call_depth=0,
+    )
+    variable_pool = VariablePool(system_variables=SystemVariable(user_id="user", files=[]), user_inputs={})
+    node_factory = DifyNodeFactory(
+        graph_init_params=graph_init_params,
+        graph_runtime_state=GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter()),
+    )
+    return Graph.from_compiled(compiled_graph, node_factory)
+
+
+def run_uncached(graph: str) -> tuple[float, float]:
+    started_at = time.perf_counter()
+    graph_config = json.loads(graph)
+    json.loads(graph)  # `graph_dict` again for `WorkflowEntry`
+    compiled_graph = Graph.compile(graph_config=graph_config)
+    parsed_at = time.perf_counter()
+    build(graph_config, compiled_graph)
+    return (parsed_at - started_at) * 1000, (time.perf_counter() - parsed_at) * 1000
+
+
+def run_cached(cache: WorkflowGraphCache, graph: str) -> tuple[float, float]:
+    started_at = time.perf_counter()
+    compiled_graph, _ = cache.get("workflow", graph)
+    parsed_at = time.perf_counter()
+    build(compiled_graph.graph_config, compiled_graph)
+    return (parsed_at - started_at) * 1000, (time.perf_counter() - parsed_at) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>6} {'graph (KB)':>10} {'uncached parse':>15} {'cached parse':>13} "
+        f"{'uncached build':>15} {'cached build':>13} {'saved':>7}"
+    )
+    print(f"{'':>6} {'':>10} {'(ms, p50)':>15} {'(ms, p50)':>13} {'(ms, p50)':>15} {'(ms, p50)':>13} {'':>7}")
+    for nodes in args.nodes:
+        graph = build_graph(max((nodes - 2) // 2, 1))
+        cache = WorkflowGraphCache(maxsize=8)
+        run_uncached(graph)
+        run_cached(cache, graph)
+        uncached = [run_uncached(graph) for _ in range(args.runs)]
+        cached = [run_cached(cache, graph) for _ in range(args.runs)]
+        uncached_parse, uncached_build = (statistics.median(phase) for phase in zip(*uncached))
+        cached_parse, cached_build = (statistics.median(phase) for phase in zip(*cached))
+        saved = 1 - (cached_parse + cached_build) / (uncached_parse + uncached_build)
+        print(
+            f"{nodes:>6} {len(graph) / 1024:>10.0f} {uncached_parse:>15.2f} {cached_parse:>13.3f} "
+            f"{uncached_build:>15.2f} {cached_build:>13.2f} {saved:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
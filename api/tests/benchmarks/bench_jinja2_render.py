@@ -0,0 +1,116 @@
+"""
+Compare rendering Jinja2 prompt templates through the code execution service with rendering them in process.
+
+Jinja2 templates of LLM prompts, template transform nodes and `Jinja2Formatter` used to always go through
+`CodeExecutor.execute_code`, an HTTP round trip to the sandbox service, which starts a Python process for every render.
+With `CODE_EXECUTION_JINJA2_MODE=in_process`, they are rendered by `jinja2_renderer` in an immutable sandboxed
+environment, with compiled templates cached by template hash. Without `--endpoint`, the benchmark starts a local
+stand-in for the sandbox service that runs each script in a fresh interpreter, the way the sandbox does.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from yarl import URL
+
+from configs import dify_config
+from core.helper.code_executor import code_executor
+from core.helper.code_executor.code_executor import CodeExecutor, CodeLanguage
+from core.helper.code_executor.jinja2.jinja2_renderer import Jinja2Renderer
+
+TEMPLATE = """You are a helpful assistant for {{ company }}.
+Answer the question of {{ user.name }} using only the context below.
+{% for document in documents %}
+<document index="{{ loop.index }}" title="{{ document.title | e }}">
+{{ document.content | trim }}
+</document>
+{% endfor %}
+{% if history %}Previous turns:
+{% for turn in history[-5:] %}{{ turn.role | capitalize }}: {{ turn.text }}
+{% endfor %}{% endif %}
+Question: {{ query }}"""
+
+INPUTS = {
+    "company": "Acme",
+    "user": {"name": "Alice"},
+    "documents": [{"title": f"Doc {i}", "content": f"  Content of document {i}. " * 20} for i in range(10)],
+    "history": [{"role": "user" if i % 2 else "assistant", "text": f"Turn {i}"} for i in range(8)],
+    "query": "What is the refund policy?",
+}
+
+
+class StandInSandboxHandler(BaseHTTPRequestHandler):
+    """Answers /v1/sandbox/run like the sandbox service, running preload and code in a new Python process."""
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        process = subprocess.run(
+            [sys.executable, "-c", request["preload"] + "\n" + request["code"]],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        body = json.dumps(
+            {"code": 0, "message": "success", "data": {"stdout": process.stdout, "error": process.stderr or None}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(render, renders: int) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(renders):
+        started_at = time.perf_counter()
+        render()
+        latencies.append((time.perf_counter() - started_at) * 1000)
+    latencies.sort()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--endpoint", help="URL of a running sandbox service instead of the local stand-in")
+    args = parser.parse_args()
+
+    if args.endpoint:
+        code_executor.code_execution_endpoint_url = URL(args.endpoint)
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSandboxHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        code_executor.code_execution_endpoint_url = URL(f"http://127.0.0.1:{server.server_port}")
+
+    def render_remote():
+        return CodeExecutor.execute_workflow_code_template(language=CodeLanguage.JINJA2, code=TEMPLATE, inputs=INPUTS)
+
+    cached_renderer = Jinja2Renderer(cache_size=16, render_timeout=5.0, max_output_length=1_000_000)
+    uncached_renderer = Jinja2Renderer(cache_size=0, render_timeout=5.0, max_output_length=1_000_000)
+
+    dify_config.CODE_EXECUTION_JINJA2_MODE = "sandbox"
+    remote_output = render_remote()["result"]
+    assert cached_renderer.render(TEMPLATE, INPUTS) == remote_output, "in-process output differs from the sandbox"
+
+    print(f"{'mode':>22} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for mode, render in (
+        ("sandbox", render_remote),
+        ("in_process, no cache", lambda: uncached_renderer.render(TEMPLATE, INPUTS)),
+        ("in_process", lambda: cached_renderer.render(TEMPLATE, INPUTS)),
+    ):
+        latencies = measure(render, args.renders)
+        print(f"{mode:>22} {statistics.median(latencies):>9.3f} {latencies[int(len(latencies) * 0.99)]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
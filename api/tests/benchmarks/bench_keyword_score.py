@@ -0,0 +1,82 @@
+"""
+Compare keyword scoring of rerank candidates before and after vectorizing TF-IDF.
+
+`DatasetRetrieval.calculate_keyword_score` and `WeightRerankRunner._calculate_keyword_score` used to count document
+frequencies with a nested Python loop and compute cosine similarity dict by dict. Both now share
+`calculate_tfidf_similarities`, which scores a sparse keyword matrix with NumPy. The benchmark also reports the
+Jieba extraction time that is saved for candidates whose segment keywords are already persisted.
+"""
+
+import argparse
+import math
+import time
+from collections import Counter
+
+import numpy as np
+
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.rerank.keyword_score import calculate_tfidf_similarities
+
+
+def loop_similarities(query_keywords: set[str], documents_keywords: list[set[str]]) -> list[float]:
+    total_documents = len(documents_keywords)
+    all_keywords: set[str] = set()
+    for document_keywords in documents_keywords:
+        all_keywords.update(document_keywords)
+    keyword_idf = {}
+    for keyword in all_keywords:
+        doc_count_containing_keyword = sum(1 for doc_keywords in documents_keywords if keyword in doc_keywords)
+        keyword_idf[keyword] = math.log((1 + total_documents) / (1 + doc_count_containing_keyword)) + 1
+    query_tfidf = {keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(query_keywords).items()}
+
+    similarities = []
+    for document_keywords in documents_keywords:
+        document_tfidf = {
+            keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(document_keywords).items()
+        }
+        numerator = sum(query_tfidf[x] * document_tfidf[x] for x in set(query_tfidf) & set(document_tfidf))
+        denominator = math.sqrt(sum(v**2 for v in query_tfidf.values())) * math.sqrt(
+            sum(v**2 for v in document_tfidf.values())
+        )
+        similarities.append(numerator / denominator if denominator else 0.0)
+    return similarities
+
+
+def build_candidates(candidates: int, vocabulary: int, words_per_document: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, vocabulary + 1)
+    sampled = rng.choice(vocabulary, size=(candidates, words_per_document), p=weights / weights.sum())
+    return [" ".join(f"term{word}" for word in words) for words in sampled.tolist()]
+
+
+def extract_keywords(keyword_table_handler: JiebaKeywordTableHandler, contents: list[str]) -> list[set[str]]:
+    return [keyword_table_handler.extract_keywords(content, None) for content in contents]
+
+
+def timed(func, *args) -> tuple[float, object]:
+    started_at = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - started_at) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--words-per-document", type=int, default=200)
+    args = parser.parse_args()
+
+    keyword_table_handler = JiebaKeywordTableHandler()
+    query_keywords = keyword_table_handler.extract_keywords("term1 term5 term20 term300", None)
+    print(f"{'candidates':>10} {'jieba (ms)':>12} {'loop (ms)':>10} {'numpy (ms)':>11}")
+    for candidates in args.candidates:
+        contents = build_candidates(candidates, args.vocabulary, args.words_per_document)
+        extraction_ms, documents_keywords = timed(extract_keywords, keyword_table_handler, contents)
+        loop_ms, expected = timed(loop_similarities, query_keywords, documents_keywords)
+        numpy_ms, actual = timed(calculate_tfidf_similarities, query_keywords, documents_keywords)
+        assert np.allclose(expected, actual)
+        print(f"{candidates:>10} {extraction_ms:>12.1f} {loop_ms:>10.1f} {numpy_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare keyword search over a large `jieba` keyword table with and without the per-process cache.
+
+Without the cache every search decoded the whole keyword table JSON and rebuilt `set(keyword_table.keys())` for
+each query keyword. With `KeywordTableCache` the decoded table is kept between searches and only the version
+stamp is checked. This benchmark builds a synthetic keyword table and measures the per-query latency of both paths.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import Callable, Mapping, Set
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+from core.rag.datasource.keyword.jieba.jieba import dumps_with_sets
+from core.rag.datasource.keyword.jieba.keyword_table_cache import KeywordTableCache
+
+
+def build_keyword_table_json(segments: int, vocabulary: int, keywords_per_segment: int) -> str:
+    rng = np.random.default_rng(0)
+    # Skew keyword frequencies so a few keywords have very long posting lists, as real corpora do.
+    weights = 1 / np.arange(1, vocabulary + 1)
+    sampled = rng.choice(vocabulary, size=(segments, keywords_per_segment), p=weights / weights.sum())
+    table: dict[str, set[str]] = defaultdict(set)
+    for segment, keywords in enumerate(sampled.tolist()):
+        node_id = f"node-{segment}"
+        for keyword in keywords:
+            table[f"kw{keyword}"].add(node_id)
+    return dumps_with_sets({"__type__": "keyword_table", "__data__": {"index_id": "dataset", "table": table}})
+
+
+def decode_keyword_table(keyword_table_json: str) -> dict[str, set[str]]:
+    # Same decoding as `DatasetKeywordTable.keyword_table_dict`.
+    def object_hook(dct: dict[str, Any]) -> dict[str, Any]:
+        return {key: set(value) if isinstance(value, list) else value for key, value in dct.items()}
+
+    return dict(json.loads(keyword_table_json, object_hook=object_hook)["__data__"]["table"])
+
+
+def rank_uncached(keyword_table: Mapping[str, Set[str]], keywords: list[str], k: int) -> list[str]:
+    chunk_indices_count: dict[str, int] = defaultdict(int)
+    for keyword in [keyword for keyword in keywords if keyword in set(keyword_table.keys())]:
+        for node_id in keyword_table[keyword]:
+            chunk_indices_count[node_id] += 1
+    return sorted(chunk_indices_count, key=lambda x: chunk_indices_count[x], reverse=True)[:k]
+
+
+def rank_cached(keyword_table: Mapping[str, Set[str]], keywords: list[str], k: int) -> list[str]:
+    chunk_indices_count: dict[str, int] = defaultdict(int)
+    for keyword in [keyword for keyword in keywords if keyword in keyword_table]:
+        for node_id in keyword_table[keyword]:
+            chunk_indices_count[node_id] += 1
+    return sorted(chunk_indices_count, key=lambda x: chunk_indices_count[x], reverse=True)[:k]
+
+
+class _StaticVersion:
+    """Stands in for Redis: the keyword table never changes during the benchmark."""
+
+    def get(self, key: str) -> bytes:
+        return b"1"
+
+
+def measure(search: Callable[[list[str]], list[str]], queries: list[list[str]]) -> tuple[float, float]:
+    timings = []
+    for keywords in queries:
+        started_at = time.perf_counter()
+        search(keywords)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--keywords-per-segment", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=4)
+    args = parser.parse_args()
+
+    keyword_table_json = build_keyword_table_json(args.segments, args.vocabulary, args.keywords_per_segment)
+    print(f"keyword table: {args.segments} segments, {len(keyword_table_json) / (1024 * 1024):.1f} MiB JSON")
+
+    rng = np.random.default_rng(1)
+    queries = [[f"kw{keyword}" for keyword in rng.integers(args.vocabulary // 10, size=5)] for _ in range(args.queries)]
+
+    def uncached_search(keywords: list[str]) -> list[str]:
+        return rank_uncached(decode_keyword_table(keyword_table_json), keywords, args.top_k)
+
+    cache = KeywordTableCache(max_postings=args.segments * args.keywords_per_segment)
+
+    def cached_search(keywords: list[str]) -> list[str]:
+        entry = cache.get("dataset", lambda: decode_keyword_table(keyword_table_json))
+        assert entry is not None
+        return rank_cached(entry.table, keywords, args.top_k)
+
+    with patch("core.rag.datasource.keyword.jieba.keyword_table_cache.redis_client", _StaticVersion()):
+        started_at = time.perf_counter()
+        cached_search(queries[0])
+        warmup = time.perf_counter() - started_at
+        print(f"cache warm-up (decode + index build): {warmup:.2f} s")
+
+        print(f"{'strategy':>10} {'p50 (ms)':>10} {'max (ms)':>10}")
+        for name, search in (("uncached", uncached_search), ("cached", cached_search)):
+            p50, worst = measure(search, queries)
+            print(f"{name:>10} {p50:>10.1f} {worst:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare the streaming output moderation of a long answer before and after moderating incremental windows.
+
+`OutputModeration` used to grow its buffer with `+=` and, from a polling thread per request, moderate the whole
+buffer again every MODERATION_BUFFER_SIZE characters, so the moderated text grows quadratically with the answer.
+It now keeps the tokens as chunks and moderates only the new text plus a small overlap, on a shared executor.
+The benchmark streams an answer of N tokens through both strategies with a keyword moderation of linear cost.
+"""
+
+import argparse
+import time
+from unittest.mock import MagicMock
+
+from flask import Flask
+
+from configs import dify_config
+from core.app.apps.base_app_queue_manager import AppQueueManager
+from core.moderation.base import ModerationAction, ModerationOutputsResult
+from core.moderation.output_moderation import ModerationRule, OutputModeration
+
+KEYWORDS = [f"blocked-term-{index}" for index in range(50)]
+
+
+def moderate(text: str) -> ModerationOutputsResult:
+    lowered = text.lower()
+    return ModerationOutputsResult(
+        flagged=any(keyword in lowered for keyword in KEYWORDS), action=ModerationAction.DIRECT_OUTPUT
+    )
+
+
+class BenchmarkOutputModeration(OutputModeration):
+    moderated_characters: int = 0
+    moderation_calls: int = 0
+
+    def moderation(self, tenant_id: str, app_id: str, moderation_buffer: str) -> ModerationOutputsResult | None:
+        self.moderated_characters += len(moderation_buffer)
+        self.moderation_calls += 1
+        return moderate(moderation_buffer)
+
+
+def build_tokens(tokens: int) -> list[str]:
+    words = ["the", "answer", "streams", "tokens", "to", "a", "client", "while", "moderating"]
+    return [f" {words[index % len(words)]}" for index in range(tokens)]
+
+
+def full_buffer_strategy(tokens: list[str], buffer_size: int) -> tuple[int, int]:
+    """Replays the previous worker loop, assuming the polling thread always kept up with the stream."""
+    buffer = ""
+    checked_length = 0
+    moderated_characters = 0
+    moderation_calls = 0
+    for token in tokens:
+        buffer += token
+        if len(buffer) - checked_length >= buffer_size:
+            checked_length = len(buffer)
+            moderated_characters += len(buffer)
+            moderation_calls += 1
+            moderate(buffer)
+    return moderated_characters, moderation_calls
+
+
+def incremental_strategy(tokens: list[str]) -> tuple[int, int]:
+    output_moderation = BenchmarkOutputModeration(
+        tenant_id="tenant",
+        app_id="app",
+        rule=ModerationRule(type="keywords", config={}),
+        queue_manager=MagicMock(spec=AppQueueManager),
+    )
+    for token in tokens:
+        output_moderation.append_new_token(token)
+    while (check := output_moderation._check) is not None:
+        check.result()
+    return output_moderation.moderated_characters, output_moderation.moderation_calls
+
+
+def timed(func, *args) -> tuple[float, tuple[int, int]]:
+    started_at = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - started_at) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    args = parser.parse_args()
+
+    buffer_size = dify_config.MODERATION_BUFFER_SIZE
+    print(f"buffer size {buffer_size}, overlap {dify_config.MODERATION_BUFFER_OVERLAP}")
+    print(
+        f"{'tokens':>8} {'full (ms)':>10} {'full chars':>12} {'full calls':>11}"
+        f" {'incremental (ms)':>17} {'incr. chars':>12} {'incr. calls':>12}"
+    )
+    with Flask(__name__).app_context():
+        for token_count in args.tokens:
+            tokens = build_tokens(token_count)
+            full_ms, (full_chars, full_calls) = timed(full_buffer_strategy, tokens, buffer_size)
+            incremental_ms, (incremental_chars, incremental_calls) = timed(incremental_strategy, tokens)
+            print(
+                f"{token_count:>8} {full_ms:>10.1f} {full_chars:>12} {full_calls:>11}"
+                f" {incremental_ms:>17.1f} {incremental_chars:>12} {incremental_calls:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare plugin daemon requests over per-call connections and over the pooled keep-alive client.
+
+`BasePluginClient` used to call the module-level `httpx.request`, which opens and tears down a TCP connection for
+every model invocation, tool call and credential validation. It now sends requests through a pooled client that
+keeps connections alive. The benchmark runs concurrent small JSON requests against a local HTTP/1.1 server that
+stands in for the plugin daemon.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+_BODY = b'{"code": 0, "message": "", "data": {"result": true}}'
+
+
+class DaemonServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(send: Callable[[], httpx.Response], requests: int, concurrency: int) -> tuple[float, float]:
+    def timed_send(_: int) -> float:
+        started_at = time.perf_counter()
+        send().raise_for_status()
+        return (time.perf_counter() - started_at) * 1000
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_send, range(requests)))
+    elapsed = time.perf_counter() - started_at
+    return statistics.median(latencies), requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    server = DaemonServer(("127.0.0.1", 0), DaemonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/plugin/tenant/dispatch/llm/invoke"
+    payload = {"user_id": "user", "data": {"prompt_messages": [{"role": "user", "content": "hello"}]}}
+
+    print(f"{'':>11} {'per-call connections':>34} {'pooled client':>30}")
+    print(f"{'concurrency':>11} {'p50 (ms)':>18} {'req/s':>15} {'p50 (ms)':>16} {'req/s':>13}")
+    for concurrency in args.concurrency:
+        per_call = run(lambda: httpx.request("POST", url, json=payload), args.requests, concurrency)
+        with httpx.Client(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)) as client:
+            pooled = run(lambda: client.request("POST", url, json=payload), args.requests, concurrency)
+        print(f"{concurrency:>11} {per_call[0]:>18.2f} {per_call[1]:>15.0f} {pooled[0]:>16.2f} {pooled[1]:>13.0f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
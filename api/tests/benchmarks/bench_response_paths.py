@@ -0,0 +1,125 @@
+"""
+Compare response node registration cost on graphs of stacked if-else diamonds.
+
+`ResponseStreamCoordinator` used to enumerate every simple path from the root to a response node, which doubles
+with each branch/merge diamond. It now keeps only the edges lying on some root-to-response path and tracks
+reachability as branch edges are taken. This benchmark registers one answer node behind N stacked diamonds and
+then takes one branch edge per diamond, with both strategies.
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from core.workflow.enums import NodeExecutionType
+from core.workflow.graph import Graph
+from core.workflow.graph.edge import Edge
+from core.workflow.graph_engine.response_coordinator.path import Path, build_blocking_edge_graph
+from core.workflow.graph_engine.response_coordinator.session import ResponseSession
+from core.workflow.nodes.base.template import Template
+
+_BLOCKING_EXECUTION_TYPES = {NodeExecutionType.BRANCH, NodeExecutionType.CONTAINER, NodeExecutionType.RESPONSE}
+
+
+class BenchmarkNode:
+    def __init__(self, node_id: str, execution_type: NodeExecutionType) -> None:
+        self.id = node_id
+        self.execution_type = execution_type
+
+    def blocks_variable_output(self, *_args: Any) -> bool:
+        return False
+
+
+def build_diamond_graph(diamonds: int) -> Graph:
+    nodes: dict[str, Any] = {"start": BenchmarkNode("start", NodeExecutionType.ROOT)}
+    edges: dict[str, Edge] = {}
+    in_edges: dict[str, list[str]] = {}
+    out_edges: dict[str, list[str]] = {}
+
+    def connect(tail: str, head: str) -> None:
+        edge = Edge(id=f"{tail}->{head}", tail=tail, head=head)
+        edges[edge.id] = edge
+        out_edges.setdefault(tail, []).append(edge.id)
+        in_edges.setdefault(head, []).append(edge.id)
+
+    previous = "start"
+    for i in range(diamonds):
+        nodes[f"if_{i}"] = BenchmarkNode(f"if_{i}", NodeExecutionType.BRANCH)
+        for name in ("true", "false", "merge"):
+            nodes[f"{name}_{i}"] = BenchmarkNode(f"{name}_{i}", NodeExecutionType.EXECUTABLE)
+        connect(previous, f"if_{i}")
+        connect(f"if_{i}", f"true_{i}")
+        connect(f"if_{i}", f"false_{i}")
+        connect(f"true_{i}", f"merge_{i}")
+        connect(f"false_{i}", f"merge_{i}")
+        previous = f"merge_{i}"
+    nodes["answer"] = BenchmarkNode("answer", NodeExecutionType.RESPONSE)
+    connect(previous, "answer")
+    return Graph(nodes=nodes, edges=edges, in_edges=in_edges, out_edges=out_edges, root_node=nodes["start"])
+
+
+def run_enumerated(graph: Graph, taken_edges: list[str]) -> bool:
+    """The previous strategy: enumerate all simple paths, then drop taken edges from each of them."""
+    all_paths: list[list[str]] = []
+
+    def find_paths(node_id: str, path: list[str], visited: set[str]) -> None:
+        if node_id == "answer":
+            all_paths.append(path.copy())
+            return
+        visited.add(node_id)
+        for edge in graph.get_outgoing_edges(node_id):
+            if edge.head not in visited:
+                find_paths(edge.head, path + [edge.id], visited.copy())
+
+    find_paths(graph.root_node.id, [], set())
+    paths = [
+        [e for e in path if graph.nodes[graph.edges[e].tail].execution_type in _BLOCKING_EXECUTION_TYPES]
+        for path in all_paths
+    ]
+    reachable = False
+    for edge_id in taken_edges:
+        for path in paths:
+            if edge_id in path:
+                path.remove(edge_id)
+            reachable = reachable or not path
+    return reachable
+
+
+def run_reachability(graph: Graph, taken_edges: list[str]) -> bool:
+    path = Path(build_blocking_edge_graph(graph, "answer"))
+    for edge_id in taken_edges:
+        path.take_edge(edge_id)
+    return path.is_reachable()
+
+
+def measure(strategy: Callable[[Graph, list[str]], bool], graph: Graph, taken_edges: list[str]) -> float:
+    started_at = time.perf_counter()
+    assert strategy(graph, taken_edges)
+    return (time.perf_counter() - started_at) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--diamonds", type=int, nargs="+", default=[10, 12, 14, 16, 18, 20])
+    parser.add_argument("--max-enumerated", type=int, default=16, help="skip path enumeration above this many diamonds")
+    args = parser.parse_args()
+
+    # The benchmark nodes have no template, they stream constants only.
+    ResponseSession.from_node = classmethod(  # type: ignore[method-assign]
+        lambda cls, node: ResponseSession(node_id=node.id, template=Template(segments=[]))
+    )
+
+    print(f"{'diamonds':>8} {'paths':>10} {'enumerated (ms)':>16} {'reachability (ms)':>18}")
+    for diamonds in args.diamonds:
+        graph = build_diamond_graph(diamonds)
+        taken_edges = [f"if_{i}->true_{i}" for i in range(diamonds)]
+        enumerated = (
+            f"{measure(run_enumerated, graph, taken_edges):>16.1f}" if diamonds <= args.max_enumerated else f"{'-':>16}"
+        )
+        reachability = measure(run_reachability, graph, taken_edges)
+        print(f"{diamonds:>8} {2**diamonds:>10} {enumerated} {reachability:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from configs import dify_config
+from core.agent.fc_agent_runner import FunctionCallAgentRunner
+from core.tools.entities.tool_entities import ToolInvokeMeta
+
+
+@pytest.fixture
+def runner():
+    runner = FunctionCallAgentRunner.__new__(FunctionCallAgentRunner)
+    runner.user_id = "user-1"
+    runner.tenant_id = "tenant-1"
+    runner.message = MagicMock(id="message-1")
+    runner.conversation = MagicMock(id="conversation-1")
+    runner.application_generate_entity = MagicMock()
+    runner.agent_callback = MagicMock()
+    return runner
+
+
+@pytest.fixture
+def parallel_tool_calls(monkeypatch):
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALLS_ENABLED", True)
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALLS_MAX_WORKERS", 4)
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALL_TIMEOUT", 5.0)
+    with Flask(__name__).app_context():
+        yield
+
+
+def _agent_invoke(delays: dict[str, float]):
+    def agent_invoke(tool, tool_parameters, **kwargs):
+        time.sleep(delays[tool])
+        return f"{tool} result", [f"{tool}-file"], ToolInvokeMeta.empty()
+
+    return agent_invoke
+
+
+def test_tool_calls_run_concurrently_in_call_order(runner, parallel_tool_calls):
+    tool_calls = [("call-1", "slow", {}), ("call-2", "fast", {}), ("call-3", "missing", {})]
+    tool_instances = {"slow": "slow", "fast": "fast"}
+
+    started_at = time.monotonic()
+    with patch("core.agent.fc_agent_runner.ToolEngine.agent_invoke", _agent_invoke({"slow": 0.2, "fast": 0.2})):
+        results = list(runner._invoke_tool_calls(tool_calls, tool_instances, None))
+
+    assert time.monotonic() - started_at < 0.35
+    assert [(response["tool_call_id"], response["tool_response"]) for response, _ in results] == [
+        ("call-1", "slow result"),
+        ("call-2", "fast result"),
+        ("call-3", "there is not a tool named missing"),
+    ]
+    assert [message_files for _, message_files in results] == [["slow-file"], ["fast-file"], []]
+
+
+def test_timed_out_tool_call_is_reported_as_error(runner, parallel_tool_calls, monkeypatch):
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALL_TIMEOUT", 0.05)
+    release = threading.Event()
+
+    def agent_invoke(tool, tool_parameters, **kwargs):
+        if tool == "hanging":
+            release.wait(1)
+        return f"{tool} result", [], ToolInvokeMeta.empty()
+
+    tool_calls = [("call-1", "hanging", {}), ("call-2", "fast", {})]
+    with patch("core.agent.fc_agent_runner.ToolEngine.agent_invoke", agent_invoke):
+        results = list(runner._invoke_tool_calls(tool_calls, {"hanging": "hanging", "fast": "fast"}, None))
+    release.set()
+
+    hanging, fast = (response for response, _ in results)
+    assert hanging["tool_response"].startswith("tool invoke timeout")
+    assert hanging["meta"]["error"] == hanging["tool_response"]
+    assert fast["tool_response"] == "fast result"
+
+
+def test_queued_tool_calls_are_timed_from_their_start(runner, parallel_tool_calls, monkeypatch):
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALLS_MAX_WORKERS", 2)
+    monkeypatch.setattr(dify_config, "AGENT_PARALLEL_TOOL_CALL_TIMEOUT", 0.3)
+
+    tool_calls = [(f"call-{index}", "tool", {}) for index in range(6)]
+    with patch("core.agent.fc_agent_runner.ToolEngine.agent_invoke", _agent_invoke({"tool": 0.2})):
+        results = list(runner._invoke_tool_calls(tool_calls, {"tool": "tool"}, None))
+
+    assert [response["tool_response"] for response, _ in results] == ["tool result"] * 6
+
+
+def test_tool_calls_run_serially_by_default(runner):
+    invoked = []
+
+    def agent_invoke(tool, tool_parameters, **kwargs):
+        invoked.append(threading.current_thread())
+        return "result", [], ToolInvokeMeta.empty()
+
+    tool_calls = [("call-1", "a", {}), ("call-2", "b", {})]
+    with patch("core.agent.fc_agent_runner.ToolEngine.agent_invoke", agent_invoke):
+        results = list(runner._invoke_tool_calls(tool_calls, {"a": "a", "b": "b"}, None))
+
+    assert invoked == [threading.current_thread()] * 2
+    assert [response["tool_call_id"] for response, _ in results] == ["call-1", "call-2"]
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from core.app.apps.common.workflow_graph_cache import WorkflowGraphCache
+
+
+def _graph(*node_ids: str) -> str:
+    return json.dumps(
+        {
+            "nodes": [{"id": node_id, "data": {"type": "start"}} for node_id in node_ids],
+            "edges": [{"source": tail, "target": head} for tail, head in zip(node_ids, node_ids[1:])],
+        }
+    )
+
+
+def test_same_workflow_version_is_compiled_once():
+    cache = WorkflowGraphCache(maxsize=8)
+    graph = _graph("start", "answer")
+
+    first, first_hit = cache.get("workflow", graph)
+    second, second_hit = cache.get("workflow", graph)
+
+    assert (first_hit, second_hit) == (False, True)
+    assert second is first
+    assert first.root_node_id == "start"
+
+
+def test_changed_graph_or_root_node_is_compiled_again():
+    cache = WorkflowGraphCache(maxsize=8)
+    compiled_graph, _ = cache.get("workflow", _graph("start", "answer"))
+
+    edited, edited_hit = cache.get("workflow", _graph("start", "llm", "answer"))
+    rooted, rooted_hit = cache.get("workflow", _graph("start", "answer"), root_node_id="answer")
+    other, other_hit = cache.get("other-workflow", _graph("start", "answer"))
+
+    assert not edited_hit
+    assert list(edited.node_configs_map) == ["start", "llm", "answer"]
+    assert not rooted_hit
+    assert rooted.root_node_id == "answer"
+    assert not other_hit
+    assert other is not compiled_graph
+
+
+def test_least_recently_used_graph_is_evicted():
+    cache = WorkflowGraphCache(maxsize=2)
+    graph = _graph("start")
+
+    cache.get("a", graph)
+    cache.get("b", graph)
+    cache.get("a", graph)
+    cache.get("c", graph)
+
+    assert cache.get("a", graph)[1]
+    assert not cache.get("b", graph)[1]
+
+
+def test_zero_maxsize_disables_cache():
+    cache = WorkflowGraphCache(maxsize=0)
+    graph = _graph("start")
+
+    first, first_hit = cache.get("workflow", graph)
+    second, second_hit = cache.get("workflow", graph)
+
+    assert not first_hit
+    assert not second_hit
+    assert second is not first
+
+
+@pytest.mark.parametrize(
+    ("graph", "message"),
+    [
+        ("", "nodes or edges not found in workflow graph"),
+        (json.dumps({"nodes": {}, "edges": []}), "nodes in workflow graph must be a list"),
+        (json.dumps({"nodes": [], "edges": {}}), "edges in workflow graph must be a list"),
+    ],
+)
+def test_invalid_graph_is_rejected(graph, message):
+    with pytest.raises(ValueError, match=message):
+        WorkflowGraphCache(maxsize=8).get("workflow", graph)
@@ -0,0 +1,108 @@
+import pytest
+
+from configs import dify_config
+from core.helper.code_executor import code_executor
+from core.helper.code_executor.code_executor import CodeExecutionError, CodeExecutor, CodeLanguage
+from core.helper.code_executor.jinja2.jinja2_renderer import Jinja2Renderer, Jinja2RenderError
+
+
+def _renderer(**kwargs) -> Jinja2Renderer:
+    return Jinja2Renderer(**{"cache_size": 8, "render_timeout": 5.0, "max_output_length": 1000, **kwargs})
+
+
+def test_render():
+    renderer = _renderer()
+    template = "Hello {{ name }}!{% for item in items %} {{ item.title | upper }}{% endfor %}"
+
+    result = renderer.render(template, {"name": "world", "items": [{"title": "a"}, {"title": "b"}]})
+
+    assert result == "Hello world! A B"
+
+
+def test_compiled_templates_are_cached():
+    renderer = _renderer()
+    template = "{{ value }}"
+
+    assert renderer.render(template, {"value": 1}) == "1"
+    compiled_template = renderer._get_template(template)
+    assert renderer.render(template, {"value": 2}) == "2"
+    assert renderer._get_template(template) is compiled_template
+    assert renderer._get_template("{{ other }}") is not compiled_template
+
+
+@pytest.mark.parametrize(
+    ("template", "error"),
+    [
+        ("{{ value.__class__.__mro__ }}", "SecurityError"),
+        ("{{ items.append(1) }}", "SecurityError"),
+        ("{% if %}", "TemplateSyntaxError"),
+        ("{% for i in range(2000) %}x{% endfor %}", "Output length exceeds 1000 characters"),
+        ("{{ 'x' * 10 ** 9 }}", "Output length exceeds 1000 characters"),
+        (
+            "{% set ns = namespace(s='a') %}{% for i in range(29) %}{% set ns.s = ns.s ~ ns.s %}{% endfor %}"
+            "{{ ns.s|length }}",
+            "Output length exceeds 1000 characters",
+        ),
+        (
+            "{% set ns = namespace(s='a') %}{% for i in range(29) %}{% set ns.s = ns.s + ns.s %}{% endfor %}"
+            "{{ ns.s|length }}",
+            "Output length exceeds 1000 characters",
+        ),
+        ("{{ '{:>300000000}'.format('x')|length }}", "Output length exceeds 1000 characters"),
+        ("{{ '{s:>{w}}'.format_map({'s': 'x', 'w': 300000000})|length }}", "Output length exceeds 1000 characters"),
+        ("{{ ('%300000000s' % 'x')|length }}", "Output length exceeds 1000 characters"),
+        ("{{ ('%*s' % (300000000, 'x'))|length }}", "Output length exceeds 1000 characters"),
+        ("{{ '%300000000s'|format('x')|length }}", "Output length exceeds 1000 characters"),
+        ("{{ 'x'.ljust(300000000)|length }}", "Output length exceeds 1000 characters"),
+        ("{{ 'x'|center(300000000)|length }}", "Output length exceeds 1000 characters"),
+        ("{{ (['x' * 1000] * 1000)|join|length }}", "Output length exceeds 1000 characters"),
+        ("{{ ('x' * 1000)|replace('', 'y' * 1000)|length }}", "Output length exceeds 1000 characters"),
+    ],
+)
+def test_unsafe_templates_are_rejected(template: str, error: str):
+    with pytest.raises(Jinja2RenderError, match=error):
+        _renderer().render(template, {"value": "", "items": []})
+
+
+def test_bounded_operations_render():
+    template = (
+        "{{ 'a' ~ 1 }} {{ 'b' + 'c' }} {{ [1] + [2] }} {{ 7 % 3 }} {{ '%s-%03d' % ('d', 4) }} "
+        "{{ '{:>3}|{:.2f}'.format('e', 1.234) }} {{ 'f'|center(3) }} {{ [1, 2]|join(',') }} "
+        "{{ 'gg'|replace('g', 'h') }}"
+    )
+
+    assert _renderer().render(template, {}) == "a1 bc [1, 2] 1 d-004   e|1.23  f  1,2 hh"
+
+
+def test_render_timeout():
+    renderer = _renderer(render_timeout=0.1)
+    template = "{% for i in range(100000) %}{% for j in range(100000) %}{% endfor %}{% endfor %}"
+
+    with pytest.raises(Jinja2RenderError, match="timed out"):
+        renderer.render(template, {})
+
+
+def test_render_timeout_for_loops_without_calls():
+    renderer = _renderer(render_timeout=0.1, max_output_length=1_000_000)
+    template = "{% set l = [0] * 100000 %}{% for a in l %}{% for b in l %}{% endfor %}{% endfor %}"
+
+    with pytest.raises(Jinja2RenderError, match="timed out"):
+        renderer.render(template, {})
+
+
+def test_code_executor_renders_in_process(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(dify_config, "CODE_EXECUTION_JINJA2_MODE", "in_process")
+    monkeypatch.setattr(code_executor, "jinja2_renderer", _renderer())
+
+    def execute_code(*args, **kwargs):
+        raise AssertionError("Jinja2 templates must not be sent to the code execution service")
+
+    monkeypatch.setattr(CodeExecutor, "execute_code", execute_code)
+
+    result = CodeExecutor.execute_workflow_code_template(language=CodeLanguage.JINJA2, code="{{ a }}", inputs={"a": 1})
+    assert result == {"result": "1"}
+
+    with pytest.raises(CodeExecutionError, match="SecurityError"):
+        CodeExecutor.execute_workflow_code_template(
+            language=CodeLanguage.JINJA2, code="{{ a.__class__.__mro__ }}", inputs={"a": 1}
+        )
@@ -0,0 +1,147 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.helper.api_token_auth_cache import ApiTokenAuthCache, ApiTokenAuthContext, ApiTokenLastUsedRecorder
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value.encode()
+
+    def delete(self, key):
+        self.values.pop(key, None)
+        self.hashes.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.values or key in self.hashes)
+
+    def renamenx(self, src, dst):
+        if dst in self.hashes:
+            return False
+        self.hashes[dst] = self.hashes.pop(src)
+        return True
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key.encode()] = str(value).encode()
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("core.helper.api_token_auth_cache.redis_client", redis):
+        yield redis
+
+
+def _context(**kwargs) -> ApiTokenAuthContext:
+    return ApiTokenAuthContext(
+        **({"id": "token-1", "type": "app", "tenant_id": "tenant-1", "app_id": "app-1"} | kwargs)
+    )
+
+
+def test_token_is_cached_per_scope(fake_redis):
+    cache = ApiTokenAuthCache(enabled=True, ttl=300, local_ttl=10, maxsize=16)
+
+    cache.set_token("app-secret", _context())
+
+    assert cache.get_token("app-secret", "app") == _context()
+    assert cache.get_token("app-secret", "dataset") is None
+    assert cache.get_stats() == {"size": 1, "hits": 1, "misses": 1}
+    assert not any("app-secret" in key for key in fake_redis.values)
+
+
+def test_other_processes_read_through_redis(fake_redis):
+    writer = ApiTokenAuthCache(enabled=True, ttl=300, local_ttl=10, maxsize=16)
+    reader = ApiTokenAuthCache(enabled=True, ttl=300, local_ttl=10, maxsize=16)
+
+    writer.set_token("app-secret", _context())
+
+    assert reader.get_token("app-secret", "app") == _context()
+    fake_redis.values.clear()
+    assert reader.get_token("app-secret", "app") == _context()
+
+
+def test_invalidated_token_is_not_returned(fake_redis):
+    cache = ApiTokenAuthCache(enabled=True, ttl=300, local_ttl=10, maxsize=16)
+    cache.set_token("app-secret", _context())
+
+    cache.invalidate_token("app-secret", "app")
+
+    assert cache.get_token("app-secret", "app") is None
+    assert fake_redis.values == {}
+
+
+def test_disabled_cache(fake_redis):
+    cache = ApiTokenAuthCache(enabled=False, ttl=300, local_ttl=10, maxsize=16)
+
+    cache.set_token("app-secret", _context())
+
+    assert cache.get_token("app-secret", "app") is None
+    assert fake_redis.values == {}
+
+
+def test_last_use_is_recorded_once_per_interval(fake_redis):
+    recorder = ApiTokenLastUsedRecorder(interval=60, maxsize=16)
+
+    with patch("core.helper.api_token_auth_cache.time.time", return_value=1_700_000_000):
+        recorder.record("token-1")
+    with patch("core.helper.api_token_auth_cache.time.time", return_value=1_700_000_030):
+        recorder.record("token-1")
+        recorder.record("token-2")
+
+    assert fake_redis.hashes["api_token_last_used_at"] == {b"token-1": b"1700000000", b"token-2": b"1700000030"}
+
+
+def test_flush_updates_last_used_at_in_batches(fake_redis):
+    recorder = ApiTokenLastUsedRecorder(interval=60, maxsize=16)
+    for token_id in ["token-1", "token-2", "token-3"]:
+        recorder.record(token_id)
+    session = MagicMock()
+
+    with (
+        patch("core.helper.api_token_auth_cache.Session") as session_class,
+        patch("core.helper.api_token_auth_cache.db"),
+    ):
+        session_class.return_value.__enter__.return_value = session
+        assert recorder.flush(batch_size=2) == 3
+
+    batches = [call.args[1] for call in session.execute.call_args_list]
+    assert [[row["token_id"] for row in batch] for batch in batches] == [["token-1", "token-2"], ["token-3"]]
+    assert all(isinstance(row["used_at"], datetime) for batch in batches for row in batch)
+    session.commit.assert_called_once()
+    assert fake_redis.hashes == {}
+    assert recorder.flush() == 0
+
+
+def test_flush_writes_hash_left_by_failed_flush(fake_redis):
+    recorder = ApiTokenLastUsedRecorder(interval=60, maxsize=16)
+    recorder.record("token-1")
+    session = MagicMock()
+    session.execute.side_effect = [RuntimeError("database is down"), None, None]
+
+    with (
+        patch("core.helper.api_token_auth_cache.Session") as session_class,
+        patch("core.helper.api_token_auth_cache.db"),
+    ):
+        session_class.return_value.__enter__.return_value = session
+        with pytest.raises(RuntimeError):
+            recorder.flush()
+        assert list(fake_redis.hashes) == ["api_token_last_used_at:flushing"]
+
+        recorder.record("token-2")
+        assert recorder.flush() == 2
+
+    batches = [call.args[1] for call in session.execute.call_args_list]
+    assert [[row["token_id"] for row in batch] for batch in batches] == [["token-1"], ["token-1"], ["token-2"]]
+    assert fake_redis.hashes == {}
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from core.helper import http_client_pooling
+from core.helper.http_client_pooling import HttpClientPoolFactory, get_connection_counts, pool_wait_trace
+
+
+def _connection(idle: bool = False, closed: bool = False) -> MagicMock:
+    connection = MagicMock()
+    connection.is_idle.return_value = idle
+    connection.is_closed.return_value = closed
+    return connection
+
+
+def test_factory_reuses_client_per_key():
+    factory = HttpClientPoolFactory()
+    builder = MagicMock(side_effect=lambda: MagicMock(spec=httpx.Client))
+
+    first = factory.get_or_create("a", builder)
+    second = factory.get_or_create("a", builder)
+    other = factory.get_or_create("b", builder)
+
+    assert first is second
+    assert other is not first
+    assert builder.call_count == 2
+    assert factory.snapshot() == {"a": first, "b": other}
+
+
+def test_connection_counts_by_state():
+    connections = [_connection(), _connection(), _connection(idle=True), _connection(closed=True)]
+    client = SimpleNamespace(_transport=SimpleNamespace(_pool=SimpleNamespace(connections=connections)))
+
+    assert get_connection_counts(client) == (2, 1)  # type: ignore[arg-type]
+
+
+def test_connection_counts_without_connection_pool():
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    assert get_connection_counts(client) == (0, 0)
+
+
+def test_pool_wait_trace_records_first_event_only():
+    with patch.object(http_client_pooling, "_pool_wait_time") as pool_wait_time:
+        trace = pool_wait_trace("pool")
+        trace("connection.connect_tcp.started", {})
+        trace("http11.send_request_headers.started", {})
+
+    pool_wait_time.record.assert_called_once()
+    assert pool_wait_time.record.call_args.args[1] == {"pool": "pool"}
@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.helper.plugin_tool_provider_cache import PluginToolProviderCache
+from core.plugin.entities.plugin_daemon import PluginToolProviderEntity
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return str(value).encode() if value is not None else None
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("core.helper.plugin_tool_provider_cache.redis_client", redis):
+        yield redis
+
+
+def _provider_entity(plugin_unique_identifier: str = "langgenius/search:0.0.1@abc") -> PluginToolProviderEntity:
+    return PluginToolProviderEntity.model_validate(
+        {
+            "provider": "search",
+            "plugin_unique_identifier": plugin_unique_identifier,
+            "plugin_id": "langgenius/search",
+            "declaration": {
+                "identity": {
+                    "author": "langgenius",
+                    "name": "langgenius/search/search",
+                    "description": {"en_US": "Search"},
+                    "icon": "icon.svg",
+                    "label": {"en_US": "Search"},
+                },
+            },
+        }
+    )
+
+
+def test_get_reuses_entry_until_plugins_change(fake_redis):
+    cache = PluginToolProviderCache(ttl=300, maxsize=16)
+    loader = MagicMock(return_value=_provider_entity())
+
+    first = cache.get("tenant-1", "langgenius/search/search", loader)
+    second = cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert loader.call_count == 1
+    assert first == second
+    assert cache.get_stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    cache.invalidate("tenant-1")
+    cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert loader.call_count == 2
+
+
+def test_plugin_change_in_another_process_reloads(fake_redis):
+    cache = PluginToolProviderCache(ttl=300, maxsize=16)
+    loader = MagicMock(side_effect=[_provider_entity("v1"), _provider_entity("v2")])
+    cache.get("tenant-1", "langgenius/search/search", loader)
+
+    fake_redis.incr("plugin_tool_provider_generation:tenant-1")
+    provider_entity = cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert provider_entity.plugin_unique_identifier == "v2"
+
+
+def test_entries_are_isolated_per_tenant(fake_redis):
+    cache = PluginToolProviderCache(ttl=300, maxsize=16)
+    loader = MagicMock(return_value=_provider_entity())
+    cache.get("tenant-1", "langgenius/search/search", loader)
+    cache.get("tenant-2", "langgenius/search/search", loader)
+
+    cache.invalidate("tenant-2")
+    cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert loader.call_count == 2
+    assert fake_redis.values == {"plugin_tool_provider_generation:tenant-2": 1}
+
+
+def test_callers_get_independent_copies(fake_redis):
+    cache = PluginToolProviderCache(ttl=300, maxsize=16)
+    loader = MagicMock(return_value=_provider_entity())
+
+    first = cache.get("tenant-1", "langgenius/search/search", loader)
+    first.declaration.identity.label.en_US = "Changed by a request"
+    second = cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert second.declaration.identity.label.en_US == "Search"
+
+
+def test_redis_failure_bypasses_the_cache():
+    cache = PluginToolProviderCache(ttl=300, maxsize=16)
+    loader = MagicMock(return_value=_provider_entity())
+
+    with patch("core.helper.plugin_tool_provider_cache.redis_client") as redis:
+        redis.get.side_effect = ConnectionError("Redis is down")
+        cache.get("tenant-1", "langgenius/search/search", loader)
+        cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert loader.call_count == 2
+    assert cache.get_stats() == {"size": 0, "hits": 0, "misses": 2}
+
+
+def test_cache_disabled(fake_redis):
+    cache = PluginToolProviderCache(ttl=0, maxsize=16)
+    loader = MagicMock(return_value=_provider_entity())
+
+    cache.get("tenant-1", "langgenius/search/search", loader)
+    cache.get("tenant-1", "langgenius/search/search", loader)
+
+    assert loader.call_count == 2
@@ -0,0 +1,147 @@
+"""Unit tests for the MCP client pool."""
+
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from core.mcp.client_pool import MCPClientPool
+from core.mcp.error import MCPConnectionError
+
+
+def _provider(provider_id: str = "provider-1") -> Mock:
+    return Mock(id=provider_id, tenant_id="tenant-1")
+
+
+def _borrow(pool: MCPClientPool, provider: Mock, headers: dict[str, str] | None = None):
+    return pool.client(
+        provider_entity=provider,
+        server_url="http://test.example.com/mcp",
+        headers=headers or {"Authorization": "Bearer token"},
+    )
+
+
+@pytest.fixture
+def mock_client_class():
+    """Every constructed client is a separate mock that is connected once entered."""
+
+    def create_client(**kwargs):
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.is_connected.return_value = True
+        return client
+
+    with patch("core.mcp.client_pool.MCPClientWithAuthRetry", side_effect=create_client) as mock_class:
+        yield mock_class
+
+
+class TestMCPClientPool:
+    """Test suite for MCPClientPool."""
+
+    def test_client_is_reused(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with _borrow(pool, provider) as first:
+            first.invoke_tool("tool", {})
+        with _borrow(pool, provider) as second:
+            second.list_tools()
+
+        assert first is second
+        mock_client_class.assert_called_once()
+        first.__enter__.assert_called_once()
+        first.__exit__.assert_not_called()
+        assert pool.get_status() == {"keys": 1, "idle_clients": 1}
+
+    def test_clients_are_keyed_on_provider_and_credentials(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with _borrow(pool, provider, {"Authorization": "Bearer old"}) as old_token_client:
+            pass
+        with _borrow(pool, provider, {"Authorization": "Bearer new"}) as new_token_client:
+            pass
+        with _borrow(pool, _provider("provider-2"), {"Authorization": "Bearer new"}) as other_provider_client:
+            pass
+
+        assert len({id(old_token_client), id(new_token_client), id(other_provider_client)}) == 3
+        assert pool.get_status() == {"keys": 3, "idle_clients": 3}
+
+    def test_concurrent_borrows_get_separate_clients(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=1, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with _borrow(pool, provider) as first, _borrow(pool, provider) as second:
+            assert first is not second
+
+        # Only one idle client is kept per key, the other one is closed
+        assert pool.get_status() == {"keys": 1, "idle_clients": 1}
+        assert first.__exit__.call_count + second.__exit__.call_count == 1
+
+    def test_client_is_closed_after_an_error(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with pytest.raises(MCPConnectionError), _borrow(pool, provider) as failed:
+            raise MCPConnectionError("Connection lost")
+        with _borrow(pool, provider) as client:
+            pass
+
+        failed.__exit__.assert_called_once_with(None, None, None)
+        assert client is not failed
+
+    def test_disconnected_client_is_replaced(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with _borrow(pool, provider) as disconnected:
+            pass
+        disconnected.is_connected.return_value = False
+        with _borrow(pool, provider) as client:
+            pass
+
+        assert client is not disconnected
+        disconnected.__exit__.assert_called_once()
+
+    def test_client_idle_past_health_check_interval_is_pinged(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=60.0, health_check_interval=0.0)
+        provider = _provider()
+
+        with _borrow(pool, provider) as healthy:
+            pass
+        with _borrow(pool, provider) as client:
+            pass
+        assert client is healthy
+        healthy.ping.assert_called_once()
+
+        healthy.ping.side_effect = MCPConnectionError("Connection lost")
+        with _borrow(pool, provider) as client:
+            pass
+        assert client is not healthy
+        healthy.__exit__.assert_called_once()
+
+    def test_idle_clients_are_evicted(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=2, idle_timeout=0.01, health_check_interval=30.0)
+
+        with _borrow(pool, _provider("provider-1")) as idle:
+            pass
+        time.sleep(0.02)
+        with _borrow(pool, _provider("provider-2")):
+            pass
+
+        idle.__exit__.assert_called_once()
+        assert pool.get_status() == {"keys": 1, "idle_clients": 1}
+
+    def test_pooling_disabled(self, mock_client_class):
+        pool = MCPClientPool(max_idle_per_key=0, idle_timeout=60.0, health_check_interval=30.0)
+        provider = _provider()
+
+        with _borrow(pool, provider) as first:
+            pass
+        with _borrow(pool, provider) as second:
+            pass
+
+        assert first is not second
+        first.__exit__.assert_called_once()
+        second.__exit__.assert_called_once()
+        assert pool.get_status() == {"keys": 0, "idle_clients": 0}
@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Imported ahead of core.memory, which cannot be imported first because of a circular import
+import core.app.entities.app_invoke_entities  # noqa: F401
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, PromptMessage, UserPromptMessage
+
+# tokens added once per request by the fake tokenizer, like the priming tokens of chat models
+_REQUEST_OVERHEAD = 3
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.values[key] = str(value)
+
+
+def count_tokens(prompt_messages) -> int:
+    return _REQUEST_OVERHEAD + sum(len(str(message.content).split()) for message in prompt_messages)
+
+
+@pytest.fixture
+def redis():
+    redis = FakeRedis()
+    with patch("core.memory.token_buffer_memory.redis_client", redis):
+        yield redis
+
+
+def make_memory() -> TokenBufferMemory:
+    model_instance = MagicMock()
+    model_instance.provider = "openai"
+    model_instance.model = "gpt-4o"
+    model_instance.get_llm_num_tokens.side_effect = count_tokens
+    return TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+
+
+def make_history(turns: int) -> tuple[list[PromptMessage], list[str]]:
+    prompt_messages: list[PromptMessage] = []
+    keys = []
+    for i in range(turns):
+        prompt_messages.append(UserPromptMessage(content=" ".join(["question"] * (i % 7 + 1))))
+        prompt_messages.append(AssistantPromptMessage(content=" ".join(["answer"] * (i % 5 + 10))))
+        keys += [f"message-{i}:user", f"message-{i}:assistant"]
+    return prompt_messages, keys
+
+
+def prune_by_popping(prompt_messages: list[PromptMessage], max_token_limit: int) -> list[PromptMessage]:
+    prompt_messages = list(prompt_messages)
+    while count_tokens(prompt_messages) > max_token_limit and len(prompt_messages) > 1:
+        prompt_messages.pop(0)
+    return prompt_messages
+
+
+def test_history_within_limit_is_counted_once(redis):
+    memory = make_memory()
+    prompt_messages, keys = make_history(3)
+
+    assert memory._prune_prompt_messages(list(prompt_messages), keys, 2000) == prompt_messages
+    assert memory.model_instance.get_llm_num_tokens.call_count == 1
+    assert redis.values == {}
+
+
+@pytest.mark.parametrize("max_token_limit", [1, 15, 40, 100, 500])
+def test_pruning_matches_popping_one_message_at_a_time(redis, max_token_limit):
+    memory = make_memory()
+    prompt_messages, keys = make_history(50)
+
+    pruned = memory._prune_prompt_messages(list(prompt_messages), keys, max_token_limit)
+
+    assert pruned == prune_by_popping(prompt_messages, max_token_limit)
+
+
+def test_message_tokens_are_counted_once_per_message(redis):
+    memory = make_memory()
+    prompt_messages, keys = make_history(200)
+    count_calls = memory.model_instance.get_llm_num_tokens
+
+    pruned = memory._prune_prompt_messages(list(prompt_messages), keys, 500)
+    first_calls = count_calls.call_count
+    count_calls.reset_mock()
+    # the next turn adds one message, only its user and assistant messages are counted on their own,
+    # plus the whole history, the window and the window extended with older messages that still fit
+    prompt_messages, keys = make_history(201)
+    memory._prune_prompt_messages(list(prompt_messages), keys, 500)
+
+    # popping one message at a time took hundreds of calls, each counting the whole remaining history,
+    # now only the messages of the window are counted on their own, plus the whole history and the window
+    assert first_calls <= len(pruned) + 4
+    assert count_calls.call_count == 5
+    assert all(key.startswith("prompt_message_tokens:openai:gpt-4o:message-") for key in redis.values)
+
+
+def test_newest_message_is_kept_even_if_over_limit(redis):
+    memory = make_memory()
+    prompt_messages, keys = make_history(2)
+
+    assert memory._prune_prompt_messages(list(prompt_messages), keys, 1) == prompt_messages[-1:]
+
+
+def test_get_message_files_splits_by_owner():
+    user_file = MagicMock(message_id="m1", belongs_to="user")
+    legacy_file = MagicMock(message_id="m1", belongs_to=None)
+    assistant_file = MagicMock(message_id="m2", belongs_to="assistant")
+
+    with patch("core.memory.token_buffer_memory.db") as db:
+        db.session.scalars.return_value = [user_file, legacy_file, assistant_file]
+        message_files = TokenBufferMemory._get_message_files(["m1", "m2"])
+
+    db.session.scalars.assert_called_once()
+    assert message_files["m1"] == ([user_file, legacy_file], [])
+    assert message_files["m2"] == ([], [assistant_file])
@@ -0,0 +1,93 @@
+import string
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from configs import dify_config
+from core.app.apps.base_app_queue_manager import AppQueueManager
+from core.moderation.base import ModerationAction, ModerationOutputsResult
+from core.moderation.output_moderation import ModerationRule, OutputModeration
+
+
+class KeywordOutputModeration(OutputModeration):
+    """Flags texts containing `keyword`, records the moderated texts."""
+
+    keyword: str = "forbidden"
+    action: ModerationAction = ModerationAction.DIRECT_OUTPUT
+    moderated: list[str] = []
+
+    def moderation(self, tenant_id: str, app_id: str, moderation_buffer: str) -> ModerationOutputsResult | None:
+        self.moderated.append(moderation_buffer)
+        return ModerationOutputsResult(
+            flagged=self.keyword in moderation_buffer,
+            action=self.action,
+            preset_response="Blocked",
+            text=moderation_buffer.replace(self.keyword, "*" * len(self.keyword)),
+        )
+
+
+@pytest.fixture(autouse=True)
+def app_context(monkeypatch):
+    monkeypatch.setattr(dify_config, "MODERATION_BUFFER_SIZE", 10)
+    monkeypatch.setattr(dify_config, "MODERATION_BUFFER_OVERLAP", 4)
+    with Flask(__name__).app_context():
+        yield
+
+
+def _output_moderation(**kwargs) -> KeywordOutputModeration:
+    return KeywordOutputModeration(
+        tenant_id="tenant-1",
+        app_id="app-1",
+        rule=ModerationRule(type="keywords", config={}),
+        queue_manager=MagicMock(spec=AppQueueManager),
+        moderated=[],
+        **kwargs,
+    )
+
+
+def _stream(moderation: OutputModeration, tokens: list[str]):
+    for token in tokens:
+        moderation.append_new_token(token)
+        while (check := moderation._check) is not None:
+            check.result()
+
+
+def test_only_new_text_is_moderated_with_overlap():
+    moderation = _output_moderation()
+
+    _stream(moderation, [string.digits, "abcde", "fghij", "xyz"])
+
+    assert moderation.moderated == [string.digits, "6789abcdefghij"]
+    moderation.queue_manager.publish.assert_not_called()
+
+
+def test_text_spanning_two_windows_is_flagged():
+    moderation = _output_moderation()
+
+    _stream(moderation, ["hello forb", "idden world"])
+
+    assert moderation.should_direct_output()
+    assert moderation.get_final_output() == "Blocked"
+    assert moderation.queue_manager.publish.call_args.args[0].text == "Blocked"
+
+
+def test_overridden_window_replaces_the_whole_text():
+    moderation = _output_moderation(action=ModerationAction.OVERRIDDEN)
+
+    _stream(moderation, ["forbidden!", "and more forbidden"])
+
+    assert moderation.moderated[-1] == "forbidden!and more forbidden"
+    assert moderation.queue_manager.publish.call_args.args[0].text == "*********!and more *********"
+    assert not moderation.should_direct_output()
+
+
+def test_no_event_is_published_after_stop():
+    moderation = _output_moderation()
+    moderation.stop()
+
+    _stream(moderation, ["forbidden!"])
+
+    assert moderation.moderated == []
+    assert moderation.moderation_completion("forbidden!") == ("Blocked", True)
+    moderation.queue_manager.publish.assert_not_called()
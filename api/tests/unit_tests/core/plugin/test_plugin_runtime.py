@@ -31,7 +31,7 @@ from core.plugin.entities.plugin_daemon import (
     CredentialType,
     PluginDaemonInnerError,
 )
-from core.plugin.impl.base import BasePluginClient
+from core.plugin.impl.base import BasePluginClient, _build_plugin_daemon_client
 from core.plugin.impl.exc import (
     PluginDaemonBadRequestError,
     PluginDaemonInternalServerError,
@@ -114,7 +114,7 @@ class TestPluginRuntimeExecution:
         mock_response.status_code = 200
         mock_response.json.return_value = {"result": "success"}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             response = plugin_client._request("GET", "plugin/test-tenant/management/list")
 
@@ -132,7 +132,7 @@ class TestPluginRuntimeExecution:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -140,10 +140,39 @@ class TestPluginRuntimeExecution:
             call_kwargs = mock_request.call_args[1]
             assert "timeout" in call_kwargs
 
+    def test_requests_share_pooled_client(self, plugin_client, mock_config):
+        """Test that requests reuse one keep-alive client instead of opening a connection per call."""
+        # Arrange
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_client = MagicMock()
+        mock_client.request.return_value = mock_response
+
+        with patch("core.plugin.impl.base.get_pooled_http_client", return_value=mock_client) as mock_get_client:
+            # Act
+            plugin_client._request("GET", "plugin/test-tenant/test")
+            plugin_client._request("POST", "plugin/test-tenant/test")
+
+            # Assert
+            assert {call.args[0] for call in mock_get_client.call_args_list} == {"plugin_daemon:http_client"}
+            assert mock_client.request.call_count == 2
+            assert "trace" in mock_client.request.call_args.kwargs["extensions"]
+
+    def test_http2_falls_back_without_h2(self, mock_config):
+        """Test that enabling HTTP/2 without the h2 package falls back to HTTP/1.1."""
+        with (
+            patch("core.plugin.impl.base.dify_config.PLUGIN_DAEMON_HTTP2_ENABLED", True),
+            patch("core.plugin.impl.base.httpx.Client", side_effect=[ImportError("h2"), MagicMock()]) as mock_client,
+        ):
+            _build_plugin_daemon_client()
+
+        assert mock_client.call_args_list[0].kwargs["http2"] is True
+        assert "http2" not in mock_client.call_args_list[1].kwargs
+
     def test_request_connection_error(self, plugin_client, mock_config):
         """Test handling of connection errors during request."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.RequestError("Connection failed")):
+        with patch("httpx.Client.request", side_effect=httpx.RequestError("Connection failed")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -182,7 +211,7 @@ class TestPluginRuntimeSandboxIsolation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -201,7 +230,7 @@ class TestPluginRuntimeSandboxIsolation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": {"result": "isolated_execution"}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/dispatch/tool/invoke", TestResponse, data={"tool": "test"}
@@ -218,7 +247,7 @@ class TestPluginRuntimeSandboxIsolation:
         error_message = json.dumps({"error_type": "PluginDaemonUnauthorizedError", "message": "Unauthorized access"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonUnauthorizedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -234,7 +263,7 @@ class TestPluginRuntimeSandboxIsolation:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginPermissionDeniedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -272,7 +301,7 @@ class TestPluginRuntimeResourceLimits:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -283,7 +312,7 @@ class TestPluginRuntimeResourceLimits:
     def test_timeout_error_handling(self, plugin_client, mock_config):
         """Test handling of timeout errors."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.TimeoutException("Request timeout")):
+        with patch("httpx.Client.request", side_effect=httpx.TimeoutException("Request timeout")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -292,7 +321,7 @@ class TestPluginRuntimeResourceLimits:
     def test_streaming_request_timeout(self, plugin_client, mock_config):
         """Test timeout handling for streaming requests."""
         # Arrange
-        with patch("httpx.stream", side_effect=httpx.TimeoutException("Stream timeout")):
+        with patch("httpx.Client.stream", side_effect=httpx.TimeoutException("Stream timeout")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 list(plugin_client._stream_request("POST", "plugin/test-tenant/stream"))
@@ -308,7 +337,7 @@ class TestPluginRuntimeResourceLimits:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonInternalServerError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -351,7 +380,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeRateLimitError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -369,7 +398,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeAuthorizationError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -387,7 +416,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -405,7 +434,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeConnectionError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -423,7 +452,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeServerUnavailableError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -441,7 +470,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(CredentialsValidateFailedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/validate", bool)
@@ -457,7 +486,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginNotFoundError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/get", bool)
@@ -473,7 +502,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginUniqueIdentifierError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/install", bool)
@@ -489,7 +518,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -503,7 +532,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginDaemonNotFoundError", "message": "Resource not found"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonNotFoundError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/resource", bool)
@@ -521,7 +550,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": invoke_error_message})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginInvokeError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -535,7 +564,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "UnknownErrorType", "message": "Unknown error occurred"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(Exception) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -550,7 +579,7 @@ class TestPluginRuntimeErrorHandling:
             "Server Error", request=MagicMock(), response=mock_response
         )
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(httpx.HTTPStatusError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -562,7 +591,7 @@ class TestPluginRuntimeErrorHandling:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -605,7 +634,7 @@ class TestPluginRuntimeCommunication:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": {"value": "test", "count": 42}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/test", TestModel, data={"input": "data"}
@@ -632,7 +661,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -662,7 +691,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -684,7 +713,7 @@ class TestPluginRuntimeCommunication:
     def test_streaming_connection_error(self, plugin_client, mock_config):
         """Test connection error during streaming."""
         # Arrange
-        with patch("httpx.stream", side_effect=httpx.RequestError("Stream connection failed")):
+        with patch("httpx.Client.stream", side_effect=httpx.RequestError("Stream connection failed")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 list(plugin_client._stream_request("POST", "plugin/test-tenant/stream"))
@@ -702,7 +731,7 @@ class TestPluginRuntimeCommunication:
         mock_response.status_code = 200
         mock_response.json.return_value = {"status": "success", "data": {"key": "value"}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_model("GET", "plugin/test-tenant/direct", DirectModel)
 
@@ -727,7 +756,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -759,7 +788,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -809,7 +838,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -839,7 +868,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -863,7 +892,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -887,7 +916,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -940,7 +969,7 @@ class TestPluginInstallerIntegration:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.list_plugins("test-tenant")
 
@@ -954,7 +983,7 @@ class TestPluginInstallerIntegration:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.uninstall("test-tenant", "plugin-installation-id")
 
@@ -968,7 +997,7 @@ class TestPluginInstallerIntegration:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.fetch_plugin_by_identifier("test-tenant", "plugin-identifier")
 
@@ -1007,7 +1036,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response.status_code = 200
         mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1020,7 +1049,7 @@ class TestPluginRuntimeEdgeCases:
         # Missing required fields in response
         mock_response.json.return_value = {"invalid": "structure"}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1036,7 +1065,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1060,7 +1089,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("POST", "plugin/test-tenant/upload", data=b"binary data")
 
@@ -1076,7 +1105,7 @@ class TestPluginRuntimeEdgeCases:
 
         files = {"file": ("test.txt", b"file content", "text/plain")}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("POST", "plugin/test-tenant/upload", files=files)
 
@@ -1090,7 +1119,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = []
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1110,7 +1139,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act & Assert
@@ -1131,7 +1160,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": -1, "message": "Plain text error message", "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1169,7 +1198,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             for i in range(5):
                 result = plugin_client._request_with_plugin_daemon_response("GET", f"plugin/test-tenant/test/{i}", bool)
@@ -1198,7 +1227,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": complex_data}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/complex", ComplexModel
@@ -1226,7 +1255,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1257,7 +1286,7 @@ class TestPluginRuntimeAdvancedScenarios:
             mock_response.status_code = 200
             return mock_response
 
-        with patch("httpx.request", side_effect=side_effect):
+        with patch("httpx.Client.request", side_effect=side_effect):
             # Act & Assert - First two calls should fail
             with pytest.raises(PluginDaemonInnerError):
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -1281,7 +1310,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test", headers=custom_headers)
 
@@ -1307,7 +1336,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1354,7 +1383,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -1376,7 +1405,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request_with_plugin_daemon_response(
                 "POST",
@@ -1398,7 +1427,7 @@ class TestPluginRuntimeSecurityAndValidation:
         error_message = json.dumps({"error_type": "PluginDaemonUnauthorizedError", "message": "Invalid API key"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonUnauthorizedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1419,7 +1448,7 @@ class TestPluginRuntimeSecurityAndValidation:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response(
@@ -1433,7 +1462,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request(
                 "POST", "plugin/test-tenant/test", headers={"Content-Type": "application/json"}, data={"key": "value"}
@@ -1484,7 +1513,7 @@ class TestPluginRuntimePerformanceScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1519,7 +1548,7 @@ class TestPluginRuntimePerformanceScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act - Process chunks one by one
@@ -1534,7 +1563,7 @@ class TestPluginRuntimePerformanceScenarios:
     def test_timeout_with_slow_response(self, plugin_client, mock_config):
         """Test timeout handling with slow response simulation."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.TimeoutException("Request timed out after 30s")):
+        with patch("httpx.Client.request", side_effect=httpx.TimeoutException("Request timed out after 30s")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/slow-endpoint")
@@ -1549,7 +1578,7 @@ class TestPluginRuntimePerformanceScenarios:
 
         request_results = []
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act - Simulate 10 concurrent requests
             for i in range(10):
                 result = plugin_client._request_with_plugin_daemon_response(
@@ -1607,7 +1636,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1636,7 +1665,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1668,7 +1697,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1699,7 +1728,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1765,7 +1794,7 @@ class TestPluginInstallerAdvanced:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.upload_pkg("test-tenant", plugin_package, verify_signature=False)
 
@@ -1783,7 +1812,7 @@ class TestPluginInstallerAdvanced:
             "data": {"content": "# Plugin README\n\nThis is a test plugin.", "language": "en"},
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.fetch_plugin_readme("test-tenant", "test-org/test-plugin", "en")
 
@@ -1802,7 +1831,7 @@ class TestPluginInstallerAdvanced:
 
         mock_response.raise_for_status = raise_for_status
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert - Should raise HTTPStatusError for 404
             with pytest.raises(httpx.HTTPStatusError):
                 installer.fetch_plugin_readme("test-tenant", "test-org/test-plugin", "en")
@@ -1821,7 +1850,7 @@ class TestPluginInstallerAdvanced:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.list_plugins_with_total("test-tenant", page=2, page_size=20)
 
@@ -1843,7 +1872,7 @@ class TestPluginInstallerAdvanced:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": [True, False]}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.check_tools_existence("test-tenant", provider_ids)
 
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.rag.datasource.keyword.jieba.jieba_incremental import JiebaIncremental
+from core.rag.datasource.keyword.keyword_factory import Keyword
+from core.rag.datasource.keyword.keyword_type import KeyWordType
+from core.rag.models.document import Document
+
+
+@pytest.fixture
+def dataset():
+    dataset = MagicMock()
+    dataset.id = "dataset-1"
+    dataset.tenant_id = "tenant-1"
+    dataset.keyword_number = 10
+    dataset.dataset_keyword_table = None
+    return dataset
+
+
+def test_factory_returns_incremental_store():
+    assert Keyword.get_keyword_factory(KeyWordType.JIEBA_INCREMENTAL) is JiebaIncremental
+
+
+def test_rank_index_node_ids_orders_by_matching_keywords():
+    keyword_table = {
+        "python": {"node-1", "node-2"},
+        "flask": {"node-2"},
+        "django": {"node-3"},
+    }
+
+    result = JiebaIncremental._rank_index_node_ids(["python", "flask", "missing"], keyword_table, k=2)
+
+    assert result[0] == "node-2"
+    assert result[1] == "node-1"
+
+
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.db")
+def test_add_texts_inserts_only_new_postings(mock_db, dataset):
+    keyword = JiebaIncremental(dataset)
+    texts = [
+        Document(page_content="first", metadata={"doc_id": "node-1"}),
+        Document(page_content="second", metadata={"doc_id": "node-2"}),
+    ]
+
+    with patch.object(keyword, "_update_segment_keywords"):
+        keyword.add_texts(texts, keywords_list=[["a", "b", "a"], ["b", "x" * 300]])
+
+    mock_db.session.execute.assert_called_once()
+    params = mock_db.session.execute.call_args[0][0].compile().params
+    inserted = {(params[key], params[key.replace("keyword", "index_node_id")]) for key in params if "keyword" in key}
+    # duplicate and over-long keywords are skipped
+    assert inserted == {("a", "node-1"), ("b", "node-1"), ("b", "node-2")}
+    mock_db.session.commit.assert_called_once()
+
+
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.db")
+def test_delete_by_ids_only_touches_given_nodes(mock_db, dataset):
+    keyword = JiebaIncremental(dataset)
+
+    keyword.delete_by_ids(["node-1"])
+
+    stmt = mock_db.session.execute.call_args[0][0]
+    compiled = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "DELETE FROM dataset_keyword_postings" in compiled
+    assert "node-1" in compiled
+
+
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.JiebaKeywordTableHandler")
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.db")
+def test_search_loads_only_query_keywords(mock_db, mock_handler, dataset):
+    mock_handler.return_value.extract_keywords.return_value = {"python", "flask"}
+    mock_db.session.execute.return_value = [("python", "node-1"), ("python", "node-2"), ("flask", "node-2")]
+    keyword = JiebaIncremental(dataset)
+
+    with patch.object(keyword, "_get_documents_by_index_node_ids", return_value=[]) as mock_get_documents:
+        keyword.search("python flask", top_k=1)
+
+    stmt = mock_db.session.execute.call_args[0][0]
+    compiled = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "dataset_keyword_postings.keyword IN" in compiled
+    mock_get_documents.assert_called_once_with(["node-2"], None)
+
+
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.redis_client")
+@patch("core.rag.datasource.keyword.jieba.jieba_incremental.db")
+def test_legacy_keyword_table_is_imported_once(mock_db, mock_redis, dataset):
+    legacy_table = MagicMock()
+    legacy_table.data_source_type = "database"
+    legacy_table.keyword_table_dict = {"__data__": {"table": {"python": {"node-1"}}}}
+    dataset.dataset_keyword_table = legacy_table
+    keyword = JiebaIncremental(dataset)
+
+    keyword._migrate_legacy_keyword_table()
+
+    mock_db.session.execute.assert_called_once()
+    mock_db.session.delete.assert_called_once_with(legacy_table)
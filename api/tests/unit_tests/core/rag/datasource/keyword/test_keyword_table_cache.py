@@ -0,0 +1,113 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.rag.datasource.keyword.jieba.jieba import Jieba
+from core.rag.datasource.keyword.jieba.keyword_table_cache import KeywordTableCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return str(value).encode() if value is not None else None
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("core.rag.datasource.keyword.jieba.keyword_table_cache.redis_client", redis):
+        yield redis
+
+
+def test_get_reuses_entry_until_version_changes(fake_redis):
+    cache = KeywordTableCache(max_postings=100)
+    loader = MagicMock(return_value={"python": {"node-1", "node-2"}, "flask": {"node-2"}})
+
+    first = cache.get("dataset-1", loader)
+    second = cache.get("dataset-1", loader)
+
+    assert first is second
+    assert loader.call_count == 1
+    assert first is not None
+    assert first.node_ids == {"node-1", "node-2"}
+    assert first.postings == 3
+
+    cache.invalidate("dataset-1")
+    cache.get("dataset-1", loader)
+
+    assert loader.call_count == 2
+
+
+def test_version_bump_from_another_process_reloads(fake_redis):
+    cache = KeywordTableCache(max_postings=100)
+    loader = MagicMock(return_value={"python": {"node-1"}})
+    cache.get("dataset-1", loader)
+
+    fake_redis.incr("keyword_table_version:dataset-1")
+    cache.get("dataset-1", loader)
+
+    assert loader.call_count == 2
+
+
+def test_entries_are_evicted_by_posting_count(fake_redis):
+    cache = KeywordTableCache(max_postings=4)
+    loader_1 = MagicMock(return_value={"a": {"node-1", "node-2"}})
+    loader_2 = MagicMock(return_value={"b": {"node-3", "node-4", "node-5"}})
+
+    cache.get("dataset-1", loader_1)
+    cache.get("dataset-2", loader_2)
+    cache.get("dataset-1", loader_1)
+
+    assert loader_1.call_count == 2
+    assert loader_2.call_count == 1
+
+
+def test_oversized_table_is_served_without_caching(fake_redis):
+    cache = KeywordTableCache(max_postings=1)
+    loader = MagicMock(return_value={"a": {"node-1", "node-2"}})
+
+    entry = cache.get("dataset-1", loader)
+    cache.get("dataset-1", loader)
+
+    assert entry is not None
+    assert entry.node_ids == {"node-1", "node-2"}
+    assert loader.call_count == 2
+
+
+def test_disabled_cache_always_loads(fake_redis):
+    cache = KeywordTableCache(max_postings=0)
+    loader = MagicMock(return_value={"a": {"node-1"}})
+
+    cache.get("dataset-1", loader)
+    cache.get("dataset-1", loader)
+
+    assert loader.call_count == 2
+    assert fake_redis.values == {}
+
+
+def test_jieba_read_paths_use_cache(fake_redis):
+    dataset = MagicMock()
+    dataset.id = "dataset-cached"
+    keyword = Jieba(dataset)
+    keyword_table = {"python": {"node-1", "node-2"}, "flask": {"node-2"}}
+
+    with (
+        patch.object(keyword, "_get_dataset_keyword_table", return_value=keyword_table) as mock_load,
+        patch("core.rag.datasource.keyword.jieba.jieba.JiebaKeywordTableHandler") as mock_handler,
+        patch.object(keyword, "_get_documents_by_index_node_ids", return_value=[]) as mock_get_documents,
+    ):
+        mock_handler.return_value.extract_keywords.return_value = {"python", "flask", "missing"}
+
+        assert keyword.text_exists("node-1")
+        assert not keyword.text_exists("node-3")
+        keyword.search("python flask", top_k=1)
+
+    mock_load.assert_called_once()
+    mock_get_documents.assert_called_once_with(["node-2"], None)
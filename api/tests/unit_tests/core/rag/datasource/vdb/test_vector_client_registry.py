@@ -0,0 +1,124 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+from psycopg2.pool import PoolError
+from pydantic import BaseModel
+
+from core.rag.datasource.vdb.pgvector.pgvector import BlockingConnectionPool
+from core.rag.datasource.vdb.vector_factory import VectorClientRegistry
+
+
+class ConnectionConfig(BaseModel):
+    host: str
+    password: str = "secret"
+
+
+def test_client_is_shared_per_connection_config():
+    registry = VectorClientRegistry(max_size=8, idle_timeout=60.0)
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+    second = registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+    other_password = registry.get("pgvector", ConnectionConfig(host="db-1", password="rotated"), factory)
+    other_type = registry.get("opengauss", ConnectionConfig(host="db-1"), factory)
+
+    assert first is second
+    assert len({id(first), id(other_password), id(other_type)}) == 3
+    assert factory.call_count == 3
+
+
+def test_least_recently_used_client_is_dropped():
+    registry = VectorClientRegistry(max_size=2, idle_timeout=60.0)
+    factory = MagicMock(side_effect=lambda: object())
+
+    db_1 = registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+    registry.get("pgvector", ConnectionConfig(host="db-2"), factory)
+    registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+    registry.get("pgvector", ConnectionConfig(host="db-3"), factory)
+
+    assert registry.get("pgvector", ConnectionConfig(host="db-1"), factory) is db_1
+    assert factory.call_count == 3
+    registry.get("pgvector", ConnectionConfig(host="db-2"), factory)
+    assert factory.call_count == 4
+
+
+def test_idle_client_is_dropped():
+    registry = VectorClientRegistry(max_size=8, idle_timeout=0.01)
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = registry.get("qdrant", ConnectionConfig(host="qdrant"), factory)
+    time.sleep(0.02)
+    second = registry.get("qdrant", ConnectionConfig(host="qdrant"), factory)
+
+    assert first is not second
+
+
+def test_concurrent_lookups_create_one_client():
+    registry = VectorClientRegistry(max_size=8, idle_timeout=60.0)
+    started = threading.Event()
+
+    def slow_factory():
+        started.wait(1)
+        return object()
+
+    factory = MagicMock(side_effect=slow_factory)
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(registry.get("qdrant", ConnectionConfig(host="q"), factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+
+    assert factory.call_count == 1
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_registry_disabled():
+    registry = VectorClientRegistry(max_size=0, idle_timeout=60.0)
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+    second = registry.get("pgvector", ConnectionConfig(host="db-1"), factory)
+
+    assert first is not second
+
+
+def test_blocking_pool_waits_for_a_free_connection(monkeypatch):
+    monkeypatch.setattr("psycopg2.pool.psycopg2.connect", lambda *args, **kwargs: MagicMock(closed=0))
+    pool = BlockingConnectionPool(1, 1, dsn="")
+    pool._wait_timeout = 0.05
+
+    conn = pool.getconn()
+    with pytest.raises(PoolError, match="no connection available"):
+        pool.getconn()
+
+    pool._wait_timeout = 1.0
+    threading.Timer(0.01, pool.putconn, args=(conn,)).start()
+    assert pool.getconn() is conn
+
+
+def test_blocking_pool_replaces_stale_connections(monkeypatch):
+    monkeypatch.setattr("psycopg2.pool.psycopg2.connect", lambda *args, **kwargs: MagicMock(closed=0))
+    pool = BlockingConnectionPool(1, 2, dsn="")
+
+    closed_conn = pool.getconn()
+    pool.putconn(closed_conn)
+    closed_conn.closed = 1
+    conn = pool.getconn()
+    assert conn is not closed_conn
+    pool.putconn(conn)
+
+    pool._ping_after_idle = 0.0
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("server closed")
+    new_conn = pool.getconn()
+    assert new_conn is not conn
+    pool.putconn(new_conn)
+
+    assert pool.getconn() is new_conn
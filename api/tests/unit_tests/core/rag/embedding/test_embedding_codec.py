@@ -0,0 +1,67 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from core.rag.embedding.embedding_codec import (
+    EmbeddingDecodeError,
+    EmbeddingDType,
+    decode_embedding,
+    encode_embedding,
+    is_compact_embedding,
+)
+
+
+def test_float32_round_trip():
+    vector = np.random.randn(1536)
+
+    data = encode_embedding(vector)
+
+    assert is_compact_embedding(data)
+    decoded = decode_embedding(data)
+    assert decoded.dtype == np.float32
+    assert np.allclose(decoded, vector, atol=1e-6)
+    # 12 bytes header plus 4 bytes per value, less than half of a pickled list of floats
+    assert len(data) == 12 + 1536 * 4
+    assert len(data) < len(pickle.dumps(vector.tolist(), protocol=pickle.HIGHEST_PROTOCOL)) / 2
+
+
+def test_float16_round_trip():
+    vector = np.random.randn(256)
+    vector = vector / np.linalg.norm(vector)
+
+    data = encode_embedding(vector, EmbeddingDType.FLOAT16)
+
+    assert len(data) == 12 + 256 * 2
+    decoded = decode_embedding(data)
+    assert decoded.dtype == np.float32
+    assert np.allclose(decoded, vector, atol=1e-3)
+
+
+def test_legacy_pickled_list_is_decoded():
+    vector = [0.1, 0.2, 0.3]
+
+    data = pickle.dumps(vector, protocol=pickle.HIGHEST_PROTOCOL)
+
+    assert not is_compact_embedding(data)
+    assert np.allclose(decode_embedding(data), vector)
+
+
+def test_truncated_payload_is_rejected():
+    data = encode_embedding([0.1, 0.2, 0.3])
+
+    with pytest.raises(EmbeddingDecodeError):
+        decode_embedding(data[:-1])
+
+
+def test_unknown_version_is_rejected():
+    data = bytearray(encode_embedding([0.1, 0.2, 0.3]))
+    data[4] = 99
+
+    with pytest.raises(EmbeddingDecodeError):
+        decode_embedding(bytes(data))
+
+
+def test_multi_dimensional_input_is_rejected():
+    with pytest.raises(ValueError):
+        encode_embedding(np.zeros((2, 2)))
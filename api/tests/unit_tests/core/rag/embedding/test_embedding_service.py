@@ -59,10 +59,19 @@ from core.model_runtime.errors.invoke import (
     InvokeConnectionError,
     InvokeRateLimitError,
 )
-from core.rag.embedding.cached_embedding import CacheEmbedding
+from core.rag.embedding.cached_embedding import CacheEmbedding, clear_document_embedding_cache
+from libs import helper
 from models.dataset import Embedding
 
 
+@pytest.fixture(autouse=True)
+def _clear_document_embedding_cache():
+    """Keep the in-process document embedding cache from leaking between tests."""
+    clear_document_embedding_cache()
+    yield
+    clear_document_embedding_cache()
+
+
 class TestCacheEmbeddingDocuments:
     """Test suite for CacheEmbedding.embed_documents method.
 
@@ -160,8 +169,8 @@ class TestCacheEmbeddingDocuments:
                 input_type=EmbeddingInputType.DOCUMENT,
             )
 
-            # Verify embedding was added to database cache
-            mock_session.add.assert_called_once()
+            # Verify embedding was added to database cache with a single bulk insert
+            mock_session.execute.assert_called_once()
             mock_session.commit.assert_called_once()
 
     def test_embed_multiple_documents_cache_miss(self, mock_model_instance):
@@ -237,24 +246,26 @@ class TestCacheEmbeddingDocuments:
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
         mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
+        mock_cached_embedding.hash = helper.generate_text_hash(texts[0])
+        mock_cached_embedding.get_embedding_array.return_value = np.asarray(normalized_cached, dtype=np.float32)
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
             # Mock database to return cached embedding (cache hit)
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+            mock_session.scalars.return_value = [mock_cached_embedding]
 
             # Act
             result = cache_embedding.embed_documents(texts)
 
             # Assert
             assert len(result) == 1
-            assert result[0] == normalized_cached
+            assert np.allclose(result[0], normalized_cached, atol=1e-6)
 
             # Verify model was NOT invoked (cache hit)
             mock_model_instance.invoke_text_embedding.assert_not_called()
 
-            # Verify no new cache entries were added
-            mock_session.add.assert_not_called()
+            # Verify cached embeddings were resolved with a single query and no new entries were added
+            mock_session.scalars.assert_called_once()
+            mock_session.execute.assert_not_called()
 
     def test_embed_documents_partial_cache_hit(self, mock_model_instance):
         """Test embedding documents with mixed cache hits and misses.
@@ -277,7 +288,8 @@ class TestCacheEmbeddingDocuments:
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
         mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
+        mock_cached_embedding.hash = "hash_1"
+        mock_cached_embedding.get_embedding_array.return_value = np.asarray(normalized_cached, dtype=np.float32)
 
         # Create new embeddings for non-cached texts
         new_embeddings = []
@@ -314,19 +326,7 @@ class TestCacheEmbeddingDocuments:
                 mock_hash.side_effect = generate_hash
 
                 # Mock database to return cached embedding only for first text (hash_1)
-                call_count = [0]
-
-                def mock_filter_by(**kwargs):
-                    call_count[0] += 1
-                    mock_query = Mock()
-                    # First call (hash_1) returns cached, others return None
-                    if call_count[0] == 1:
-                        mock_query.first.return_value = mock_cached_embedding
-                    else:
-                        mock_query.first.return_value = None
-                    return mock_query
-
-                mock_session.query.return_value.filter_by = mock_filter_by
+                mock_session.scalars.return_value = [mock_cached_embedding]
                 mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
                 # Act
@@ -334,7 +334,7 @@ class TestCacheEmbeddingDocuments:
 
                 # Assert
                 assert len(result) == 3
-                assert result[0] == normalized_cached  # From cache
+                assert np.allclose(result[0], normalized_cached, atol=1e-6)  # From cache
                 # The model returns already normalized embeddings, but the code normalizes again
                 # So we just verify the structure and dimensions
                 assert result[1] is not None
@@ -703,6 +703,45 @@ class TestCacheEmbeddingQuery:
             mock_redis.expire.assert_called_once()
             assert mock_redis.expire.call_args[0][1] == 600
 
+    def test_embed_query_uses_compact_encoding(self, mock_model_instance):
+        """Test query embeddings are cached in Redis in the compact binary format."""
+        # Arrange
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        vector = np.random.randn(1536)
+        normalized = (vector / np.linalg.norm(vector)).tolist()
+        mock_model_instance.invoke_text_embedding.return_value = EmbeddingResult(
+            model="text-embedding-ada-002",
+            embeddings=[normalized],
+            usage=EmbeddingUsage(
+                tokens=5,
+                total_tokens=5,
+                unit_price=Decimal("0.0001"),
+                price_unit=Decimal(1000),
+                total_price=Decimal("0.0000005"),
+                currency="USD",
+                latency=0.3,
+            ),
+        )
+
+        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+            mock_redis.get.return_value = None
+
+            # Act - cache miss stores compact bytes
+            cache_embedding.embed_query("What is Python?")
+            cached_value = mock_redis.setex.call_args[0][2]
+
+            # Assert
+            assert isinstance(cached_value, bytes)
+            assert len(cached_value) == 12 + 1536 * 4
+
+            # Act - cache hit decodes compact bytes
+            mock_redis.get.return_value = cached_value
+            result = cache_embedding.embed_query("What is Python?")
+
+            # Assert
+            assert np.allclose(result, normalized, atol=1e-6)
+            mock_model_instance.invoke_text_embedding.assert_called_once()
+
     def test_embed_query_nan_handling(self, mock_model_instance):
         """Test handling of NaN values in query embeddings.
 
@@ -1741,7 +1780,8 @@ class TestEmbeddingCachePerformance:
         normalized = (vector / np.linalg.norm(vector)).tolist()
 
         mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized
+        mock_cached_embedding.hash = helper.generate_text_hash(text)
+        mock_cached_embedding.get_embedding_array.return_value = np.asarray(normalized, dtype=np.float32)
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
             # First call: cache miss
@@ -1772,8 +1812,9 @@ class TestEmbeddingCachePerformance:
             assert mock_model_instance.invoke_text_embedding.call_count == 1
             assert len(result1) == 1
 
-            # Arrange - Second call: cache hit
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+            # Arrange - Second call: cache hit from the database
+            clear_document_embedding_cache()
+            mock_session.scalars.return_value = [mock_cached_embedding]
 
             # Act - Second call (cache hit)
             result2 = cache_embedding.embed_documents([text])
@@ -1781,7 +1822,7 @@ class TestEmbeddingCachePerformance:
             # Assert - Model was NOT called again (still 1 call total)
             assert mock_model_instance.invoke_text_embedding.call_count == 1
             assert len(result2) == 1
-            assert result2[0] == normalized  # Same embedding from cache
+            assert np.allclose(result2[0], normalized, atol=1e-6)  # Same embedding from cache
 
     def test_batch_processing_efficiency(self, mock_model_instance):
         """Test that batch processing is more efficient than individual calls.
@@ -1919,3 +1960,111 @@ class TestEmbeddingCachePerformance:
             # Assert - TTL was extended
             mock_redis.expire.assert_called_once()
             assert mock_redis.expire.call_args[0][1] == 600
+
+
+class TestEmbeddingCacheBulkLookup:
+    """Test suite for the batched lookup and bulk insert of cached document embeddings."""
+
+    @pytest.fixture
+    def mock_model_instance(self):
+        model_instance = Mock()
+        model_instance.model = "text-embedding-ada-002"
+        model_instance.provider = "openai"
+
+        model_type_instance = Mock()
+        model_instance.model_type_instance = model_type_instance
+
+        model_schema = Mock()
+        model_schema.model_properties = {ModelPropertyKey.MAX_CHUNKS: 10}
+        model_type_instance.get_model_schema.return_value = model_schema
+
+        return model_instance
+
+    @staticmethod
+    def _embedding_result(count: int) -> EmbeddingResult:
+        usage = EmbeddingUsage(
+            tokens=count,
+            total_tokens=count,
+            unit_price=Decimal("0.0001"),
+            price_unit=Decimal(1000),
+            total_price=Decimal("0.000001"),
+            currency="USD",
+            latency=0.1,
+        )
+        return EmbeddingResult(
+            model="text-embedding-ada-002",
+            embeddings=[np.random.randn(8).tolist() for _ in range(count)],
+            usage=usage,
+        )
+
+    def test_lookup_is_chunked_by_batch_size(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        texts = [f"Text {i}" for i in range(5)]
+
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session") as mock_session,
+            patch("core.rag.embedding.cached_embedding.dify_config.EMBEDDING_CACHE_BATCH_SIZE", 2),
+        ):
+            mock_session.scalars.return_value = []
+            mock_model_instance.invoke_text_embedding.return_value = self._embedding_result(5)
+
+            cache_embedding.embed_documents(texts)
+
+            # 5 hashes in batches of 2 -> 3 lookups and 3 inserts, committed once
+            assert mock_session.scalars.call_count == 3
+            assert mock_session.execute.call_count == 3
+            mock_session.commit.assert_called_once()
+
+    def test_in_process_cache_avoids_database(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        texts = ["Frequently indexed text"]
+
+        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
+            mock_session.scalars.return_value = []
+            mock_model_instance.invoke_text_embedding.return_value = self._embedding_result(1)
+
+            first = cache_embedding.embed_documents(texts)
+            mock_session.reset_mock()
+            second = cache_embedding.embed_documents(texts)
+
+            assert np.allclose(second, first, atol=1e-6)
+            mock_session.scalars.assert_not_called()
+            mock_session.execute.assert_not_called()
+            mock_model_instance.invoke_text_embedding.assert_called_once()
+
+    def test_duplicate_texts_are_stored_once(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        texts = ["Same text", "Same text"]
+
+        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
+            mock_session.scalars.return_value = []
+            mock_model_instance.invoke_text_embedding.return_value = self._embedding_result(2)
+
+            result = cache_embedding.embed_documents(texts)
+
+            assert len(result) == 2
+            insert_stmt = mock_session.execute.call_args[0][0]
+            assert len(insert_stmt.compile().params) == 5  # id, model_name, hash, provider_name, embedding
+
+    def test_multimodal_documents_use_bulk_lookup(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        documents = [{"file_id": "file-1"}, {"file_id": "file-2"}]
+
+        cached_vector = np.random.randn(8)
+        cached_vector = (cached_vector / np.linalg.norm(cached_vector)).tolist()
+        mock_cached_embedding = Mock(spec=Embedding)
+        mock_cached_embedding.hash = "file-1"
+        mock_cached_embedding.get_embedding_array.return_value = np.asarray(cached_vector, dtype=np.float32)
+
+        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
+            mock_session.scalars.return_value = [mock_cached_embedding]
+            mock_model_instance.invoke_multimodal_embedding.return_value = self._embedding_result(1)
+
+            result = cache_embedding.embed_multimodal_documents(documents)
+
+            assert np.allclose(result[0], cached_vector, atol=1e-6)
+            assert len(result[1]) == 8
+            mock_session.scalars.assert_called_once()
+            call_args = mock_model_instance.invoke_multimodal_embedding.call_args
+            assert call_args.kwargs["multimodel_documents"] == [{"file_id": "file-2"}]
+            mock_session.execute.assert_called_once()
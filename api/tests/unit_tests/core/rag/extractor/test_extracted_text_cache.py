@@ -0,0 +1,164 @@
+from operator import itemgetter
+from unittest.mock import patch
+
+import pytest
+
+from core.rag.extractor.extract_processor import ExtractProcessor
+from core.rag.extractor.extracted_text_cache import ExtractedTextCache
+from core.rag.extractor.text_extractor import TextExtractor
+from core.rag.models.document import Document
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def exists(self, key):
+        return key in self.files
+
+    def load_once(self, key):
+        return self.files[key]
+
+    def save(self, key, data):
+        self.files[key] = data
+
+    def delete(self, key):
+        self.files.pop(key, None)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sorted_sets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, int]] = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+    def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    def zrem(self, name, *keys):
+        for key in keys:
+            self.sorted_sets.get(name, {}).pop(key, None)
+
+    def zrange(self, name, start, end):
+        members = sorted(self.sorted_sets.get(name, {}).items(), key=itemgetter(1))
+        return [key for key, _ in members][start : end + 1]
+
+    def zrangebyscore(self, name, min_score, max_score, start, num):
+        members = sorted(self.sorted_sets.get(name, {}).items(), key=itemgetter(1))
+        return [key for key, score in members if min_score <= score <= max_score][start : start + num]
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hdel(self, name, *keys):
+        for key in keys:
+            self.hashes.get(name, {}).pop(key, None)
+
+    def hvals(self, name):
+        return list(self.hashes.get(name, {}).values())
+
+    def hmget(self, name, keys):
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+
+@pytest.fixture
+def fake_storage():
+    storage = FakeStorage()
+    with patch("core.rag.extractor.extracted_text_cache.storage", storage):
+        yield storage
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("core.rag.extractor.extracted_text_cache.redis_client", redis):
+        yield redis
+
+
+def _cache(**kwargs) -> ExtractedTextCache:
+    options = {"enabled": True, "max_entry_size": 1024, "max_total_size": 1024, "retention_days": 30} | kwargs
+    return ExtractedTextCache(**options)
+
+
+def test_text_is_keyed_on_content_hash_and_extractor(fake_storage, fake_redis):
+    cache = _cache()
+
+    cache.set("hash-1", "pdf", "Hello")
+
+    assert cache.get("hash-1", "pdf", source="test") == "Hello"
+    assert cache.get("hash-1", "docx", source="test") is None
+    assert cache.get("hash-2", "pdf", source="test") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 2}
+
+
+def test_large_text_is_not_cached(fake_storage, fake_redis):
+    cache = _cache(max_entry_size=4)
+
+    cache.set("hash-1", "pdf", "Hello")
+
+    assert fake_storage.files == {}
+
+
+def test_cleanup_deletes_expired_then_least_recently_used(fake_storage, fake_redis):
+    cache = _cache(max_total_size=10, retention_days=1)
+    with patch("core.rag.extractor.extracted_text_cache.time.time", return_value=0):
+        cache.set("expired", "txt", "x" * 4)
+    with patch("core.rag.extractor.extracted_text_cache.time.time", return_value=2 * 24 * 60 * 60):
+        cache.set("oldest", "txt", "x" * 4)
+        cache.set("newer", "txt", "x" * 4)
+        cache.set("newest", "txt", "x" * 4)
+    cache._CLEANUP_BATCH_SIZE = 1
+
+    with patch("core.rag.extractor.extracted_text_cache.time.time", return_value=2 * 24 * 60 * 60 + 1):
+        assert cache.cleanup() == (2, 8)
+
+    assert cache.get("expired", "txt", source="test") is None
+    assert cache.get("oldest", "txt", source="test") is None
+    assert cache.get("newest", "txt", source="test") == "x" * 4
+
+
+def test_cleanup_keeps_index_of_entries_that_failed_to_delete(fake_storage, fake_redis):
+    cache = _cache(max_total_size=0, retention_days=1)
+    with patch("core.rag.extractor.extracted_text_cache.time.time", return_value=0):
+        cache.set("locked", "txt", "x" * 4)
+        cache.set("expired", "txt", "x" * 4)
+    locked_key = cache._storage_key("locked", "txt")
+    delete = fake_storage.delete
+
+    def failing_delete(key):
+        if key == locked_key:
+            raise OSError("storage unavailable")
+        delete(key)
+
+    fake_storage.delete = failing_delete
+    cache._CLEANUP_BATCH_SIZE = 1
+
+    with patch("core.rag.extractor.extracted_text_cache.time.time", return_value=2 * 24 * 60 * 60):
+        assert cache.cleanup() == (1, 4)
+
+    assert list(fake_storage.files) == [locked_key]
+    assert list(fake_redis.sorted_sets[cache._ACCESS_TIMES_KEY]) == [locked_key]
+    assert list(fake_redis.hashes[cache._SIZES_KEY]) == [locked_key]
+
+
+def test_extract_processor_reuses_documents_of_same_content(fake_storage, fake_redis, tmp_path):
+    cache = _cache()
+    first_file = tmp_path / "first.txt"
+    second_file = tmp_path / "second.txt"
+    first_file.write_text("Same content")
+    second_file.write_text("Same content")
+
+    with patch("core.rag.extractor.extract_processor.extracted_text_cache", cache):
+        first = ExtractProcessor._extract_file(TextExtractor(str(first_file)), str(first_file), {"tenant_id": "t"})
+        second_extractor = TextExtractor(str(second_file))
+        with patch.object(second_extractor, "extract") as extract:
+            second = ExtractProcessor._extract_file(second_extractor, str(second_file), {"tenant_id": "t"})
+
+    extract.assert_not_called()
+    assert first == [Document(page_content="Same content", metadata={"source": str(first_file)})]
+    assert second == [Document(page_content="Same content", metadata={"source": str(second_file)})]
@@ -0,0 +1,87 @@
+import math
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.rag.models.document import Document
+from core.rag.rerank.keyword_score import calculate_tfidf_similarities, get_documents_keywords
+
+
+def reference_similarities(query_keywords, documents_keywords):
+    """The per-keyword loop implementation the vectorized scoring replaced."""
+    total_documents = len(documents_keywords)
+    all_keywords = set().union(*documents_keywords)
+    keyword_idf = {
+        keyword: math.log((1 + total_documents) / (1 + sum(1 for doc in documents_keywords if keyword in doc))) + 1
+        for keyword in all_keywords
+    }
+    query_tfidf = {keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(query_keywords).items()}
+
+    similarities = []
+    for document_keywords in documents_keywords:
+        document_tfidf = {
+            keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(document_keywords).items()
+        }
+        numerator = sum(query_tfidf[x] * document_tfidf[x] for x in set(query_tfidf) & set(document_tfidf))
+        denominator = math.sqrt(sum(v**2 for v in query_tfidf.values())) * math.sqrt(
+            sum(v**2 for v in document_tfidf.values())
+        )
+        similarities.append(numerator / denominator if denominator else 0.0)
+    return similarities
+
+
+def test_matches_reference_implementation():
+    vocabulary = [f"kw{i}" for i in range(200)]
+    # deterministic, uneven keyword sets with shared and unique keywords
+    documents_keywords = [{vocabulary[(i * j) % 200] for j in range(i % 30)} for i in range(100)]
+    query_keywords = {"kw0", "kw7", "kw42", "kw199", "unknown"}
+
+    result = calculate_tfidf_similarities(query_keywords, documents_keywords)
+
+    assert result == pytest.approx(reference_similarities(query_keywords, documents_keywords))
+
+
+def test_documents_without_overlap_score_zero():
+    result = calculate_tfidf_similarities({"python"}, [{"python", "flask"}, {"java"}, set()])
+
+    assert result[0] > 0
+    assert result[1:] == [0.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    ("query_keywords", "documents_keywords"),
+    [({"python"}, []), (set(), [{"python"}]), ({"python"}, [set(), set()])],
+)
+def test_empty_inputs(query_keywords, documents_keywords):
+    assert calculate_tfidf_similarities(query_keywords, documents_keywords) == [0.0] * len(documents_keywords)
+
+
+@patch("core.rag.rerank.keyword_score.session_factory")
+def test_get_documents_keywords_reuses_segment_keywords(mock_session_factory):
+    session = mock_session_factory.create_session.return_value.__enter__.return_value
+    session.execute.return_value = [("node-1", "dataset-1", ["python", "flask"]), ("node-2", "dataset-1", None)]
+    handler = MagicMock()
+    handler.extract_keywords.return_value = {"extracted"}
+    documents = [
+        Document(page_content="a", metadata={"doc_id": "node-1", "dataset_id": "dataset-1"}),
+        Document(page_content="b", metadata={"doc_id": "node-2", "dataset_id": "dataset-1"}),
+        Document(page_content="c", metadata={"doc_id": "node-3"}),
+    ]
+
+    result = get_documents_keywords(documents, handler)
+
+    assert result == [{"python", "flask"}, {"extracted"}, {"extracted"}]
+    assert documents[0].metadata["keywords"] == {"python", "flask"}
+    assert handler.extract_keywords.call_count == 2
+    session.execute.assert_called_once()
+
+
+@patch("core.rag.rerank.keyword_score.session_factory")
+def test_get_documents_keywords_skips_lookup_without_dataset_ids(mock_session_factory):
+    handler = MagicMock()
+    handler.extract_keywords.return_value = {"extracted"}
+    documents = [Document(page_content="a", metadata={"doc_id": "node-1"}, provider="external")]
+
+    assert get_documents_keywords(documents, handler) == [{"extracted"}]
+    mock_session_factory.create_session.assert_not_called()
@@ -14,6 +14,7 @@ Tests follow the Arrange-Act-Assert pattern for clarity.
 
 from unittest.mock import MagicMock, Mock, patch
 
+import numpy as np
 import pytest
 
 from core.model_manager import ModelInstance
@@ -1566,9 +1567,8 @@ class TestRerankErrorHandling:
         """Test weighted reranking when document vector is missing.
 
         Verifies:
-        - Missing vectors cause appropriate errors
-        - TypeError is raised when trying to process None vector
-        - System fails fast with clear error
+        - Missing vectors are embedded in a single batched call
+        - The embedded vectors are used for the cosine score
         """
         # Arrange: Document without vector
         weights = Weights(
@@ -1587,6 +1587,12 @@ class TestRerankErrorHandling:
                 provider="dify",
                 vector=None,  # No vector
             ),
+            Document(
+                page_content="Another document without vector",
+                metadata={"doc_id": "doc2"},
+                provider="dify",
+                vector=None,
+            ),
         ]
 
         runner = WeightRerankRunner(tenant_id="tenant123", weights=weights)
@@ -1605,9 +1611,58 @@ class TestRerankErrorHandling:
 
             mock_cache_instance = MagicMock()
             mock_cache_instance.embed_query.return_value = [0.1, 0.2]
+            mock_cache_instance.embed_documents.return_value = [[0.1, 0.2], [0.2, -0.1]]
             mock_cache.return_value = mock_cache_instance
 
-            # Act & Assert: Should raise TypeError when processing None vector
-            # The numpy array() call on None vector will fail
-            with pytest.raises((TypeError, AttributeError)):
-                runner.run(query="test", documents=documents)
+            # Act
+            result = runner.run(query="test", documents=documents)
+
+            # Assert: Both vectors are fetched in one call and scored
+            mock_cache_instance.embed_documents.assert_called_once_with(
+                ["Document without vector", "Another document without vector"]
+            )
+            assert documents[0].vector == [0.1, 0.2]
+            assert result[0].metadata["doc_id"] == "doc1"
+            # Only the vector score differs: 0.5 * cosine(1.0) vs 0.5 * cosine(0.0)
+            assert result[0].metadata["score"] - result[1].metadata["score"] == pytest.approx(0.5)
+
+    def test_weighted_rerank_cosine_scores_match_per_document_cosine(self):
+        """Test the batched cosine scores match the per-document cosine similarity.
+
+        Verifies:
+        - Documents with an existing score keep it
+        - Other documents get the cosine similarity of their vector with the query vector
+        - Zero vectors score 0 instead of NaN
+        """
+        weights = Weights(
+            vector_setting=VectorSetting(
+                vector_weight=1.0,
+                embedding_provider_name="openai",
+                embedding_model_name="text-embedding-ada-002",
+            ),
+            keyword_setting=KeywordSetting(keyword_weight=0.0),
+        )
+        vectors = [[0.3, 0.4, 0.5], [0.0, 0.0, 0.0], [-1.0, 2.0, 0.5]]
+        documents = [
+            Document(page_content=f"doc {i}", metadata={"doc_id": f"doc{i}"}, provider="dify", vector=vector)
+            for i, vector in enumerate(vectors)
+        ]
+        documents.append(
+            Document(page_content="scored", metadata={"doc_id": "doc3", "score": 0.42}, provider="dify", vector=None)
+        )
+        query_vector = [0.1, 0.2, 0.3]
+
+        runner = WeightRerankRunner(tenant_id="tenant123", weights=weights)
+        with (
+            patch("core.rag.rerank.weight_rerank.ModelManager"),
+            patch("core.rag.rerank.weight_rerank.CacheEmbedding") as mock_cache,
+        ):
+            mock_cache.return_value.embed_query.return_value = query_vector
+            scores = runner._calculate_cosine("tenant123", "query", documents, weights.vector_setting)
+
+        expected = [
+            float(np.dot(vector, query_vector) / (np.linalg.norm(vector) * np.linalg.norm(query_vector)))
+            for vector in (vectors[0], vectors[2])
+        ]
+        assert scores == pytest.approx([expected[0], 0.0, expected[1], 0.42])
+        mock_cache.return_value.embed_documents.assert_not_called()
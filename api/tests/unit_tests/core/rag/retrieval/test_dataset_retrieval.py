@@ -463,6 +463,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             """Simulate _retrieve adding documents to the shared list."""
             if all_documents is not None:
@@ -534,6 +535,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             if all_documents is not None:
                 all_documents.extend(filtered_docs)
@@ -613,6 +615,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             if all_documents is not None:
                 all_documents.extend(sample_documents)
@@ -683,7 +686,14 @@ class TestRetrievalService:
         filtered_docs = [sample_documents[1]]
 
         def side_effect_keyword_search(
-            flask_app, dataset_id, query, top_k, all_documents, exceptions, document_ids_filter=None
+            flask_app,
+            dataset_id,
+            query,
+            top_k,
+            all_documents,
+            exceptions,
+            document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(filtered_docs)
 
@@ -741,6 +751,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(sample_documents[:2])
 
@@ -758,6 +769,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(sample_documents[1:])
 
@@ -861,6 +873,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             """Vector search finds 2 documents including high-score duplicate."""
             all_documents.extend([doc1_high, doc2])
@@ -879,6 +892,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             """Full-text search finds the same document but with lower score."""
             all_documents.extend([doc1_low])
@@ -951,6 +965,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(sample_documents[:2])
 
@@ -967,6 +982,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(sample_documents[1:])
 
@@ -1033,6 +1049,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            retrieval_plan=None,
         ):
             all_documents.extend(sample_documents)
 
@@ -1193,6 +1210,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             if all_documents is not None:
                 all_documents.append(filtered_doc)
@@ -1288,6 +1306,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             if exceptions is not None:
                 exceptions.append("Search failed")
@@ -1341,6 +1360,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             if all_documents is not None:
                 all_documents.append(high_score_doc)
@@ -1401,6 +1421,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             # Return only top_k documents
             if all_documents is not None:
@@ -1480,6 +1501,7 @@ class TestRetrievalService:
             attachment_id=None,
             all_documents=None,
             exceptions=None,
+            retrieval_plan=None,
         ):
             # _retrieve handles reranking internally
             if all_documents is not None:
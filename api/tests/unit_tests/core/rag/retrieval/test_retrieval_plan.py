@@ -0,0 +1,62 @@
+import threading
+from unittest.mock import MagicMock
+
+from core.rag.retrieval.retrieval_plan import RetrievalPlan
+
+
+def _dataset(embedding_model: str = "text-embedding-3-small") -> MagicMock:
+    return MagicMock(tenant_id="tenant-1", embedding_model_provider="openai", embedding_model=embedding_model)
+
+
+def test_query_is_embedded_once_per_embedding_model():
+    plan = RetrievalPlan()
+    embed = MagicMock(return_value=[0.1, 0.2])
+    other_embed = MagicMock(return_value=[0.3])
+
+    assert plan.embed_query(_dataset(), "refund policy", embed) == [0.1, 0.2]
+    assert plan.embed_query(_dataset(), "refund policy", embed) == [0.1, 0.2]
+    assert plan.embed_query(_dataset("text-embedding-3-large"), "refund policy", other_embed) == [0.3]
+
+    embed.assert_called_once()
+    other_embed.assert_called_once()
+    assert plan.get_stats() == {"datasets": 0, "embeddings": 2, "reused_embeddings": 1}
+    assert set(plan.get_timings()) == {"embedding"}
+
+
+def test_concurrent_datasets_wait_for_the_first_embedding():
+    plan = RetrievalPlan()
+    started = threading.Event()
+
+    def slow_embed():
+        started.wait(1)
+        return [0.1]
+
+    embed = MagicMock(side_effect=slow_embed)
+    query_vectors = []
+    threads = [
+        threading.Thread(target=lambda: query_vectors.append(plan.embed_query(_dataset(), "refund policy", embed)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+
+    embed.assert_called_once()
+    assert query_vectors == [[0.1]] * 8
+
+
+def test_stage_timings_are_summed():
+    plan = RetrievalPlan()
+
+    with plan.stage("vector_search"):
+        pass
+    with plan.stage("vector_search"):
+        pass
+    with plan.stage("rerank"):
+        pass
+
+    timings = plan.get_timings()
+    assert set(timings) == {"vector_search", "rerank"}
+    assert all(milliseconds >= 0 for milliseconds in timings.values())
@@ -279,3 +279,77 @@ class TestMarkInactiveRootBranches:
         assert edges["edge3"].state == NodeState.SKIPPED
         assert edges["edge4"].state == NodeState.UNKNOWN
         assert edges["edge5"].state == NodeState.SKIPPED
+
+
+class _MockNodeFactory:
+    """Node factory creating mock nodes, roots are the nodes whose config data has `root` set."""
+
+    def __init__(self):
+        self.created: list[Node] = []
+
+    def create_node(self, node_config: dict[str, object]) -> Node:
+        data = node_config["data"]
+        assert isinstance(data, dict)
+        execution_type = NodeExecutionType.ROOT if data.get("root") else NodeExecutionType.EXECUTABLE
+        node = create_mock_node(str(node_config["id"]), execution_type)
+        node.error_strategy = None
+        self.created.append(node)
+        return node
+
+
+class TestCompiledGraph:
+    """Test cases for Graph.compile and Graph.from_compiled."""
+
+    graph_config = {
+        "nodes": [
+            {"id": "root1", "data": {"type": "start", "root": True}},
+            {"id": "root2", "data": {"type": "start", "root": True}},
+            {"id": "child1", "data": {"type": "answer"}},
+            {"id": "child2", "data": {"type": "answer"}},
+            {"id": "note", "type": "custom-note", "data": {}},
+        ],
+        "edges": [
+            {"source": "root1", "target": "child1"},
+            {"source": "root2", "target": "child2", "sourceHandle": "true"},
+        ],
+    }
+
+    def test_compile_parses_topology(self):
+        compiled_graph = Graph.compile(graph_config=self.graph_config, root_node_id="root1")
+
+        assert compiled_graph.graph_config is self.graph_config
+        assert list(compiled_graph.node_configs_map) == ["root1", "root2", "child1", "child2"]
+        assert compiled_graph.root_node_id == "root1"
+        assert [(edge.id, edge.tail, edge.head, edge.source_handle) for edge in compiled_graph.edges] == [
+            ("edge_0", "root1", "child1", "source"),
+            ("edge_1", "root2", "child2", "true"),
+        ]
+        assert compiled_graph.in_edges == {"child1": ("edge_0",), "child2": ("edge_1",)}
+        assert compiled_graph.out_edges == {"root1": ("edge_0",), "root2": ("edge_1",)}
+
+    def test_runs_from_the_same_compiled_graph_do_not_share_state(self):
+        compiled_graph = Graph.compile(graph_config=self.graph_config, root_node_id="root1")
+
+        first = Graph.from_compiled(compiled_graph, _MockNodeFactory())
+        second = Graph.from_compiled(compiled_graph, _MockNodeFactory())
+
+        # inactive root branches are marked on the per-run copies only
+        assert first.edges["edge_1"].state == NodeState.SKIPPED
+        assert first.nodes["child2"].state == NodeState.SKIPPED
+        assert all(edge.state == NodeState.UNKNOWN for edge in compiled_graph.edges)
+
+        first.edges["edge_0"].state = NodeState.TAKEN
+        first.out_edges["root1"].append("edge_1")
+        assert second.edges["edge_0"].state == NodeState.UNKNOWN
+        assert second.out_edges["root1"] == ["edge_0"]
+        assert first.nodes["root1"] is not second.nodes["root1"]
+
+    def test_init_compiles_and_builds_the_graph(self):
+        node_factory = _MockNodeFactory()
+
+        graph = Graph.init(graph_config=self.graph_config, node_factory=node_factory, root_node_id="root2")
+
+        assert graph.root_node.id == "root2"
+        assert set(graph.nodes) == {"root1", "root2", "child1", "child2"}
+        assert graph.edges["edge_0"].state == NodeState.SKIPPED
+        assert graph.edges["edge_1"].state == NodeState.UNKNOWN
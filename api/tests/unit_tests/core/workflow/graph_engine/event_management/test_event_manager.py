@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
+import threading
 
+from core.workflow.enums import NodeType
 from core.workflow.graph_engine.event_management.event_manager import EventManager
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
-from core.workflow.graph_events import GraphEngineEvent
+from core.workflow.graph_events import GraphEngineEvent, NodeRunStreamChunkEvent
 
 
 class _FaultyLayer(GraphEngineLayer):
@@ -37,3 +39,95 @@ def test_event_manager_logs_layer_errors(caplog) -> None:
     log_record = error_logs[0]
     assert log_record.exc_info is not None
     assert isinstance(log_record.exc_info[1], RuntimeError)
+
+
+def test_emit_events_wakes_up_on_collect_and_completion() -> None:
+    """Events collected from another thread are yielded without polling, completion ends the generator."""
+
+    event_manager = EventManager()
+    emitted: list[GraphEngineEvent] = []
+    first_event_emitted = threading.Event()
+
+    def consume() -> None:
+        for event in event_manager.emit_events():
+            emitted.append(event)
+            first_event_emitted.set()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    event_manager.collect(GraphEngineEvent())
+    assert first_event_emitted.wait(timeout=1.0)
+
+    event_manager.collect(GraphEngineEvent())
+    event_manager.mark_complete()
+    consumer.join(timeout=1.0)
+
+    assert not consumer.is_alive()
+    assert len(emitted) == 2
+
+
+def _chunk(chunk: str, selector: list[str], is_final: bool = False) -> NodeRunStreamChunkEvent:
+    return NodeRunStreamChunkEvent(
+        id="execution",
+        node_id=selector[0],
+        node_type=NodeType.LLM,
+        selector=selector,
+        chunk=chunk,
+        is_final=is_final,
+    )
+
+
+def test_read_events_are_released() -> None:
+    """Events are dropped from the buffer once the consumer has read them."""
+
+    event_manager = EventManager()
+    for _ in range(3):
+        event_manager.collect(GraphEngineEvent())
+
+    consumer = event_manager.emit_events()
+    next(consumer)
+    assert len(event_manager._events) == 0
+
+    event_manager.collect(GraphEngineEvent())
+    event_manager.mark_complete()
+    assert len(list(consumer)) == 3
+    assert len(event_manager._events) == 0
+
+
+def test_stream_chunks_are_coalesced_until_read() -> None:
+    """Adjacent unread chunks of the same selector are merged, layers still see every chunk."""
+
+    class _RecordingLayer(_FaultyLayer):
+        def __init__(self) -> None:
+            super().__init__()
+            self.events: list[GraphEngineEvent] = []
+
+        def on_event(self, event: GraphEngineEvent) -> None:
+            self.events.append(event)
+
+    layer = _RecordingLayer()
+    event_manager = EventManager(coalesce_stream_chunks=True)
+    event_manager.set_layers([layer])
+
+    event_manager.collect(_chunk("Hel", ["llm", "text"]))
+    event_manager.collect(_chunk("lo", ["llm", "text"]))
+    event_manager.collect(_chunk("other", ["answer", "answer"]))
+    event_manager.collect(_chunk(" world", ["answer", "answer"], is_final=True))
+    event_manager.collect(_chunk("!", ["answer", "answer"]))
+
+    consumer = event_manager.emit_events()
+    first_batch = [next(consumer) for _ in range(3)]
+
+    # Read chunks are not merged anymore
+    event_manager.collect(_chunk("?", ["answer", "answer"]))
+    event_manager.mark_complete()
+    emitted = first_batch + list(consumer)
+
+    assert [(event.chunk, event.is_final) for event in emitted] == [
+        ("Hello", False),
+        ("other world", True),
+        ("!", False),
+        ("?", False),
+    ]
+    assert len(layer.events) == 6
@@ -0,0 +1,87 @@
+"""Tests for the InMemoryReadyQueue."""
+
+from __future__ import annotations
+
+import queue
+import threading
+
+import pytest
+
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue
+
+
+def test_get_returns_items_in_order_and_times_out_when_empty() -> None:
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.put("b")
+
+    assert ready_queue.qsize() == 2
+    assert ready_queue.get(timeout=0.1) == "a"
+    assert ready_queue.get() == "b"
+    assert ready_queue.empty()
+    with pytest.raises(queue.Empty):
+        ready_queue.get(timeout=0.01)
+
+
+def test_put_wakes_up_blocked_get() -> None:
+    ready_queue = InMemoryReadyQueue()
+    received: list[str] = []
+    consumer = threading.Thread(target=lambda: received.append(ready_queue.get()))
+    consumer.start()
+
+    ready_queue.put("node")
+    consumer.join(timeout=1.0)
+
+    assert not consumer.is_alive()
+    assert received == ["node"]
+
+
+def test_wake_waiters_interrupts_blocked_get() -> None:
+    ready_queue = InMemoryReadyQueue()
+    interrupted = threading.Event()
+
+    def consume() -> None:
+        try:
+            ready_queue.get(timeout=5.0)
+        except queue.Empty:
+            interrupted.set()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    # Only threads already blocked in get() are woken, so keep waking until the consumer got there
+    for _ in range(100):
+        ready_queue.wake_waiters()
+        if interrupted.wait(timeout=0.01):
+            break
+    consumer.join(timeout=1.0)
+
+    assert interrupted.is_set()
+    # Items put afterwards are still delivered
+    ready_queue.put("node")
+    assert ready_queue.get(timeout=0.1) == "node"
+
+
+def test_task_done_called_too_many_times() -> None:
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("node")
+    ready_queue.get()
+    ready_queue.task_done()
+
+    with pytest.raises(ValueError):
+        ready_queue.task_done()
+
+
+def test_dumps_and_loads_round_trip() -> None:
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.put("b")
+    data = ready_queue.dumps()
+
+    restored = InMemoryReadyQueue()
+    restored.put("stale")
+    restored.loads(data)
+
+    assert ready_queue.qsize() == 2
+    assert restored.get(timeout=0.1) == "a"
+    assert restored.get(timeout=0.1) == "b"
+    assert restored.empty()
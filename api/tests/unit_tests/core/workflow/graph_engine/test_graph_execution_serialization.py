@@ -9,7 +9,6 @@ from unittest.mock import MagicMock
 from core.workflow.enums import NodeExecutionType, NodeState, NodeType
 from core.workflow.graph_engine.domain import GraphExecution
 from core.workflow.graph_engine.response_coordinator import ResponseStreamCoordinator
-from core.workflow.graph_engine.response_coordinator.path import Path
 from core.workflow.graph_engine.response_coordinator.session import ResponseSession
 from core.workflow.graph_events import NodeRunStreamChunkEvent
 from core.workflow.nodes.base.template import Template, TextSegment, VariableSegment
@@ -140,12 +139,8 @@ def test_response_stream_coordinator_serialization_round_trip(monkeypatch) -> No
     monkeypatch.setattr(ResponseSession, "from_node", classmethod(fake_from_node))
 
     coordinator = ResponseStreamCoordinator(variable_pool=MagicMock(), graph=graph)  # type: ignore[arg-type]
-    coordinator._response_nodes = {"response-1", "response-2", "response-3"}
-    coordinator._paths_maps = {
-        "response-1": [Path(edges=["edge-1"])],
-        "response-2": [Path(edges=[])],
-        "response-3": [Path(edges=["edge-2", "edge-3"])],
-    }
+    for response_node_id in ("response-1", "response-2", "response-3"):
+        coordinator.register(response_node_id)
 
     active_session = ResponseSession(node_id="response-1", template=response_node1.template)
     active_session.index = 1
@@ -176,7 +171,8 @@ def test_response_stream_coordinator_serialization_round_trip(monkeypatch) -> No
     restored.loads(serialized)
 
     assert restored._response_nodes == {"response-1", "response-2", "response-3"}
-    assert restored._paths_maps["response-1"][0].edges == ["edge-1"]
+    assert restored._paths["response-1"].is_reachable()
+    assert not restored._paths["response-3"].is_reachable()
     assert restored._active_session is not None
     assert restored._active_session.node_id == "response-1"
     assert restored._active_session.index == 1
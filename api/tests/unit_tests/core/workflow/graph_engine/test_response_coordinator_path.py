@@ -0,0 +1,201 @@
+"""Tests for the reachability-based path analysis of ResponseStreamCoordinator."""
+
+import itertools
+import json
+from dataclasses import dataclass, field
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.workflow.enums import NodeExecutionType
+from core.workflow.graph.edge import Edge
+from core.workflow.graph_engine.response_coordinator import ResponseStreamCoordinator
+from core.workflow.graph_engine.response_coordinator.path import Path, build_blocking_edge_graph
+from core.workflow.graph_engine.response_coordinator.session import ResponseSession
+from core.workflow.nodes.base.template import Template
+
+
+@dataclass
+class FakeNode:
+    id: str
+    execution_type: NodeExecutionType = NodeExecutionType.EXECUTABLE
+
+    def blocks_variable_output(self, *_args) -> bool:
+        return False
+
+
+@dataclass(eq=False)
+class FakeGraph:
+    nodes: dict[str, FakeNode]
+    edges: dict[str, Edge]
+    root_id: str
+    out_edges: dict[str, list[str]] = field(default_factory=dict)
+    in_edges: dict[str, list[str]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for edge in self.edges.values():
+            self.out_edges.setdefault(edge.tail, []).append(edge.id)
+            self.in_edges.setdefault(edge.head, []).append(edge.id)
+
+    @property
+    def root_node(self) -> FakeNode:
+        return self.nodes[self.root_id]
+
+    def get_outgoing_edges(self, node_id: str) -> list[Edge]:
+        return [self.edges[edge_id] for edge_id in self.out_edges.get(node_id, [])]
+
+    def get_incoming_edges(self, node_id: str) -> list[Edge]:
+        return [self.edges[edge_id] for edge_id in self.in_edges.get(node_id, [])]
+
+
+@pytest.fixture(autouse=True)
+def _empty_templates(monkeypatch):
+    monkeypatch.setattr(
+        ResponseSession,
+        "from_node",
+        classmethod(lambda cls, node: ResponseSession(node_id=node.id, template=Template(segments=[]))),
+    )
+
+
+def make_graph(node_types: dict[str, NodeExecutionType], edges: list[tuple[str, str]], root_id: str) -> FakeGraph:
+    return FakeGraph(
+        nodes={node_id: FakeNode(node_id, execution_type) for node_id, execution_type in node_types.items()},
+        edges={f"{tail}->{head}": Edge(id=f"{tail}->{head}", tail=tail, head=head) for tail, head in edges},
+        root_id=root_id,
+    )
+
+
+def enumerated_blocking_paths(graph: FakeGraph, response_node_id: str) -> list[list[str]]:
+    """Blocking edges of every simple path, as the coordinator computed them before."""
+    blocking_types = {NodeExecutionType.BRANCH, NodeExecutionType.CONTAINER, NodeExecutionType.RESPONSE}
+    paths: list[list[str]] = []
+
+    def walk(node_id: str, path: list[str], visited: set[str]) -> None:
+        if node_id == response_node_id:
+            paths.append([e for e in path if graph.nodes[graph.edges[e].tail].execution_type in blocking_types])
+            return
+        for edge in graph.get_outgoing_edges(node_id):
+            if edge.head not in visited:
+                walk(edge.head, path + [edge.id], visited | {node_id})
+
+    walk(graph.root_id, [], set())
+    return paths
+
+
+def diamond_graph(diamonds: int) -> FakeGraph:
+    node_types = {"start": NodeExecutionType.ROOT}
+    edges = []
+    previous = "start"
+    for i in range(diamonds):
+        node_types[f"if_{i}"] = NodeExecutionType.BRANCH
+        node_types[f"true_{i}"] = NodeExecutionType.EXECUTABLE
+        node_types[f"false_{i}"] = NodeExecutionType.EXECUTABLE
+        node_types[f"merge_{i}"] = NodeExecutionType.EXECUTABLE
+        edges += [
+            (previous, f"if_{i}"),
+            (f"if_{i}", f"true_{i}"),
+            (f"if_{i}", f"false_{i}"),
+            (f"true_{i}", f"merge_{i}"),
+            (f"false_{i}", f"merge_{i}"),
+        ]
+        previous = f"merge_{i}"
+    node_types["answer"] = NodeExecutionType.RESPONSE
+    edges.append((previous, "answer"))
+    return make_graph(node_types, edges, "start")
+
+
+def test_root_response_node_is_reachable():
+    graph = make_graph({"answer": NodeExecutionType.RESPONSE}, [], "answer")
+
+    assert Path(build_blocking_edge_graph(graph, "answer")).is_reachable()
+
+
+def test_unreachable_response_node_never_becomes_reachable():
+    graph = make_graph(
+        {"start": NodeExecutionType.ROOT, "if": NodeExecutionType.BRANCH, "answer": NodeExecutionType.RESPONSE},
+        [("start", "if")],
+        "start",
+    )
+    path = Path(build_blocking_edge_graph(graph, "answer"))
+
+    path.take_edge("start->if")
+
+    assert not path.is_reachable()
+
+
+def test_stacked_diamonds_need_one_branch_per_diamond():
+    graph = diamond_graph(20)
+    edge_graph = build_blocking_edge_graph(graph, "answer")
+    path = Path(edge_graph)
+
+    # 2 branch edges per diamond, instead of 2**20 enumerated paths
+    assert len(edge_graph.blocking_edges) == 40
+    for i in range(19):
+        path.take_edge(f"if_{i}->{'true' if i % 2 else 'false'}_{i}")
+        assert not path.is_reachable()
+    path.take_edge("if_19->true_19")
+    assert path.is_reachable()
+
+
+def test_edges_outside_response_paths_are_ignored():
+    graph = diamond_graph(1)
+    graph = make_graph(
+        {**{node_id: node.execution_type for node_id, node in graph.nodes.items()}, "other": NodeExecutionType.BRANCH},
+        [(edge.tail, edge.head) for edge in graph.edges.values()] + [("start", "other")],
+        "start",
+    )
+    edge_graph = build_blocking_edge_graph(graph, "answer")
+
+    assert [edge.edge_id for edge in edge_graph.outgoing_edges["start"]] == ["start->if_0"]
+    assert set(edge_graph.blocking_edges) == {"if_0->true_0", "if_0->false_0"}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_path_enumeration(seed):
+    # small random DAGs with every node type mix, checked against brute-force path enumeration
+    node_ids = [f"n{i}" for i in range(8)]
+    types = [NodeExecutionType.EXECUTABLE, NodeExecutionType.BRANCH, NodeExecutionType.RESPONSE]
+    node_types = {node_id: types[(seed * 7 + i * 3) % 3] for i, node_id in enumerate(node_ids)}
+    node_types["n0"] = NodeExecutionType.ROOT
+    edges = [
+        (tail, head)
+        for (i, tail), (j, head) in itertools.combinations(enumerate(node_ids), 2)
+        if (seed * 31 + i * 17 + j * 13) % 5 < 2
+    ]
+    graph = make_graph(node_types, edges, "n0")
+    response_node_id = node_ids[-1]
+
+    enumerated = enumerated_blocking_paths(graph, response_node_id)
+    path = Path(build_blocking_edge_graph(graph, response_node_id))
+    taken: set[str] = set()
+    for tail, head in edges:
+        edge_id = f"{tail}->{head}"
+        taken.add(edge_id)
+        path.take_edge(edge_id)
+        expected = any(set(blocking_edges) <= taken for blocking_edges in enumerated)
+        assert path.is_reachable() == expected
+
+
+def test_coordinator_restores_legacy_paths_map():
+    graph = diamond_graph(2)
+    coordinator = ResponseStreamCoordinator(variable_pool=MagicMock(), graph=graph)  # type: ignore[arg-type]
+    coordinator.register("answer")
+    state = json.loads(coordinator.dumps())
+    assert state["taken_edges"] == {"answer": []}
+
+    # snapshot written before taken edges were tracked, after `if_0->true_0` was taken
+    del state["taken_edges"]
+    state["paths_map"] = {
+        "answer": [
+            ["if_1->true_1"],
+            ["if_1->false_1"],
+            ["if_0->false_0", "if_1->true_1"],
+            ["if_0->false_0", "if_1->false_1"],
+        ]
+    }
+    restored = ResponseStreamCoordinator(variable_pool=MagicMock(), graph=graph)  # type: ignore[arg-type]
+    restored.loads(json.dumps(state))
+
+    assert restored._paths["answer"].taken_edges == ["if_0->true_0"]
+    restored._paths["answer"].take_edge("if_1->false_1")
+    assert restored._paths["answer"].is_reachable()
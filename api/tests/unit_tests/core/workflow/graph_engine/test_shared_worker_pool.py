@@ -0,0 +1,158 @@
+"""Tests for the worker pool shared by all GraphEngine instances."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+
+import pytest
+
+from configs import dify_config
+from core.workflow.graph_engine.worker_management import SharedWorkerPool, shared_worker_pool
+
+from .test_table_runner import TableTestRunner, WorkflowTestCase
+
+
+class _FakeClient:
+    """Stands in for SharedWorkerPoolClient, with a ready queue and a node callback."""
+
+    def __init__(self, node_ids: list[str], on_execute: Callable[[str], None]) -> None:
+        self._ready = deque(node_ids)
+        self._on_execute = on_execute
+
+    def take_ready_node(self) -> str | None:
+        return self._ready.popleft() if self._ready else None
+
+    def execute(self, node_id: str) -> None:
+        self._on_execute(node_id)
+
+
+def _register(pool: SharedWorkerPool, client: _FakeClient, tenant_id: str = "t", max_running: int = 10):
+    return pool.register(client=client, tenant_id=tenant_id, max_running=max_running)  # type: ignore[arg-type]
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("Condition not met in time")
+
+
+def test_runs_are_served_round_robin() -> None:
+    pool = SharedWorkerPool(max_workers=1, max_workers_per_tenant=0, idle_time=1.0)
+    executed: list[str] = []
+    started = threading.Event()
+    gate = threading.Event()
+
+    def block(_: str) -> None:
+        started.set()
+        gate.wait(timeout=5.0)
+
+    # Keep the only worker busy until both runs are queued
+    blocking_run = _register(pool, _FakeClient(["block"], block), "t0")
+    pool.notify_ready(blocking_run)
+    assert started.wait(timeout=5.0)
+
+    run_a = _register(pool, _FakeClient(["a1", "a2", "a3"], executed.append), "t1")
+    run_b = _register(pool, _FakeClient(["b1", "b2", "b3"], executed.append), "t2")
+    pool.notify_ready(run_a)
+    pool.notify_ready(run_b)
+    gate.set()
+
+    _wait_for(lambda: len(executed) == 6)
+    assert executed == ["a1", "b1", "a2", "b2", "a3", "b3"]
+
+
+@pytest.mark.parametrize(("max_workers_per_tenant", "max_running", "expected"), [(2, 10, 2), (0, 1, 1), (0, 10, 4)])
+def test_concurrency_is_capped_per_tenant_and_per_run(max_workers_per_tenant: int, max_running: int, expected: int):
+    pool = SharedWorkerPool(max_workers=4, max_workers_per_tenant=max_workers_per_tenant, idle_time=1.0)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    done = 0
+
+    def on_execute(_: str) -> None:
+        nonlocal running, peak, done
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.05)
+        with lock:
+            running -= 1
+            done += 1
+
+    run = _register(pool, _FakeClient([f"n{i}" for i in range(8)], on_execute), "t", max_running)
+    pool.notify_ready(run)
+
+    _wait_for(lambda: done == 8)
+    assert peak == expected
+
+
+def test_blocked_worker_does_not_starve_nested_runs() -> None:
+    pool = SharedWorkerPool(max_workers=1, max_workers_per_tenant=1, idle_time=1.0)
+    nested_done = threading.Event()
+
+    def run_nested(_: str) -> None:
+        nested_done.set()
+
+    def run_container(_: str) -> None:
+        blocked_worker = pool.begin_blocking()
+        try:
+            nested = _register(pool, _FakeClient(["child"], run_nested), "t")
+            pool.notify_ready(nested)
+            assert nested_done.wait(timeout=5.0)
+        finally:
+            pool.end_blocking(blocked_worker)
+
+    run = _register(pool, _FakeClient(["container"], run_container), "t")
+    pool.notify_ready(run)
+
+    assert nested_done.wait(timeout=5.0)
+    _wait_for(lambda: pool.get_status()["blocked_workers"] == 0)
+
+
+def test_unregister_waits_for_running_nodes_and_stops_scheduling() -> None:
+    pool = SharedWorkerPool(max_workers=1, max_workers_per_tenant=0, idle_time=1.0)
+    started = threading.Event()
+    release = threading.Event()
+    executed: list[str] = []
+
+    def on_execute(node_id: str) -> None:
+        started.set()
+        release.wait(timeout=5.0)
+        executed.append(node_id)
+
+    client = _FakeClient(["n1", "n2"], on_execute)
+    run = _register(pool, client, "t")
+    pool.notify_ready(run)
+    assert started.wait(timeout=5.0)
+
+    threading.Timer(0.05, release.set).start()
+    pool.unregister(run, timeout=5.0)
+
+    assert executed == ["n1"]
+    assert client.take_ready_node() == "n2"
+
+
+def test_iteration_workflow_on_shared_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Nested iteration engines run on a single shared worker without deadlocking."""
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_POOL_ENABLED", True)
+    monkeypatch.setattr(
+        shared_worker_pool,
+        "_shared_worker_pool",
+        SharedWorkerPool(max_workers=1, max_workers_per_tenant=1, idle_time=1.0),
+    )
+
+    test_case = WorkflowTestCase(
+        fixture_path="array_iteration_formatting_workflow",
+        inputs={},
+        expected_outputs={"output": ["output: 1", "output: 2", "output: 3"]},
+        description="Iteration formats numbers into strings on the shared worker pool",
+        use_auto_mock=True,
+    )
+    result = TableTestRunner().run_test_case(test_case)
+
+    assert result.success, f"Iteration workflow failed: {result.error}"
+    assert result.actual_outputs == test_case.expected_outputs
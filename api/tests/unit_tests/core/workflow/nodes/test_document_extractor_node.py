@@ -1,6 +1,8 @@
 import io
-from unittest.mock import Mock, patch
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, Mock, patch
 
+import docx
 import pandas as pd
 import pytest
 from docx.oxml.text.paragraph import CT_P
@@ -13,10 +15,12 @@ from core.variables.variables import StringVariable
 from core.workflow.entities import GraphInitParams
 from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
 from core.workflow.node_events import NodeRunResult
-from core.workflow.nodes.document_extractor import DocumentExtractorNode, DocumentExtractorNodeData
+from core.workflow.nodes.document_extractor import DocumentExtractorNode, DocumentExtractorNodeData, node
+from core.workflow.nodes.document_extractor.exc import TextExtractionError
 from core.workflow.nodes.document_extractor.node import (
     _extract_text_from_docx,
     _extract_text_from_excel,
+    _extract_text_from_files,
     _extract_text_from_pdf,
     _extract_text_from_plain_text,
 )
@@ -130,6 +134,7 @@ def test_run_extract_text(
     document_extractor_node.graph_runtime_state = mock_graph_runtime_state
 
     mock_file = Mock(spec=File)
+    mock_file.tenant_id = "test_tenant_id"
     mock_file.mime_type = mime_type
     mock_file.transfer_method = transfer_method
     mock_file.related_id = "test_file_id" if transfer_method == FileTransferMethod.LOCAL_FILE else None
@@ -141,12 +146,11 @@ def test_run_extract_text(
 
     mock_graph_runtime_state.variable_pool.get.return_value = mock_array_file_segment
 
-    mock_download = Mock(return_value=file_content)
-    mock_ssrf_proxy_get = Mock()
-    mock_ssrf_proxy_get.return_value.content = file_content
-    mock_ssrf_proxy_get.return_value.raise_for_status = Mock()
+    mock_download = Mock(return_value=iter([file_content]))
+    mock_ssrf_proxy_get = MagicMock()
+    mock_ssrf_proxy_get.return_value.__enter__.return_value.iter_bytes.return_value = iter([file_content])
 
-    monkeypatch.setattr("core.file.file_manager.download", mock_download)
+    monkeypatch.setattr("core.file.file_manager.download_stream", mock_download)
     monkeypatch.setattr("core.helper.ssrf_proxy.get", mock_ssrf_proxy_get)
 
     if mime_type == "application/pdf":
@@ -164,7 +168,7 @@ def test_run_extract_text(
     assert result.outputs["text"] == ArrayStringSegment(value=expected_text)
 
     if transfer_method == FileTransferMethod.REMOTE_URL:
-        mock_ssrf_proxy_get.assert_called_once_with("https://example.com/file.txt")
+        mock_ssrf_proxy_get.assert_called_once_with("https://example.com/file.txt", stream=True)
     elif transfer_method == FileTransferMethod.LOCAL_FILE:
         mock_download.assert_called_once_with(mock_file)
 
@@ -191,9 +195,10 @@ def test_extract_text_from_pdf(mock_pdf_document):
     mock_text_page = Mock()
     mock_text_page.get_text_range.return_value = "PDF content"
     mock_page.get_textpage.return_value = mock_text_page
-    mock_pdf_document.return_value = [mock_page]
+    mock_pdf_document.return_value.__iter__.return_value = [mock_page]
     text = _extract_text_from_pdf(b"%PDF-1.5\n%Test PDF content")
     assert text == "PDF content"
+    mock_pdf_document.return_value.close.assert_called_once()
 
 
 @patch("docx.Document")
@@ -382,3 +387,80 @@ def test_extract_text_from_excel_numeric_type_column(mock_excel_file):
     expected_manual = "| 1.0 | 1.1 |\n| --- | --- |\n| Test | Test |\n\n"
 
     assert expected_manual == result
+
+
+def _local_text_file(content: bytes, tenant_id: str = "tenant-1") -> Mock:
+    mock_file = Mock(spec=File)
+    mock_file.tenant_id = tenant_id
+    mock_file.transfer_method = FileTransferMethod.LOCAL_FILE
+    mock_file.extension = ".txt"
+    mock_file.mime_type = "text/plain"
+    mock_file.content = content
+    return mock_file
+
+
+def test_extract_text_from_files_in_parallel_keeps_order(monkeypatch):
+    monkeypatch.setattr("configs.dify_config.DOCUMENT_EXTRACTOR_MAX_WORKERS", 4)
+    monkeypatch.setattr("core.file.file_manager.download_stream", lambda file: iter([file.content]))
+    files = [_local_text_file(f"File {i}".encode()) for i in range(10)]
+
+    assert _extract_text_from_files(files) == [f"File {i}" for i in range(10)]
+
+
+def test_extracted_text_is_cached_by_content_hash(monkeypatch):
+    cache = {}
+    mock_cache = Mock()
+    mock_cache.get.side_effect = lambda content_hash, extractor, source: cache.get((content_hash, extractor))
+    mock_cache.set.side_effect = lambda content_hash, extractor, text: cache.update({(content_hash, extractor): text})
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node.extracted_text_cache", mock_cache)
+    monkeypatch.setattr("core.file.file_manager.download_stream", lambda file: iter([file.content]))
+    mock_extract = Mock(return_value="Hello")
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_plain_text", mock_extract)
+
+    assert _extract_text_from_files([_local_text_file(b"Hello")]) == ["Hello"]
+    assert _extract_text_from_files([_local_text_file(b"Hello")]) == ["Hello"]
+
+    mock_extract.assert_called_once()
+    assert len(cache) == 1
+
+    assert _extract_text_from_files([_local_text_file(b"Hello", tenant_id="tenant-2")]) == ["Hello"]
+    assert mock_extract.call_count == 2
+
+
+def _local_docx_file(text: str) -> Mock:
+    document = docx.Document()
+    document.add_paragraph(text)
+    content = io.BytesIO()
+    document.save(content)
+    mock_file = _local_text_file(content.getvalue())
+    mock_file.extension = ".docx"
+    mock_file.mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    return mock_file
+
+
+def test_extract_text_from_files_in_parser_processes(monkeypatch):
+    monkeypatch.setattr("configs.dify_config.DOCUMENT_EXTRACTOR_MAX_WORKERS", 2)
+    monkeypatch.setattr("configs.dify_config.DOCUMENT_EXTRACTOR_PARSER_PROCESSES", 1)
+    monkeypatch.setattr("core.file.file_manager.download_stream", lambda file: iter([file.content]))
+    files = [_local_docx_file(f"Document {i}") for i in range(3)]
+
+    try:
+        assert _extract_text_from_files(files) == [f"Document {i}" for i in range(3)]
+    finally:
+        parser_pool = node._get_parser_pool()
+        assert parser_pool is not None
+        node._discard_parser_pool(parser_pool)
+
+
+def test_broken_parser_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr("configs.dify_config.DOCUMENT_EXTRACTOR_PARSER_PROCESSES", 1)
+    monkeypatch.setattr("core.file.file_manager.download_stream", lambda file: iter([file.content]))
+    parser_pool = MagicMock()
+    parser_pool.submit.return_value.result.side_effect = BrokenProcessPool("terminated abruptly")
+    monkeypatch.setattr(node, "_parser_pool", parser_pool)
+
+    with pytest.raises(TextExtractionError, match="Parser process terminated"):
+        _extract_text_from_files([_local_docx_file("Document")])
+
+    parser_pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert node._parser_pool is None
@@ -135,6 +135,101 @@ class TestVariablePool:
             assert segment.value == expected_value
 
 
+class TestVariablePoolChild:
+    def test_child_reads_through_to_parent(self, pool):
+        pool.add(("node_1", "output"), "parent value")
+        child = pool.create_child()
+
+        segment = child.get(("node_1", "output"))
+        assert segment is not None
+        assert segment.value == "parent value"
+        assert child.get([SYSTEM_VARIABLE_NODE_ID, "user_id"]) is not None
+        assert child.system_variables is pool.system_variables
+
+    def test_child_writes_do_not_leak_into_parent(self, pool):
+        pool.add(("node_1", "output"), "parent value")
+        child = pool.create_child()
+
+        child.add(("node_1", "output"), "child value")
+        child.add(("node_2", "output"), 1)
+
+        assert child.get(("node_1", "output")).value == "child value"
+        assert pool.get(("node_1", "output")).value == "parent value"
+        assert pool.get(("node_2", "output")) is None
+        assert "node_2" not in pool.variable_dictionary
+
+    def test_child_remove_masks_parent_entries(self, pool):
+        pool.add(("node_1", "a"), "a")
+        pool.add(("node_1", "b"), "b")
+        pool.add(("node_2", "c"), "c")
+        child = pool.create_child()
+
+        child.remove(("node_1", "a"))
+        child.remove(["node_2"])
+
+        assert child.get(("node_1", "a")) is None
+        assert child.get(("node_1", "b")).value == "b"
+        assert child.get(("node_2", "c")) is None
+        assert pool.get(("node_1", "a")).value == "a"
+        assert pool.get(("node_2", "c")).value == "c"
+
+        child.add(("node_1", "a"), "restored")
+        assert child.get(("node_1", "a")).value == "restored"
+
+    def test_child_does_not_see_later_parent_updates(self, pool):
+        pool.add(("node_1", "output"), "value")
+        pool.add(("node_1", "removed"), "value")
+        child = pool.create_child()
+
+        pool.add(("node_1", "output"), "late value")
+        pool.add(("node_2", "output"), "late value")
+        pool.remove(("node_1", "removed"))
+
+        assert child.get(("node_1", "output")).value == "value"
+        assert child.get(("node_2", "output")) is None
+        assert child.get(("node_1", "removed")).value == "value"
+        assert set(child.get_node_variables("node_1")) == {"output", "removed"}
+
+    def test_nested_children(self, pool):
+        pool.add(("node_1", "output"), "root")
+        child = pool.create_child()
+        child.add(("node_2", "output"), "child")
+        grandchild = child.create_child()
+        grandchild.add(("node_1", "output"), "grandchild")
+
+        assert grandchild.get(("node_1", "output")).value == "grandchild"
+        assert grandchild.get(("node_2", "output")).value == "child"
+        assert child.get(("node_1", "output")).value == "root"
+
+    def test_get_node_variables_and_prefix_merge_layers(self, pool):
+        pool.add(("node_1", "a"), "a")
+        pool.add(("node_1", "b"), "b")
+        child = pool.create_child()
+        child.add(("node_1", "b"), "child b")
+        child.add(("node_1", "c"), "c")
+        child.remove(("node_1", "a"))
+
+        assert {name: variable.value for name, variable in child.get_node_variables("node_1").items()} == {
+            "b": "child b",
+            "c": "c",
+        }
+        assert child.get_by_prefix("node_1") == {"b": "child b", "c": "c"}
+
+    def test_child_serialization_is_flattened(self, pool):
+        pool.add(("node_1", "a"), "a")
+        pool.add(("node_2", "b"), "b")
+        child = pool.create_child()
+        child.add(("node_3", "c"), "c")
+        child.remove(["node_2"])
+
+        loaded = VariablePool.model_validate_json(child.model_dump_json())
+
+        assert loaded.get(("node_1", "a")).value == "a"
+        assert loaded.get(("node_2", "b")) is None
+        assert loaded.get(("node_3", "c")).value == "c"
+        assert loaded.get([SYSTEM_VARIABLE_NODE_ID, "user_id"]).value == "test_user_id"
+
+
 class TestVariablePoolSerialization:
     """Test cases for VariablePool serialization and deserialization using Pydantic's built-in methods.
 
@@ -124,6 +124,7 @@ class TestCelerySSLConfiguration:
         # Mock all the scheduler configs
         mock_config.CELERY_BEAT_SCHEDULER_TIME = 1
         mock_config.ENABLE_CLEAN_EMBEDDING_CACHE_TASK = False
+        mock_config.ENABLE_CLEAN_EXTRACTED_TEXT_CACHE_TASK = False
         mock_config.ENABLE_CLEAN_UNUSED_DATASETS_TASK = False
         mock_config.ENABLE_CREATE_TIDB_SERVERLESS_TASK = False
         mock_config.ENABLE_UPDATE_TIDB_SERVERLESS_STATUS_TASK = False
@@ -137,6 +138,7 @@ class TestCelerySSLConfiguration:
         mock_config.WORKFLOW_SCHEDULE_MAX_DISPATCH_PER_TICK = 0
         mock_config.ENABLE_TRIGGER_PROVIDER_REFRESH_TASK = False
         mock_config.TRIGGER_PROVIDER_REFRESH_INTERVAL = 15
+        mock_config.API_TOKEN_AUTH_CACHE_ENABLED = False
 
         with patch("extensions.ext_celery.dify_config", mock_config):
             from dify_app import DifyApp
@@ -15,6 +15,8 @@ from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
+import pytest
+
 from models.dataset import (
     AppDatasetJoin,
     ChildChunk,
@@ -709,13 +711,13 @@ class TestEmbeddingStorage:
         retrieved_data = embedding.get_embedding()
 
         # Assert
-        assert retrieved_data == embedding_data
+        assert retrieved_data == pytest.approx(embedding_data, abs=1e-6)
         assert len(retrieved_data) == 5
-        assert retrieved_data[0] == 0.1
-        assert retrieved_data[4] == 0.5
+        assert retrieved_data[0] == pytest.approx(0.1, abs=1e-6)
+        assert retrieved_data[4] == pytest.approx(0.5, abs=1e-6)
 
-    def test_embedding_pickle_serialization(self):
-        """Test embedding data is properly pickled."""
+    def test_embedding_compact_serialization(self):
+        """Test embedding data is stored in the compact binary format."""
         # Arrange
         embedding_data = [0.1, 0.2, 0.3]
         embedding = Embedding(
@@ -729,11 +731,26 @@ class TestEmbeddingStorage:
         embedding.set_embedding(embedding_data)
 
         # Assert
-        # Verify the embedding is stored as pickled binary data
         assert isinstance(embedding.embedding, bytes)
-        # Verify we can unpickle it
-        unpickled_data = pickle.loads(embedding.embedding)  # noqa: S301
-        assert unpickled_data == embedding_data
+        assert not embedding.is_legacy_format
+        # 12 bytes header plus 3 float32 values
+        assert len(embedding.embedding) == 12 + 3 * 4
+        assert embedding.get_embedding_array().tolist() == pytest.approx(embedding_data, abs=1e-6)
+
+    def test_embedding_legacy_pickle_is_readable(self):
+        """Test embeddings written as pickled lists can still be read."""
+        # Arrange
+        embedding_data = [0.1, 0.2, 0.3]
+        embedding = Embedding(
+            model_name="text-embedding-ada-002",
+            hash="test_hash",
+            provider_name="openai",
+            embedding=pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+
+        # Act & Assert
+        assert embedding.is_legacy_format
+        assert embedding.get_embedding() == pytest.approx(embedding_data, abs=1e-6)
 
     def test_embedding_with_large_vector(self):
         """Test embedding with large dimension vector."""
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from sqlalchemy.dialects import postgresql
+
+from services.dataset_service import DocumentService
+
+
+def test_segment_counts_are_aggregated_in_one_query():
+    with patch("services.dataset_service.db") as mock_db:
+        mock_db.session.execute.return_value.all.return_value = [("document-1", 2, 3), ("document-2", 0, 1)]
+
+        counts = DocumentService.get_segment_counts(["document-1", "document-2", "document-3"])
+
+    assert counts == {"document-1": (2, 3), "document-2": (0, 1)}
+    mock_db.session.execute.assert_called_once()
+    sql = str(mock_db.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "count(document_segments.completed_at)" in sql
+    assert "document_segments.status != " in sql
+    assert "GROUP BY document_segments.document_id" in sql
+
+
+def test_segment_counts_of_no_documents():
+    with patch("services.dataset_service.db") as mock_db:
+        assert DocumentService.get_segment_counts([]) == {}
+
+    mock_db.session.execute.assert_not_called()
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.plugin.entities.plugin_daemon import PluginInstallTaskStatus
+from tasks import process_tenant_plugin_autoupgrade_check_task as autoupgrade_task
+
+
+@pytest.fixture
+def installer():
+    with patch.object(autoupgrade_task, "PluginInstaller") as installer_class:
+        yield installer_class.return_value
+
+
+@pytest.fixture
+def apply_async():
+    with patch.object(autoupgrade_task.check_plugin_upgrade_tasks_task, "apply_async") as mock_apply_async:
+        yield mock_apply_async
+
+
+def _statuses(installer, statuses: dict[str, PluginInstallTaskStatus]):
+    installer.fetch_plugin_installation_task.side_effect = lambda tenant_id, task_id: MagicMock(
+        status=statuses[task_id]
+    )
+
+
+def test_check_plugin_upgrade_tasks_reschedules_running_tasks(installer, apply_async):
+    _statuses(
+        installer,
+        {
+            "task-1": PluginInstallTaskStatus.Running,
+            "task-2": PluginInstallTaskStatus.Success,
+        },
+    )
+
+    autoupgrade_task.check_plugin_upgrade_tasks_task("tenant-1", ["task-1", "task-2"], 1)
+
+    assert [call.args for call in installer.fetch_plugin_installation_task.call_args_list] == [
+        ("tenant-1", "task-1"),
+        ("tenant-1", "task-2"),
+    ]
+    apply_async.assert_called_once_with(
+        args=("tenant-1", ["task-1"], 2), countdown=autoupgrade_task.UPGRADE_TASK_CHECK_INTERVAL
+    )
+
+
+def test_check_plugin_upgrade_tasks_stops_when_all_finished(installer, apply_async):
+    _statuses(
+        installer,
+        {
+            "task-1": PluginInstallTaskStatus.Failed,
+            "task-2": PluginInstallTaskStatus.Success,
+        },
+    )
+
+    autoupgrade_task.check_plugin_upgrade_tasks_task("tenant-1", ["task-1", "task-2"])
+
+    apply_async.assert_not_called()
+
+
+def test_check_plugin_upgrade_tasks_gives_up_after_max_attempts(installer, apply_async):
+    _statuses(installer, {"task-1": PluginInstallTaskStatus.Running})
+
+    autoupgrade_task.check_plugin_upgrade_tasks_task(
+        "tenant-1", ["task-1"], autoupgrade_task.UPGRADE_TASK_CHECK_MAX_ATTEMPTS - 1
+    )
+
+    apply_async.assert_not_called()